@@ -0,0 +1,24 @@
+from backend.app.core.logger import get_logger
+from backend.app.models.schemas import AgentState
+from backend.app.utils.dateResolver import parse_reference_date, resolve_date_range
+
+logger = get_logger(__name__)
+
+
+def date_resolver_node(state: AgentState):
+    """
+    Pre-processing step: resolve relative date expressions ("this weekend",
+    "next month", holidays, ranges) locally, before the rewriter runs.
+    No LLM call is made; the resolved range is passed to the prompts.
+    """
+    today = parse_reference_date(state.get("current_date", ""))
+    date_range = resolve_date_range(state["user_query"], today)
+
+    if date_range:
+        logger.info(
+            f"Resolved '{date_range['expression']}' to {date_range['start']} - {date_range['end']}"
+        )
+    else:
+        logger.info("No date expression found in query")
+
+    return {"date_range": date_range}
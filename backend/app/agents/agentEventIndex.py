@@ -0,0 +1,67 @@
+from backend.app.core import config, metrics
+from backend.app.core.eventIndex import lookup_events
+from backend.app.core.localIndex import lookup_local_events
+from backend.app.core.logger import get_logger
+from backend.app.models.schemas import AgentState
+from backend.app.utils.queryParser import content_terms, extract_category, extract_cities
+
+logger = get_logger(__name__)
+
+
+def event_index_node(state: AgentState):
+    """
+    Read-through step before searching: look the query's city, category and
+    dates up in the local event index.
+
+    - "hit": the range was searched recently and enough events are indexed;
+      the graph skips searching and answers from the index.
+    - "seed": some events are indexed but coverage is stale or partial; they
+      are used as a starting point and merged with fresh extraction results.
+    - "miss": nothing usable, search as usual. A query naming several cities
+      is always a miss (the index answers one city) and is not indexed under
+      any of them.
+
+    When the event index is disabled, unavailable or has nothing, the
+    in-process local index is asked instead (freshness there means every
+    matching event was indexed within EVENT_INDEX_MAX_AGE_HOURS).
+    """
+    query = state["user_query"]
+    cities = extract_cities(query)
+    city = cities[0] if len(cities) == 1 else None
+    category = extract_category(query)
+    terms = content_terms(query)
+    date_range = state.get("date_range")
+
+    result: dict = {"city": city, "category": category, "index_status": "miss"}
+    if len(cities) > 1:
+        logger.info(f"Event index skipped: the query names {len(cities)} cities")
+    if not city or not date_range:
+        return result
+
+    events: list = []
+    fresh = False
+    source = "event index"
+    if config.EVENT_INDEX_ENABLED:
+        try:
+            events, fresh = lookup_events(city, category, date_range, terms)
+        except Exception as e:
+            logger.warning(f"Event index lookup failed: {e}")
+    if not events and config.LOCAL_INDEX_ENABLED:
+        events, fresh = lookup_local_events(query, city, category, date_range)
+        source = "local index"
+
+    if fresh and len(events) >= config.EVENT_INDEX_MIN_EVENTS:
+        result["index_status"] = "hit"
+    elif events:
+        result["index_status"] = "seed"
+
+    if events:
+        result["events"] = events
+    metrics.increment(f"event_index.{result['index_status']}")
+    if source == "local index" and events:
+        metrics.increment(f"local_index.{result['index_status']}")
+    logger.info(
+        f"{source.capitalize()} {result['index_status']}: {len(events)} events for "
+        f"city={city}, category={category}, {date_range['start']} - {date_range['end']}"
+    )
+    return result
@@ -1,9 +1,23 @@
+import time
+from collections.abc import Callable
+from typing import Optional
+
 from langchain_core.messages import HumanMessage, SystemMessage
-from pydantic import BaseModel, Field
+from langgraph.config import get_stream_writer
+from pydantic import BaseModel, Field, ValidationError
 
-from backend.app.core.llmClient import get_llm
+from backend.app.core import config, metrics
+from backend.app.core.circuitBreaker import CircuitOpenError
+from backend.app.core.llmClient import get_llm, invoke_llm, stream_llm
+from backend.app.core.llmScheduler import PRIORITY_EXTRACTION, LLMRateLimitError
 from backend.app.core.logger import get_logger
-from backend.app.models.schemas import AgentState, Event
+from backend.app.core.pageCache import matching_events, page_cache
+from backend.app.models.schemas import AgentState, DateRange, Event
+from backend.app.utils.dateResolver import normalize_event_date, parse_reference_date
+from backend.app.utils.heuristicExtractor import extract_events, has_event_signals
+from backend.app.utils.partialJson import ArrayObjectParser
+from backend.app.utils.queryParser import extract_category, extract_cities
+from backend.app.utils.reranker import rerank, select_within_budget, snippet_tokens
 
 logger = get_logger(__name__)
 
@@ -15,40 +29,253 @@ class EventList(BaseModel):
     events: list[Event] = Field(description="The list of events found in the text.")
 
 
+def _event_key(event: Event) -> tuple[str, str]:
+    """Identity used to deduplicate events across extraction passes."""
+    return (event.title.strip().lower(), event.date.strip().lower())
+
+
+def merge_events(existing: list[Event], new: list[Event]) -> list[Event]:
+    """
+    Merge newly extracted events into the existing list.
+    Duplicates (same title and date) keep the higher score.
+    """
+    merged: dict[tuple[str, str], Event] = {}
+    for event in [*existing, *new]:
+        key = _event_key(event)
+        current = merged.get(key)
+        if current is None or (event.score or 0) > (current.score or 0):
+            merged[key] = event
+    return list(merged.values())
+
+
+def _invoke_extractor(msg: list, model: str) -> list[Event]:
+    """Run the structured extraction call against a specific model."""
+    llm = get_llm(model=model, temperature=config.EXTRACTOR_TEMPERATURE)
+    structured_llm = llm.with_structured_output(EventList)
+    response: EventList = invoke_llm(structured_llm, msg, priority=PRIORITY_EXTRACTION)
+    return response.events
+
+
+def _route_extraction(extract: Callable[[str], list[Event]]) -> list[Event]:
+    """
+    Run extract(model) with the small model first and escalate to
+    EXTRACTOR_MODEL only when it returns zero events or fails (e.g. schema
+    validation errors).
+    """
+    small_model = config.LLM_SMALL_MODEL
+    try:
+        events = extract(small_model)
+        if events:
+            return events
+        reason = "no events"
+    except (CircuitOpenError, LLMRateLimitError):
+        raise
+    except Exception as e:
+        reason = f"error: {e}"
+
+    logger.info(
+        f"Router: escalating extraction from {small_model} to {config.EXTRACTOR_MODEL} ({reason})"
+    )
+    metrics.increment("llm.router.escalations")
+    return extract(config.EXTRACTOR_MODEL)
+
+
+def _event_writer():
+    """LangGraph custom-stream writer of the current run (no-op outside a graph run)."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda chunk: None
+
+
+def _stream_extractor(
+    msg: list,
+    model: str,
+    current_date: str,
+    date_range: Optional[DateRange],
+    emitted: Optional[set[tuple[str, str]]] = None,
+) -> list[Event]:
+    """
+    Stream the extraction as JSON and emit each event as soon as its object
+    closes, validated against Event, on the graph's custom stream ({"event": ...}).
+    Events whose key is in emitted (streamed by an earlier, escalated attempt)
+    are returned but not emitted again.
+    """
+    if emitted is None:
+        emitted = set()
+    llm = get_llm(model=model, temperature=config.EXTRACTOR_TEMPERATURE)
+    json_llm = llm.bind(response_format={"type": "json_object"})
+    parser = ArrayObjectParser()
+    write = _event_writer()
+    start_time = time.perf_counter()
+
+    events: list[Event] = []
+    for text in stream_llm(json_llm, msg, priority=PRIORITY_EXTRACTION):
+        for obj in parser.feed(text):
+            try:
+                event = Event(**obj)
+            except ValidationError:
+                metrics.increment("extractor.stream.invalid_events")
+                continue
+            event = normalize_event_dates([event], current_date, date_range)[0]
+            if not events:
+                metrics.observe(
+                    "extractor.first_event_ms", (time.perf_counter() - start_time) * 1000
+                )
+            events.append(event)
+            if _event_key(event) not in emitted:
+                emitted.add(_event_key(event))
+                write({"event": event.model_dump()})
+    metrics.increment("extractor.stream.events", len(events))
+    return events
+
+
+def normalize_event_dates(
+    events: list[Event], current_date: str, date_range: Optional[DateRange]
+) -> list[Event]:
+    """Rewrite each Event.date as a sortable YYYY-MM-DD[ HH:MM] string when it can be parsed."""
+    today = parse_reference_date(current_date)
+    normalized = []
+    for event in events:
+        resolved = normalize_event_date(event.date, today, date_range)
+        normalized.append(event.model_copy(update={"date": resolved}) if resolved else event)
+    return normalized
+
+
+def _prefilter(raw_results: list[dict]) -> list[dict]:
+    """Drop snippets without enough event signals to be worth a place in the prompt."""
+    kept = [r for r in raw_results if has_event_signals(r, config.EXTRACTOR_PREFILTER_MIN_SIGNALS)]
+    dropped = len(raw_results) - len(kept)
+    if dropped:
+        logger.info(
+            f"Pre-filter dropped {dropped}/{len(raw_results)} snippets without event signals"
+        )
+        metrics.increment("extractor.prefiltered", dropped)
+    return kept
+
+
+def _split_cached_pages(
+    raw_results: list[dict], user_query: str, date_range: Optional[DateRange]
+) -> tuple[list[dict], list[Event]]:
+    """
+    Separate snippets of pages extracted by an earlier request whose cached
+    events include some matching the query's dates, cities and category
+    (those events are reused) from pages that still need the LLM: unseen,
+    stale, or only known for other events.
+    """
+    cities = extract_cities(user_query)
+    category = extract_category(user_query)
+    uncached = []
+    cached_events: list[Event] = []
+    for result in raw_results:
+        page = page_cache.get(result.get("url"))
+        events = matching_events(page.events, cities, category, date_range) if page else []
+        if not events:
+            uncached.append(result)
+            continue
+        cached_events.extend(events)
+
+    hits = len(raw_results) - len(uncached)
+    if hits:
+        logger.info(
+            f"Page cache: {hits}/{len(raw_results)} pages known, {len(cached_events)} events"
+        )
+        metrics.increment("extractor.page_cache_hits", hits)
+    metrics.increment("extractor.page_cache_misses", len(uncached))
+
+    write = _event_writer()
+    for event in cached_events:
+        write({"event": event.model_dump()})
+    return uncached, cached_events
+
+
+def _select_context(
+    raw_results: list[dict], user_query: str, current_date: str, date_range: Optional[DateRange]
+) -> list[dict]:
+    """Most relevant snippets first, as many as fit EXTRACTOR_CONTEXT_TOKEN_BUDGET."""
+    ranked = rerank(raw_results, user_query, current_date, date_range)
+    selected = select_within_budget(
+        ranked, config.EXTRACTOR_CONTEXT_TOKEN_BUDGET, config.EXTRACTOR_MIN_SNIPPETS
+    )
+    dropped = len(raw_results) - len(selected)
+    if dropped:
+        logger.info(f"Re-ranker kept {len(selected)}/{len(raw_results)} snippets within budget")
+        metrics.increment("extractor.rerank_dropped", dropped)
+    metrics.observe("extractor.context_tokens", sum(snippet_tokens(r) for r in selected))
+    return selected
+
+
+def _fallback_events(
+    raw_results: list[dict], current_date: str, date_range: Optional[DateRange]
+) -> list[Event]:
+    """Events found by the local heuristic extractor after a failed LLM call."""
+    if not config.HEURISTIC_EXTRACTOR_FALLBACK_ENABLED:
+        return []
+    events = extract_events(raw_results, current_date, date_range)
+    logger.info(f"Heuristic fallback extracted {len(events)} events")
+    metrics.increment("extractor.heuristic_fallbacks")
+    return events
+
+
 # Agent Function
 def extraction_node(state: AgentState):
     """
     Agent 3: Extract structured event data from raw search results.
+    On a retry only the sources added by the latest search pass are processed,
+    and the result is merged with the events extracted earlier.
+    If OpenAI is rate limited, extraction_error is set so the graph does not
+    retry with another search that would hit the same limit.
+    With EXTRACTOR_STREAMING_ENABLED, events are parsed from the streamed JSON
+    output and emitted on the graph's custom stream one by one; the router
+    picks the model to stream from as it does for structured calls.
+    Snippets without event signals are dropped before the prompt is built, the
+    rest are ordered by local relevance and cut to the context token budget.
+    If the LLM call fails, events are extracted with local rules instead.
+    Pages already extracted by an earlier request contribute their cached
+    events matching this query and are not sent to the LLM again.
     """
-    raw_results = state.get("raw_results", [])
+    new_raw_results = state.get("new_raw_results")
+    raw_results = new_raw_results if new_raw_results is not None else state.get("raw_results", [])
+    previous_events = state.get("events", [])
     user_query = state["user_query"]
     current_date = state["current_date"]
+    date_range = state.get("date_range")
 
     logger.info(f"Agent 3: Extracting events (input: {len(raw_results)} snippets)")
 
-    # If no results, return empty list immediately
+    if config.EXTRACTOR_PREFILTER_ENABLED:
+        raw_results = _prefilter(raw_results)
+
+    cached_events: list[Event] = []
+    if config.PAGE_CACHE_ENABLED:
+        raw_results, cached_events = _split_cached_pages(raw_results, user_query, date_range)
+
+    if config.EXTRACTOR_RERANK_ENABLED:
+        raw_results = _select_context(raw_results, user_query, current_date, date_range)
+
+    # If no new results, keep whatever was extracted before
     if not raw_results:
-        return {"events": []}
+        return {"events": merge_events(previous_events, cached_events), "extraction_error": None}
 
     # Prepare the context text for the LLM
     # We join titles and content to give the LLM the full picture
     context_text = "\n\n".join(
         [
-            f"Source {i+1} ({r.get('url', 'N/A')}):\nTitle: {r.get('title', '')}\nContent: {r.get('content', '')}\nScore: {r.get('score', '')}"
+            f"Source {i + 1} ({r.get('url', 'N/A')}):\nTitle: {r.get('title', '')}\nContent: {r.get('content', '')}\nScore: {r.get('score', '')}"
             for i, r in enumerate(raw_results)
         ]
     )
 
-    # Initialize LLM
-    llm = get_llm(temperature=0)
-    structured_llm = llm.with_structured_output(EventList)
+    requested_dates = ""
+    if date_range:
+        requested_dates = f"\n- Requested Dates: {date_range['start']} to {date_range['end']}"
 
     # System Prompt
     system_msg = f"""You are an expert data extraction assistant.
 
 Context:
 - Current Date: {current_date}
-- User Query: {user_query}
+- User Query: {user_query}{requested_dates}
 
 Your Goal:
 Extract a list of unique events from the provided search results.
@@ -60,6 +287,11 @@ Guidelines:
 4. IGNORE: General articles, "top 10" lists without specific dates, or events far in the past.
 5. If no events are found, return an empty list.
 6. Keep the confidence score the same as in the raw search results or the higher score in case an event is deduplicated.
+"""
+
+    if config.EXTRACTOR_STREAMING_ENABLED:
+        system_msg += """
+Respond with a JSON object of the form {"events": [{"title": "...", "date": "...", "location": "...", "description": "...", "url": "...", "score": 0.0}]}.
 """
 
     msg = [
@@ -67,14 +299,46 @@ Guidelines:
         HumanMessage(content=f"Here are the search results:\n\n{context_text}"),
     ]
 
-    # Invoke LLM
+    # Invoke LLM (through the small/large router when enabled)
+    use_router = (
+        config.EXTRACTOR_ROUTER_ENABLED and config.LLM_SMALL_MODEL != config.EXTRACTOR_MODEL
+    )
+    extract: Callable[[str], list[Event]]
+    if config.EXTRACTOR_STREAMING_ENABLED:
+        emitted: set[tuple[str, str]] = set()
+
+        def extract(model: str) -> list[Event]:
+            return _stream_extractor(msg, model, current_date, date_range, emitted)
+
+    else:
+
+        def extract(model: str) -> list[Event]:
+            return _invoke_extractor(msg, model)
+
+    extraction_error = None
     try:
-        response = structured_llm.invoke(msg)
-        extracted_events = response.events
+        if use_router:
+            extracted_events = _route_extraction(extract)
+        else:
+            extracted_events = extract(config.EXTRACTOR_MODEL)
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping LLM extraction: {e}")
+        extracted_events = _fallback_events(raw_results, current_date, date_range)
+    except LLMRateLimitError as e:
+        logger.warning(f"Skipping LLM extraction: {e}")
+        extracted_events = _fallback_events(raw_results, current_date, date_range)
+        extraction_error = "rate_limited"
     except Exception as e:
         logger.error(f"Error in extraction: {e}", exc_info=True)
-        extracted_events = []
+        extracted_events = _fallback_events(raw_results, current_date, date_range)
+    else:
+        extracted_events = normalize_event_dates(extracted_events, current_date, date_range)
+        if config.PAGE_CACHE_ENABLED:
+            page_cache.store_extraction(raw_results, extracted_events)
 
     logger.info(f"Extracted {len(extracted_events)} events")
 
-    return {"events": extracted_events}
+    return {
+        "events": merge_events(previous_events, [*cached_events, *extracted_events]),
+        "extraction_error": extraction_error,
+    }
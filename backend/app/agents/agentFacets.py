@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from langgraph.types import Send
+
+from backend.app.agents.agentExtractor import extraction_node, merge_events
+from backend.app.agents.agentSearch import search_node
+from backend.app.core import metrics
+from backend.app.core.logger import get_logger
+from backend.app.models.schemas import AgentState, FacetState
+
+logger = get_logger(__name__)
+
+
+def route_after_rewrite(state: AgentState):
+    """
+    Fan out one "facet" task per search facet (map step), or continue with the
+    single searcher -> extractor pipeline when the query was not split.
+    """
+    facets = state.get("search_facets") or []
+    if len(facets) < 2:
+        return "searcher"
+
+    shared = {
+        "user_query": state["user_query"],
+        "current_date": state["current_date"],
+        "date_range": state.get("date_range"),
+        "warm_run": state.get("warm_run", False),
+        "retry_count": state.get("retry_count", 0),
+        # URLs already fetched by earlier attempts are skipped by every facet
+        "raw_results": state.get("raw_results", []),
+        "events": [],
+    }
+    return [
+        Send("facet", {**shared, "facet_label": facet["label"], "search_queries": facet["queries"]})
+        for facet in facets
+    ]
+
+
+async def facet_node(state: FacetState):
+    """
+    Search and extract a single facet. Runs in parallel with the other facets;
+    its output is appended to facet_results and combined by facet_merge_node.
+    """
+    label = state["facet_label"]
+
+    start_time = time.perf_counter()
+    search_update = await search_node(state)
+    search_ms = (time.perf_counter() - start_time) * 1000
+
+    start_time = time.perf_counter()
+    extract_state: FacetState = {**state, **search_update}
+    extract_update = await asyncio.to_thread(extraction_node, extract_state)
+    extract_ms = (time.perf_counter() - start_time) * 1000
+
+    events = extract_update.get("events", [])
+    new_raw_results = search_update.get("new_raw_results", [])
+    metrics.observe("facet.search_ms", search_ms)
+    metrics.observe("facet.extract_ms", extract_ms)
+    logger.info(
+        f"Facet '{label}': {len(new_raw_results)} snippets, {len(events)} events "
+        f"(search {search_ms:.0f} ms, extract {extract_ms:.0f} ms)"
+    )
+
+    return {
+        "facet_results": [
+            {
+                "label": label,
+                "attempt": state.get("retry_count", 0),
+                "events": events,
+                "new_raw_results": new_raw_results,
+                "extraction_error": extract_update.get("extraction_error"),
+                "timing": {
+                    "label": label,
+                    "search_ms": round(search_ms, 1),
+                    "extract_ms": round(extract_ms, 1),
+                    "snippets": len(new_raw_results),
+                    "events": len(events),
+                },
+            }
+        ]
+    }
+
+
+def facet_merge_node(state: AgentState):
+    """
+    Reduce step: merge the events and snippets of the latest fan-out into the
+    main state (duplicate events keep the higher score, duplicate URLs are dropped).
+    """
+    attempt = state.get("retry_count", 0)
+    results = [r for r in state.get("facet_results", []) if r["attempt"] == attempt]
+
+    events = state.get("events", [])
+    raw_results = list(state.get("raw_results", []))
+    seen_urls = {r.get("url") for r in raw_results if r.get("url")}
+    new_raw_results = []
+    for result in results:
+        events = merge_events(events, result["events"])
+        for snippet in result["new_raw_results"]:
+            url = snippet.get("url")
+            if url and url in seen_urls:
+                continue
+            if url:
+                seen_urls.add(url)
+            new_raw_results.append(snippet)
+
+    timings = [result["timing"] for result in results]
+    logger.info(f"Merged {len(results)} facets into {len(events)} events: {timings}")
+
+    rate_limited = any(r["extraction_error"] == "rate_limited" for r in results)
+    return {
+        "events": events,
+        "raw_results": raw_results + new_raw_results,
+        "new_raw_results": new_raw_results,
+        "facet_timings": timings,
+        "extraction_error": "rate_limited" if rate_limited else None,
+    }
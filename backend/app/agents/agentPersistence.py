@@ -1,40 +1,175 @@
 import datetime
+import hashlib
+import json
+import re
 import uuid
 
+from pymongo.errors import DuplicateKeyError
+
+from backend.app.core import config, metrics
+from backend.app.core.circuitBreaker import CircuitOpenError, get_breaker
 from backend.app.core.dbClient import get_db_collection
+from backend.app.core.eventIndex import index_events, record_coverage
+from backend.app.core.localIndex import index_search_results
 from backend.app.core.logger import get_logger
-from backend.app.models.schemas import AgentState
+from backend.app.models.schemas import AgentState, Event
+from backend.app.utils.queryParser import content_terms
 
 logger = get_logger(__name__)
 
+_indexes_ready = False
 
-def persistence_node(state: AgentState):
+
+def search_hash(user_query: str, date_context: str, events: list[Event]) -> str:
     """
-    Agent 4: Save the query and results to MongoDB Atlas.
+    Key of a search's content: the normalized query, its date context and the
+    set of events (title, date, location and URL; scores and descriptions vary
+    between runs of the same search and are left out).
     """
-    logger.info("Agent 4: Saving to MongoDB")
+    normalized_query = " ".join(user_query.lower().split())
+    event_set = sorted(
+        {
+            (re.sub(r"\W+", " ", e.title.lower()).strip(), e.date, e.location.lower(), e.url)
+            for e in events
+        }
+    )
+    payload = json.dumps([normalized_query, date_context, event_set])
+    return hashlib.sha256(payload.encode()).hexdigest()
 
-    # Prepare the document and generate a unique ID for this specific run
-    search_id = str(uuid.uuid4())
 
+def _searches_collection():
+    """The searches collection, with its unique content_hash index created on first use."""
+    global _indexes_ready
+
+    collection = get_db_collection()
+    if config.PERSISTENCE_UPSERT_ENABLED and not _indexes_ready:
+        # Sparse: documents written with upserts disabled have no content_hash
+        get_breaker("mongodb").call(
+            collection.create_index, "content_hash", unique=True, sparse=True
+        )
+        _indexes_ready = True
+    return collection
+
+
+def _upsert_search(collection, document: dict) -> bool:
+    """
+    Record one more hit on the document with the same content, or insert the
+    search. The hit is tried first on its own, so a repeated search sends a
+    small update instead of the whole document. Returns True when an existing
+    document was updated.
+    """
+    query = {"content_hash": document["content_hash"]}
+    hit = {"search_id": document["_id"], "timestamp": document["timestamp"]}
+    record_hit = {
+        "$inc": {"hit_count": 1},
+        "$set": {"last_seen": document["timestamp"]},
+        "$push": {"hits": {"$each": [hit], "$slice": -config.PERSISTENCE_MAX_HITS}},
+    }
+    breaker = get_breaker("mongodb")
+    if breaker.call(collection.update_one, query, record_hit).matched_count:
+        return True
+
+    on_insert = {k: v for k, v in document.items() if k not in ("content_hash", "last_seen")}
+    try:
+        result = breaker.call(
+            collection.update_one, query, {**record_hit, "$setOnInsert": on_insert}, upsert=True
+        )
+    except DuplicateKeyError:
+        # A concurrent run inserted the same content first: record the hit on its document
+        breaker.call(collection.update_one, query, record_hit)
+        return True
+    return result.upserted_id is None
+
+
+def _save_search(state: AgentState, search_id: str) -> None:
+    """Insert the search document, or record a hit on the identical saved search."""
+    events = state.get("events", [])
+
+    now = datetime.datetime.utcnow()
     document = {
         "_id": search_id,
         "user_query": state.get("user_query"),
-        "timestamp": datetime.datetime.utcnow(),
+        "timestamp": now,
+        "last_seen": now,  # Refreshed by every hit; the retention TTL index expires on it
         "date_context": state.get("current_date"),
-        "events": [event.model_dump() for event in state.get("events", [])],
+        "events": [event.model_dump() for event in events],
         "raw_results_count": len(state.get("raw_results", [])),
         "raw_results": state.get("raw_results", []),
         "status": "SUCCESS",
     }
+    if state.get("facet_timings"):
+        document["facets"] = state["facet_timings"]
 
-    # Insert into DB
+    # Insert into DB, or count a hit on the identical search saved earlier
     try:
-        collection = get_db_collection()
-        collection.insert_one(document)
-        logger.info(f"Saved search with ID: {search_id}")
+        collection = _searches_collection()
+        if config.PERSISTENCE_UPSERT_ENABLED:
+            document["content_hash"] = search_hash(
+                state.get("user_query") or "", state.get("current_date") or "", events
+            )
+            if _upsert_search(collection, document):
+                metrics.increment("persistence.deduplicated")
+                logger.info(f"Search {search_id} matched a saved search; hit recorded")
+            else:
+                metrics.increment("persistence.inserted")
+                logger.info(f"Saved search with ID: {search_id}")
+        else:
+            get_breaker("mongodb").call(collection.insert_one, document)
+            metrics.increment("persistence.inserted")
+            logger.info(f"Saved search with ID: {search_id}")
+    except CircuitOpenError as e:
+        logger.warning(f"Search {search_id} not saved: {e}")
     except Exception as e:
         logger.error(f"Error saving to MongoDB: {e}", exc_info=True)
 
+
+def persistence_node(state: AgentState):
+    """
+    Agent 4: Save the query and results to MongoDB Atlas.
+    Cache warmer runs only update the event and local indexes: they are not
+    user searches, and saving them would feed back into mine_hot_queries.
+    """
+    logger.info("Agent 4: Saving to MongoDB")
+
+    # The run's ID is assigned up front (or generated here)
+    search_id = state.get("search_id") or str(uuid.uuid4())
+    if state.get("warm_run"):
+        logger.info(f"Warm run {search_id} not saved to search history")
+    else:
+        _save_search(state, search_id)
+
+    _update_event_index(state)
+    _update_local_index(state)
+
     # Don't change the state, just pass it through
     return {"search_id": search_id}
+
+
+def _update_event_index(state: AgentState) -> None:
+    """Upsert the extracted events into the event index and record the searched coverage."""
+    events = state.get("events", [])
+    if not config.EVENT_INDEX_ENABLED or not events or state.get("index_status") == "hit":
+        return
+
+    city = state.get("city")
+    category = state.get("category")
+    date_range = state.get("date_range")
+    terms = content_terms(state.get("user_query") or "")
+    try:
+        index_events(events, city, category, terms)
+        if city and date_range:
+            record_coverage(city, category, date_range, terms)
+    except CircuitOpenError as e:
+        logger.warning(f"Event index not updated: {e}")
+    except Exception as e:
+        logger.error(f"Error updating event index: {e}", exc_info=True)
+
+
+def _update_local_index(state: AgentState) -> None:
+    """Add this run's events and the newly fetched snippets to the in-process BM25 index."""
+    if not config.LOCAL_INDEX_ENABLED or state.get("index_status") == "hit":
+        return
+    try:
+        index_search_results(state.get("events", []), state.get("raw_results", []))
+    except Exception as e:
+        logger.error(f"Error updating local index: {e}", exc_info=True)
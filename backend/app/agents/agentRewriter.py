@@ -4,33 +4,68 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from pydantic import BaseModel, Field
 
 from backend.app.core import config
-from backend.app.core.llmClient import get_llm
+from backend.app.core.circuitBreaker import CircuitOpenError
+from backend.app.core.llmClient import get_llm, invoke_llm
+from backend.app.core.llmScheduler import PRIORITY_REWRITE
 from backend.app.core.logger import get_logger
-from backend.app.models.schemas import AgentState
+from backend.app.models.schemas import AgentState, SearchFacet
 
 logger = get_logger(__name__)
 
 
+class Facet(BaseModel):
+    label: str = Field(description="Short name of the facet, e.g. 'Austin' or 'jazz'.")
+    queries: list[str] = Field(description="Search queries for this facet only.")
+
+
 class QueryList(BaseModel):
     queries: list[str] = Field(description="A list of targeted search queries.")
+    facets: list[Facet] = Field(
+        default_factory=list,
+        description="Independent sub-searches, only when the request names several locations or categories.",
+    )
+
+
+def _facets_from_response(response, query_history: list[str]) -> list[SearchFacet]:
+    """Keep facets only when there are at least two, each with unused queries."""
+    seen = {q.strip().lower() for q in query_history}
+    facets: list[SearchFacet] = []
+    for facet in list(response.facets or [])[: config.FACET_MAX_FACETS]:
+        queries = [q for q in facet.queries if q.strip().lower() not in seen] or facet.queries
+        if queries:
+            facets.append({"label": facet.label, "queries": queries[: config.FACET_NUM_QUERIES]})
+    return facets if len(facets) > 1 else []
 
 
 def query_rewriter_node(state: AgentState):
     """
     Agent 1: Analyze user input and generate search queries.
     Now includes logic to handle RETRIES by broadening the scope.
+    With FACET_FANOUT_ENABLED, a request naming several locations or categories
+    is also split into search_facets, which the graph searches and extracts in parallel.
     """
     user_query = state["user_query"]
     # Default to 0 if not set
     retry_count = state.get("retry_count", 0)
+    query_history = state.get("query_history", [])
     current_date = state.get("current_date", datetime.datetime.now().strftime("%Y-%m-%d"))
+    date_range = state.get("date_range")
 
     logger.info(f"Agent 1: Rewriting query (attempt: {retry_count + 1})")
 
-    llm = get_llm(temperature=0)
+    llm = get_llm(model=config.REWRITER_MODEL, temperature=config.REWRITER_TEMPERATURE)
     structured_llm = llm.with_structured_output(QueryList)
 
-    system_msg = f"""You are an expert event researcher. Current Date: {current_date}.
+    if date_range:
+        # Dates were resolved locally; leaving current_date out keeps the prompt
+        # identical for the same intent on different days
+        system_msg = f"""You are an expert event researcher.
+    Generate {config.REWRITER_NUM_QUERIES} targeted search queries for the user's request.
+    The requested dates ("{date_range["expression"]}") are {date_range["start"]} to {date_range["end"]}.
+    Use these exact dates in the queries.
+    """
+    else:
+        system_msg = f"""You are an expert event researcher. Current Date: {current_date}.
     Generate {config.REWRITER_NUM_QUERIES} targeted search queries for the user's request.
     Resolve relative dates (e.g., "this weekend") to specific YYYY-MM-DD dates.
     """
@@ -45,19 +80,57 @@ Please generate NEW queries that are BROADER and less specific.
 - Try general terms like "events near me" or "city calendar".
 - Try searching for generic events in the specified location and date range.
 Ensure the new queries still relate to the user's original intent.
+"""
+        if query_history:
+            previous = "\n".join(f"- {q}" for q in query_history)
+            system_msg += f"""
+Do NOT repeat any of these previously used queries:
+{previous}
+"""
+
+    if config.FACET_FANOUT_ENABLED:
+        system_msg += f"""
+If the request names several independent locations or event categories
+(e.g. "food festivals in Austin, Dallas and Houston"), also split it into facets:
+one facet per location or category, each with a short label and
+{config.FACET_NUM_QUERIES} queries specific to it. Otherwise return no facets.
 """
 
     msg = [SystemMessage(content=system_msg), HumanMessage(content=user_query)]
 
+    facets: list[SearchFacet] = []
     try:
-        response = structured_llm.invoke(msg)
+        response = invoke_llm(structured_llm, msg, priority=PRIORITY_REWRITE)
         queries = response.queries
+        if config.FACET_FANOUT_ENABLED:
+            facets = _facets_from_response(response, query_history)
         logger.info(f"Generated {len(queries)} search queries")
+    except CircuitOpenError as e:
+        logger.warning(f"Using original query as fallback: {e}")
+        queries = [user_query]
     except Exception as e:
         logger.error(f"Error generating search queries: {e}", exc_info=True)
         # Return a basic fallback query so the pipeline can continue
         queries = [user_query]
         logger.warning("Using original query as fallback")
 
+    # Drop queries we already sent to Tavily; their results are still in raw_results
+    if query_history:
+        seen = {q.strip().lower() for q in query_history}
+        fresh_queries = [q for q in queries if q.strip().lower() not in seen]
+        if fresh_queries:
+            queries = fresh_queries
+        else:
+            logger.warning("All generated queries were already used, reusing them")
+
+    if facets:
+        queries = [q for facet in facets for q in facet["queries"]]
+        logger.info(f"Split into {len(facets)} facets: {[facet['label'] for facet in facets]}")
+
     # Return state update: New queries AND incremented retry_count
-    return {"search_queries": queries, "retry_count": retry_count + 1}
+    return {
+        "search_queries": queries,
+        "search_facets": facets,
+        "query_history": query_history + queries,
+        "retry_count": retry_count + 1,
+    }
@@ -1,57 +1,216 @@
 import asyncio
+import copy
+import time
+from typing import Optional
 
-from backend.app.core import config
+from backend.app.core import config, metrics
+from backend.app.core.cache import TTLCache
+from backend.app.core.circuitBreaker import CircuitOpenError, get_breaker
 from backend.app.core.logger import get_logger
 from backend.app.core.tavilyClient import get_async_tavily_client
 from backend.app.models.schemas import AgentState
+from backend.app.utils.snippetCleaner import clean_snippets
 
 logger = get_logger(__name__)
 
+# Tavily API credits charged per search, by depth
+SEARCH_DEPTH_CREDITS = {"basic": 1, "advanced": 2}
+
+# Recent responses per (query, depth), reused instead of calling Tavily again
+tavily_result_cache = TTLCache(
+    max_entries=config.TAVILY_CACHE_SIZE,
+    ttl_seconds=config.TAVILY_CACHE_TTL_SECONDS,
+)
+
+# Last good response per (query, depth), served while the Tavily breaker is open
+tavily_fallback_cache = TTLCache(
+    max_entries=config.TAVILY_FALLBACK_CACHE_SIZE,
+    ttl_seconds=config.TAVILY_FALLBACK_CACHE_TTL_SECONDS,
+)
+
+
+def needs_escalation(response) -> bool:
+    """
+    Decide whether a basic search response is too weak and should be retried
+    with the deeper search tier (failed call, too few results or low relevance).
+    """
+    if not isinstance(response, dict):
+        return True
+
+    results = response.get("results", [])
+    if len(results) < config.TAVILY_ESCALATION_MIN_RESULTS:
+        return True
+
+    scores = [r["score"] for r in results if isinstance(r.get("score"), (int, float))]
+    return bool(scores) and max(scores) < config.TAVILY_ESCALATION_MIN_SCORE
+
+
+async def _search_one(
+    tavily_async, query: str, depth: str, cache_ttl: Optional[float] = None
+) -> dict:
+    """
+    Run a single search through the Tavily circuit breaker.
+    Recent responses for the same query and depth are served from cache (new
+    ones are kept for cache_ttl seconds, default TAVILY_CACHE_TTL_SECONDS); while
+    the breaker is open, the last good response for the same query is used instead.
+    """
+    cache_key = (query.strip().lower(), depth)
+    if config.TAVILY_CACHE_TTL_SECONDS > 0:
+        cached = tavily_result_cache.get(cache_key)
+        if cached is not None:
+            metrics.increment("tavily.cache_hits")
+            return copy.deepcopy(cached)
+
+    try:
+        response: dict = await get_breaker("tavily").acall(
+            tavily_async.search,
+            query=query,
+            search_depth=depth,
+            max_results=config.TAVILY_MAX_RESULTS,
+            include_answer=config.TAVILY_INCLUDE_ANSWER,
+        )
+    except CircuitOpenError:
+        cached = tavily_fallback_cache.get(cache_key)
+        if cached is None:
+            raise
+        metrics.increment("tavily.fallback_hits")
+        return copy.deepcopy(cached)
+
+    metrics.increment(f"tavily.searches.{depth}")
+    metrics.increment("tavily.credits", SEARCH_DEPTH_CREDITS.get(depth, 1))
+    if isinstance(response, dict):
+        tavily_fallback_cache.set(cache_key, copy.deepcopy(response))
+        if config.TAVILY_CACHE_TTL_SECONDS > 0:
+            tavily_result_cache.set(cache_key, copy.deepcopy(response), ttl_seconds=cache_ttl)
+    return response
+
+
+async def _search_batch(
+    tavily_async, queries: list[str], depth: str, cache_ttl: Optional[float] = None
+) -> list:
+    """Run one search per query at the given depth, in parallel."""
+    start_time = time.perf_counter()
+
+    # Create a list of coroutine tasks
+    search_tasks = [_search_one(tavily_async, q, depth, cache_ttl) for q in queries]
+
+    # Execute all tasks concurrently and wait for them to finish
+    responses = await asyncio.gather(*search_tasks, return_exceptions=True)
+
+    metrics.observe(f"tavily.batch_latency_ms.{depth}", (time.perf_counter() - start_time) * 1000)
+    return responses
+
+
+async def _search_adaptive(tavily_async, query: str, cache_ttl: Optional[float] = None) -> list:
+    """
+    Search one query with the 'basic' tier and, when its results are weak,
+    escalate it to TAVILY_SEARCH_DEPTH right away instead of waiting for the
+    other queries' basic searches. Returns the responses (or exceptions) of
+    each depth searched.
+    """
+    responses: list = []
+    for depth in ("basic", config.TAVILY_SEARCH_DEPTH):
+        try:
+            responses.append(await _search_one(tavily_async, query, depth, cache_ttl))
+        except Exception as e:
+            responses.append(e)
+        if not needs_escalation(responses[-1]):
+            break
+    return responses
+
 
 async def search_node(state: AgentState):
     """
     Agent 2: Execute search queries in PARALLEL using asyncio.
+
+    With adaptive depth enabled, every query is first searched with the cheap
+    'basic' tier, and only queries with weak results are escalated to
+    TAVILY_SEARCH_DEPTH, each as soon as its own basic results arrive.
+    New results are cleaned of boilerplate before they reach the extractor.
     """
     queries = state["search_queries"]
     logger.info(f"Agent 2: Searching Tavily ({len(queries)} queries in parallel)")
 
     tavily_async = get_async_tavily_client()
 
-    # Create a list of coroutine tasks
-    search_tasks = []
-    for q in queries:
-        # Schedule the coroutine
-        task = tavily_async.search(
-            query=q,
-            search_depth=config.TAVILY_SEARCH_DEPTH,
-            max_results=config.TAVILY_MAX_RESULTS,
-            include_answer=config.TAVILY_INCLUDE_ANSWER,
-        )
-        search_tasks.append(task)
+    adaptive = config.TAVILY_ADAPTIVE_DEPTH and config.TAVILY_SEARCH_DEPTH != "basic"
+    # Results fetched by the cache warmer must last through the next peak hours
+    cache_ttl = config.CACHE_WARMER_TTL_SECONDS if state.get("warm_run") else None
 
-    # Execute all tasks concurrently and wait for them to finish
+    escalated: list[str] = []
     try:
-        search_responses = await asyncio.gather(*search_tasks, return_exceptions=True)
+        if adaptive:
+            start_time = time.perf_counter()
+            responses_per_query = await asyncio.gather(
+                *(_search_adaptive(tavily_async, q, cache_ttl) for q in queries)
+            )
+            metrics.observe(
+                "tavily.batch_latency_ms.adaptive", (time.perf_counter() - start_time) * 1000
+            )
+            escalated = [
+                q for q, responses in zip(queries, responses_per_query) if len(responses) > 1
+            ]
+            if escalated:
+                logger.info(
+                    f"Escalated {len(escalated)}/{len(queries)} queries to "
+                    f"'{config.TAVILY_SEARCH_DEPTH}' search"
+                )
+                metrics.increment("tavily.escalations", len(escalated))
+        else:
+            responses = await _search_batch(
+                tavily_async, queries, config.TAVILY_SEARCH_DEPTH, cache_ttl
+            )
+            responses_per_query = [[response] for response in responses]
     except Exception as e:
         logger.error(f"Critical async error during search: {e}", exc_info=True)
-        return {"raw_results": []}
+        return {
+            "raw_results": state.get("raw_results", []),
+            "new_raw_results": [],
+            "search_escalations": escalated,
+        }
+
+    # Results from earlier attempts are kept; only unseen URLs are added
+    previous_results = state.get("raw_results", [])
+    seen_urls = {r.get("url") for r in previous_results if r.get("url")}
 
     # Process results
-    all_results = []
-    for i, response in enumerate(search_responses):
-        query_used = queries[i]
+    new_results = []
+    for query_used, responses in zip(queries, responses_per_query):
+        for response in responses:
+            # Handle individual task failures (if one query fails, others shouldn't die)
+            if isinstance(response, Exception):
+                logger.warning(f"Error searching for '{query_used}': {response}")
+                continue
 
-        # Handle individual task failures (if one query fails, others shouldn't die)
-        if isinstance(response, Exception):
-            logger.warning(f"Error searching for '{query_used}': {response}")
-            continue
+            # Tag results with context (response is a dict here, not an exception)
+            results = response.get("results", []) if isinstance(response, dict) else []
+            for result in results:
+                url = result.get("url")
+                if url and url in seen_urls:
+                    continue
+                if url:
+                    seen_urls.add(url)
+                result["query_context"] = query_used
+                new_results.append(result)
 
-        # Tag results with context (response is a dict here, not an exception)
-        results = response.get("results", []) if isinstance(response, dict) else []
-        for result in results:
-            result["query_context"] = query_used
-            all_results.append(result)
+    if config.SNIPPET_CLEANING_ENABLED and new_results:
+        new_results, stats = clean_snippets(
+            new_results, config.SNIPPET_BOILERPLATE_MIN_DOCS, config.SNIPPET_CONTEXT_SENTENCES
+        )
+        metrics.observe("search.clean.bytes_in", stats["bytes_in"])
+        metrics.observe("search.clean.bytes_out", stats["bytes_out"])
+        removed = 1 - stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else 0.0
+        logger.info(
+            f"Cleaned snippets: {stats['bytes_in']} -> {stats['bytes_out']} bytes "
+            f"({removed:.0%} removed)"
+        )
 
-    logger.info(f"Found {len(all_results)} raw results")
+    logger.info(
+        f"Found {len(new_results)} new raw results ({len(previous_results)} kept from earlier attempts)"
+    )
 
-    return {"raw_results": all_results}
+    return {
+        "raw_results": previous_results + new_results,
+        "new_raw_results": new_results,
+        "search_escalations": escalated,
+    }
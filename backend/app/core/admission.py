@@ -0,0 +1,127 @@
+"""
+Global admission control for graph runs started by /search.
+
+At most ADMISSION_MAX_IN_FLIGHT graph runs execute at once. Up to
+ADMISSION_MAX_QUEUE further requests may wait for a slot for at most
+ADMISSION_MAX_WAIT_SECONDS. Anything beyond that is rejected immediately with
+AdmissionRejected, so that under a spike the admitted requests keep their latency
+instead of every request slowing down together until all of them time out.
+Callers turn the rejection into HTTP 503 with a Retry-After header.
+
+Usage:
+    from backend.app.core.admission import search_admission
+    async with search_admission.slot():
+        result = await graph.ainvoke(state)
+"""
+
+import asyncio
+import contextlib
+import math
+import time
+from collections.abc import AsyncIterator
+from typing import Optional
+
+from backend.app.core import config, metrics
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Weight of the newest run in the moving average of run time
+_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot start before its deadline."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounded in-flight counter with a short, deadline-limited wait queue."""
+
+    def __init__(self, max_in_flight: int, max_queue: int, max_wait_seconds: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.in_flight = 0
+        self.waiting = 0
+        self._avg_run_seconds = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain (at least 1)."""
+        backlog = self.in_flight + self.waiting
+        estimate = self._avg_run_seconds * backlog / max(1, self.max_in_flight)
+        return max(1, math.ceil(estimate))
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("admission.in_flight", self.in_flight)
+        metrics.set_gauge("admission.queue_depth", self.waiting)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        metrics.increment("admission.rejected")
+        metrics.increment(f"admission.rejected.{reason}")
+        retry_after = self.retry_after()
+        logger.warning(f"Admission rejected ({reason}); retry after {retry_after}s")
+        return AdmissionRejected(reason, retry_after)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting up to max_wait_seconds; raises AdmissionRejected."""
+        semaphore = self._get_semaphore()
+        if not semaphore.locked():
+            await semaphore.acquire()  # a slot is free: no wait, no timer
+            self.in_flight += 1
+            self._update_gauges()
+            metrics.observe("admission.wait_ms", 0.0)
+            return
+        if self.waiting >= self.max_queue:
+            raise self._reject("queue_full")
+
+        start_time = time.perf_counter()
+        self.waiting += 1
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            raise self._reject("timeout") from None
+        finally:
+            self.waiting -= 1
+            self._update_gauges()
+        self.in_flight += 1
+        self._update_gauges()
+        metrics.observe("admission.wait_ms", (time.perf_counter() - start_time) * 1000)
+
+    def release(self, run_seconds: float) -> None:
+        self._avg_run_seconds += _EWMA_ALPHA * (run_seconds - self._avg_run_seconds)
+        self.in_flight -= 1
+        self._get_semaphore().release()
+        self._update_gauges()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        metrics.increment("admission.admitted")
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start_time)
+
+
+# Shared by all /search requests in this process
+search_admission = AdmissionController(
+    max_in_flight=config.ADMISSION_MAX_IN_FLIGHT,
+    max_queue=config.ADMISSION_MAX_QUEUE,
+    max_wait_seconds=config.ADMISSION_MAX_WAIT_SECONDS,
+)
@@ -0,0 +1,171 @@
+"""
+Background cache warmer driven by search history.
+
+Query popularity is heavily skewed, so the most frequent recent queries in the
+`searches` collection are re-run off-peak. Running them fills the semantic
+response cache and the Tavily result cache, so peak-hour requests for the same
+queries are served from cache. The runner is expected to cache warm results for
+CACHE_WARMER_TTL_SECONDS and to keep them out of the search history, so warm
+runs neither expire before peak hours nor count towards query popularity.
+
+Each warm cycle stops early once its LLM spend (USD) or Tavily credits reach
+CACHE_WARMER_MAX_LLM_COST_USD / CACHE_WARMER_MAX_TAVILY_CREDITS. Only the
+warmer's own runs are counted (metrics.meter), not concurrent user traffic.
+
+Usage:
+    warmer = CacheWarmer(runner=lambda q: execute_search(q, warm=True))  # async -> dict
+    warmer.start()   # on startup
+    await warmer.stop()  # on shutdown
+"""
+
+import asyncio
+import contextlib
+import datetime
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from backend.app.core import config, metrics
+from backend.app.core.circuitBreaker import get_breaker
+from backend.app.core.dbClient import get_db_collection
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+SearchRunner = Callable[[str], Awaitable[dict]]
+
+
+def is_off_peak(now: datetime.datetime) -> bool:
+    """True if now falls in [OFF_PEAK_START_HOUR, OFF_PEAK_END_HOUR), wrapping past midnight."""
+    start = config.CACHE_WARMER_OFF_PEAK_START_HOUR
+    end = config.CACHE_WARMER_OFF_PEAK_END_HOUR
+    if start <= end:
+        return start <= now.hour < end
+    return now.hour >= start or now.hour < end
+
+
+def mine_hot_queries(now: Optional[datetime.datetime] = None) -> list[tuple[str, int]]:
+    """
+    Most frequent successful queries over the lookback window, as (query, count),
+    normalized to lowercase so trivially different spellings are counted together.
+    A deduplicated search counts each of its hits in the window; a document
+    without hits (saved with upserts disabled) counts once.
+    """
+    now = now or datetime.datetime.utcnow()
+    cutoff = now - datetime.timedelta(hours=config.CACHE_WARMER_LOOKBACK_HOURS)
+    hits_in_window = {
+        "$size": {
+            "$filter": {
+                "input": {"$ifNull": ["$hits", [{"timestamp": "$timestamp"}]]},
+                "cond": {"$gte": ["$$this.timestamp", cutoff]},
+            }
+        }
+    }
+    pipeline: list[dict[str, Any]] = [
+        {
+            "$match": {
+                "$or": [{"timestamp": {"$gte": cutoff}}, {"last_seen": {"$gte": cutoff}}],
+                "status": "SUCCESS",
+            }
+        },
+        {
+            "$group": {
+                "_id": {"$toLower": {"$trim": {"input": "$user_query"}}},
+                "count": {"$sum": hits_in_window},
+            }
+        },
+        {"$match": {"count": {"$gte": config.CACHE_WARMER_MIN_COUNT}}},
+        {"$sort": {"count": -1}},
+        {"$limit": config.CACHE_WARMER_TOP_QUERIES},
+    ]
+    collection = get_db_collection()
+    documents = get_breaker("mongodb").call(lambda: list(collection.aggregate(pipeline)))
+    return [(doc["_id"], doc["count"]) for doc in documents if doc.get("_id")]
+
+
+def _spend(usage: dict[str, float]) -> tuple[float, float]:
+    """(LLM cost in USD, Tavily credits) recorded in a metered usage dict."""
+    cost = sum(
+        value
+        for name, value in usage.items()
+        if name.startswith("llm.") and name.endswith(".cost_usd")
+    )
+    return cost, usage.get("tavily.credits", 0)
+
+
+async def run_warm_cycle(runner: SearchRunner, queries: list[tuple[str, int]]) -> dict:
+    """
+    Run the given queries hottest first until the cycle's budget is spent.
+    Queries already answered from cache cost nothing and are counted as skipped.
+    """
+    summary: dict[str, Any] = {"warmed": 0, "skipped": 0, "failed": 0, "budget_exhausted": False}
+    cost = credits = 0.0
+
+    for query, _count in queries:
+        if (
+            cost >= config.CACHE_WARMER_MAX_LLM_COST_USD
+            or credits >= config.CACHE_WARMER_MAX_TAVILY_CREDITS
+        ):
+            summary["budget_exhausted"] = True
+            metrics.increment("cache_warmer.budget_exhausted")
+            break
+
+        response = None
+        with metrics.meter() as usage:
+            try:
+                response = await runner(query)
+            except Exception as e:
+                logger.warning(f"Cache warmer failed for '{query}': {e}")
+        query_cost, query_credits = _spend(usage)
+        cost += query_cost
+        credits += query_credits
+
+        if response is None:
+            summary["failed"] += 1
+        elif response.get("cached"):
+            summary["skipped"] += 1
+        else:
+            summary["warmed"] += 1
+
+    summary["llm_cost_usd"] = round(cost, 6)
+    summary["tavily_credits"] = credits
+    metrics.increment("cache_warmer.cycles")
+    metrics.increment("cache_warmer.queries_warmed", summary["warmed"])
+    logger.info(f"Cache warm cycle finished: {summary}")
+    return summary
+
+
+class CacheWarmer:
+    """Periodic off-peak warm cycles as a background asyncio task."""
+
+    def __init__(self, runner: SearchRunner):
+        self.runner = runner
+        self._task: Optional[asyncio.Task] = None
+
+    async def warm_once(self, now: Optional[datetime.datetime] = None) -> Optional[dict]:
+        """Run one cycle if the current hour is off-peak; returns its summary."""
+        now = now or datetime.datetime.now()
+        if not is_off_peak(now):
+            return None
+        try:
+            queries = await asyncio.to_thread(mine_hot_queries)
+        except Exception as e:
+            logger.warning(f"Cache warmer could not read search history: {e}")
+            return None
+        return await run_warm_cycle(self.runner, queries)
+
+    async def _loop(self) -> None:
+        while True:
+            await self.warm_once()
+            await asyncio.sleep(config.CACHE_WARMER_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            logger.info("Starting cache warmer")
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -0,0 +1,598 @@
+"""
+Checkpointers of the agent graph, so failed or interrupted runs resume where they stopped.
+
+With a checkpointer, LangGraph saves the graph state after every completed
+node under the run's thread id (the search_id). Running the graph again with
+the same thread id and no input continues from the last completed node
+instead of repeating the validator, rewriter, Tavily searches and LLM
+extraction that already succeeded.
+
+CHECKPOINTER_BACKEND selects the storage:
+- "none": no checkpoints (default),
+- "memory": LangGraph's InMemorySaver (survives failed runs, not restarts),
+- "sqlite": a local SQLite file (CHECKPOINT_SQLITE_PATH),
+- "mongodb": collections of the application database (reuses dbClient's pool).
+
+Channel values are stored as versioned blobs, so a checkpoint only writes the
+channels its node changed; raw_results is not written again by nodes that
+leave it untouched. Measured by benchmarks/bench_checkpointer.py.
+
+Usage:
+    from backend.app.core.checkpointer import get_checkpointer, thread_config
+    graph = build_graph()  # compiled with get_checkpointer()
+    await graph.ainvoke(initial_state, thread_config(search_id))
+    await graph.ainvoke(None, thread_config(search_id))  # resume after a failure
+"""
+
+import abc
+import asyncio
+import datetime
+import sqlite3
+import threading
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from backend.app.core import config
+from backend.app.core.circuitBreaker import get_breaker
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("none", "memory", "sqlite", "mongodb")
+# Non-LangGraph types in the graph state that checkpoints may deserialize
+STATE_TYPES = [("backend.app.models.schemas", "Event")]
+
+
+def state_serializer() -> JsonPlusSerializer:
+    """LangGraph's serializer, allowed to restore the Event models of the graph state."""
+    try:
+        return JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES)
+    except TypeError:
+        # langgraph-checkpoint < 4.0.1 (the last releases for Python 3.9) has no
+        # allowlist and restores any module
+        return JsonPlusSerializer()
+
+
+def thread_config(search_id: str) -> RunnableConfig:
+    """Run config that keys the graph's checkpoints by search_id."""
+    return {"configurable": {"thread_id": search_id}}
+
+
+def graph_checkpointer(graph) -> Optional[BaseCheckpointSaver]:
+    """Checkpointer a compiled graph saves to, or None."""
+    checkpointer = getattr(graph, "checkpointer", None)
+    return checkpointer if isinstance(checkpointer, BaseCheckpointSaver) else None
+
+
+class StoreCheckpointSaver(BaseCheckpointSaver, abc.ABC):
+    """
+    Checkpoint saver over a key-value style store.
+
+    Implements LangGraph's saver interface (serialization, parent links,
+    pending writes, metadata filters); subclasses only read and write rows:
+    checkpoints, channel blobs by (channel, version) and pending writes.
+    The async methods run the sync ones in a worker thread.
+    """
+
+    def __init__(self, *, serde=None):
+        super().__init__(serde=serde or state_serializer())
+
+    # --- Storage primitives ---
+
+    @abc.abstractmethod
+    def _save_checkpoint(self, row: dict, blobs: list[dict]) -> None:
+        """Insert a checkpoint row, replacing it if it exists, and blobs not stored yet."""
+
+    @abc.abstractmethod
+    def _save_writes(self, rows: list[dict]) -> None:
+        """Insert write rows; rows with a negative idx (special channels) replace existing ones."""
+
+    @abc.abstractmethod
+    def _checkpoint_rows(
+        self,
+        thread_id: Optional[str],
+        checkpoint_ns: Optional[str],
+        checkpoint_id: Optional[str],
+        before_id: Optional[str],
+    ) -> Iterable[dict]:
+        """Checkpoint rows matching the non-None arguments, newest first."""
+
+    @abc.abstractmethod
+    def _blob_rows(
+        self, thread_id: str, checkpoint_ns: str, versions: dict[str, str]
+    ) -> list[dict]:
+        """Blob rows of a thread for the given {channel: version} pairs."""
+
+    @abc.abstractmethod
+    def _write_rows(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> list[dict]:
+        """Write rows of a checkpoint, in any order."""
+
+    @abc.abstractmethod
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, blob and write of a thread."""
+
+    # --- BaseCheckpointSaver ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        saved = checkpoint.copy()
+        values: dict[str, Any] = saved.pop("channel_values")  # type: ignore[misc]
+
+        blobs = []
+        for channel, version in new_versions.items():
+            value_type, value = (
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            )
+            blobs.append(
+                {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "channel": channel,
+                    "version": str(version),
+                    "type": value_type,
+                    "value": value,
+                }
+            )
+        checkpoint_type, checkpoint_bytes = self.serde.dumps_typed(saved)
+        metadata_type, metadata_bytes = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        row = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "type": checkpoint_type,
+            "checkpoint": checkpoint_bytes,
+            "metadata_type": metadata_type,
+            "metadata": metadata_bytes,
+        }
+        self._save_checkpoint(row, blobs)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_bytes = self.serde.dumps_typed(value)
+            rows.append(
+                {
+                    "thread_id": config["configurable"]["thread_id"],
+                    "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+                    "checkpoint_id": config["configurable"]["checkpoint_id"],
+                    "task_id": task_id,
+                    "idx": WRITES_IDX_MAP.get(channel, idx),
+                    "channel": channel,
+                    "type": value_type,
+                    "value": value_bytes,
+                    "task_path": task_path,
+                }
+            )
+        self._save_writes(rows)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        rows = self._checkpoint_rows(
+            config["configurable"]["thread_id"],
+            config["configurable"].get("checkpoint_ns", ""),
+            get_checkpoint_id(config),
+            None,
+        )
+        row = next(iter(rows), None)
+        return self._to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        configurable = config["configurable"] if config else {}
+        rows = self._checkpoint_rows(
+            configurable.get("thread_id"),
+            configurable.get("checkpoint_ns"),
+            get_checkpoint_id(config) if config else None,
+            get_checkpoint_id(before) if before else None,
+        )
+        listed = 0
+        for row in rows:
+            if limit is not None and listed >= limit:
+                return
+            if filter:
+                metadata = self.serde.loads_typed((row["metadata_type"], row["metadata"]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            listed += 1
+            yield self._to_tuple(row)
+
+    def _to_tuple(self, row: dict) -> CheckpointTuple:
+        thread_id = row["thread_id"]
+        checkpoint_ns = row["checkpoint_ns"]
+        checkpoint: Checkpoint = self.serde.loads_typed((row["type"], row["checkpoint"]))
+        versions = {channel: str(v) for channel, v in checkpoint["channel_versions"].items()}
+        channel_values = {
+            blob["channel"]: self.serde.loads_typed((blob["type"], blob["value"]))
+            for blob in self._blob_rows(thread_id, checkpoint_ns, versions)
+            if blob["type"] != "empty"
+        }
+        writes = sorted(
+            self._write_rows(thread_id, checkpoint_ns, row["checkpoint_id"]),
+            # The order live execution applies a super-step's writes in
+            key=lambda w: (w["task_path"], w["task_id"], w["idx"]),
+        )
+        parent_id = row["parent_checkpoint_id"]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": row["checkpoint_id"],
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((row["metadata_type"], row["metadata"])),
+            pending_writes=[
+                (w["task_id"], w["channel"], self.serde.loads_typed((w["type"], w["value"])))
+                for w in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT,
+    type TEXT,
+    value BLOB,
+    task_path TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class SqliteCheckpointSaver(StoreCheckpointSaver):
+    """Checkpoints in a local SQLite file (or ":memory:"), one connection shared under a lock."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SQLITE_SCHEMA)
+
+    def _save_checkpoint(self, row: dict, blobs: list[dict]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_blobs VALUES "
+                "(:thread_id, :checkpoint_ns, :channel, :version, :type, :value)",
+                blobs,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (:thread_id, :checkpoint_ns, "
+                ":checkpoint_id, :parent_checkpoint_id, :type, :checkpoint, :metadata_type, :metadata)",
+                row,
+            )
+
+    def _save_writes(self, rows: list[dict]) -> None:
+        columns = (
+            "(:thread_id, :checkpoint_ns, :checkpoint_id, :task_id, :idx, "
+            ":channel, :type, :value, :task_path)"
+        )
+        with self._lock, self._conn:
+            for row in rows:
+                verb = "INSERT OR REPLACE" if row["idx"] < 0 else "INSERT OR IGNORE"
+                self._conn.execute(f"{verb} INTO checkpoint_writes VALUES {columns}", row)
+
+    def _checkpoint_rows(self, thread_id, checkpoint_ns, checkpoint_id, before_id):
+        clauses, params = [], []
+        for clause, value in (
+            ("thread_id = ?", thread_id),
+            ("checkpoint_ns = ?", checkpoint_ns),
+            ("checkpoint_id = ?", checkpoint_id),
+            ("checkpoint_id < ?", before_id),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM checkpoints {where} ORDER BY checkpoint_id DESC", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _blob_rows(self, thread_id, checkpoint_ns, versions):
+        if not versions:
+            return []
+        pairs = " OR ".join("(channel = ? AND version = ?)" for _ in versions)
+        params = [thread_id, checkpoint_ns, *(x for item in versions.items() for x in item)]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                f"AND ({pairs})",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _write_rows(self, thread_id, checkpoint_ns, checkpoint_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM checkpoint_writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock, self._conn:
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class MongoCheckpointSaver(StoreCheckpointSaver):
+    """
+    Checkpoints in three collections of the application database: `<name>`,
+    `<name>_blobs` and `<name>_writes` (CHECKPOINT_MONGODB_COLLECTION).
+    Every call goes through the mongodb circuit breaker, and rows carry a
+    created_at that the TTL indexes of dbClient.ensure_checkpoint_indexes
+    expire after CHECKPOINT_TTL_HOURS.
+    """
+
+    def __init__(self, collection_name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.collection_name = collection_name
+        self._indexed = False
+
+    def _collection(self, suffix: str = ""):
+        from backend.app.core.dbClient import ensure_checkpoint_indexes, get_named_collection
+
+        collection = get_named_collection(self.collection_name + suffix)
+        if not self._indexed:
+            ensure_checkpoint_indexes(self.collection_name)
+            self._indexed = True
+        return collection
+
+    def _save_checkpoint(self, row: dict, blobs: list[dict]) -> None:
+        from pymongo import ReplaceOne, UpdateOne
+
+        breaker = get_breaker("mongodb")
+        now = datetime.datetime.utcnow()
+        if blobs:
+            breaker.call(
+                self._collection("_blobs").bulk_write,
+                [
+                    UpdateOne(
+                        {
+                            "_id": _key(
+                                b["thread_id"], b["checkpoint_ns"], b["channel"], b["version"]
+                            )
+                        },
+                        {"$setOnInsert": {**b, "created_at": now}},
+                        upsert=True,
+                    )
+                    for b in blobs
+                ],
+                ordered=False,
+            )
+        key = _key(row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"])
+        breaker.call(
+            self._collection().bulk_write,
+            [ReplaceOne({"_id": key}, {**row, "created_at": now}, upsert=True)],
+        )
+
+    def _save_writes(self, rows: list[dict]) -> None:
+        from pymongo import ReplaceOne, UpdateOne
+
+        now = datetime.datetime.utcnow()
+        operations: list[Union[ReplaceOne, UpdateOne]] = []
+        for row in rows:
+            row = {**row, "created_at": now}
+            key = _key(
+                row["thread_id"],
+                row["checkpoint_ns"],
+                row["checkpoint_id"],
+                row["task_id"],
+                row["idx"],
+            )
+            if row["idx"] < 0:
+                operations.append(ReplaceOne({"_id": key}, row, upsert=True))
+            else:
+                operations.append(UpdateOne({"_id": key}, {"$setOnInsert": row}, upsert=True))
+        if operations:
+            get_breaker("mongodb").call(
+                self._collection("_writes").bulk_write, operations, ordered=False
+            )
+
+    def _checkpoint_rows(self, thread_id, checkpoint_ns, checkpoint_id, before_id):
+        query: dict[str, Any] = {}
+        if thread_id is not None:
+            query["thread_id"] = thread_id
+        if checkpoint_ns is not None:
+            query["checkpoint_ns"] = checkpoint_ns
+        id_query = {}
+        if checkpoint_id is not None:
+            id_query["$eq"] = checkpoint_id
+        if before_id is not None:
+            id_query["$lt"] = before_id
+        if id_query:
+            query["checkpoint_id"] = id_query
+        collection = self._collection()
+        return get_breaker("mongodb").call(
+            lambda: list(collection.find(query).sort("checkpoint_id", -1))
+        )
+
+    def _blob_rows(self, thread_id, checkpoint_ns, versions):
+        if not versions:
+            return []
+        keys = [_key(thread_id, checkpoint_ns, c, v) for c, v in versions.items()]
+        collection = self._collection("_blobs")
+        return get_breaker("mongodb").call(lambda: list(collection.find({"_id": {"$in": keys}})))
+
+    def _write_rows(self, thread_id, checkpoint_ns, checkpoint_id):
+        collection = self._collection("_writes")
+        query = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }
+        return get_breaker("mongodb").call(lambda: list(collection.find(query)))
+
+    def delete_thread(self, thread_id: str) -> None:
+        breaker = get_breaker("mongodb")
+        for suffix in ("", "_blobs", "_writes"):
+            breaker.call(self._collection(suffix).delete_many, {"thread_id": thread_id})
+
+
+def _key(*parts: Any) -> str:
+    return "|".join(str(part) for part in parts)
+
+
+_checkpointer: Optional[BaseCheckpointSaver] = None
+
+
+def create_checkpointer(backend: str) -> Optional[BaseCheckpointSaver]:
+    """New checkpointer for a backend name (None for "none")."""
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return InMemorySaver(serde=state_serializer())
+    if backend == "sqlite":
+        return SqliteCheckpointSaver(config.CHECKPOINT_SQLITE_PATH)
+    if backend == "mongodb":
+        return MongoCheckpointSaver(config.CHECKPOINT_MONGODB_COLLECTION)
+    raise ValueError(f"Unknown CHECKPOINTER_BACKEND '{backend}' (expected one of {BACKENDS})")
+
+
+def get_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """Shared checkpointer of the configured backend, or None if checkpointing is off."""
+    global _checkpointer
+
+    if config.CHECKPOINTER_BACKEND == "none":
+        return None
+    if _checkpointer is None:
+        logger.info(f"Using {config.CHECKPOINTER_BACKEND} graph checkpointer")
+        _checkpointer = create_checkpointer(config.CHECKPOINTER_BACKEND)
+    return _checkpointer
+
+
+def reset_checkpointer() -> None:
+    """Drop the shared checkpointer (closing a SQLite connection), e.g. after a config change."""
+    global _checkpointer
+
+    if isinstance(_checkpointer, SqliteCheckpointSaver):
+        _checkpointer.close()
+    _checkpointer = None
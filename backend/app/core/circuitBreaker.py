@@ -0,0 +1,271 @@
+"""
+Circuit breakers for upstream dependencies (OpenAI, Tavily, MongoDB).
+
+Each dependency gets its own breaker. A breaker opens when the failure rate or
+the slow-call rate over a sliding window of recent calls crosses its threshold;
+while open, calls fail fast with CircuitOpenError so callers can take their
+fallback path immediately instead of waiting for a timeout. After
+CIRCUIT_BREAKER_OPEN_SECONDS a few probe calls are let through (half-open):
+a successful probe closes the breaker, a failed one re-opens it. A probe that
+ends without an outcome (cancelled, or raising an error listed in `ignore`,
+such as a rate limit) gives its slot back for the next call.
+
+Usage:
+    from backend.app.core.circuitBreaker import get_breaker
+    response = get_breaker("tavily").call(client.search, query="...")
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Union
+
+from backend.app.core import config, metrics
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Numeric encoding used for the state gauges
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Exception types that say nothing about the dependency's health
+IgnoredErrors = Union[type[BaseException], tuple[type[BaseException], ...]]
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the dependency's breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open (retry in {retry_after:.0f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by error-rate and latency thresholds."""
+
+    def __init__(
+        self,
+        name: str,
+        slow_call_ms: float,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.slow_call_ms = slow_call_ms
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        # Sliding window of (failed, slow) outcomes
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+        metrics.set_gauge(f"circuit.{name}.state", _STATE_VALUES[CLOSED])
+
+    # --- State handling -------------------------------------------------------
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit '{self.name}': {self._state} -> {state}")
+        self._state = state
+        metrics.set_gauge(f"circuit.{self.name}.state", _STATE_VALUES[state])
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            metrics.increment(f"circuit.{self.name}.opened")
+        elif state == HALF_OPEN:
+            self._half_open_calls = 0
+        else:
+            self._window.clear()
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe call through."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed (always True when breakers are disabled)."""
+        if not config.CIRCUIT_BREAKER_ENABLED:
+            return True
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+        metrics.increment(f"circuit.{self.name}.rejected")
+        return False
+
+    def record_success(self, latency_ms: float) -> None:
+        slow = latency_ms >= self.slow_call_ms
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN if slow else CLOSED)
+                return
+            self._window.append((False, slow))
+            self._evaluate()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot for a call that ended without an outcome."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            self._window.append((True, False))
+            self._evaluate()
+
+    def _evaluate(self) -> None:
+        if self._state != CLOSED or len(self._window) < self.min_calls:
+            return
+        calls = len(self._window)
+        failure_rate = sum(failed for failed, _ in self._window) / calls
+        slow_rate = sum(slow for _, slow in self._window) / calls
+        if failure_rate >= self.failure_rate_threshold:
+            logger.warning(f"Circuit '{self.name}' opening: failure rate {failure_rate:.0%}")
+            self._transition(OPEN)
+        elif slow_rate >= self.slow_call_rate_threshold:
+            logger.warning(f"Circuit '{self.name}' opening: slow-call rate {slow_rate:.0%}")
+            self._transition(OPEN)
+
+    # --- Call wrappers --------------------------------------------------------
+
+    def _reject(self) -> CircuitOpenError:
+        return CircuitOpenError(self.name, self.retry_after())
+
+    def call(self, fn: Callable, *args, ignore: IgnoredErrors = (), **kwargs) -> Any:
+        """
+        Run a sync call through the breaker. Errors matching `ignore` are
+        re-raised without counting as failures.
+        """
+        if not self.allow_request():
+            raise self._reject()
+        start_time = time.perf_counter()
+        recorded = False
+        try:
+            result = fn(*args, **kwargs)
+        except ignore:
+            raise
+        except Exception:
+            recorded = True
+            self.record_failure()
+            raise
+        else:
+            recorded = True
+            self.record_success((time.perf_counter() - start_time) * 1000)
+            return result
+        finally:
+            if not recorded:
+                self.release()
+
+    async def acall(self, fn: Callable, *args, ignore: IgnoredErrors = (), **kwargs) -> Any:
+        """Run an async call through the breaker (see call)."""
+        if not self.allow_request():
+            raise self._reject()
+        start_time = time.perf_counter()
+        recorded = False
+        try:
+            result = await fn(*args, **kwargs)
+        except ignore:
+            raise
+        except Exception:
+            recorded = True
+            self.record_failure()
+            raise
+        else:
+            recorded = True
+            self.record_success((time.perf_counter() - start_time) * 1000)
+            return result
+        finally:
+            if not recorded:
+                self.release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refresh()
+            calls = len(self._window)
+            failures = sum(failed for failed, _ in self._window)
+            return {
+                "state": self._state,
+                "window_calls": calls,
+                "failure_rate": failures / calls if calls else 0.0,
+                "retry_after": (
+                    max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+                    if self._state == OPEN
+                    else 0.0
+                ),
+            }
+
+
+# Module-level registry (one breaker per dependency)
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+# Latency above which a call counts as slow, per dependency
+_SLOW_CALL_MS = {
+    "openai": lambda: config.OPENAI_SLOW_CALL_MS,
+    "tavily": lambda: config.TAVILY_SLOW_CALL_MS,
+    "mongodb": lambda: config.MONGODB_SLOW_CALL_MS,
+}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for a dependency, creating it on first use."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            slow_call_ms = _SLOW_CALL_MS.get(name, lambda: config.OPENAI_SLOW_CALL_MS)()
+            breaker = CircuitBreaker(
+                name,
+                slow_call_ms=slow_call_ms,
+                failure_rate_threshold=config.CIRCUIT_BREAKER_FAILURE_RATE,
+                slow_call_rate_threshold=config.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+                window_size=config.CIRCUIT_BREAKER_WINDOW_SIZE,
+                min_calls=config.CIRCUIT_BREAKER_MIN_CALLS,
+                open_seconds=config.CIRCUIT_BREAKER_OPEN_SECONDS,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_states() -> dict:
+    """Snapshot of every breaker, keyed by dependency name."""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def reset_breakers() -> None:
+    """Drop all breakers (used by tests)."""
+    with _registry_lock:
+        _breakers.clear()
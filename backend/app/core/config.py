@@ -63,6 +63,68 @@ MONGODB_URI = os.getenv("MONGODB_URI")
 # =============================================================================
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
 LLM_TEMPERATURE = _get_float("LLM_TEMPERATURE", 0.0)
+LLM_SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "gpt-4o-mini")
+
+# Per-node models: the validator and rewriter only need short outputs
+VALIDATOR_MODEL = os.getenv("VALIDATOR_MODEL", LLM_SMALL_MODEL)
+VALIDATOR_TEMPERATURE = _get_float("VALIDATOR_TEMPERATURE", LLM_TEMPERATURE)
+REWRITER_MODEL = os.getenv("REWRITER_MODEL", LLM_SMALL_MODEL)
+REWRITER_TEMPERATURE = _get_float("REWRITER_TEMPERATURE", 0.0)
+EXTRACTOR_MODEL = os.getenv("EXTRACTOR_MODEL", LLM_MODEL)
+EXTRACTOR_TEMPERATURE = _get_float("EXTRACTOR_TEMPERATURE", 0.0)
+
+# Router: extract with LLM_SMALL_MODEL first, escalate to EXTRACTOR_MODEL on failure/no events
+EXTRACTOR_ROUTER_ENABLED = _get_bool("EXTRACTOR_ROUTER_ENABLED", False)
+
+# Stream the extraction as JSON and emit each event as soon as it is parsed
+# (POST /search/stream); uses EXTRACTOR_MODEL, the router is not applied
+EXTRACTOR_STREAMING_ENABLED = _get_bool("EXTRACTOR_STREAMING_ENABLED", False)
+
+# Drop snippets with fewer than EXTRACTOR_PREFILTER_MIN_SIGNALS kinds of event
+# signals (date, venue, price, event keyword) before building the prompt
+EXTRACTOR_PREFILTER_ENABLED = _get_bool("EXTRACTOR_PREFILTER_ENABLED", True)
+EXTRACTOR_PREFILTER_MIN_SIGNALS = _get_int("EXTRACTOR_PREFILTER_MIN_SIGNALS", 1)
+# Extract events with local rules when the LLM call fails (see bench_heuristic_extractor)
+HEURISTIC_EXTRACTOR_FALLBACK_ENABLED = _get_bool("HEURISTIC_EXTRACTOR_FALLBACK_ENABLED", True)
+
+# Re-rank snippets against the user query (BM25, date proximity, city overlap)
+# and keep the best ones within a token budget (see bench_reranker)
+EXTRACTOR_RERANK_ENABLED = _get_bool("EXTRACTOR_RERANK_ENABLED", True)
+EXTRACTOR_CONTEXT_TOKEN_BUDGET = _get_int("EXTRACTOR_CONTEXT_TOKEN_BUDGET", 6000)
+EXTRACTOR_MIN_SNIPPETS = _get_int("EXTRACTOR_MIN_SNIPPETS", 3)
+
+# Cache extracted pages by URL across requests: known pages contribute their
+# cached events and skip the LLM until the entry expires
+PAGE_CACHE_ENABLED = _get_bool("PAGE_CACHE_ENABLED", True)
+PAGE_CACHE_TTL_SECONDS = _get_int("PAGE_CACHE_TTL_SECONDS", 21600)
+PAGE_CACHE_SIZE = _get_int("PAGE_CACHE_SIZE", 5000)
+
+# Micro-batch validator calls from concurrent requests into one LLM call: each
+# validation waits up to the window for others to join (see bench_validation_batch)
+VALIDATION_BATCH_ENABLED = _get_bool("VALIDATION_BATCH_ENABLED", False)
+VALIDATION_BATCH_WINDOW_MS = _get_int("VALIDATION_BATCH_WINDOW_MS", 20)
+VALIDATION_BATCH_MAX_SIZE = _get_int("VALIDATION_BATCH_MAX_SIZE", 16)
+
+# Process-wide OpenAI budgets shared by all requests (0 = unlimited); set them to
+# your account's rate limits so bursts queue locally instead of returning 429
+LLM_RPM_LIMIT = _get_int("LLM_RPM_LIMIT", 0)
+LLM_TPM_LIMIT = _get_int("LLM_TPM_LIMIT", 0)
+# Output tokens assumed per call when estimating its size
+LLM_ESTIMATED_OUTPUT_TOKENS = _get_int("LLM_ESTIMATED_OUTPUT_TOKENS", 500)
+# A call that cannot be scheduled within this time fails with LLMRateLimitError
+LLM_SCHEDULER_MAX_WAIT_SECONDS = _get_float("LLM_SCHEDULER_MAX_WAIT_SECONDS", 60.0)
+# Retries after an OpenAI 429 (all calls pause for Retry-After or the backoff)
+LLM_RATE_LIMIT_MAX_RETRIES = _get_int("LLM_RATE_LIMIT_MAX_RETRIES", 3)
+LLM_RATE_LIMIT_BACKOFF_SECONDS = _get_float("LLM_RATE_LIMIT_BACKOFF_SECONDS", 2.0)
+
+# =============================================================================
+# Facet Fan-out Configuration
+# =============================================================================
+# Multi-location/category queries are split by the rewriter into facets that are
+# searched and extracted in parallel, then merged
+FACET_FANOUT_ENABLED = _get_bool("FACET_FANOUT_ENABLED", True)
+FACET_MAX_FACETS = _get_int("FACET_MAX_FACETS", 5)
+FACET_NUM_QUERIES = _get_int("FACET_NUM_QUERIES", 2)  # Search queries per facet
 
 # =============================================================================
 # Tavily Search Configuration
@@ -70,6 +132,19 @@ LLM_TEMPERATURE = _get_float("LLM_TEMPERATURE", 0.0)
 TAVILY_MAX_RESULTS = _get_int("TAVILY_MAX_RESULTS", 3)
 TAVILY_SEARCH_DEPTH = os.getenv("TAVILY_SEARCH_DEPTH", "advanced")
 TAVILY_INCLUDE_ANSWER = _get_bool("TAVILY_INCLUDE_ANSWER", True)
+# Read-through cache of Tavily responses per (query, depth); 0 disables it
+TAVILY_CACHE_TTL_SECONDS = _get_int("TAVILY_CACHE_TTL_SECONDS", 3600)
+TAVILY_CACHE_SIZE = _get_int("TAVILY_CACHE_SIZE", 2000)
+# Adaptive depth: search with "basic" first, escalate weak queries to TAVILY_SEARCH_DEPTH
+TAVILY_ADAPTIVE_DEPTH = _get_bool("TAVILY_ADAPTIVE_DEPTH", True)
+TAVILY_ESCALATION_MIN_SCORE = _get_float("TAVILY_ESCALATION_MIN_SCORE", 0.5)
+TAVILY_ESCALATION_MIN_RESULTS = _get_int("TAVILY_ESCALATION_MIN_RESULTS", 1)
+# Clean snippet content in search_node: normalize text, drop boilerplate lines
+# (site chrome, or repeated in SNIPPET_BOILERPLATE_MIN_DOCS results of a request)
+# and keep SNIPPET_CONTEXT_SENTENCES around each date/venue mention
+SNIPPET_CLEANING_ENABLED = _get_bool("SNIPPET_CLEANING_ENABLED", True)
+SNIPPET_BOILERPLATE_MIN_DOCS = _get_int("SNIPPET_BOILERPLATE_MIN_DOCS", 3)
+SNIPPET_CONTEXT_SENTENCES = _get_int("SNIPPET_CONTEXT_SENTENCES", 1)
 
 # =============================================================================
 # Agent Configuration
@@ -77,12 +152,155 @@ TAVILY_INCLUDE_ANSWER = _get_bool("TAVILY_INCLUDE_ANSWER", True)
 MAX_RETRY_COUNT = _get_int("MAX_RETRY_COUNT", 1)
 REWRITER_NUM_QUERIES = _get_int("REWRITER_NUM_QUERIES", 3)
 
+# =============================================================================
+# Graph Checkpoint Configuration
+# =============================================================================
+# Save graph state after every node so failed runs resume: none, memory, sqlite or mongodb
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "none").lower()
+CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH", "data/checkpoints.db")
+CHECKPOINT_MONGODB_COLLECTION = os.getenv("CHECKPOINT_MONGODB_COLLECTION", "checkpoints")
+# Delete a run's checkpoints once it completed (only failed runs keep theirs)
+CHECKPOINT_DELETE_ON_SUCCESS = _get_bool("CHECKPOINT_DELETE_ON_SUCCESS", True)
+# MongoDB checkpoints (e.g. of failed runs never resumed) expire after this (0 = never)
+CHECKPOINT_TTL_HOURS = _get_int("CHECKPOINT_TTL_HOURS", 24)
+
 # =============================================================================
 # MongoDB Configuration
 # =============================================================================
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "tavily_events_db")
 MONGODB_COLLECTION_NAME = os.getenv("MONGODB_COLLECTION_NAME", "searches")
 MONGODB_TIMEOUT_MS = _get_int("MONGODB_TIMEOUT_MS", 5000)
+# Repeated searches (same normalized query, date and events) update one document
+# (hit_count, hits) instead of inserting a new one; false inserts every run
+PERSISTENCE_UPSERT_ENABLED = _get_bool("PERSISTENCE_UPSERT_ENABLED", True)
+# Most recent hits ({search_id, timestamp}) kept on a deduplicated search
+PERSISTENCE_MAX_HITS = _get_int("PERSISTENCE_MAX_HITS", 100)
+
+# =============================================================================
+# Search Retention Configuration
+# =============================================================================
+# TTL index and background compaction of the searches collection
+SEARCH_RETENTION_ENABLED = _get_bool("SEARCH_RETENTION_ENABLED", False)
+# Searches expire this long after their last hit (0 = keep them forever)
+SEARCH_RETENTION_DAYS = _get_int("SEARCH_RETENTION_DAYS", 90)
+# raw_results are stripped from searches older than this; the summary is kept
+SEARCH_RAW_RESULTS_RETENTION_DAYS = _get_int("SEARCH_RAW_RESULTS_RETENTION_DAYS", 7)
+SEARCH_COMPACTION_INTERVAL_SECONDS = _get_int("SEARCH_COMPACTION_INTERVAL_SECONDS", 3600)
+# Documents compacted per update_many pass
+SEARCH_COMPACTION_BATCH_SIZE = _get_int("SEARCH_COMPACTION_BATCH_SIZE", 500)
+
+# =============================================================================
+# Event Index Configuration
+# =============================================================================
+# Extracted events are indexed by (city, date) and reused by later queries
+EVENT_INDEX_ENABLED = _get_bool("EVENT_INDEX_ENABLED", True)
+MONGODB_EVENTS_COLLECTION_NAME = os.getenv("MONGODB_EVENTS_COLLECTION_NAME", "events")
+MONGODB_COVERAGE_COLLECTION_NAME = os.getenv("MONGODB_COVERAGE_COLLECTION_NAME", "event_coverage")
+# A (city, category, date range) searched more recently than this is answered from the index
+EVENT_INDEX_MAX_AGE_HOURS = _get_float("EVENT_INDEX_MAX_AGE_HOURS", 12.0)
+# Minimum indexed events needed to skip searching entirely
+EVENT_INDEX_MIN_EVENTS = _get_int("EVENT_INDEX_MIN_EVENTS", 3)
+
+# =============================================================================
+# Local Search Index Configuration
+# =============================================================================
+# In-process BM25 index over extracted events and raw snippets
+LOCAL_INDEX_ENABLED = _get_bool("LOCAL_INDEX_ENABLED", True)
+# Snapshot file loaded at startup (empty = in-memory only)
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "data/local_index.bin")
+LOCAL_INDEX_SNAPSHOT_EVERY = _get_int("LOCAL_INDEX_SNAPSHOT_EVERY", 20)
+
+# =============================================================================
+# Semantic Cache Configuration
+# =============================================================================
+# Reuse responses of near-duplicate queries with the same resolved date range
+SEMANTIC_CACHE_ENABLED = _get_bool("SEMANTIC_CACHE_ENABLED", True)
+# Minimum cosine similarity between query embeddings to reuse a response
+SEMANTIC_CACHE_THRESHOLD = _get_float("SEMANTIC_CACHE_THRESHOLD", 0.8)
+SEMANTIC_CACHE_SIZE = _get_int("SEMANTIC_CACHE_SIZE", 2000)
+SEMANTIC_CACHE_TTL_SECONDS = _get_int("SEMANTIC_CACHE_TTL_SECONDS", 3600)
+QUERY_EMBEDDING_DIM = _get_int("QUERY_EMBEDDING_DIM", 512)
+
+# =============================================================================
+# Refinement Session Configuration
+# =============================================================================
+# Sessions expire this long after their last query
+SESSION_TTL_SECONDS = _get_int("SESSION_TTL_SECONDS", 1800)
+SESSION_MAX_SESSIONS = _get_int("SESSION_MAX_SESSIONS", 1000)
+
+# =============================================================================
+# Result Pagination Configuration
+# =============================================================================
+# Largest page of events a /search request may ask for
+SEARCH_PAGE_MAX_SIZE = _get_int("SEARCH_PAGE_MAX_SIZE", 100)
+# Full responses kept for the next pages of a filtered /search
+SEARCH_RESULTS_TTL_SECONDS = _get_int("SEARCH_RESULTS_TTL_SECONDS", 600)
+SEARCH_RESULTS_MAX_ENTRIES = _get_int("SEARCH_RESULTS_MAX_ENTRIES", 500)
+
+# =============================================================================
+# Admission Control Configuration
+# =============================================================================
+# Global cap on concurrent /search graph runs; cache hits are not counted
+ADMISSION_MAX_IN_FLIGHT = _get_int("ADMISSION_MAX_IN_FLIGHT", 16)
+# Requests allowed to wait for a slot; further requests get 503 immediately
+ADMISSION_MAX_QUEUE = _get_int("ADMISSION_MAX_QUEUE", 32)
+# Waiting requests that cannot start within this deadline get 503
+ADMISSION_MAX_WAIT_SECONDS = _get_float("ADMISSION_MAX_WAIT_SECONDS", 5.0)
+
+# =============================================================================
+# Batch Search Configuration
+# =============================================================================
+BATCH_MAX_QUERIES = _get_int("BATCH_MAX_QUERIES", 500)
+# Graph runs in flight at once across all batch requests
+BATCH_MAX_CONCURRENCY = _get_int("BATCH_MAX_CONCURRENCY", 4)
+BATCH_RATE_LIMIT = os.getenv("BATCH_RATE_LIMIT", "5/minute")
+
+# =============================================================================
+# Job Queue Configuration
+# =============================================================================
+JOB_WORKERS = _get_int("JOB_WORKERS", 4)
+JOB_QUEUE_MAX_SIZE = _get_int("JOB_QUEUE_MAX_SIZE", 1000)
+# Finished jobs are kept this long
+JOB_TTL_SECONDS = _get_int("JOB_TTL_SECONDS", 3600)
+# Mirror jobs to MongoDB so any process can answer GET /jobs/{id}
+JOBS_MONGODB_ENABLED = _get_bool("JOBS_MONGODB_ENABLED", False)
+MONGODB_JOBS_COLLECTION_NAME = os.getenv("MONGODB_JOBS_COLLECTION_NAME", "jobs")
+
+# =============================================================================
+# Cache Warmer Configuration
+# =============================================================================
+# Pre-runs the most frequent recent queries off-peak to fill the response and Tavily caches
+CACHE_WARMER_ENABLED = _get_bool("CACHE_WARMER_ENABLED", False)
+CACHE_WARMER_INTERVAL_SECONDS = _get_int("CACHE_WARMER_INTERVAL_SECONDS", 1800)
+# Local hours [start, end) considered off-peak; the window may wrap past midnight
+CACHE_WARMER_OFF_PEAK_START_HOUR = _get_int("CACHE_WARMER_OFF_PEAK_START_HOUR", 2)
+CACHE_WARMER_OFF_PEAK_END_HOUR = _get_int("CACHE_WARMER_OFF_PEAK_END_HOUR", 6)
+CACHE_WARMER_LOOKBACK_HOURS = _get_int("CACHE_WARMER_LOOKBACK_HOURS", 168)
+CACHE_WARMER_TOP_QUERIES = _get_int("CACHE_WARMER_TOP_QUERIES", 200)
+CACHE_WARMER_MIN_COUNT = _get_int("CACHE_WARMER_MIN_COUNT", 2)
+# Warmed responses and Tavily results stay cached this long (through the next peak hours);
+# a warm run reuses a cached response only if it has at least half of this left
+CACHE_WARMER_TTL_SECONDS = _get_int("CACHE_WARMER_TTL_SECONDS", 86400)
+# Spend caps per warm cycle
+CACHE_WARMER_MAX_LLM_COST_USD = _get_float("CACHE_WARMER_MAX_LLM_COST_USD", 0.50)
+CACHE_WARMER_MAX_TAVILY_CREDITS = _get_int("CACHE_WARMER_MAX_TAVILY_CREDITS", 100)
+
+# =============================================================================
+# Circuit Breaker Configuration
+# =============================================================================
+CIRCUIT_BREAKER_ENABLED = _get_bool("CIRCUIT_BREAKER_ENABLED", True)
+CIRCUIT_BREAKER_FAILURE_RATE = _get_float("CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+CIRCUIT_BREAKER_SLOW_CALL_RATE = _get_float("CIRCUIT_BREAKER_SLOW_CALL_RATE", 0.8)
+CIRCUIT_BREAKER_WINDOW_SIZE = _get_int("CIRCUIT_BREAKER_WINDOW_SIZE", 20)
+CIRCUIT_BREAKER_MIN_CALLS = _get_int("CIRCUIT_BREAKER_MIN_CALLS", 5)
+CIRCUIT_BREAKER_OPEN_SECONDS = _get_float("CIRCUIT_BREAKER_OPEN_SECONDS", 30.0)
+# A call slower than this counts towards the slow-call rate
+OPENAI_SLOW_CALL_MS = _get_int("OPENAI_SLOW_CALL_MS", 30000)
+TAVILY_SLOW_CALL_MS = _get_int("TAVILY_SLOW_CALL_MS", 10000)
+MONGODB_SLOW_CALL_MS = _get_int("MONGODB_SLOW_CALL_MS", 2000)
+# Last good Tavily responses served while the Tavily breaker is open
+TAVILY_FALLBACK_CACHE_SIZE = _get_int("TAVILY_FALLBACK_CACHE_SIZE", 1000)
+TAVILY_FALLBACK_CACHE_TTL_SECONDS = _get_int("TAVILY_FALLBACK_CACHE_TTL_SECONDS", 86400)
 
 # =============================================================================
 # Server Configuration
@@ -1,10 +1,12 @@
-from typing import Optional
+import datetime
+from typing import Any, Optional
 
-from pymongo import MongoClient
+from pymongo import ASCENDING, MongoClient
 from pymongo.collection import Collection
-from pymongo.errors import ConfigurationError, ConnectionFailure
+from pymongo.errors import ConfigurationError, ConnectionFailure, OperationFailure
 
 from backend.app.core import config
+from backend.app.core.circuitBreaker import get_breaker
 from backend.app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,12 +14,15 @@ logger = get_logger(__name__)
 # Module-level connection pool (singleton pattern)
 _client: Optional[MongoClient] = None
 _collection: Optional[Collection] = None
+_named_collections: dict[str, Collection] = {}
 
 
 def get_db_client() -> MongoClient:
     """
     Returns a shared MongoDB client instance (connection pool).
     Creates the client on first call, reuses on subsequent calls.
+    While the MongoDB circuit breaker is open, raises CircuitOpenError immediately
+    instead of waiting for another server selection timeout.
     """
     global _client
 
@@ -28,22 +33,20 @@ def get_db_client() -> MongoClient:
         logger.error("MONGODB_URI not found in environment variables")
         raise ValueError("MONGODB_URI not found in .env")
 
-    logger.info("Initializing MongoDB connection pool")
-
-    try:
-        _client = MongoClient(
+    def connect() -> MongoClient:
+        logger.info("Initializing MongoDB connection pool")
+        client: MongoClient = MongoClient(
             config.MONGODB_URI,
             serverSelectionTimeoutMS=config.MONGODB_TIMEOUT_MS,
             maxPoolSize=10,
             minPoolSize=1,
         )
-
         # Verify connection is working
-        _client.admin.command("ping")
-        logger.info("MongoDB connection pool established successfully")
-
-        return _client
+        client.admin.command("ping")
+        return client
 
+    try:
+        _client = get_breaker("mongodb").call(connect)
     except ConnectionFailure as e:
         logger.error(f"Failed to connect to MongoDB: {e}", exc_info=True)
         raise
@@ -51,6 +54,9 @@ def get_db_client() -> MongoClient:
         logger.error(f"MongoDB configuration error: {e}", exc_info=True)
         raise
 
+    logger.info("MongoDB connection pool established successfully")
+    return _client
+
 
 def get_db_collection() -> Collection:
     """
@@ -74,6 +80,23 @@ def get_db_collection() -> Collection:
     return _collection
 
 
+def get_named_collection(name: str) -> Collection:
+    """
+    Returns another collection of the same database (e.g. the events index).
+    Uses the shared connection pool.
+    """
+    collection = _named_collections.get(name)
+    if collection is not None:
+        return collection
+
+    client = get_db_client()
+    collection = client.get_database(config.MONGODB_DB_NAME).get_collection(name)
+    _named_collections[name] = collection
+
+    logger.debug(f"Using database: {config.MONGODB_DB_NAME}, collection: {name}")
+    return collection
+
+
 def close_db_connection():
     """
     Closes the MongoDB connection pool.
@@ -86,6 +109,7 @@ def close_db_connection():
         _client.close()
         _client = None
         _collection = None
+        _named_collections.clear()
 
 
 def check_db_health() -> bool:
@@ -95,8 +119,113 @@ def check_db_health() -> bool:
     """
     try:
         client = get_db_client()
-        client.admin.command("ping")
+        get_breaker("mongodb").call(client.admin.command, "ping")
         return True
     except Exception as e:
         logger.warning(f"MongoDB health check failed: {e}")
         return False
+
+
+def _ensure_ttl_index(collection: Collection, field: str, seconds: int) -> bool:
+    """
+    Create a TTL index expiring documents `seconds` after `field`. A TTL index
+    created with another expiry is changed in place; returns True in that case.
+    """
+    breaker = get_breaker("mongodb")
+    try:
+        breaker.call(collection.create_index, field, expireAfterSeconds=seconds)
+        return False
+    except OperationFailure:
+        breaker.call(
+            collection.database.command,
+            "collMod",
+            collection.name,
+            index={"keyPattern": {field: 1}, "expireAfterSeconds": seconds},
+        )
+        return True
+
+
+def ensure_retention_indexes() -> None:
+    """
+    Index timestamp for compaction passes, and create the TTL index that
+    expires searches SEARCH_RETENTION_DAYS after their last hit (none when 0).
+    A TTL index created with another retention is changed in place.
+    """
+    collection = get_db_collection()
+    get_breaker("mongodb").call(collection.create_index, [("timestamp", ASCENDING)])
+    if config.SEARCH_RETENTION_DAYS <= 0:
+        return
+
+    if _ensure_ttl_index(collection, "last_seen", config.SEARCH_RETENTION_DAYS * 86400):
+        logger.info(f"Search retention changed to {config.SEARCH_RETENTION_DAYS} days")
+
+
+def ensure_checkpoint_indexes(collection_name: str) -> None:
+    """
+    Index the checkpoint collections of MongoCheckpointSaver (`<name>`,
+    `<name>_blobs`, `<name>_writes`) for lookups, and create the TTL indexes
+    that drop checkpoints CHECKPOINT_TTL_HOURS after they were written (none
+    when 0), so runs that failed and were never resumed do not pile up.
+    """
+    breaker = get_breaker("mongodb")
+    breaker.call(
+        get_named_collection(collection_name).create_index,
+        [("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", -1)],
+    )
+    breaker.call(
+        get_named_collection(collection_name + "_writes").create_index,
+        [("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", ASCENDING)],
+    )
+    if config.CHECKPOINT_TTL_HOURS <= 0:
+        return
+
+    seconds = config.CHECKPOINT_TTL_HOURS * 3600
+    for suffix in ("", "_blobs", "_writes"):
+        if _ensure_ttl_index(get_named_collection(collection_name + suffix), "created_at", seconds):
+            logger.info(f"Checkpoint TTL of {collection_name + suffix} changed")
+
+
+def compact_raw_results(now: Optional[datetime.datetime] = None) -> dict:
+    """
+    Strip raw_results from searches older than SEARCH_RAW_RESULTS_RETENTION_DAYS
+    in update_many passes of SEARCH_COMPACTION_BATCH_SIZE documents; the rest of
+    each document (query, events, raw_results_count, hits) is kept. Searches
+    saved before last_seen was recorded get it from their timestamp, so the
+    TTL index covers them too.
+
+    Returns {"documents", "batches", "reclaimed_bytes"}, where reclaimed_bytes
+    is the BSON size of the removed payloads (WiredTiger reuses the space; the
+    files only shrink after a `compact`).
+    """
+    now = now or datetime.datetime.utcnow()
+    cutoff = now - datetime.timedelta(days=config.SEARCH_RAW_RESULTS_RETENTION_DAYS)
+    collection = get_db_collection()
+    breaker = get_breaker("mongodb")
+
+    breaker.call(
+        collection.update_many,
+        {"last_seen": {"$exists": False}},
+        [{"$set": {"last_seen": "$timestamp"}}],
+    )
+
+    pipeline: list[dict[str, Any]] = [
+        {"$match": {"timestamp": {"$lt": cutoff}, "raw_results": {"$exists": True}}},
+        {"$limit": config.SEARCH_COMPACTION_BATCH_SIZE},
+        {"$project": {"raw_bytes": {"$bsonSize": {"raw_results": "$raw_results"}}}},
+    ]
+    summary = {"documents": 0, "batches": 0, "reclaimed_bytes": 0}
+    while True:
+        batch = breaker.call(lambda: list(collection.aggregate(pipeline)))
+        if not batch:
+            break
+        breaker.call(
+            collection.update_many,
+            {"_id": {"$in": [doc["_id"] for doc in batch]}},
+            {"$unset": {"raw_results": ""}, "$set": {"compacted_at": now}},
+        )
+        summary["documents"] += len(batch)
+        summary["batches"] += 1
+        summary["reclaimed_bytes"] += sum(doc.get("raw_bytes") or 0 for doc in batch)
+        if len(batch) < config.SEARCH_COMPACTION_BATCH_SIZE:
+            break
+    return summary
@@ -0,0 +1,182 @@
+"""
+Local index of previously extracted events, keyed by (city, date).
+
+Every deduplicated event is upserted into its own collection with a normalized
+start date, city and category, and the content terms of the queries that found
+it (queryParser.content_terms). A separate coverage collection remembers which
+(city, category, content terms, date range) combinations were searched and
+when, so the graph can answer a repeat query from the index instead of
+searching again; a "jazz" query is not answered by a "rock" search.
+
+Usage:
+    from backend.app.core.eventIndex import index_events, lookup_events
+    index_events(events, city="chicago", category="music", terms=["jazz"])
+    events, fresh = lookup_events("chicago", "music", date_range, terms=["jazz"])
+"""
+
+import datetime
+import hashlib
+import re
+from collections.abc import Sequence
+from typing import Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from backend.app.core import config, metrics
+from backend.app.core.circuitBreaker import get_breaker
+from backend.app.core.dbClient import get_named_collection
+from backend.app.core.logger import get_logger
+from backend.app.models.schemas import DateRange, Event
+from backend.app.utils.queryParser import city_from_location, extract_category
+
+logger = get_logger(__name__)
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_indexes_ready = False
+
+
+def _collections():
+    """Return (events, coverage) collections, creating their indexes on first use."""
+    global _indexes_ready
+
+    events = get_named_collection(config.MONGODB_EVENTS_COLLECTION_NAME)
+    coverage = get_named_collection(config.MONGODB_COVERAGE_COLLECTION_NAME)
+    if not _indexes_ready:
+        breaker = get_breaker("mongodb")
+        breaker.call(events.create_index, [("city", ASCENDING), ("start_date", ASCENDING)])
+        breaker.call(
+            coverage.create_index,
+            [("city", ASCENDING), ("category", ASCENDING), ("refreshed_at", DESCENDING)],
+        )
+        _indexes_ready = True
+    return events, coverage
+
+
+def event_key(title: str, start_date: str, city: str) -> str:
+    """Stable id for an event: the same show found by two searches maps to one document."""
+    normalized_title = re.sub(r"\W+", " ", title.lower()).strip()
+    return hashlib.sha1(f"{normalized_title}|{start_date}|{city}".encode()).hexdigest()
+
+
+def index_events(
+    events: list[Event],
+    city: Optional[str],
+    category: Optional[str],
+    terms: Sequence[str] = (),
+) -> int:
+    """
+    Upsert events into the index. Events without an ISO date or a resolvable
+    city are skipped. terms (the content terms of the query) are added to
+    each event's terms. Returns the number of events written.
+    """
+    now = datetime.datetime.utcnow()
+    operations = []
+    for event in events:
+        if not _ISO_DATE.match(event.date):
+            continue
+        event_city = city_from_location(event.location, city)
+        if not event_city:
+            continue
+
+        start_date = event.date[:10]
+        document = {
+            **event.model_dump(),
+            "city": event_city,
+            "category": category or extract_category(f"{event.title} {event.description}"),
+            "start_date": start_date,
+            "updated_at": now,
+        }
+        operations.append(
+            UpdateOne(
+                {"_id": event_key(event.title, start_date, event_city)},
+                {
+                    "$set": document,
+                    "$setOnInsert": {"first_seen": now},
+                    "$addToSet": {"terms": {"$each": list(terms)}},
+                },
+                upsert=True,
+            )
+        )
+
+    if not operations:
+        return 0
+
+    events_collection, _ = _collections()
+    get_breaker("mongodb").call(events_collection.bulk_write, operations, ordered=False)
+    metrics.increment("event_index.upserts", len(operations))
+    logger.info(f"Indexed {len(operations)} events")
+    return len(operations)
+
+
+def _coverage_id(
+    city: str, category: Optional[str], terms: Sequence[str], date_range: DateRange
+) -> str:
+    return (
+        f"{city}|{category or '*'}|{'+'.join(sorted(terms))}|"
+        f"{date_range['start']}|{date_range['end']}"
+    )
+
+
+def record_coverage(
+    city: str, category: Optional[str], date_range: DateRange, terms: Sequence[str] = ()
+) -> None:
+    """Remember that (city, category, content terms, date range) was just searched."""
+    _, coverage = _collections()
+    get_breaker("mongodb").call(
+        coverage.update_one,
+        {"_id": _coverage_id(city, category, terms, date_range)},
+        {
+            "$set": {
+                "city": city,
+                "category": category,
+                "terms": sorted(terms),
+                "start": date_range["start"],
+                "end": date_range["end"],
+                "refreshed_at": datetime.datetime.utcnow(),
+            }
+        },
+        upsert=True,
+    )
+
+
+def lookup_events(
+    city: str, category: Optional[str], date_range: DateRange, terms: Sequence[str] = ()
+) -> tuple[list[Event], bool]:
+    """
+    Return the indexed events for a city and date range found by queries with
+    all of terms, best first, and whether a search for the same terms covering
+    the whole range ran within EVENT_INDEX_MAX_AGE_HOURS.
+    """
+    events_collection, coverage = _collections()
+    breaker = get_breaker("mongodb")
+
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=config.EVENT_INDEX_MAX_AGE_HOURS)
+    fresh = (
+        breaker.call(
+            coverage.find_one,
+            {
+                "city": city,
+                "category": category,
+                "terms": sorted(terms),
+                "start": {"$lte": date_range["start"]},
+                "end": {"$gte": date_range["end"]},
+                "refreshed_at": {"$gte": cutoff},
+            },
+        )
+        is not None
+    )
+
+    event_filter: dict = {
+        "city": city,
+        "start_date": {"$gte": date_range["start"], "$lte": date_range["end"]},
+    }
+    if category:
+        event_filter["category"] = category
+    if terms:
+        event_filter["terms"] = {"$all": list(terms)}
+    documents = breaker.call(
+        lambda: list(events_collection.find(event_filter).sort("score", DESCENDING))
+    )
+
+    events = [Event(**{field: doc.get(field) for field in Event.model_fields}) for doc in documents]
+    return events, fresh
@@ -0,0 +1,242 @@
+"""
+Asynchronous search jobs executed by a bounded asyncio worker pool.
+
+POST /jobs enqueues a query and returns a job id immediately; workers run the
+graph and record each node's output as it finishes, so GET /jobs/{id} can show
+progress before the final events are available. Jobs live in memory and can
+optionally be mirrored to MongoDB (JOBS_MONGODB_ENABLED) so any worker process
+can answer status requests. Finished jobs are dropped after JOB_TTL_SECONDS.
+
+Usage:
+    job_queue = JobQueue(runner=run_search)  # async (query, on_update) -> response dict
+    job = await job_queue.submit("Comedy shows in Chicago")
+    job_queue.get(job["job_id"])
+"""
+
+import asyncio
+import contextlib
+import datetime
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from backend.app.core import config, metrics
+from backend.app.core.circuitBreaker import get_breaker
+from backend.app.core.dbClient import get_named_collection
+from backend.app.core.logger import get_logger
+from backend.app.models.schemas import Event
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+NodeCallback = Callable[[str, dict], None]
+JobRunner = Callable[[str, NodeCallback], Awaitable[dict]]
+
+# State keys reported as counts instead of full payloads
+_COUNTED_KEYS = {"raw_results", "new_raw_results"}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at JOB_QUEUE_MAX_SIZE."""
+
+
+def summarize_node_output(update: dict) -> dict:
+    """Make a node's state update JSON-friendly (events dumped, raw results counted)."""
+    summary: dict[str, Any] = {}
+    for key, value in (update or {}).items():
+        if key in _COUNTED_KEYS and isinstance(value, list):
+            summary[f"{key}_count"] = len(value)
+        elif isinstance(value, list) and value and isinstance(value[0], Event):
+            summary[key] = [event.model_dump() for event in value]
+        else:
+            summary[key] = value
+    return summary
+
+
+class JobQueue:
+    """In-memory job store plus a fixed pool of worker tasks."""
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        ttl_seconds: float = 3600,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.ttl_seconds = ttl_seconds
+        self._jobs: dict[str, dict] = {}
+        self._finished_at: dict[str, float] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._running = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # --- Lifecycle ------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker pool and the cleanup task (idempotent per event loop)."""
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._cleanup_loop()))
+        logger.info(f"Started job queue with {self.workers} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    # --- Public API -----------------------------------------------------------
+
+    async def submit(self, query: str) -> dict:
+        """Create a job and enqueue it. Raises QueueFullError when the queue is full."""
+        self.start()
+        assert self._queue is not None
+        if self._queue.full():
+            metrics.increment("jobs.rejected")
+            raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs)")
+
+        now = datetime.datetime.utcnow()
+        job_id = str(uuid.uuid4())
+        job: dict[str, Any] = {
+            "job_id": job_id,
+            "query": query,
+            "status": QUEUED,
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+            "nodes": [],
+            "events": [],
+            "result": None,
+            "error": None,
+        }
+        self._jobs[job_id] = job
+        self._queue.put_nowait(job_id)
+        metrics.increment("jobs.submitted")
+        self._update_gauges()
+        await self._persist(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Return a job from memory, or from MongoDB when backing is enabled."""
+        job = self._jobs.get(job_id)
+        if job is not None or not config.JOBS_MONGODB_ENABLED:
+            return job
+        try:
+            collection = get_named_collection(config.MONGODB_JOBS_COLLECTION_NAME)
+            document: Optional[dict] = await asyncio.to_thread(
+                get_breaker("mongodb").call, collection.find_one, {"_id": job_id}
+            )
+        except Exception as e:
+            logger.warning(f"Could not load job {job_id} from MongoDB: {e}")
+            return None
+        if document is None:
+            return None
+        document.pop("_id", None)
+        return document
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    # --- Workers --------------------------------------------------------------
+
+    def _update_gauges(self) -> None:
+        metrics.set_gauge("jobs.queue_depth", self.queue_depth)
+        metrics.set_gauge("jobs.running", self._running)
+
+    def _touch(self, job: dict, **changes) -> None:
+        job.update(changes, updated_at=datetime.datetime.utcnow().isoformat())
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None:
+                self._queue.task_done()
+                continue
+
+            self._running += 1
+            self._update_gauges()
+            self._touch(job, status=RUNNING)
+            await self._persist(job)
+            start_time = time.perf_counter()
+
+            def on_update(node: str, update: dict, job=job) -> None:
+                output = summarize_node_output(update)
+                job["nodes"].append({"node": node, "output": output})
+                if "events" in output:
+                    job["events"] = output["events"]
+                self._touch(job)
+
+            try:
+                result = await self.runner(job["query"], on_update)
+                self._touch(job, status=COMPLETED, result=result, events=result.get("events", []))
+                metrics.increment("jobs.completed")
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+                self._touch(job, status=FAILED, error=str(e))
+                metrics.increment("jobs.failed")
+            finally:
+                metrics.observe("jobs.run_ms", (time.perf_counter() - start_time) * 1000)
+                self._finished_at[job_id] = time.monotonic()
+                self._running -= 1
+                self._update_gauges()
+                self._queue.task_done()
+            await self._persist(job)
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, min(60.0, self.ttl_seconds / 4)))
+            self.cleanup()
+
+    def cleanup(self) -> int:
+        """Drop finished jobs older than the TTL. Returns the number removed."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [job_id for job_id, at in self._finished_at.items() if at < cutoff]
+        for job_id in expired:
+            self._finished_at.pop(job_id, None)
+            self._jobs.pop(job_id, None)
+        if expired:
+            metrics.increment("jobs.expired", len(expired))
+        return len(expired)
+
+    async def _persist(self, job: dict) -> None:
+        """Mirror a job to MongoDB (best effort; expires via a TTL index on expires_at)."""
+        if not config.JOBS_MONGODB_ENABLED:
+            return
+        expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=self.ttl_seconds)
+        document = {**job, "expires_at": expires_at}
+        try:
+            collection = get_named_collection(config.MONGODB_JOBS_COLLECTION_NAME)
+            await asyncio.to_thread(
+                get_breaker("mongodb").call,
+                collection.replace_one,
+                {"_id": job["job_id"]},
+                document,
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"Could not persist job {job['job_id']}: {e}")
+
+
+def ensure_job_indexes() -> None:
+    """Create the TTL index that expires mirrored jobs in MongoDB."""
+    collection = get_named_collection(config.MONGODB_JOBS_COLLECTION_NAME)
+    get_breaker("mongodb").call(collection.create_index, "expires_at", expireAfterSeconds=0)
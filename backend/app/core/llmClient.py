@@ -1,34 +1,159 @@
-from typing import Optional
+import random
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
 
+import openai
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
 from langchain_openai import ChatOpenAI
-from pydantic import SecretStr
+from pydantic import SecretStr, ValidationError
 
-from backend.app.core import config
+from backend.app.core import config, metrics
+from backend.app.core.circuitBreaker import get_breaker
+from backend.app.core.llmScheduler import (
+    PRIORITY_DEFAULT,
+    LLMRateLimitError,
+    estimate_tokens,
+    llm_scheduler,
+)
 from backend.app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# USD per 1M tokens (input, output), used for the per-model cost breakdown
+MODEL_PRICES_PER_1M_TOKENS = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
 
-def get_llm(temperature: Optional[float] = None):
+# Rate limits and malformed structured output are not OpenAI outages, so they
+# do not count against the breaker
+_NON_OUTAGE_ERRORS = (openai.RateLimitError, OutputParserException, ValidationError)
+
+
+class LLMUsageTracker(BaseCallbackHandler):
+    """Records call count, latency, token usage and cost per model in the metrics registry."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._start_times: dict[Any, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start_times[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prefix = f"llm.{self.model}"
+        metrics.increment(f"{prefix}.calls")
+
+        start_time = self._start_times.pop(run_id, None)
+        if start_time is not None:
+            metrics.observe(f"{prefix}.latency_ms", (time.perf_counter() - start_time) * 1000)
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        metrics.increment(f"{prefix}.prompt_tokens", prompt_tokens)
+        metrics.increment(f"{prefix}.completion_tokens", completion_tokens)
+
+        input_price, output_price = MODEL_PRICES_PER_1M_TOKENS.get(self.model, (0.0, 0.0))
+        cost = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+        metrics.increment(f"{prefix}.cost_usd", cost)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._start_times.pop(run_id, None)
+        metrics.increment(f"llm.{self.model}.errors")
+
+
+def get_llm(temperature: Optional[float] = None, model: Optional[str] = None):
     """
     Returns a configured ChatOpenAI instance.
 
     Args:
         temperature: Override for LLM temperature. If None, uses LLM_TEMPERATURE from config.
+        model: Override for the model name. If None, uses LLM_MODEL from config.
     """
     if not config.OPENAI_API_KEY:
         logger.error("OPENAI_API_KEY not found in environment variables")
         raise ValueError("OPENAI_API_KEY not found in .env")
 
     temp = temperature if temperature is not None else config.LLM_TEMPERATURE
-    model = config.LLM_MODEL
+    model = model or config.LLM_MODEL
 
     logger.debug(f"Initializing LLM client (model={model}, temperature={temp})")
 
     try:
-        client = ChatOpenAI(model=model, temperature=temp, api_key=SecretStr(config.OPENAI_API_KEY))
+        client = ChatOpenAI(
+            model=model,
+            temperature=temp,
+            api_key=SecretStr(config.OPENAI_API_KEY),
+            callbacks=[LLMUsageTracker(model)],
+        )
         logger.debug("LLM client initialized successfully")
         return client
     except Exception as e:
         logger.error(f"Failed to initialize LLM client: {e}", exc_info=True)
         raise
+
+
+def _retry_after_seconds(error: openai.RateLimitError, attempt: int) -> float:
+    """Delay before retrying a 429: the Retry-After header, else exponential backoff with jitter."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return float(headers[header]) * scale
+        except (KeyError, TypeError, ValueError):
+            continue
+    backoff = config.LLM_RATE_LIMIT_BACKOFF_SECONDS * 2.0**attempt
+    return backoff * random.uniform(0.5, 1.0)
+
+
+def _call_with_rate_limit_retries(fn, messages: list, priority: int):
+    """Run fn() once scheduled, retrying OpenAI 429s with a global pause between attempts."""
+    tokens = estimate_tokens(messages)
+    for attempt in range(config.LLM_RATE_LIMIT_MAX_RETRIES + 1):
+        llm_scheduler.acquire(tokens, priority)
+        try:
+            return get_breaker("openai").call(fn, ignore=_NON_OUTAGE_ERRORS)
+        except openai.RateLimitError as e:
+            metrics.increment("llm.rate_limited")
+            if getattr(e, "code", None) == "insufficient_quota":
+                raise LLMRateLimitError(f"OpenAI quota exhausted: {e}") from e
+            if attempt == config.LLM_RATE_LIMIT_MAX_RETRIES:
+                raise LLMRateLimitError(f"OpenAI rate limit persisted: {e}") from e
+            delay = _retry_after_seconds(e, attempt)
+            logger.warning(f"OpenAI rate limit hit, pausing LLM calls for {delay:.1f}s")
+            llm_scheduler.pause(delay)
+
+
+def invoke_llm(runnable, messages: list, priority: int = PRIORITY_DEFAULT):
+    """
+    Invoke an LLM (or structured-output runnable) through the shared LLM scheduler
+    and the OpenAI circuit breaker.
+    Raises CircuitOpenError immediately while OpenAI is considered down, and
+    LLMRateLimitError when the call cannot be scheduled or 429s persist after
+    LLM_RATE_LIMIT_MAX_RETRIES retries.
+    """
+    return _call_with_rate_limit_retries(lambda: runnable.invoke(messages), messages, priority)
+
+
+def stream_llm(runnable, messages: list, priority: int = PRIORITY_DEFAULT) -> Iterator[str]:
+    """
+    Stream the text of an LLM response, with the same scheduling, breaker and
+    429 handling as invoke_llm. The request is sent when the first chunk is
+    pulled; that step is what the breaker and retries cover.
+    """
+
+    def open_stream():
+        chunks = iter(runnable.stream(messages))
+        return chunks, next(chunks, None)
+
+    chunks, first = _call_with_rate_limit_retries(open_stream, messages, priority)
+    if first is None:
+        return
+    yield first.content
+    for chunk in chunks:
+        yield chunk.content
@@ -0,0 +1,147 @@
+"""
+Process-wide scheduler for OpenAI calls.
+
+All agents share one pair of token buckets: requests per minute (LLM_RPM_LIMIT)
+and estimated tokens per minute (LLM_TPM_LIMIT). A call waits until both
+buckets can cover it. Waiting calls are served by priority, so extraction for a
+request already in progress goes ahead of rewrites and new validations. When
+OpenAI answers 429, invoke_llm pauses the whole scheduler for the Retry-After
+period, so the other callers hold off too instead of each hitting the limit again.
+
+Token counts are estimated before the call (about 4 characters per token plus
+LLM_ESTIMATED_OUTPUT_TOKENS for the answer). A limit of 0 disables that bucket.
+
+Usage:
+    from backend.app.core.llmScheduler import PRIORITY_EXTRACTION, llm_scheduler
+    llm_scheduler.acquire(estimate_tokens(messages), PRIORITY_EXTRACTION)
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Optional
+
+from backend.app.core import config, metrics
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lower value = served first
+PRIORITY_EXTRACTION = 0
+PRIORITY_REWRITE = 1
+PRIORITY_VALIDATION = 2
+PRIORITY_DEFAULT = PRIORITY_REWRITE
+
+_CHARS_PER_TOKEN = 4
+
+
+class LLMRateLimitError(Exception):
+    """Raised when a call cannot be scheduled in time or OpenAI keeps answering 429."""
+
+
+def estimate_tokens(messages: list, output_tokens: Optional[int] = None) -> int:
+    """Rough token estimate of a chat call: prompt characters / 4 plus the expected output."""
+    if output_tokens is None:
+        output_tokens = config.LLM_ESTIMATED_OUTPUT_TOKENS
+    characters = sum(len(str(getattr(message, "content", message))) for message in messages)
+    return characters // _CHARS_PER_TOKEN + output_tokens
+
+
+class LLMScheduler:
+    """Priority-ordered RPM/TPM token buckets shared by all threads of the process."""
+
+    def __init__(self, rpm: int, tpm: int, max_wait_seconds: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait_seconds = max_wait_seconds
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int]] = []  # heap of (priority, arrival)
+        self._arrivals = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _seconds_until_available(self, tokens: int, now: float) -> float:
+        wait = self._paused_until - now
+        if self.rpm and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.rpm)
+        if self.tpm and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+        return max(0.0, wait)
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_DEFAULT) -> float:
+        """
+        Block until the call fits in both budgets and no higher-priority call is
+        waiting. Returns the seconds waited; raises LLMRateLimitError after
+        max_wait_seconds.
+        """
+        if self.tpm:
+            tokens = min(tokens, self.tpm)  # a single oversized call must still fit eventually
+        start_time = time.monotonic()
+        deadline = start_time + self.max_wait_seconds
+        entry = (priority, next(self._arrivals))
+
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            metrics.set_gauge("llm.scheduler.waiting", len(self._waiters) - 1)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiters[0] == entry:
+                        wait = self._seconds_until_available(tokens, now)
+                        if wait == 0:
+                            break
+                    else:
+                        wait = deadline - now  # woken when the head of the queue is served
+                    if now >= deadline:
+                        metrics.increment("llm.scheduler.rejected")
+                        raise LLMRateLimitError(
+                            f"LLM call not scheduled within {self.max_wait_seconds:.0f}s"
+                        )
+                    self._condition.wait(min(wait, deadline - now))
+
+                self._requests -= 1
+                self._tokens -= tokens
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                metrics.set_gauge("llm.scheduler.waiting", len(self._waiters))
+                self._condition.notify_all()
+
+        waited = time.monotonic() - start_time
+        metrics.observe("llm.scheduler.wait_ms", waited * 1000)
+        if waited > 0.01:
+            metrics.increment("llm.scheduler.throttled")
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every call for the given time (e.g. after a 429)."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    def reset(self) -> None:
+        with self._condition:
+            self._requests = float(self.rpm)
+            self._tokens = float(self.tpm)
+            self._updated = time.monotonic()
+            self._paused_until = 0.0
+
+
+# Shared by every LLM call in this process
+llm_scheduler = LLMScheduler(
+    rpm=config.LLM_RPM_LIMIT,
+    tpm=config.LLM_TPM_LIMIT,
+    max_wait_seconds=config.LLM_SCHEDULER_MAX_WAIT_SECONDS,
+)
@@ -0,0 +1,189 @@
+"""
+Process-wide BM25 index over everything the service has already fetched:
+extracted events (title, description, location) and raw Tavily snippets.
+
+The index is updated by persistence_node after every search, loaded from
+LOCAL_INDEX_PATH at startup so workers start warm, and snapshotted every
+LOCAL_INDEX_SNAPSHOT_EVERY updates and at shutdown. Documents whose content
+did not change are not re-added, and the index is compacted once replaced
+documents outnumber live ones. event_index_node falls back to
+lookup_local_events when the MongoDB event index has nothing for a query.
+
+Usage:
+    from backend.app.core.localIndex import lookup_local_events, search_local
+    search_local("comedy chicago", k=10)  # [(key, score, payload), ...]
+    events, fresh = lookup_local_events("comedy in chicago", "chicago", "comedy", date_range)
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from backend.app.core import config, metrics
+from backend.app.core.logger import get_logger
+from backend.app.models.schemas import DateRange, Event
+from backend.app.utils.bm25Index import BM25Index
+from backend.app.utils.queryParser import city_from_location, extract_category
+
+logger = get_logger(__name__)
+
+# Module-level singleton
+_index: Optional[BM25Index] = None
+_updates_since_snapshot = 0
+_lock = threading.Lock()
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+# BM25 event candidates (snippets excluded) considered per lookup before
+# filtering by city and dates
+_LOOKUP_CANDIDATES = 100
+
+
+def _load_or_create() -> BM25Index:
+    path = config.LOCAL_INDEX_PATH
+    if path and os.path.exists(path):
+        try:
+            index = BM25Index.load(path)
+            logger.info(f"Loaded local index from {path} ({len(index)} documents)")
+            return index
+        except Exception as e:
+            logger.error(f"Failed to load local index from {path}: {e}", exc_info=True)
+    return BM25Index()
+
+
+def get_local_index() -> BM25Index:
+    """Returns the shared index, loading the snapshot on first call."""
+    global _index
+
+    with _lock:
+        if _index is None:
+            _index = _load_or_create()
+        return _index
+
+
+def save_local_index() -> None:
+    """Write the index to LOCAL_INDEX_PATH (no-op without a path or an index)."""
+    global _updates_since_snapshot
+
+    if not config.LOCAL_INDEX_PATH or _index is None:
+        return
+    with _lock:
+        try:
+            _index.save(config.LOCAL_INDEX_PATH)
+            _updates_since_snapshot = 0
+            logger.info(f"Saved local index to {config.LOCAL_INDEX_PATH} ({len(_index)} documents)")
+        except Exception as e:
+            logger.error(f"Failed to save local index: {e}", exc_info=True)
+
+
+def _add_if_changed(index: BM25Index, key: str, text: str, payload: dict) -> bool:
+    """
+    Add a document unless the same key is indexed with the same payload, in
+    which case only its indexed_at is refreshed. Returns True if it was added.
+    """
+    current = index.get_payload(key)
+    if current is not None:
+        unchanged = {k: v for k, v in current.items() if k != "indexed_at"} == {
+            k: v for k, v in payload.items() if k != "indexed_at"
+        }
+        if unchanged:
+            if "indexed_at" in payload:
+                current["indexed_at"] = payload["indexed_at"]
+            return False
+    index.add(key, text, payload=payload)
+    return True
+
+
+def index_search_results(events: list[Event], raw_results: list[dict]) -> int:
+    """
+    Add events and raw snippets to the index, skipping documents that are
+    already indexed unchanged. Returns the number of documents added.
+    """
+    global _updates_since_snapshot
+
+    index = get_local_index()
+    added = 0
+    compacted = 0
+    now = time.time()
+    with _lock:
+        for event in events:
+            added += _add_if_changed(
+                index,
+                f"event:{event.url}|{event.title.lower()}|{event.date}",
+                f"{event.title} {event.description} {event.location}",
+                {"kind": "event", **event.model_dump(), "indexed_at": now},
+            )
+        for result in raw_results:
+            url = result.get("url")
+            content = result.get("content") or ""
+            if not url or not content:
+                continue
+            added += _add_if_changed(
+                index,
+                f"snippet:{url}",
+                f"{result.get('title', '')} {content}",
+                {
+                    "kind": "snippet",
+                    "url": url,
+                    "title": result.get("title", ""),
+                    "content": content,
+                },
+            )
+        if index.tombstones > len(index):
+            compacted = index.compact()
+        _updates_since_snapshot += 1
+        snapshot_due = _updates_since_snapshot >= config.LOCAL_INDEX_SNAPSHOT_EVERY
+
+    metrics.increment("local_index.documents_added", added)
+    if compacted:
+        metrics.increment("local_index.compactions")
+        logger.info(f"Compacted local index: {compacted} replaced documents dropped")
+    metrics.set_gauge("local_index.documents", len(index))
+    metrics.set_gauge("local_index.postings", index.posting_count)
+    if snapshot_due:
+        save_local_index()
+    return added
+
+
+def search_local(query: str, k: int = 10, prefix: str = "") -> list[tuple[str, float, Any]]:
+    """BM25 search over the local index ("event:" / "snippet:" prefix to search one kind)."""
+    index = get_local_index()
+    with _lock:
+        return index.search(query, k, prefix)
+
+
+def lookup_local_events(
+    query: str, city: str, category: Optional[str], date_range: DateRange
+) -> tuple[list[Event], bool]:
+    """
+    Indexed events matching the query in a city, category and date range, best
+    BM25 match first, and whether all of them were indexed within
+    EVENT_INDEX_MAX_AGE_HOURS. Events without an ISO date are skipped.
+    """
+    cutoff = time.time() - config.EVENT_INDEX_MAX_AGE_HOURS * 3600
+    events = []
+    fresh = True
+    candidates = search_local(f"{city} {query}", k=_LOOKUP_CANDIDATES, prefix="event:")
+    for _, _, payload in candidates:
+        if not _ISO_DATE.match(payload.get("date") or ""):
+            continue
+        if not date_range["start"] <= payload["date"][:10] <= date_range["end"]:
+            continue
+        if city_from_location(payload.get("location") or "", city) != city:
+            continue
+        text = f"{payload.get('title', '')} {payload.get('description', '')}"
+        if category and extract_category(text) != category:
+            continue
+        events.append(Event(**{field: payload.get(field) for field in Event.model_fields}))
+        fresh = fresh and payload.get("indexed_at", 0) >= cutoff
+    return events, fresh and bool(events)
+
+
+def reset_local_index() -> None:
+    """Drop the in-memory index (used by tests)."""
+    global _index, _updates_since_snapshot
+
+    with _lock:
+        _index = None
+        _updates_since_snapshot = 0
@@ -0,0 +1,106 @@
+"""
+Lightweight in-process metrics registry for the WhatsThePlan application.
+
+Counters, gauges and observations (count/sum/max) are kept per process and
+exposed through the /metrics endpoint. meter() additionally collects the
+counter increments of one piece of work, e.g. the spend of a single search.
+
+Usage:
+    from backend.app.core import metrics
+    metrics.increment("tavily.escalations")
+    metrics.observe("tavily.latency_ms.basic", 412.0)
+    with metrics.meter() as usage:
+        await execute_search(query)
+    usage.get("tavily.credits", 0)
+"""
+
+import contextlib
+import contextvars
+import threading
+from collections.abc import Iterator
+
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_gauges: dict[str, float] = {}
+_observations: dict[str, dict[str, float]] = {}
+
+# Usage dicts of the meter() blocks enclosing the current context
+_meters: contextvars.ContextVar[tuple[dict[str, float], ...]] = contextvars.ContextVar(
+    "metrics_meters", default=()
+)
+
+
+def increment(name: str, value: float = 1) -> None:
+    """Increase a counter by the given value."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        for usage in _meters.get():
+            usage[name] = usage.get(name, 0) + value
+
+
+@contextlib.contextmanager
+def meter() -> Iterator[dict[str, float]]:
+    """
+    Collect the counter increments made inside the block into a dict, including
+    those of asyncio tasks, graph nodes and asyncio.to_thread calls started from
+    it (they inherit the context). Concurrent work outside the block is not counted.
+    """
+    usage: dict[str, float] = {}
+    token = _meters.set((*_meters.get(), usage))
+    try:
+        yield usage
+    finally:
+        _meters.reset(token)
+
+
+def set_gauge(name: str, value: float) -> None:
+    """Set a gauge to its current value."""
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name: str, value: float) -> None:
+    """Record a single observation (e.g. a latency in milliseconds)."""
+    with _lock:
+        stats = _observations.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["sum"] += value
+        stats["max"] = max(stats["max"], value)
+
+
+def get_counter(name: str) -> float:
+    """Return the current value of a counter (0 if never incremented)."""
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def sum_counters(prefix: str, suffix: str = "") -> float:
+    """Sum all counters matching prefix*suffix (e.g. "llm.", ".cost_usd" for total LLM spend)."""
+    with _lock:
+        return sum(
+            value
+            for name, value in _counters.items()
+            if name.startswith(prefix) and name.endswith(suffix)
+        )
+
+
+def snapshot() -> dict:
+    """Return a copy of all metrics, including the mean of each observation."""
+    with _lock:
+        observations = {
+            name: {**stats, "avg": stats["sum"] / stats["count"] if stats["count"] else 0.0}
+            for name, stats in _observations.items()
+        }
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "observations": observations,
+        }
+
+
+def reset() -> None:
+    """Clear all metrics (used by tests and benchmarks)."""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _observations.clear()
@@ -0,0 +1,91 @@
+"""
+Thread-safe micro-batcher that merges concurrent calls into one batch call.
+
+The first caller to arrive opens a batch and becomes its leader. Callers that
+arrive within `window_seconds` join the batch, up to `max_batch_size` (a full
+batch is sent immediately). The leader then runs `batch_fn` once over all
+items and every caller receives the result at its own position. If the batch
+call raises, every caller in the batch gets the same exception.
+
+The window is the tradeoff: a caller waits up to window_seconds longer, and in
+exchange N concurrent calls cost one upstream request.
+
+Usage:
+    batcher = MicroBatcher(validate_queries, window_seconds=0.02, max_batch_size=16)
+    status = batcher.submit("Comedy shows in Chicago")  # blocks until the batch returns
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any, Optional
+
+from backend.app.core import metrics
+
+
+class _Batch:
+    def __init__(self):
+        self.items: list[Any] = []
+        self.results: list[Any] = []
+        self.error: Optional[BaseException] = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """Collects submit() calls for up to window_seconds and runs them as one batch."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], list],
+        window_seconds: float,
+        max_batch_size: int,
+        name: str = "batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.name = name
+        self._pending: Optional[_Batch] = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Any) -> Any:
+        """Add an item to the open batch and block until its result is available."""
+        with self._lock:
+            pending = self._pending
+            leader = pending is None
+            batch = _Batch() if pending is None else pending
+            if leader:
+                self._pending = batch
+            position = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch_size:
+                self._pending = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window_seconds)
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+            self._run(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[position]
+
+    def _run(self, batch: _Batch) -> None:
+        metrics.increment(f"{self.name}.batches")
+        metrics.observe(f"{self.name}.batch_size", len(batch.items))
+        try:
+            results = self.batch_fn(batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"{self.name}: batch returned {len(results)} results for {len(batch.items)} items"
+                )
+            batch.results = results
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
@@ -0,0 +1,141 @@
+"""
+Cross-request cache of extracted pages, keyed by normalized URL.
+
+The same ticketing and city-calendar pages come back from Tavily again and
+again. For every page that went through the LLM extractor, the events
+extracted from it are stored, so later requests that find the page again
+(for any query) contribute its cached events directly instead of shipping
+the content to the LLM once more. Entries are shared across queries; the
+caller keeps only the cached events matching its dates, city and category
+(see matching_events). Events extracted from a page by later requests are
+added to its entry. Pages the extraction found no events on are not cached.
+Entries expire after PAGE_CACHE_TTL_SECONDS; a stale page is extracted again.
+
+Usage:
+    from backend.app.core.pageCache import matching_events, page_cache
+    page_cache.store_extraction(snippets, events)  # after a successful extraction
+    page = page_cache.get("https://www.zanies.com/chicago")  # CachedPage or None
+    matching_events(page.events, ["chicago"], "comedy", date_range)
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from backend.app.core import config
+from backend.app.core.cache import TTLCache
+from backend.app.models.schemas import DateRange, Event
+from backend.app.utils.queryParser import city_from_location, extract_category
+
+
+@dataclass
+class CachedPage:
+    url: str
+    events: list[Event]
+
+
+def normalize_url(url: str) -> str:
+    """Cache key of a URL: lowercase host, no fragment, tracking parameters or trailing slash."""
+    parts = urlsplit(url.strip())
+    query = urlencode(
+        [(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_")]
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def matching_events(
+    events: list[Event],
+    cities: Sequence[str],
+    category: Optional[str],
+    date_range: Optional[DateRange],
+) -> list[Event]:
+    """
+    Cached events a query can use: dated within date_range (undated events
+    are kept), located in one of cities and of the query's category, each
+    filter applying only when the query has one.
+    """
+    matching = []
+    for event in events:
+        if (
+            date_range
+            and event.date[:4].isdigit()
+            and not date_range["start"] <= event.date[:10] <= date_range["end"]
+        ):
+            continue
+        if cities and not any(city_from_location(event.location, city) == city for city in cities):
+            continue
+        if category and extract_category(f"{event.title} {event.description}") != category:
+            continue
+        matching.append(event)
+    return matching
+
+
+def _event_key(event: Event) -> tuple[str, str]:
+    return (event.title.strip().lower(), event.date.strip().lower())
+
+
+def _mentions(snippet: dict, event: Event) -> bool:
+    title = event.title.strip().lower()
+    text = f"{snippet.get('title') or ''}\n{snippet.get('content') or ''}".lower()
+    return bool(title) and title in text
+
+
+class PageCache:
+    """TTL cache of CachedPage entries by normalized URL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._pages = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, url: Optional[str]) -> Optional[CachedPage]:
+        """Cached page for a URL, or None if unknown or stale."""
+        if not url:
+            return None
+        return self._pages.get(normalize_url(url))
+
+    def store(self, url: str, events: list[Event]) -> None:
+        self._pages.set(normalize_url(url), CachedPage(url=url, events=events))
+
+    def store_extraction(self, snippets: list[dict], events: list[Event]) -> int:
+        """
+        Cache every snippet that was sent to the extractor with the events found
+        on it: events whose URL points to it, and events it mentions by title
+        (the extractor merges an event listed on several pages under one URL).
+        Events already cached for the page are kept, a newly extracted event
+        with the same title and date replaces its cached copy. Pages without
+        events are not cached. Returns the number of pages stored.
+        """
+        stored = 0
+        for snippet in snippets:
+            url = snippet.get("url")
+            if not url:
+                continue
+            key = normalize_url(url)
+            page_events = [
+                event
+                for event in events
+                if normalize_url(event.url) == key or _mentions(snippet, event)
+            ]
+            if not page_events:
+                continue
+            cached = self.get(url)
+            if cached is not None:
+                new_keys = {_event_key(event) for event in page_events}
+                kept = [e for e in cached.events if _event_key(e) not in new_keys]
+                page_events = [*kept, *page_events]
+            self.store(url, page_events)
+            stored += 1
+        return stored
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+page_cache = PageCache(
+    max_entries=config.PAGE_CACHE_SIZE,
+    ttl_seconds=config.PAGE_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,43 @@
+"""
+In-process store of full search responses for cursor pagination.
+
+When a filtered /search response does not fit in one page, the whole
+response is kept here by search_id, so the following pages (and the same
+filters re-applied) are served from memory without another cache lookup or
+graph run. Entries expire SEARCH_RESULTS_TTL_SECONDS after they were stored.
+
+Usage:
+    from backend.app.core.resultStore import result_store
+    result_store.save(search_id, response)
+    result_store.get(search_id)  # response dict or None once expired
+"""
+
+from typing import Optional
+
+from backend.app.core import config
+from backend.app.core.cache import TTLCache
+
+
+class ResultStore:
+    """TTL cache of search responses by search_id."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._responses = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, search_id: str) -> Optional[dict]:
+        return self._responses.get(search_id)
+
+    def save(self, search_id: str, response: dict) -> None:
+        self._responses.set(search_id, response)
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+
+result_store = ResultStore(
+    max_entries=config.SEARCH_RESULTS_MAX_ENTRIES,
+    ttl_seconds=config.SEARCH_RESULTS_TTL_SECONDS,
+)
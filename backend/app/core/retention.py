@@ -0,0 +1,68 @@
+"""
+Background retention of the searches collection.
+
+Saved searches keep their full raw Tavily payload, which dominates the size
+of the collection. With SEARCH_RETENTION_ENABLED, a TTL index on last_seen
+expires searches SEARCH_RETENTION_DAYS after their last hit, and this job
+strips raw_results from searches older than SEARCH_RAW_RESULTS_RETENTION_DAYS
+every SEARCH_COMPACTION_INTERVAL_SECONDS (see dbClient.compact_raw_results),
+keeping their compact summary. Reclaimed bytes are logged and counted in
+/metrics.
+
+Usage:
+    job = RetentionJob()
+    job.start()   # on startup, after ensure_retention_indexes()
+    await job.stop()  # on shutdown
+"""
+
+import asyncio
+import contextlib
+import datetime
+from typing import Optional
+
+from backend.app.core import config, metrics
+from backend.app.core.dbClient import compact_raw_results
+from backend.app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RetentionJob:
+    """Periodic compaction passes as a background asyncio task."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def compact_once(self, now: Optional[datetime.datetime] = None) -> Optional[dict]:
+        """Run one compaction; returns its summary, or None when MongoDB failed."""
+        try:
+            summary = await asyncio.to_thread(compact_raw_results, now)
+        except Exception as e:
+            logger.warning(f"Search compaction failed: {e}")
+            return None
+
+        metrics.increment("retention.cycles")
+        metrics.increment("retention.compacted_documents", summary["documents"])
+        metrics.increment("retention.reclaimed_bytes", summary["reclaimed_bytes"])
+        logger.info(
+            f"Search compaction finished: {summary['documents']} documents in "
+            f"{summary['batches']} batches, {summary['reclaimed_bytes'] / 2**20:.1f} MiB reclaimed"
+        )
+        return summary
+
+    async def _loop(self) -> None:
+        while True:
+            await self.compact_once()
+            await asyncio.sleep(config.SEARCH_COMPACTION_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            logger.info("Starting search retention job")
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
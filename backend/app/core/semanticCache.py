@@ -0,0 +1,159 @@
+"""
+Semantic response cache for near-duplicate queries.
+
+Queries are embedded locally (utils/queryEmbedder) and stored as rows of one
+contiguous float32 matrix, so a lookup is a single matrix-vector product
+followed by masking. A cached response is reused when the most similar query
+in the same scope (the resolved date range) reaches SEMANTIC_CACHE_THRESHOLD
+and both queries have the same content terms and cities (queryParser): a
+response is reused across word order, plurals and filler words, never for
+"free concerts" vs "concerts" or "austin and dallas" vs "austin", which embed
+close together but ask for different events.
+
+Usage:
+    from backend.app.core.semanticCache import cache_scope, semantic_cache
+    scope = cache_scope(date_range)
+    hit = semantic_cache.lookup("chicago comedy shows this weekend", scope)
+    semantic_cache.store("comedy shows in Chicago this weekend", scope, response)
+"""
+
+import math
+import threading
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from backend.app.core import config, metrics
+from backend.app.models.schemas import DateRange
+from backend.app.utils.queryEmbedder import embed_query, query_terms
+from backend.app.utils.queryParser import content_terms, extract_cities
+
+
+@dataclass
+class SemanticCacheHit:
+    value: Any
+    similarity: float
+    cached_query: str
+
+
+def cache_scope(date_range: Optional[DateRange]) -> Hashable:
+    """Cache entries are only shared between queries resolving to the same dates."""
+    if not date_range:
+        return None
+    return (date_range["start"], date_range["end"])
+
+
+def _guard_terms(query: str) -> frozenset[str]:
+    """Content terms plus the words of every city; cached and new query must match."""
+    cities = {word for city in extract_cities(query) for word in city.split()}
+    return frozenset(content_terms(query)) | cities
+
+
+class SemanticCache:
+    """Fixed-capacity nearest-neighbour cache; the oldest row is overwritten when full."""
+
+    def __init__(self, max_entries: int, threshold: float, ttl_seconds: float = 0, dim: int = 512):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.dim = dim
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._scopes = np.full(max_entries, -1, dtype=np.int64)  # -1 = empty row
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._entries: list[Optional[dict]] = [None] * max_entries
+        self._scope_ids: dict[Hashable, int] = {}
+        self._rows_by_query: dict[tuple, int] = {}
+        self._next_row = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(np.count_nonzero(self._scopes >= 0))
+
+    def lookup(
+        self, query: str, scope: Hashable, min_ttl_seconds: float = 0
+    ) -> Optional[SemanticCacheHit]:
+        """
+        Return the best cached response above the threshold, or None. With
+        min_ttl_seconds, entries expiring sooner than that are ignored.
+        """
+        vector = embed_query(query, self.dim)
+        with self._lock:
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is None or not vector.any():
+                metrics.increment("semantic_cache.misses")
+                return None
+
+            similarities = self._vectors @ vector
+            valid = self._scopes == scope_id
+            valid &= self._expires_at >= time.monotonic() + min_ttl_seconds
+            similarities[~valid] = -1.0
+
+            terms = _guard_terms(query)
+            for row in np.argsort(-similarities):
+                similarity = float(similarities[row])
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[row]
+                if entry["terms"] != terms:
+                    continue
+                metrics.increment("semantic_cache.hits")
+                return SemanticCacheHit(entry["value"], similarity, entry["query"])
+
+        metrics.increment("semantic_cache.misses")
+        return None
+
+    def store(
+        self, query: str, scope: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Cache a response; the same query in the same scope replaces its old entry.
+        ttl_seconds overrides the cache's TTL for this entry.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        vector = embed_query(query, self.dim)
+        if not vector.any():
+            return
+
+        with self._lock:
+            scope_id = self._scope_ids.setdefault(scope, len(self._scope_ids))
+            query_key = (scope_id, tuple(query_terms(query)))
+            row = self._rows_by_query.get(query_key)
+            if row is None:
+                row = self._next_row
+                self._next_row = (self._next_row + 1) % self.max_entries
+                previous = self._entries[row]
+                if previous is not None:
+                    self._rows_by_query.pop(previous["key"], None)
+
+            self._vectors[row] = vector
+            self._scopes[row] = scope_id
+            self._expires_at[row] = time.monotonic() + ttl if ttl > 0 else math.inf
+            self._entries[row] = {
+                "key": query_key,
+                "query": query,
+                "terms": _guard_terms(query),
+                "value": value,
+            }
+            self._rows_by_query[query_key] = row
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.fill(0)
+            self._scopes.fill(-1)
+            self._entries = [None] * self.max_entries
+            self._scope_ids.clear()
+            self._rows_by_query.clear()
+            self._next_row = 0
+
+
+# Shared response cache used by the /search endpoint
+semantic_cache = SemanticCache(
+    max_entries=config.SEMANTIC_CACHE_SIZE,
+    threshold=config.SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=config.SEMANTIC_CACHE_TTL_SECONDS,
+    dim=config.QUERY_EMBEDDING_DIM,
+)
@@ -0,0 +1,105 @@
+"""
+In-process store of refinement sessions.
+
+A session keeps the state of its last search (the events, the raw Tavily
+snippets and the constraints that search covered) together with the
+constraints of the latest follow-up, so refinements such as "only Saturday"
+or "near Wicker Park" can be answered from it without another graph run.
+A search for the same city and category extends the results (extend_search)
+instead of replacing them (record_search).
+Sessions expire SESSION_TTL_SECONDS after their last use.
+
+Usage:
+    from backend.app.core.sessionStore import session_store
+    session = session_store.start("comedy in Chicago this weekend", "2024-12-20")
+    session.record_search(constraints, events, raw_results)
+    session_store.save(session)
+    session_store.get(session.session_id)  # Session or None once expired
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from backend.app.core import config
+from backend.app.core.cache import TTLCache
+from backend.app.models.schemas import Event
+from backend.app.utils.dateResolver import parse_reference_date
+from backend.app.utils.refinement import Constraints, constraints_from_query, covered_range
+
+
+@dataclass
+class Session:
+    session_id: str
+    current_date: str
+    covered: Constraints  # What the last search covered
+    current: Constraints  # What the latest query asks for
+    events: list[Event] = field(default_factory=list)  # Events of the last search
+    raw_results: list[dict] = field(default_factory=list)  # Snippets of the last search
+    turns: list[dict] = field(default_factory=list)  # {"query", "mode", "events"} per query
+
+    def record_search(
+        self, constraints: Constraints, events: list[Event], raw_results: list[dict]
+    ) -> None:
+        """Replace the session's results with those of a new search."""
+        self.covered = constraints.copy()
+        self.current = constraints.copy()
+        self.events = events
+        self.raw_results = raw_results
+
+    def extend_search(
+        self, constraints: Constraints, events: list[Event], raw_results: list[dict]
+    ) -> None:
+        """
+        Add the results of a search for the same city and category to the
+        session's. events are the session's events merged with the new ones.
+        """
+        date_range = covered_range(self.covered.date_range, constraints.date_range)
+        self.covered = constraints.copy()
+        self.covered.date_range = date_range
+        self.current = constraints.copy()
+        self.events = events
+        seen = {snippet.get("url") for snippet in self.raw_results}
+        self.raw_results = self.raw_results + [r for r in raw_results if r.get("url") not in seen]
+
+    def known_places(self) -> str:
+        """Text of the session's results, to recognize neighborhoods and venues."""
+        return " ".join(
+            [event.location for event in self.events]
+            + [snippet.get("content") or "" for snippet in self.raw_results]
+        )
+
+
+class SessionStore:
+    """TTL cache of sessions by id; every save refreshes a session's expiry."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self._sessions = TTLCache(max_entries=max_sessions, ttl_seconds=ttl_seconds)
+
+    def start(self, query: str, current_date: str) -> Session:
+        """New (unsaved) session whose constraints are those of its first query."""
+        constraints = constraints_from_query(query, parse_reference_date(current_date))
+        return Session(
+            session_id=str(uuid.uuid4()),
+            current_date=current_date,
+            covered=constraints.copy(),
+            current=constraints,
+        )
+
+    def get(self, session_id: str) -> Optional[Session]:
+        return self._sessions.get(session_id)
+
+    def save(self, session: Session) -> None:
+        self._sessions.set(session.session_id, session)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+session_store = SessionStore(
+    max_sessions=config.SESSION_MAX_SESSIONS,
+    ttl_seconds=config.SESSION_TTL_SECONDS,
+)
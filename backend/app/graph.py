@@ -1,11 +1,18 @@
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
+from backend.app.agents.agentDateResolver import date_resolver_node
+from backend.app.agents.agentEventIndex import event_index_node
 from backend.app.agents.agentExtractor import extraction_node
+from backend.app.agents.agentFacets import facet_merge_node, facet_node, route_after_rewrite
 from backend.app.agents.agentPersistence import persistence_node
 from backend.app.agents.agentRewriter import query_rewriter_node
 from backend.app.agents.agentSearch import search_node
 from backend.app.agents.agentValidator import query_validator_node
 from backend.app.core import config
+from backend.app.core.checkpointer import get_checkpointer
 from backend.app.core.logger import get_logger
 from backend.app.models.schemas import AgentState
 
@@ -21,6 +28,10 @@ def check_results(state: AgentState):
 
     if events:
         return "success"
+    elif state.get("extraction_error") == "rate_limited":
+        # Another search pass would only hit the same LLM rate limit
+        logger.info("Decision: Give up (LLM rate limited)")
+        return "give_up"
     elif retry_count < config.MAX_RETRY_COUNT:
         # Increment retry count and signal to retry
         state["retry_count"] = retry_count + 1
@@ -31,13 +42,21 @@ def check_results(state: AgentState):
         return "give_up"
 
 
-def build_graph():
+def build_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """
+    Compile the agent graph. Without an explicit checkpointer, the one of
+    CHECKPOINTER_BACKEND is used (none by default).
+    """
     workflow = StateGraph(AgentState)
 
     workflow.add_node("validator", query_validator_node)  # AGENT 0: VALIDATION
+    workflow.add_node("date_resolver", date_resolver_node)  # LOCAL: DATE RESOLUTION
+    workflow.add_node("event_index", event_index_node)  # LOCAL: EVENT INDEX LOOKUP
     workflow.add_node("rewriter", query_rewriter_node)  # AGENT 1: REWRITE
     workflow.add_node("searcher", search_node)  # AGENT 2: SEARCH
     workflow.add_node("extractor", extraction_node)  # AGENT 3: EXTRACTION
+    workflow.add_node("facet", facet_node)  # AGENTS 2+3 PER FACET (parallel fan-out)
+    workflow.add_node("facet_merge", facet_merge_node)  # LOCAL: MERGE FACET RESULTS
     workflow.add_node("persistence", persistence_node)  # AGENT 4: PERSISTENCE
 
     # 1. Starting Point: Validator
@@ -48,23 +67,38 @@ def build_graph():
         "validator",
         lambda state: state.get("query_status"),
         {
-            "valid": "rewriter",  # If valid, proceed to the Rewriter (Agent 1)
+            "valid": "date_resolver",  # If valid, resolve dates and proceed to the Rewriter
             "invalid": END,  # If invalid, stop the graph immediately
         },
     )
 
     # 3. Standard Edges
-    workflow.add_edge("rewriter", "searcher")
+    workflow.add_edge("date_resolver", "event_index")
+    workflow.add_conditional_edges(
+        "event_index",
+        lambda state: state.get("index_status"),
+        {
+            "hit": "persistence",  # Fresh coverage: answer from the index, skip searching
+            "seed": "rewriter",
+            "miss": "rewriter",
+        },
+    )
+    # Multi-location/category queries fan out to one search+extract task per facet
+    workflow.add_conditional_edges("rewriter", route_after_rewrite, ["searcher", "facet"])
     workflow.add_edge("searcher", "extractor")
+    workflow.add_edge("facet", "facet_merge")
 
     # 4. Conditional Edge after Extractor (Retry/Success/Give Up)
-    workflow.add_conditional_edges(
-        "extractor",
-        check_results,
-        {"success": "persistence", "retry": "rewriter", "give_up": "persistence"},
-    )
+    for node in ("extractor", "facet_merge"):
+        workflow.add_conditional_edges(
+            node,
+            check_results,
+            {"success": "persistence", "retry": "rewriter", "give_up": "persistence"},
+        )
 
     # 5. Final Flow
     workflow.add_edge("persistence", END)
 
-    return workflow.compile()
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
+    return workflow.compile(checkpointer=checkpointer)
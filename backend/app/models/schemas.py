@@ -1,4 +1,5 @@
-from typing import Optional, TypedDict
+import operator
+from typing import Annotated, Optional, TypedDict
 
 from pydantic import BaseModel, Field
 
@@ -25,17 +26,47 @@ class Event(BaseModel):
 # This is the shared memory passed between agents.
 
 
+class DateRange(TypedDict):
+    start: str  # Inclusive start date (YYYY-MM-DD)
+    end: str  # Inclusive end date (YYYY-MM-DD)
+    expression: str  # The matched expression (e.g., "this weekend")
+
+
+class SearchFacet(TypedDict):
+    label: str  # e.g. "Austin" or "jazz"
+    queries: list[str]  # Search queries for this facet only
+
+
 class AgentState(TypedDict):
     # --- Inputs ---
     user_query: str  # The raw query from the user
     current_date: str  # Grounding context (e.g., "Friday, Nov 24, 2023")
+    date_range: Optional[DateRange]  # Locally resolved date range of the query, if any
+    search_id: str  # Id of the run: checkpoint thread id and _id of the saved search
+    warm_run: bool  # Started by the cache warmer: longer cache TTLs, not saved to history
 
     # --- Internal Logic ---
     retry_count: int  # To prevent infinite loops if no events are found
     search_queries: list[str]  # The generated search queries for Tavily
+    search_facets: list[SearchFacet]  # Independent sub-searches run in parallel (2+ or empty)
+    facet_results: Annotated[list[dict], operator.add]  # Per-facet outputs gathered by fan-in
+    facet_timings: list[dict]  # Per-facet search/extract timings of the latest fan-out
+    query_history: list[str]  # Every query issued so far (avoids repeats on retry)
     query_status: str
+    city: Optional[str]  # City parsed from the query (index key)
+    category: Optional[str]  # Event category parsed from the query
+    index_status: str  # Event index lookup outcome: "hit", "seed" or "miss"
+    search_escalations: list[str]  # Queries escalated from basic to advanced search
 
     # --- Outputs ---
-    raw_results: list[dict]  # Raw snippets from Tavily
+    raw_results: list[dict]  # Raw snippets from Tavily (accumulated across retries)
+    new_raw_results: list[dict]  # Snippets added by the latest search pass only
     events: list[Event]  # The structured list of extracted events
+    extraction_error: Optional[str]  # "rate_limited" when the extractor could not call the LLM
     final_response: str  # The human-readable summary
+
+
+class FacetState(AgentState):
+    """State of one facet task: the Send payload built by route_after_rewrite."""
+
+    facet_label: str  # Label of the facet being searched
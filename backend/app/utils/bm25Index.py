@@ -0,0 +1,311 @@
+"""
+In-memory BM25 inverted index with array-backed postings.
+
+Postings are stored per term as two parallel `array('I')` columns (document
+numbers and term frequencies), i.e. 8 bytes per posting. Documents can be added
+incrementally; re-adding a key replaces the previous document. Replaced and
+removed documents are tombstoned, and compact() rebuilds the postings without
+them.
+
+An index can be written to a single binary snapshot and loaded back with mmap:
+the postings of a loaded index are read-only memoryviews into the mapped file
+(no copy, pages are read lazily), and are copied into arrays only when a later
+add touches that term.
+
+Usage:
+    from backend.app.utils.bm25Index import BM25Index
+    index = BM25Index()
+    index.add("event:1", "Holiday Concert Chicago", payload={"kind": "event"})
+    index.search("concert chicago", k=5)  # [(key, score, payload), ...]
+    index.save("data/local_index.bin")
+    index = BM25Index.load("data/local_index.bin")
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+from array import array
+from typing import Any, Optional, Union
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with",
+})  # fmt: skip
+
+_MAGIC = b"BM25IDX1"
+# magic, k1, b, doc count, term count, metadata length
+_HEADER = struct.Struct("<8sddIIQ")
+
+Postings = Union[array, memoryview]
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens without stop words."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOP_WORDS]
+
+
+def _pad(length: int) -> int:
+    """Bytes needed to align an offset to 4 bytes."""
+    return -length % 4
+
+
+class BM25Index:
+    """Okapi BM25 over incrementally added documents."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._keys: list[str] = []
+        self._payloads: list[Any] = []
+        self._doc_lengths = array("I")
+        self._deleted = bytearray()
+        self._key_to_doc: dict[str, int] = {}
+        self._term_ids: dict[str, int] = {}
+        self._doc_ids: list[Postings] = []
+        self._freqs: list[Postings] = []
+        self._total_length = 0
+        self._live_docs = 0
+        self._posting_count = 0
+        self._mmap: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return self._live_docs
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_doc
+
+    @property
+    def posting_count(self) -> int:
+        return self._posting_count
+
+    @property
+    def tombstones(self) -> int:
+        """Replaced or removed documents whose postings are still stored."""
+        return len(self._keys) - self._live_docs
+
+    def postings_nbytes(self) -> int:
+        """Memory used by the postings columns."""
+        return sum(
+            len(d) * d.itemsize + len(f) * f.itemsize for d, f in zip(self._doc_ids, self._freqs)
+        )
+
+    # --- Updates --------------------------------------------------------------
+
+    def add(self, key: str, text: str, payload: Any = None) -> None:
+        """Index a document; an existing document with the same key is replaced."""
+        if key in self._key_to_doc:
+            self.remove(key)
+
+        tokens = tokenize(text)
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._payloads.append(payload)
+        self._doc_lengths.append(len(tokens))
+        self._deleted.append(0)
+        self._key_to_doc[key] = doc
+        self._total_length += len(tokens)
+        self._live_docs += 1
+
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        for term, freq in counts.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = len(self._doc_ids)
+                self._term_ids[term] = term_id
+                self._doc_ids.append(array("I"))
+                self._freqs.append(array("I"))
+            doc_ids, freqs = self._doc_ids[term_id], self._freqs[term_id]
+            if not isinstance(doc_ids, array) or not isinstance(freqs, array):
+                # Copy-on-write for postings still backed by the snapshot
+                doc_ids, freqs = array("I", doc_ids), array("I", freqs)
+                self._doc_ids[term_id], self._freqs[term_id] = doc_ids, freqs
+            doc_ids.append(doc)
+            freqs.append(freq)
+        self._posting_count += len(counts)
+
+    def remove(self, key: str) -> None:
+        """Tombstone a document; its postings are skipped at query time."""
+        doc = self._key_to_doc.pop(key, None)
+        if doc is None:
+            return
+        self._deleted[doc] = 1
+        self._total_length -= self._doc_lengths[doc]
+        self._live_docs -= 1
+
+    def compact(self) -> int:
+        """
+        Renumber the live documents and rebuild the postings without tombstoned
+        ones, so they no longer take memory or count towards document
+        frequencies. Returns the number of documents dropped.
+        """
+        dropped = self.tombstones
+        if not dropped:
+            return 0
+
+        new_doc: dict[int, int] = {}
+        keys: list[str] = []
+        payloads: list[Any] = []
+        doc_lengths = array("I")
+        for doc, key in enumerate(self._keys):
+            if not self._deleted[doc]:
+                new_doc[doc] = len(keys)
+                keys.append(key)
+                payloads.append(self._payloads[doc])
+                doc_lengths.append(self._doc_lengths[doc])
+
+        term_ids: dict[str, int] = {}
+        all_doc_ids: list[Postings] = []
+        all_freqs: list[Postings] = []
+        for term, term_id in self._term_ids.items():
+            doc_ids, freqs = array("I"), array("I")
+            for doc, freq in zip(self._doc_ids[term_id], self._freqs[term_id]):
+                if doc in new_doc:
+                    doc_ids.append(new_doc[doc])
+                    freqs.append(freq)
+            if doc_ids:
+                term_ids[term] = len(all_doc_ids)
+                all_doc_ids.append(doc_ids)
+                all_freqs.append(freqs)
+
+        self._keys = keys
+        self._payloads = payloads
+        self._doc_lengths = doc_lengths
+        self._deleted = bytearray(len(keys))
+        self._key_to_doc = {key: doc for doc, key in enumerate(keys)}
+        self._term_ids = term_ids
+        self._doc_ids = all_doc_ids
+        self._freqs = all_freqs
+        self._posting_count = sum(len(doc_ids) for doc_ids in all_doc_ids)
+        # Every posting is now an array copy; the snapshot mapping is no longer used
+        self._mmap = None
+        return dropped
+
+    # --- Queries --------------------------------------------------------------
+
+    def search(self, query: str, k: int = 10, prefix: str = "") -> list[tuple[str, float, Any]]:
+        """
+        Return the top-k (key, score, payload) matches for a query, only
+        counting documents whose key starts with prefix.
+        """
+        if not self._live_docs:
+            return []
+
+        avg_length = self._total_length / self._live_docs
+        k1, b = self.k1, self.b
+        deleted = self._deleted
+        doc_lengths = self._doc_lengths
+        scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                continue
+            doc_ids = self._doc_ids[term_id]
+            freqs = self._freqs[term_id]
+            df = len(doc_ids)
+            idf = math.log(1 + (self._live_docs - df + 0.5) / (df + 0.5))
+            for doc, freq in zip(doc_ids, freqs):
+                if deleted[doc]:
+                    continue
+                norm = k1 * (1 - b + b * doc_lengths[doc] / avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * freq * (k1 + 1) / (freq + norm)
+
+        if prefix:
+            keys = self._keys
+            scores = {doc: score for doc, score in scores.items() if keys[doc].startswith(prefix)}
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self._keys[doc], score, self._payloads[doc]) for doc, score in top]
+
+    def get_payload(self, key: str) -> Any:
+        doc = self._key_to_doc.get(key)
+        return None if doc is None else self._payloads[doc]
+
+    # --- Snapshots ------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """
+        Write a snapshot: header, JSON metadata (keys, payloads, vocabulary),
+        then 4-byte aligned uint32 columns (doc lengths, tombstones, per-term
+        posting offsets, all doc ids, all frequencies).
+        The file is written to a temporary path and renamed into place.
+        """
+        terms = sorted(self._term_ids, key=self._term_ids.__getitem__)
+        metadata = json.dumps(
+            {"keys": self._keys, "payloads": self._payloads, "terms": terms},
+            separators=(",", ":"),
+        ).encode()
+
+        offsets = array("I", [0])
+        for doc_ids in self._doc_ids:
+            offsets.append(offsets[-1] + len(doc_ids))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                _HEADER.pack(_MAGIC, self.k1, self.b, len(self._keys), len(terms), len(metadata))
+            )
+            f.write(metadata)
+            f.write(b"\0" * _pad(_HEADER.size + len(metadata)))
+            f.write(self._doc_lengths.tobytes())
+            f.write(array("I", list(self._deleted)).tobytes())
+            f.write(offsets.tobytes())
+            for doc_ids in self._doc_ids:
+                f.write(doc_ids.tobytes() if isinstance(doc_ids, array) else doc_ids)
+            for freqs in self._freqs:
+                f.write(freqs.tobytes() if isinstance(freqs, array) else freqs)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Open a snapshot written by save(); postings stay in the memory-mapped file."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, k1, b, doc_count, term_count, metadata_length = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError(f"Not a BM25 index snapshot: {path}")
+
+        position = _HEADER.size
+        metadata = json.loads(mapped[position : position + metadata_length])
+        position += metadata_length + _pad(_HEADER.size + metadata_length)
+
+        words = memoryview(mapped)[position:].cast("I")
+        doc_lengths = words[:doc_count]
+        deleted = words[doc_count : 2 * doc_count]
+        offsets = words[2 * doc_count : 2 * doc_count + term_count + 1]
+        postings_start = 2 * doc_count + term_count + 1
+        total_postings = offsets[term_count]
+        all_doc_ids = words[postings_start : postings_start + total_postings]
+        all_freqs = words[postings_start + total_postings : postings_start + 2 * total_postings]
+
+        index = cls(k1=k1, b=b)
+        index._mmap = mapped
+        index._keys = metadata["keys"]
+        index._payloads = metadata["payloads"]
+        index._doc_lengths = array("I", doc_lengths)
+        index._deleted = bytearray(deleted.tolist())
+        index._key_to_doc = {
+            key: doc for doc, key in enumerate(index._keys) if not index._deleted[doc]
+        }
+        index._term_ids = {term: term_id for term_id, term in enumerate(metadata["terms"])}
+        index._doc_ids = [all_doc_ids[offsets[t] : offsets[t + 1]] for t in range(term_count)]
+        index._freqs = [all_freqs[offsets[t] : offsets[t + 1]] for t in range(term_count)]
+        index._live_docs = len(index._key_to_doc)
+        index._posting_count = total_postings
+        index._total_length = sum(
+            length for length, gone in zip(index._doc_lengths, index._deleted) if not gone
+        )
+        return index
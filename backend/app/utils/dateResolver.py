@@ -0,0 +1,465 @@
+"""
+Deterministic resolution of date expressions in user queries and event dates.
+
+Resolving "this weekend" or "next month" locally saves reasoning tokens in the
+rewriter/extractor prompts, and gives downstream caching and filtering a
+concrete date range to work with.
+
+Usage:
+    from backend.app.utils.dateResolver import resolve_date_range
+    resolve_date_range("comedy in Chicago this weekend", date(2024, 12, 20))
+    # {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+"""
+
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from backend.app.models.schemas import DateRange
+
+WEEKDAYS = {
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "friday": 4,
+    "saturday": 5,
+    "sunday": 6,
+}
+
+MONTHS = {
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "august": 8,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12,
+}
+MONTH_ALIASES = {
+    **MONTHS,
+    **{name[:3]: number for name, number in MONTHS.items()},
+    "sept": 9,
+}
+
+SEASONS = {
+    "spring": ((3, 1), (5, 31)),
+    "summer": ((6, 1), (8, 31)),
+    "fall": ((9, 1), (11, 30)),
+    "autumn": ((9, 1), (11, 30)),
+}
+
+# Longest names first so "march" is preferred over "mar"; \b avoids "marathon" or "novel"
+_MONTH_RE = "(?:" + "|".join(sorted(MONTH_ALIASES, key=len, reverse=True)) + r")\b\.?"
+_WEEKDAY_RE = r"(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+_ORDINAL_RE = r"(\d{1,2})(?:st|nd|rd|th)?"
+
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})(?!\d)")
+_US_DATE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+_MONTH_DAY = re.compile(rf"\b({_MONTH_RE})\s+{_ORDINAL_RE}\b(?:,?\s+(\d{{4}}))?")
+_DAY_MONTH = re.compile(rf"\b{_ORDINAL_RE}\s+(?:of\s+)?({_MONTH_RE})\b(?:,?\s+(\d{{4}}))?")
+# "dec 27-29" or, across a month boundary, "dec 30 - jan 2"
+_MONTH_DAY_SPAN = re.compile(
+    rf"\b({_MONTH_RE})\s+{_ORDINAL_RE}\s*(?:-|–|to|through|thru|until)\s*"
+    rf"(?:({_MONTH_RE})\s+)?{_ORDINAL_RE}\b(?:,?\s+(\d{{4}}))?"
+)
+_TIME = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?\b|\b([01]?\d|2[0-3]):([0-5]\d)\b")
+_NEXT_N = re.compile(r"\bnext\s+(\d{1,2})\s+(day|week)s?\b")
+_WEEKDAY_DATE = re.compile(
+    rf"\b{_WEEKDAY_RE}\b|\b(?:mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)\b\.?"
+)
+
+
+def _holiday(name: str, year: int) -> Optional[date]:
+    """Date of a named holiday in a given year."""
+
+    def nth_weekday(month: int, weekday: int, n: int) -> date:
+        first = date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        return first + timedelta(days=offset + 7 * (n - 1))
+
+    def last_weekday(month: int, weekday: int) -> date:
+        last = date(year, month, calendar.monthrange(year, month)[1])
+        return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+    def easter() -> date:
+        # Anonymous Gregorian algorithm
+        a, b, c = year % 19, year // 100, year % 100
+        d, e = b // 4, b % 4
+        f = (b + 8) // 25
+        g = (b - f + 1) // 3
+        h = (19 * a + b - d - g + 15) % 30
+        i, k = c // 4, c % 4
+        l_ = (32 + 2 * e + 2 * i - h - k) % 7
+        m = (a + 11 * h + 22 * l_) // 451
+        month = (h + l_ - 7 * m + 114) // 31
+        day = ((h + l_ - 7 * m + 114) % 31) + 1
+        return date(year, month, day)
+
+    fixed = {
+        "new year's day": (1, 1),
+        "valentine's day": (2, 14),
+        "st patrick's day": (3, 17),
+        "cinco de mayo": (5, 5),
+        "juneteenth": (6, 19),
+        "independence day": (7, 4),
+        "halloween": (10, 31),
+        "christmas eve": (12, 24),
+        "christmas": (12, 25),
+        "new year's eve": (12, 31),
+    }
+    if name in fixed:
+        return date(year, *fixed[name])
+    if name == "mlk day":
+        return nth_weekday(1, 0, 3)
+    if name == "memorial day":
+        return last_weekday(5, 0)
+    if name == "labor day":
+        return nth_weekday(9, 0, 1)
+    if name == "thanksgiving":
+        return nth_weekday(11, 3, 4)
+    if name == "easter":
+        return easter()
+    return None
+
+
+# Spelling variants mapped to the canonical holiday names understood by _holiday
+HOLIDAY_PATTERNS = [
+    (re.compile(r"\bnew\s*year'?s?\s*eve\b|\bnye\b"), "new year's eve"),
+    (re.compile(r"\bnew\s*year'?s?\s*day\b"), "new year's day"),
+    (re.compile(r"\bchristmas\s+eve\b|\bxmas\s+eve\b"), "christmas eve"),
+    (re.compile(r"\bchristmas\b|\bxmas\b"), "christmas"),
+    (re.compile(r"\bvalentines?'?s?\s*day\b|\bvalentine'?s\b"), "valentine's day"),
+    (re.compile(r"\bst\.?\s*patrick'?s?\s*day\b|\bst\.?\s*paddy'?s\b"), "st patrick's day"),
+    (re.compile(r"\bcinco\s+de\s+mayo\b"), "cinco de mayo"),
+    (re.compile(r"\bjuneteenth\b"), "juneteenth"),
+    (
+        re.compile(r"\bindependence\s+day\b|\bfourth\s+of\s+july\b|\bjuly\s+4(?:th)?\b"),
+        "independence day",
+    ),
+    (re.compile(r"\bhalloween\b"), "halloween"),
+    (re.compile(r"\bthanksgiving\b"), "thanksgiving"),
+    (re.compile(r"\bmemorial\s+day\b"), "memorial day"),
+    (re.compile(r"\blabou?r\s+day\b"), "labor day"),
+    (re.compile(r"\b(?:mlk|martin\s+luther\s+king)(?:\s+jr\.?)?\s+day\b"), "mlk day"),
+    (re.compile(r"\beaster\b"), "easter"),
+]
+
+
+def _month_number(token: str) -> Optional[int]:
+    return MONTH_ALIASES.get(token.lower().rstrip("."))
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _upcoming_year(month: int, day: int, today: date) -> int:
+    """Pick the year that makes a month/day the nearest date not in the past."""
+    candidate = _safe_date(today.year, month, day)
+    if candidate is not None and candidate < today:
+        return today.year + 1
+    return today.year
+
+
+def _month_range(year: int, month: int) -> tuple[date, date]:
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _clamp_to_today(start: date, end: date, today: date) -> tuple[date, date]:
+    """Drop the part of a period that is already over, keeping past periods intact."""
+    return (max(start, today), end) if end >= today else (start, end)
+
+
+def _make_range(start: date, end: date, expression: str) -> DateRange:
+    return {"start": start.isoformat(), "end": end.isoformat(), "expression": expression}
+
+
+def _resolve_weekday(name: str, qualifier: str, today: date) -> date:
+    """Resolve 'friday', 'this friday' or 'next friday' relative to today."""
+    target = WEEKDAYS[name]
+    if qualifier == "next":
+        # The named day in the following Monday-Sunday week
+        next_monday = today + timedelta(days=7 - today.weekday())
+        return next_monday + timedelta(days=target)
+    return today + timedelta(days=(target - today.weekday()) % 7)
+
+
+def _weekend(today: date, weeks_ahead: int = 0) -> tuple[date, date]:
+    """Saturday-Sunday of the current (or a following) weekend, never starting in the past."""
+    if today.weekday() == 6:
+        saturday = today - timedelta(days=1)
+    else:
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+    saturday += timedelta(weeks=weeks_ahead)
+    return max(saturday, today), saturday + timedelta(days=1)
+
+
+def _season_end(season: str, year: int) -> date:
+    if season == "winter":
+        return date(year, 2, calendar.monthrange(year, 2)[1])
+    end_month, end_day = SEASONS[season][1]
+    return date(year, end_month, end_day)
+
+
+def _parse_single_date(text: str, today: date) -> Optional[tuple[date, str]]:
+    """Find the first absolute calendar date in text (ISO, US or month-name form)."""
+    candidates: list[tuple[int, date, str]] = []
+
+    for match in _ISO_DATE.finditer(text):
+        parsed = _safe_date(int(match[1]), int(match[2]), int(match[3]))
+        if parsed:
+            candidates.append((match.start(), parsed, match[0]))
+    for match in _US_DATE.finditer(text):
+        parsed = _safe_date(int(match[3]), int(match[1]), int(match[2]))
+        if parsed:
+            candidates.append((match.start(), parsed, match[0]))
+    for match in _MONTH_DAY.finditer(text):
+        month = _month_number(match[1])
+        if month is None:
+            continue
+        day = int(match[2])
+        year = int(match[3]) if match[3] else _upcoming_year(month, day, today)
+        parsed = _safe_date(year, month, day)
+        if parsed:
+            candidates.append((match.start(), parsed, match[0]))
+    for match in _DAY_MONTH.finditer(text):
+        month = _month_number(match[2])
+        if month is None:
+            continue
+        day = int(match[1])
+        year = int(match[3]) if match[3] else _upcoming_year(month, day, today)
+        parsed = _safe_date(year, month, day)
+        if parsed:
+            candidates.append((match.start(), parsed, match[0]))
+
+    if not candidates:
+        return None
+    _, parsed, expression = min(candidates, key=lambda c: c[0])
+    return parsed, expression
+
+
+def _resolve_relative(text: str, today: date) -> Optional[tuple[date, date, str]]:
+    """Resolve relative expressions (weekend, weekdays, months, holidays...)."""
+    if match := re.search(r"\bday after tomorrow\b", text):
+        day = today + timedelta(days=2)
+        return day, day, match[0]
+    if match := re.search(r"\b(?:today|tonight|this evening)\b", text):
+        return today, today, match[0]
+    if match := re.search(r"\btomorrow(?:\s+night)?\b", text):
+        day = today + timedelta(days=1)
+        return day, day, match[0]
+
+    if match := re.search(r"\b(this|next|coming)?\s*weekend\b", text):
+        start, end = _weekend(today, weeks_ahead=1 if match[1] == "next" else 0)
+        return start, end, match[0].strip()
+
+    if match := _NEXT_N.search(text):
+        count = int(match[1]) * (7 if match[2] == "week" else 1)
+        return today, today + timedelta(days=count - 1), match[0]
+
+    if match := re.search(r"\b(this|next)\s+week\b", text):
+        monday = today - timedelta(days=today.weekday())
+        if match[1] == "next":
+            monday += timedelta(weeks=1)
+            return monday, monday + timedelta(days=6), match[0]
+        return today, monday + timedelta(days=6), match[0]
+
+    if match := re.search(rf"\b(?:(this|next|on)\s+)?({_WEEKDAY_RE})(?:\s+night)?\b", text):
+        day = _resolve_weekday(match[2], match[1] or "", today)
+        return day, day, match[0]
+
+    if match := re.search(r"\b(this|next)\s+month\b", text):
+        if match[1] == "this":
+            return today, _month_range(today.year, today.month)[1], match[0]
+        year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+        start, end = _month_range(year, month)
+        return start, end, match[0]
+
+    for pattern, name in HOLIDAY_PATTERNS:
+        if match := pattern.search(text):
+            holiday = _holiday(name, today.year)
+            if holiday is not None and holiday < today:
+                holiday = _holiday(name, today.year + 1)
+            if holiday is not None:
+                return holiday, holiday, match[0]
+
+    season_re = r"\b(?:(this|next)\s+)?(spring|summer|fall|autumn|winter)\b"
+    if match := re.search(season_re, text):
+        season = match[2]
+        year = today.year + (1 if match[1] == "next" else 0)
+        if season == "winter" and today.month <= 2 and match[1] != "next":
+            # January/February belong to the winter that started last December
+            year -= 1
+        if season == "winter":
+            start = date(year, 12, 1)
+            end = _season_end(season, year + 1)
+        else:
+            start_month, start_day = SEASONS[season][0]
+            start, end = date(year, start_month, start_day), _season_end(season, year)
+        if end < today:
+            start, end = start.replace(year=start.year + 1), _season_end(season, end.year + 1)
+        return (*_clamp_to_today(start, end, today), match[0])
+
+    month_re = rf"\b(?:(?:in|during|this|next)\s+)?({_MONTH_RE})\b(?:\s+(\d{{4}}))?"
+    for match in re.finditer(month_re, text):
+        named_month = _month_number(match[1])
+        # "may" is too ambiguous as a bare word without a year or preposition
+        if named_month is None or (match[1] == "may" and not match[2] and "in may" not in match[0]):
+            continue
+        if match[2]:
+            year = int(match[2])
+        else:
+            year = today.year if named_month >= today.month else today.year + 1
+        start, end = _month_range(year, named_month)
+        return (*_clamp_to_today(start, end, today), match[0].strip())
+
+    if match := re.search(r"\b(20\d{2})\b", text):
+        year = int(match[1])
+        if year >= today.year:
+            return max(date(year, 1, 1), today), date(year, 12, 31), match[0]
+
+    return None
+
+
+def resolve_date_range(text: str, today: date) -> Optional[DateRange]:
+    """
+    Resolve the date expression in a free-text query to a concrete range.
+
+    Handles explicit dates and spans ("Dec 20-22", "from 2024-12-20 to 2024-12-22"),
+    relative expressions (today, tonight, this/next weekend, weekday names,
+    this/next week and month, next N days), holidays, seasons, month names and years.
+    Returns None when the text contains no recognizable date expression.
+    """
+    lowered = text.lower()
+
+    if match := _MONTH_DAY_SPAN.search(lowered):
+        first_month = _month_number(match[1])
+        last_month = _month_number(match[3]) if match[3] else first_month
+        if first_month is not None and last_month is not None:
+            first_day, last_day = int(match[2]), int(match[4])
+            # A span that wraps into January ends in the following year
+            wraps = last_month < first_month
+            if match[5]:
+                year = int(match[5]) - (1 if wraps else 0)
+            else:
+                year = _upcoming_year(first_month, first_day, today)
+            span_start = _safe_date(year, first_month, first_day)
+            span_end = _safe_date(year + (1 if wraps else 0), last_month, last_day)
+            if span_start and span_end and span_start <= span_end:
+                return _make_range(span_start, span_end, match[0])
+
+    span = re.search(r"\b(?:from|between)\s+(.+?)\s+(?:to|and|until|through|-)\s+(.+)", lowered)
+    if span:
+        first = _parse_single_date(span[1], today) or _relative_as_date(span[1], today)
+        last = _parse_single_date(span[2], today) or _relative_as_date(span[2], today)
+        if first and last and first[0] <= last[0]:
+            return _make_range(first[0], last[0], span[0].strip())
+
+    single = _parse_single_date(lowered, today)
+    if single:
+        return _make_range(single[0], single[0], single[1])
+
+    relative = _resolve_relative(lowered, today)
+    if relative:
+        return _make_range(*relative)
+    return None
+
+
+def _relative_as_date(text: str, today: date) -> Optional[tuple[date, str]]:
+    resolved = _resolve_relative(text, today)
+    return (resolved[0], resolved[2]) if resolved else None
+
+
+def parse_reference_date(current_date: str) -> date:
+    """Parse the YYYY-MM-DD grounding date from state, falling back to today."""
+    try:
+        return datetime.strptime(current_date[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return date.today()
+
+
+def normalize_event_date(
+    text: str, today: date, date_range: Optional[DateRange] = None
+) -> Optional[str]:
+    """
+    Normalize a free-form event date ("Friday, 8:00 PM", "Dec 25", "2024-12-25T19:30")
+    to a sortable "YYYY-MM-DD" or "YYYY-MM-DD HH:MM" string.
+
+    Relative expressions are resolved against the start of the query's date
+    range when available, so "Saturday" lands inside the requested weekend.
+    Times with am/pm are preferred; a lone ambiguous "7:30" leaves the date
+    without a time. Returns None when no date can be recognized.
+    """
+    lowered = text.lower()
+    anchor = today
+    if date_range:
+        anchor = parse_reference_date(date_range["start"])
+
+    single = _parse_single_date(lowered, anchor)
+    if single:
+        day = single[0]
+    else:
+        relative = _resolve_relative(lowered, anchor)
+        if relative is None:
+            return None
+        day = relative[0]
+
+    # Ignore digits that belong to the date itself (and the ISO "T" separator)
+    without_date = re.sub(r"\bt(?=\d)", " ", _ISO_DATE.sub(" ", lowered))
+    # A time with am/pm wins over a bare "7:30" ("Doors 7:30, show 9pm")
+    time_matches = list(_TIME.finditer(without_date))
+    time_match = next((m for m in time_matches if m[3] is not None), None)
+    if time_match is None and time_matches:
+        time_match = time_matches[0]
+        # A bare H:MM before noon ("7:30") may be am or pm; "07:30" and "19:30" are not
+        if 1 <= int(time_match[4]) <= 11 and not time_match[4].startswith("0"):
+            return day.isoformat()
+    if time_match is None:
+        return day.isoformat()
+
+    if time_match[4] is not None:
+        hour, minute = int(time_match[4]), int(time_match[5])
+    else:
+        hour, minute = int(time_match[1]) % 12, int(time_match[2] or 0)
+        if time_match[3] == "p":
+            hour += 12
+    if hour > 23 or minute > 59:
+        return day.isoformat()
+    return f"{day.isoformat()} {hour:02d}:{minute:02d}"
+
+
+def date_spans(text: str) -> list[tuple[int, int]]:
+    """
+    Character spans of date and time expressions in text (absolute dates,
+    weekday names and clock times), e.g. to cut them out of a title.
+    Matching is case-insensitive; spans refer to the original text.
+    """
+    lowered = text.lower()
+    spans: list[tuple[int, int]] = []
+    for pattern in (
+        _MONTH_DAY_SPAN,
+        _ISO_DATE,
+        _US_DATE,
+        _MONTH_DAY,
+        _DAY_MONTH,
+        _WEEKDAY_DATE,
+        _TIME,
+    ):
+        spans.extend(match.span() for match in pattern.finditer(lowered))
+    return sorted(spans)
+
+
+def has_absolute_date(text: str) -> bool:
+    """True if text names a calendar date (ISO, US or month-name form), not just a weekday."""
+    lowered = text.lower()
+    return any(p.search(lowered) for p in (_ISO_DATE, _US_DATE, _MONTH_DAY, _DAY_MONTH))
@@ -0,0 +1,119 @@
+"""
+Local filtering, sorting and cursor pagination of a search's events.
+
+The extractor normalizes Event.date to "YYYY-MM-DD" or "YYYY-MM-DD HH:MM"
+whenever it can parse it, so dates compare as datetimes here without another
+parse of free-form text; events whose date stayed free-form fail date filters
+and sort after the dated ones. Filters run over the events of a response
+(cached or fresh) as dicts, and a page of the result is addressed by an
+opaque cursor holding the search_id, the offset of the next page and a
+signature of the filters it was issued for.
+
+Usage:
+    from backend.app.utils.eventFilters import EventQuery, decode_cursor, encode_cursor, page
+    event_query = EventQuery(date_from=date(2024, 12, 21), min_score=0.5, sort_by="date")
+    events = event_query.apply(response["events"])
+    items, next_offset = page(events, offset=0, limit=20)
+    cursor = encode_cursor(search_id, next_offset, event_query)
+    decode_cursor(cursor, event_query)  # (search_id, next_offset)
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Optional
+
+SORT_FIELDS = ("date", "score")
+
+
+def event_datetime(value: Optional[str]) -> Optional[datetime]:
+    """A normalized event date ("2024-12-21" or "2024-12-21 20:00") as a datetime, else None."""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """Filters and sort order applied to the events of a search."""
+
+    date_from: Optional[date] = None  # Inclusive
+    date_to: Optional[date] = None  # Inclusive
+    min_score: Optional[float] = None
+    location: Optional[str] = None  # Case-insensitive substring of Event.location
+    sort_by: Optional[str] = None  # "date" (earliest first), "score" (highest first) or relevance
+
+    def __post_init__(self):
+        if self.sort_by is not None and self.sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of {SORT_FIELDS}, got {self.sort_by!r}")
+
+    def signature(self) -> str:
+        """Short stable hash of the filters, so a cursor is only valid for them."""
+        payload = json.dumps(asdict(self), default=str, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+    def _matches(self, event: dict) -> bool:
+        if self.date_from or self.date_to:
+            starts_at = event_datetime(event.get("date"))
+            if starts_at is None:
+                return False
+            if self.date_from and starts_at.date() < self.date_from:
+                return False
+            if self.date_to and starts_at.date() > self.date_to:
+                return False
+        if self.min_score is not None:
+            score = event.get("score")
+            if score is None or score < self.min_score:
+                return False
+        if self.location:
+            return self.location.lower() in (event.get("location") or "").lower()
+        return True
+
+    def apply(self, events: list[dict]) -> list[dict]:
+        """Matching events in the requested order; ties keep the relevance order."""
+        matching = [event for event in events if self._matches(event)]
+        if self.sort_by == "date":
+            # Undated events last
+            matching.sort(key=lambda e: event_datetime(e.get("date")) or datetime.max)
+        elif self.sort_by == "score":
+            matching.sort(key=lambda e: -e["score"] if e.get("score") is not None else float("inf"))
+        return matching
+
+
+def page(events: list[dict], offset: int, limit: Optional[int]) -> tuple[list[dict], Optional[int]]:
+    """Events of one page and the offset of the next page (None on the last page)."""
+    if limit is None:
+        return events[offset:], None
+    end = offset + limit
+    return events[offset:end], end if end < len(events) else None
+
+
+def encode_cursor(search_id: str, offset: int, event_query: EventQuery) -> str:
+    payload = json.dumps({"s": search_id, "o": offset, "f": event_query.signature()})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, event_query: EventQuery) -> tuple[str, int]:
+    """
+    (search_id, offset) of a cursor. Raises ValueError when the cursor is
+    malformed or was issued for other filters.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        search_id, offset, signature = payload["s"], int(payload["o"]), payload["f"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError("Malformed cursor") from e
+    if signature != event_query.signature():
+        raise ValueError("Cursor was issued for different filters or sort order")
+    if offset < 0:
+        raise ValueError("Malformed cursor")
+    return search_id, offset
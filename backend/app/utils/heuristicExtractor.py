@@ -0,0 +1,224 @@
+"""
+Rule-based event extraction from Tavily snippets, without an LLM.
+
+Two uses in the extractor:
+- Pre-filter: event_signals() looks for dates, venues, prices and event
+  keywords, so snippets without any of them are dropped before they are
+  added to the extraction prompt.
+- Fallback: extract_events() turns snippet lines that name a calendar date
+  into Events (title, date, venue) when the LLM call fails, instead of
+  returning nothing and paying for another search/extract cycle.
+
+Both are measured against hand-labeled snippets in
+benchmarks/fixtures/extraction_snippets.json (see bench_heuristic_extractor).
+
+Usage:
+    from backend.app.utils.heuristicExtractor import event_signals, extract_events
+    event_signals(snippet)  # {"date", "venue", "keyword"}
+    extract_events(snippets, "2024-12-20")  # [Event(...), ...]
+"""
+
+import re
+from typing import Optional
+
+from backend.app.models.schemas import DateRange, Event
+from backend.app.utils.dateResolver import (
+    date_spans,
+    has_absolute_date,
+    normalize_event_date,
+    parse_reference_date,
+)
+from backend.app.utils.queryParser import CATEGORY_KEYWORDS
+
+# Heuristic events rank below LLM-extracted duplicates (merge keeps the higher score)
+SCORE_FACTOR = 0.5
+
+_EVENT_WORDS = ["event", "show", "tickets", "live", "performance", "tour", "lineup", "doors"]
+_KEYWORDS = sorted(
+    {word for words in CATEGORY_KEYWORDS.values() for word in words} | set(_EVENT_WORDS),
+    key=len,
+    reverse=True,
+)
+_KEYWORD = re.compile(r"\b(?:" + "|".join(map(re.escape, _KEYWORDS)) + r")s?\b", re.IGNORECASE)
+_RELATIVE_DATE = re.compile(r"\b(?:tonight|today|tomorrow|this weekend|next weekend)\b", re.I)
+_PRICE = re.compile(r"\$\s?\d+|\bfree (?:admission|entry)\b|\badmission\b", re.IGNORECASE)
+
+_VENUE_NOUNS = (
+    "Theater|Theatre|Hall|Arena|Center|Centre|Club|Park|Stadium|Museum|Gallery|Bar|Lounge|"
+    "Ballroom|Auditorium|Pavilion|Amphitheater|Cafe|Brewery|Church|Gardens?|Field|Square|"
+    "Room|House|Factory|Cellar|Tavern|Pier|Library|Garage|Warehouse"
+)
+_CAPITALIZED = r"[A-Z][\w'&-]*"
+_VENUE_AT = re.compile(
+    rf"(?:\bat|@)[ \t]+((?:[Tt]he[ \t]+)?{_CAPITALIZED}(?:[ \t]+(?:{_CAPITALIZED}|of|the|&))*)"
+)
+_VENUE_NOUN = re.compile(rf"\b((?:{_CAPITALIZED}[ \t]+){{1,4}}(?:{_VENUE_NOUNS}))\b")
+_TRAILING_CONNECTORS = re.compile(r"(?:\s+(?:of|the|&))+$")
+
+# Sentence ends, but not after "vs." or "St."
+_SENTENCE_END = re.compile(r"(?<=[.!?])(?<!\bvs\.)(?<!\bSt\.)\s+(?=[A-Z])")
+_SEGMENT_SPLIT = re.compile(rf"\n+|\s[|•·]\s|{_SENTENCE_END.pattern}")
+_TITLE_SPLIT = re.compile(r"[|•·;,()\[\]!?]|\s[-–—]\s")
+# Lowercase words allowed inside a title ("Devil in a Woodpile", "Bulls vs. Celtics")
+_TITLE_CONNECTORS = {"of", "the", "and", "&", "with", "in", "a", "an", "for", "vs", "vs.", "de"}
+_GENERIC_TITLE_WORDS = {
+    "am", "pm", "buy", "get", "tickets", "ticket", "doors", "free", "on", "sale", "now",
+    "from", "the", "and", "at", "every", "more", "info", "details", "upcoming", "events",
+    "performances", "performance", "shows", "show", "open", "runs",
+}  # fmt: skip
+_SITE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]+$")
+
+
+def _snippet_text(snippet: dict) -> str:
+    return f"{snippet.get('title', '')}\n{snippet.get('content', '')}"
+
+
+def find_venue(text: str) -> Optional[str]:
+    """Venue named in text ("at The Hideout", "Thalia Hall"), ignoring dates and times."""
+    masked = _mask(text, date_spans(text))
+    match = _VENUE_AT.search(masked) or _VENUE_NOUN.search(masked)
+    if match is None:
+        return None
+    venue = _TRAILING_CONNECTORS.sub("", match[1].strip(" .&-"))
+    return venue or None
+
+
+def split_sentences(line: str) -> list[str]:
+    """Sentences of a line of text."""
+    return [sentence.strip() for sentence in _SENTENCE_END.split(line) if sentence.strip()]
+
+
+def mentions_date_or_venue(text: str) -> bool:
+    """True if text names a date, weekday, time, "tonight" or a venue."""
+    return bool(date_spans(text) or _RELATIVE_DATE.search(text) or find_venue(text))
+
+
+def event_signals(snippet: dict) -> set[str]:
+    """
+    Event signals found in a snippet's title and content: "date" (calendar
+    date, weekday, time or "tonight"), "venue", "price" and "keyword"
+    (event words such as concert, comedy, tickets).
+    """
+    text = _snippet_text(snippet)
+    signals = set()
+    if date_spans(text) or _RELATIVE_DATE.search(text):
+        signals.add("date")
+    if find_venue(text):
+        signals.add("venue")
+    if _PRICE.search(text):
+        signals.add("price")
+    if _KEYWORD.search(text):
+        signals.add("keyword")
+    return signals
+
+
+def has_event_signals(snippet: dict, min_signals: int = 1) -> bool:
+    """True if the snippet shows at least min_signals kinds of event signals."""
+    return len(event_signals(snippet)) >= min_signals
+
+
+def _mask(text: str, spans: list[tuple[int, int]]) -> str:
+    """Replace the given spans with a title separator."""
+    for start, end in sorted(spans, reverse=True):
+        text = f"{text[:start]} | {text[end:]}"
+    return text
+
+
+def _merge_spans(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _segments(snippet: dict) -> list[str]:
+    """Snippet title and the lines/sentences of its content."""
+    content = snippet.get("content", "") or ""
+    parts = [snippet.get("title", "") or "", *_SEGMENT_SPLIT.split(content)]
+    return [part.strip() for part in parts if part and part.strip()]
+
+
+def _title_run(chunk: str) -> str:
+    """Longest run of capitalized words (and connectors between them) in a chunk."""
+    best: list[str] = []
+    run: list[str] = []
+    for word in [*chunk.split(), ""]:
+        if word[:1].isupper() or word[:1].isdigit():
+            run.append(word)
+            continue
+        if word.lower() in _TITLE_CONNECTORS and run:
+            run.append(word)
+            continue
+        while run and run[-1].lower() in _TITLE_CONNECTORS:
+            run.pop()
+        if len(run) > len(best):
+            best = run
+        run = []
+    return " ".join(best).strip(" .:-–—'\"")
+
+
+def _is_title(text: str) -> bool:
+    words = re.findall(r"[A-Za-z0-9']+", text)
+    return len(text) >= 3 and any(word.lower() not in _GENERIC_TITLE_WORDS for word in words)
+
+
+def _title(segment: str, venue: Optional[str], fallback: str) -> str:
+    """
+    Longest capitalized phrase left after removing dates, times, venue and
+    prices, or the snippet title (without a " - Site Name" suffix).
+    """
+    spans = date_spans(segment)
+    if venue:
+        spans += [m.span() for m in re.finditer(rf"(?:\bat|@)?\s*{re.escape(venue)}", segment)]
+    spans += [match.span() for match in _PRICE.finditer(segment)]
+    masked = _mask(segment, _merge_spans(spans))
+
+    for chunk in _TITLE_SPLIT.split(masked):
+        title = _title_run(chunk)
+        if _is_title(title):
+            return title
+    return _SITE_SUFFIX.sub("", fallback).strip()
+
+
+def extract_events(
+    snippets: list[dict], current_date: str, date_range: Optional[DateRange] = None
+) -> list[Event]:
+    """
+    Build Events from snippet lines that name a calendar date.
+
+    Dates are normalized like LLM output; past dates and dates outside the
+    query's date range are dropped, as are duplicate (title, date) pairs.
+    """
+    today = parse_reference_date(current_date)
+    events: dict[tuple[str, str], Event] = {}
+
+    for snippet in snippets:
+        snippet_venue = find_venue(_snippet_text(snippet))
+        for segment in _segments(snippet):
+            if not has_absolute_date(segment):
+                continue
+            resolved = normalize_event_date(segment, today, date_range)
+            if resolved is None or resolved[:10] < today.isoformat():
+                continue
+            if date_range and not date_range["start"] <= resolved[:10] <= date_range["end"]:
+                continue
+
+            venue = find_venue(segment)
+            title = _title(segment, venue, snippet.get("title", ""))
+            if not title:
+                continue
+            key = (title.lower(), resolved)
+            if key in events:
+                continue
+            events[key] = Event(
+                title=title,
+                date=resolved,
+                location=venue or snippet_venue or "",
+                description=segment[:200],
+                url=snippet.get("url", ""),
+                score=round((snippet.get("score") or 0) * SCORE_FACTOR, 3),
+            )
+    return list(events.values())
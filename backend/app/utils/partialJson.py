@@ -0,0 +1,85 @@
+"""
+Incremental parser for objects inside a streamed JSON array.
+
+Streaming LLM output arrives as arbitrary text fragments of a document like
+{"events": [{...}, {...}]}. ArrayObjectParser tracks string/escape state and
+nesting depth across fragments, and returns each object of the first array in
+the document as soon as its closing brace arrives, long before the document
+is complete.
+
+Usage:
+    from backend.app.utils.partialJson import ArrayObjectParser
+    parser = ArrayObjectParser()
+    for fragment in stream:
+        for obj in parser.feed(fragment):
+            handle(obj)
+"""
+
+import json
+from typing import Optional
+
+
+class ArrayObjectParser:
+    """Yields the elements of the first JSON array that are objects, one by one."""
+
+    def __init__(self):
+        self._buffer: list[str] = []  # text of the element being read
+        self._stack: list[str] = []  # open containers: "{" or "["
+        self._array_depth: Optional[int] = None  # stack depth inside the target array
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+
+    def feed(self, text: str) -> list[dict]:
+        """Consume a fragment and return the objects completed by it."""
+        completed = []
+        for char in text:
+            if self._done:
+                break
+            capturing = self._array_depth is not None and len(self._stack) > self._array_depth
+
+            if self._in_string:
+                if capturing:
+                    self._buffer.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+                if self._array_depth is None and char == "[":
+                    self._array_depth = len(self._stack)
+                    continue
+                capturing = self._array_depth is not None and len(self._stack) > self._array_depth
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if self._array_depth is not None and len(self._stack) == self._array_depth:
+                    self._buffer.append(char)
+                    element = self._parse_element()
+                    if element is not None:
+                        completed.append(element)
+                    continue
+                if self._array_depth is not None and len(self._stack) < self._array_depth:
+                    self._done = True  # the target array is closed
+                    continue
+
+            if capturing:
+                self._buffer.append(char)
+        return completed
+
+    def _parse_element(self):
+        text = "".join(self._buffer)
+        self._buffer = []
+        try:
+            element = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return element if isinstance(element, dict) else None
@@ -0,0 +1,73 @@
+"""
+Local query vectorizer: hashed word and character n-gram features.
+
+No model or network call is needed: each word contributes a feature for the
+word itself plus its character 3- and 4-grams, hashed into a fixed number of
+dimensions (signed hashing keeps collisions unbiased). Filler words and date
+words are dropped, since the semantic cache scopes entries by resolved date
+range separately. The result is L2-normalized, so a dot product is the cosine
+similarity.
+
+Usage:
+    from backend.app.utils.queryEmbedder import embed_query
+    similarity = float(embed_query("standup comedy chicago") @ embed_query("comedy shows in Chicago"))
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+# Words that do not change what the user is looking for
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "in", "at", "on", "for", "of", "to", "and", "or", "with", "near",
+    "around", "me", "find", "show", "shows", "event", "events", "things", "thing", "do",
+    "what", "whats", "are", "is", "any", "some", "best", "good", "happening", "upcoming",
+    "fun", "please", "list",
+})  # fmt: skip
+
+# Date words are covered by the date-range scope of the cache
+_DATE_WORDS = frozenset({
+    "this", "next", "coming", "weekend", "week", "tonight", "today", "tomorrow", "month",
+    "year", "day", "days", "night", "evening", "morning", "afternoon", "january",
+    "february", "march", "april", "may", "june", "july", "august", "september", "october",
+    "november", "december", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday",
+    "sunday",
+})  # fmt: skip
+
+_WORD_WEIGHT = 1.0
+_NGRAM_WEIGHT = 0.5
+_NGRAM_SIZES = (3, 4)
+
+
+def query_terms(text: str) -> list[str]:
+    """Content words of a query ("Stand-up comedy in Chicago" -> ["standup", "comedy", "chicago"])."""
+    text = re.sub(r"\bstand[\s-]up\b", "standup", text.lower())
+    return [
+        word
+        for word in re.findall(r"[a-z0-9]+", text)
+        if word not in _FILLER_WORDS and word not in _DATE_WORDS and not word.isdigit()
+    ]
+
+
+def _add_feature(vector: np.ndarray, feature: str, weight: float) -> None:
+    hashed = zlib.crc32(feature.encode())
+    sign = -1.0 if hashed & 0x80000000 else 1.0
+    vector[hashed % vector.shape[0]] += sign * weight
+
+
+def embed_query(text: str, dim: int = 512) -> np.ndarray:
+    """Return an L2-normalized float32 vector of length dim (all zeros for an empty query)."""
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in query_terms(text):
+        _add_feature(vector, f"w:{word}", _WORD_WEIGHT)
+        padded = f"<{word}>"
+        for size in _NGRAM_SIZES:
+            for i in range(len(padded) - size + 1):
+                _add_feature(vector, padded[i : i + size], _NGRAM_WEIGHT)
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
@@ -0,0 +1,187 @@
+"""
+Lightweight, rule-based parsing of event queries and event locations.
+
+Extracts the city and event category from a free-text query so results can be
+indexed and looked up by (city, category, date range) without an LLM call.
+"""
+
+import re
+from typing import Optional
+
+from backend.app.utils.queryEmbedder import query_terms
+
+# Checked in order: specific categories win over the generic "festival"
+CATEGORY_KEYWORDS = {
+    "comedy": ["comedy", "stand-up", "standup", "stand up", "improv", "comedian"],
+    "food": ["food", "wine", "beer", "brewery", "culinary", "tasting", "restaurant"],
+    "music": [
+        "concert",
+        "music",
+        "gig",
+        "jazz",
+        "rock",
+        "band",
+        "dj",
+        "edm",
+        "techno",
+        "hip hop",
+        "orchestra",
+        "symphony",
+        "opera",
+    ],
+    "theater": ["theater", "theatre", "broadway", "musical", "play", "ballet", "dance"],
+    "sports": ["game", "match", "sports", "marathon", "race", "nba", "nfl", "mlb", "soccer"],
+    "art": ["art", "exhibition", "exhibit", "gallery", "museum"],
+    "film": ["film", "movie", "cinema", "screening"],
+    "conference": ["conference", "summit", "expo", "convention", "meetup", "workshop"],
+    "family": ["kids", "family", "children"],
+    "nightlife": ["party", "club", "nightlife", "bar crawl"],
+    "festival": ["festival", "fest", "fair", "carnival", "parade"],
+}
+
+# Words that end a city name in a lowercase query ("in chicago this weekend")
+_STOP_WORDS = {
+    "this",
+    "next",
+    "on",
+    "at",
+    "for",
+    "during",
+    "tonight",
+    "today",
+    "tomorrow",
+    "from",
+    "between",
+    "in",
+    "near",
+    "and",
+    "or",
+    "with",
+    "the",
+    "weekend",
+    "week",
+    "month",
+    "area",
+}
+
+_US_STATES = {
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "fl", "ga", "hi", "id", "il", "in", "ia",
+    "ks", "ky", "la", "me", "md", "ma", "mi", "mn", "ms", "mo", "mt", "ne", "nv", "nh", "nj",
+    "nm", "ny", "nc", "nd", "oh", "ok", "or", "pa", "ri", "sc", "sd", "tn", "tx", "ut", "vt",
+    "va", "wa", "wv", "wi", "wy", "dc",
+}  # fmt: skip
+_COUNTRIES = {"usa", "us", "united states", "uk", "united kingdom", "canada", "australia"}
+
+_CAPITALIZED_PLACE = re.compile(r"\b(?:in|near|around)\s+((?:[A-Z][\w.'-]*)(?:\s+[A-Z][\w.'-]*)*)")
+_LOWERCASE_PLACE = re.compile(r"\b(?:in|near|around)\s+([a-z][\w.'-]*(?:\s+[a-z][\w.'-]*){0,2})")
+# "austin and dallas", "chicago, evanston": the next place of a list of cities
+_CITY_LIST_CONTINUATION = re.compile(r"^\s*(?:,|&|\band\b|\bor\b)\s*(?:in\s+)?", re.IGNORECASE)
+_DATE_WORDS = re.compile(
+    r"^(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|mon|tue|wed|thu|fri|sat|sun)",
+    re.IGNORECASE,
+)
+# Whole month and weekday names, which end a lowercase place ("in december")
+_DATE_NAMES = re.compile(
+    r"(?:jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec|january|february|march|april|may|"
+    r"june|july|august|september|october|november|december|(?:mon|tues|wednes|thurs|fri|"
+    r"satur|sun)day)"
+)
+
+
+def normalize_city(city: str) -> str:
+    """Canonical form used as an index key ('New York' -> 'new york')."""
+    return re.sub(r"\s+", " ", city.strip().lower().rstrip(".,"))
+
+
+def extract_city(query: str) -> Optional[str]:
+    """
+    Find the city in a query ("comedy shows in Chicago this weekend" -> "chicago").
+    Returns None when no location phrase is found.
+    """
+    for match in _CAPITALIZED_PLACE.finditer(query):
+        words = []
+        for word in match[1].split():
+            if word.lower() in _STOP_WORDS or _DATE_WORDS.match(word):
+                break
+            words.append(word)
+        if words:
+            return normalize_city(" ".join(words))
+
+    lowercase_match = _LOWERCASE_PLACE.search(query.lower())
+    if lowercase_match:
+        words = []
+        for word in lowercase_match[1].split():
+            if word in _STOP_WORDS or word.isdigit() or _DATE_NAMES.fullmatch(word):
+                break
+            words.append(word)
+        if words:
+            return normalize_city(" ".join(words))
+    return None
+
+
+def extract_cities(query: str) -> list[str]:
+    """
+    Every city named in a query, in order ("food festivals in Austin and Dallas"
+    -> ["austin", "dallas"]). Only the first one is returned by extract_city.
+    """
+    cities: list[str] = []
+    remaining = query
+    while (city := extract_city(remaining)) is not None:
+        if city not in cities:
+            cities.append(city)
+        position = remaining.lower().find(city)
+        if position < 0:
+            break
+        remaining = remaining[position + len(city) :]
+        remaining = _CITY_LIST_CONTINUATION.sub(" in ", remaining, count=1)
+    return cities
+
+
+def _singular(word: str) -> str:
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def content_terms(query: str) -> list[str]:
+    """
+    Sorted, singular content words of a query other than its cities
+    ("Jazz concerts in Chicago this weekend" -> ["concert", "jazz"]). Two
+    queries with the same terms, cities and dates ask for the same events.
+    """
+    city_words = {word for city in extract_cities(query) for word in city.split()}
+    return sorted({_singular(word) for word in query_terms(query) if word not in city_words})
+
+
+def extract_category(query: str) -> Optional[str]:
+    """Map a query to one of CATEGORY_KEYWORDS' categories, or None."""
+    lowered = query.lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(re.search(rf"\b{re.escape(keyword)}s?\b", lowered) for keyword in keywords):
+            return category
+    return None
+
+
+def city_from_location(location: str, hint: Optional[str] = None) -> Optional[str]:
+    """
+    Derive the city from an event location ("Laugh Factory, Chicago, IL" -> "chicago").
+    When the query's city (hint) appears in the location, it is used directly.
+    Returns None when the location names no city ("Online", "Laugh Factory"):
+    the event may be in another city than the query's.
+    """
+    lowered = location.lower()
+    if hint and hint in lowered:
+        return hint
+
+    parts = [part.strip() for part in lowered.split(",") if part.strip()]
+    candidates = [
+        part
+        for part in parts
+        if part not in _US_STATES
+        and part not in _COUNTRIES
+        and not re.fullmatch(r"[a-z]{2}\s*\d{5}|\d{5}(-\d{4})?", part)
+        and not re.match(r"^\d", part)
+    ]
+    if len(candidates) >= 2:
+        return normalize_city(candidates[-1])
+    return None
@@ -0,0 +1,418 @@
+"""
+Planning of follow-up queries in a refinement session.
+
+Users narrow a search step by step: "comedy in Chicago this weekend" ->
+"only Saturday" -> "near Wicker Park". plan_refinement() merges a follow-up
+into the session's current constraints (date range, time of day, price,
+city, category and narrowing terms) and decides how to answer it:
+- "local": the constraints stay within what the session's last search
+  covered (same city and category, dates inside the searched range), so
+  answer_locally() filters and re-ranks the session's events, and falls back
+  to rule-based extraction over its raw snippets, without LLM or Tavily calls;
+- "search": the follow-up asks for something the last search did not cover
+  (another city or category, dates outside the searched range) and the
+  composed standalone query is searched. A search for the same city and
+  category (same_intent) extends the session's results instead of replacing
+  them, and covered_range() grows the searched dates;
+- "unsupported": the follow-up ranks by something events carry no data for
+  ("closer", "bigger"); nothing is searched and the reason says so.
+Comparatives with data behind them are filters: "earlier"/"later" are times
+of day, "cheaper" keeps the events priced at or below the median listed price.
+
+Usage:
+    from backend.app.utils.refinement import answer_locally, plan_refinement
+    plan = plan_refinement("only Saturday", current, covered, today)
+    plan.mode, plan.query  # "local", "comedy in Chicago on December 21"
+    events = answer_locally(plan, session_events, raw_results, "2024-12-20")
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Optional
+
+from backend.app.models.schemas import DateRange, Event
+from backend.app.utils.dateResolver import WEEKDAYS, parse_reference_date, resolve_date_range
+from backend.app.utils.heuristicExtractor import extract_events
+from backend.app.utils.queryParser import CATEGORY_KEYWORDS, extract_category, extract_city
+from backend.app.utils.reranker import rerank
+
+# Words of a follow-up that carry no constraint ("what about only saturday")
+_FILLER = {
+    "a", "about", "also", "an", "and", "any", "anything", "are", "around", "at", "but", "can",
+    "do", "event", "events", "for", "how", "i", "in", "instead", "is", "just", "me", "near",
+    "of", "on", "ones", "only", "or", "please", "show", "some", "something", "that", "the",
+    "then", "there", "things", "this", "those", "to", "what", "with", "you", "shows",
+}  # fmt: skip
+# Comparatives that add nothing to match ("something else"); not matched as literal text
+_COMPARATIVES = {"different", "else", "fewer", "less", "more", "other", "others"}
+# Comparatives that rank by data events do not have (distance, size, age)
+_UNSUPPORTED_COMPARATIVES = {
+    "bigger", "biggest", "closer", "closest", "nearer", "nearest", "newer", "newest",
+    "smaller", "smallest",
+}  # fmt: skip
+# Words asking for the cheaper end of the listed prices
+_PRICE_WORDS = {"affordable", "budget", "cheap", "cheaper", "cheapest", "inexpensive"}
+# Hours [start, end) of a time-of-day word; "later shows" means late ones
+_TIME_OF_DAY = {
+    "morning": (5, 12),
+    "afternoon": (12, 17),
+    "evening": (17, 24),
+    "night": (18, 24),
+    "late": (21, 24),
+    "later": (21, 24),
+    "early": (0, 19),
+    "earlier": (0, 19),
+}
+_WORD = re.compile(r"[a-z0-9$']+")
+_NEAR_PLACE = re.compile(r"\b(?:near|around|close to|closer to|nearer to)\s+(.+)$", re.IGNORECASE)
+_PRICE = re.compile(r"\$\s?(\d+(?:\.\d{2})?)|\b(free)\b", re.IGNORECASE)
+_CATEGORY_WORDS = {keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords}
+
+
+@dataclass
+class Constraints:
+    """What a session currently asks for."""
+
+    base_query: str  # Standalone query with the current dates, city and category
+    date_range: Optional[DateRange] = None
+    time_of_day: Optional[str] = None  # A _TIME_OF_DAY word ("evening")
+    cheaper: bool = False  # Only the cheaper half of the priced events
+    city: Optional[str] = None
+    category: Optional[str] = None
+    places: list[str] = field(default_factory=list)  # Narrowing places ("Wicker Park")
+    keywords: list[str] = field(default_factory=list)  # Narrowing words ("free")
+
+    @property
+    def terms(self) -> list[str]:
+        """Lowercase phrases a matching event must mention."""
+        return [term.lower() for term in (*self.places, *self.keywords)]
+
+    @property
+    def query(self) -> str:
+        """Standalone query with every narrowing term."""
+        parts = [self.base_query, *(f"near {place}" for place in self.places), *self.keywords]
+        if self.time_of_day and self.time_of_day not in self.base_query.lower():
+            parts.append(self.time_of_day)
+        if self.cheaper and "cheap" not in self.base_query.lower():
+            parts.append("cheap")
+        return " ".join(parts)
+
+    def copy(self) -> "Constraints":
+        return replace(self, places=list(self.places), keywords=list(self.keywords))
+
+
+@dataclass
+class RefinementPlan:
+    mode: str  # "local", "search" or "unsupported"
+    constraints: Constraints  # Merged constraints of the follow-up
+    reason: str  # Why a search is needed, or what was narrowed
+
+    @property
+    def query(self) -> str:
+        return self.constraints.query
+
+
+def category_keyword(text: str) -> Optional[tuple[str, str]]:
+    """(category, keyword) of the first CATEGORY_KEYWORDS keyword in text, or None."""
+    lowered = text.lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            if re.search(rf"\b{re.escape(keyword)}s?\b", lowered):
+                return category, keyword
+    return None
+
+
+def _weekday_in_range(expression: str, date_range: DateRange) -> Optional[date]:
+    """The day named by a bare weekday expression ("saturday") inside a date range."""
+    match = re.fullmatch(r"(?:on\s+|this\s+)?(\w+day)(?:\s+night)?", expression.strip())
+    if not match or match[1] not in WEEKDAYS:
+        return None
+    day = parse_reference_date(date_range["start"])
+    end = parse_reference_date(date_range["end"])
+    while day <= end:
+        if day.weekday() == WEEKDAYS[match[1]]:
+            return day
+        day += timedelta(days=1)
+    return None
+
+
+def constraints_from_query(query: str, today: date) -> Constraints:
+    """Constraints of a standalone query (the first query of a session)."""
+    return Constraints(
+        base_query=query,
+        date_range=resolve_date_range(query, today),
+        city=extract_city(query),
+        category=extract_category(query),
+    )
+
+
+def anchor_weekday(resolved: DateRange, searched: Optional[DateRange]) -> DateRange:
+    """
+    A bare weekday ("only Saturday") means that day within the searched range
+    when the range contains it, not the next one after today.
+    """
+    day = _weekday_in_range(resolved["expression"], searched) if searched else None
+    if day is None:
+        return resolved
+    return {
+        "start": day.isoformat(),
+        "end": day.isoformat(),
+        "expression": f"on {day:%B} {day.day}",
+    }
+
+
+def _within(inner: Optional[DateRange], outer: Optional[DateRange]) -> bool:
+    if inner is None:
+        return True
+    if outer is None:
+        return False
+    return outer["start"] <= inner["start"] and inner["end"] <= outer["end"]
+
+
+def same_intent(a: Constraints, b: Constraints) -> bool:
+    """Same city and category: a search for a extends the results of b."""
+    return a.city == b.city and a.category == b.category
+
+
+def covered_range(
+    covered: Optional[DateRange], searched: Optional[DateRange]
+) -> Optional[DateRange]:
+    """
+    Dates covered after searching `searched` on top of `covered`: both ranges
+    when they overlap or touch, else only the searched one.
+    """
+    if covered is None or searched is None:
+        return searched
+    day = timedelta(days=1)
+    start, end = parse_reference_date(covered["start"]), parse_reference_date(covered["end"])
+    new_start, new_end = (
+        parse_reference_date(searched["start"]),
+        parse_reference_date(searched["end"]),
+    )
+    if new_start > end + day or start > new_end + day:
+        return searched
+    start, end = min(start, new_start), max(end, new_end)
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "expression": f"{covered['expression']} and {searched['expression']}",
+    }
+
+
+def _replace(text: str, old: str, new: str) -> str:
+    """Replace old (case-insensitive) in text, or append new if old does not occur."""
+    if old and re.search(re.escape(old), text, re.IGNORECASE):
+        return re.sub(re.escape(old), new, text, count=1, flags=re.IGNORECASE)
+    return f"{text} {new}".strip()
+
+
+def _leftover_terms(followup: str, removed: list[str]) -> list[str]:
+    """
+    Words of the follow-up that are not filler, comparatives, price words,
+    times of day, dates, places or categories.
+    """
+    text = followup.lower()
+    for phrase in removed:
+        text = text.replace(phrase.lower(), " ")
+    ignored = (
+        _FILLER | _COMPARATIVES | _UNSUPPORTED_COMPARATIVES | _PRICE_WORDS | _TIME_OF_DAY.keys()
+    )
+    return [word for word in _WORD.findall(text) if word not in ignored and len(word) > 1]
+
+
+def _add(terms: list[str], term: str) -> None:
+    if term.lower() not in (existing.lower() for existing in terms):
+        terms.append(term)
+
+
+def plan_refinement(
+    followup: str,
+    current: Constraints,
+    covered: Constraints,
+    today: date,
+    known_places: str = "",
+) -> RefinementPlan:
+    """
+    Merge a follow-up into the current constraints and decide whether the
+    session's last search (covered) can answer it locally. known_places is
+    text of the session's results: a place found in it ("in Wicker Park")
+    narrows the results instead of switching cities.
+    """
+    merged = current.copy()
+    removed: list[str] = []
+    narrowed: list[str] = []
+    words = _WORD.findall(followup.lower())
+
+    unsupported = next((w for w in words if w in _UNSUPPORTED_COMPARATIVES), None)
+    if unsupported and not _NEAR_PLACE.search(followup):
+        return RefinementPlan(
+            "unsupported",
+            merged,
+            f"unsupported refinement: '{unsupported}' (events have no data to rank by it)",
+        )
+
+    resolved = resolve_date_range(followup, today)
+    if resolved:
+        date_range = anchor_weekday(resolved, covered.date_range)
+        old_expression = current.date_range["expression"] if current.date_range else ""
+        merged.base_query = _replace(merged.base_query, old_expression, date_range["expression"])
+        merged.date_range = date_range
+        removed.append(resolved["expression"])
+        narrowed.append("dates")
+
+    near = _NEAR_PLACE.search(followup)
+    city = extract_city(followup)
+    place = None
+    if near:
+        place = near[1].strip(" ?.!")
+    elif city and city != current.city and city in known_places.lower():
+        place = city.title()
+    if place:
+        _add(merged.places, place)
+        removed.append(place)
+        narrowed.append("place")
+    elif city and city != current.city:
+        merged.base_query = _replace(merged.base_query, current.city or "", city.title())
+        merged.city = city
+        merged.places = []
+        removed.append(city)
+
+    followup_category = category_keyword(followup)
+    if followup_category and followup_category[0] != current.category:
+        category, keyword = followup_category
+        current_keyword = category_keyword(current.base_query)
+        merged.base_query = _replace(
+            merged.base_query, current_keyword[1] if current_keyword else "", keyword
+        )
+        merged.category = category
+        merged.keywords = [word for word in merged.keywords if word not in _CATEGORY_WORDS]
+        removed.append(keyword)
+    elif followup_category:
+        # Same category, more specific keyword ("only jazz" within music)
+        keyword = followup_category[1]
+        if keyword not in merged.base_query.lower():
+            _add(merged.keywords, keyword)
+            narrowed.append("keyword")
+        removed.append(keyword)
+
+    time_of_day = next((w for w in words if w in _TIME_OF_DAY), None)
+    if time_of_day:
+        merged.time_of_day = time_of_day
+        narrowed.append("time of day")
+
+    if any(w in _PRICE_WORDS for w in words):
+        merged.cheaper = True
+        narrowed.append("price")
+
+    for word in _leftover_terms(followup, removed):
+        _add(merged.keywords, word)
+        narrowed.append("keyword")
+
+    if merged.city != covered.city:
+        return RefinementPlan("search", merged, f"new city: {merged.city}")
+    if merged.category != covered.category:
+        return RefinementPlan("search", merged, f"new category: {merged.category}")
+    if not _within(merged.date_range, covered.date_range):
+        return RefinementPlan("search", merged, "dates outside the searched range")
+    if not narrowed:
+        return RefinementPlan("local", merged, "no new constraints")
+    return RefinementPlan("local", merged, f"narrowed {', '.join(dict.fromkeys(narrowed))}")
+
+
+def _in_range(event_date: str, date_range: Optional[DateRange]) -> bool:
+    if date_range is None:
+        return True
+    day = event_date[:10]
+    return bool(re.fullmatch(r"\d{4}-\d{2}-\d{2}", day)) and (
+        date_range["start"] <= day <= date_range["end"]
+    )
+
+
+def _at_time_of_day(event_date: str, time_of_day: Optional[str]) -> bool:
+    """Events without a time ("2024-12-21") match any time of day."""
+    match = re.fullmatch(r"\d{4}-\d{2}-\d{2} (\d{2}):\d{2}", event_date)
+    if time_of_day is None or not match:
+        return True
+    start, end = _TIME_OF_DAY[time_of_day]
+    return start <= int(match[1]) < end
+
+
+def _price(text: str) -> Optional[float]:
+    """Lowest price listed in text ("free" is 0), or None."""
+    prices = [0.0 if match[2] else float(match[1]) for match in _PRICE.finditer(text)]
+    return min(prices) if prices else None
+
+
+def _cheaper(events: list[Event], sources: dict) -> list[Event]:
+    """
+    Events priced at or below the median listed price, cheapest first. An
+    event's price comes from its own fields, else from its source snippet;
+    events without a price are dropped.
+    """
+    priced = []
+    for event in events:
+        price = _price(f"{event.title} {event.description}")
+        if price is None:
+            price = _price(sources.get(event.url, ""))
+        if price is not None:
+            priced.append((price, event))
+    if not priced:
+        return []
+    prices = sorted(price for price, _ in priced)
+    median = prices[(len(prices) - 1) // 2]
+    return [event for price, event in sorted(priced, key=lambda p: p[0]) if price <= median]
+
+
+def _mentions(text: str, terms: list[str]) -> bool:
+    lowered = text.lower()
+    return all(term in lowered for term in terms)
+
+
+def answer_locally(
+    plan: RefinementPlan,
+    events: list[Event],
+    raw_results: list[dict],
+    current_date: str,
+) -> list[Event]:
+    """
+    Events of the session that satisfy the plan's constraints, most relevant
+    first. An event matches narrowing terms through its own fields or the
+    content of the snippet it was extracted from. When no event matches,
+    events are extracted by rules from the matching snippets instead. With
+    constraints.cheaper, the cheaper events are kept and listed cheapest first.
+    """
+    constraints = plan.constraints
+    sources = {snippet.get("url"): snippet.get("content") or "" for snippet in raw_results}
+
+    matching = [
+        event
+        for event in events
+        if _in_range(event.date, constraints.date_range)
+        and _at_time_of_day(event.date, constraints.time_of_day)
+        and _mentions(
+            " ".join([event.title, event.description, event.location, sources.get(event.url, "")]),
+            constraints.terms,
+        )
+    ]
+    if not matching:
+        snippets = [
+            s
+            for s in raw_results
+            if _mentions(f"{s.get('title', '')} {s.get('content', '')}", constraints.terms)
+        ]
+        matching = [
+            event
+            for event in extract_events(snippets, current_date, constraints.date_range)
+            if _at_time_of_day(event.date, constraints.time_of_day)
+        ]
+
+    if constraints.cheaper:
+        return _cheaper(matching, sources)
+
+    documents = [
+        {"title": event.title, "content": f"{event.description} {event.location}", "event": event}
+        for event in matching
+    ]
+    ranked = rerank(documents, constraints.query, current_date, constraints.date_range)
+    return [document["event"] for document, _ in ranked]
@@ -0,0 +1,125 @@
+"""
+Local relevance re-ranking of search snippets before extraction.
+
+Tavily's `score` is relative to the rewritten query that found a snippet, so
+it cannot order snippets coming from different queries. rerank() scores every
+snippet against the original user query instead, combining:
+- BM25 over the snippets' title and content (normalized to the best match),
+- date proximity: how close the dates a snippet mentions are to the query's
+  resolved date range (1.0 inside the range, decaying by the week),
+- location overlap: share of the query city's words found in the snippet.
+
+select_within_budget() then keeps the best snippets that fit a token budget,
+so K adapts to snippet length instead of being fixed.
+
+Usage:
+    from backend.app.utils.reranker import rerank, select_within_budget
+    ranked = rerank(raw_results, "comedy in Chicago this weekend", "2024-12-20", date_range)
+    context = select_within_budget(ranked, token_budget=6000, min_snippets=3)
+"""
+
+from datetime import date
+from typing import Optional
+
+from backend.app.models.schemas import DateRange
+from backend.app.utils.bm25Index import BM25Index, tokenize
+from backend.app.utils.dateResolver import date_spans, normalize_event_date, parse_reference_date
+from backend.app.utils.queryParser import extract_city
+
+BM25_WEIGHT = 0.6
+DATE_WEIGHT = 0.25
+LOCATION_WEIGHT = 0.15
+# Date score of a snippet that mentions dates but no requested range is known
+UNRANGED_DATE_SCORE = 0.5
+# Same rough estimate as the LLM scheduler's budget accounting
+CHARS_PER_TOKEN = 4
+
+
+def _snippet_text(snippet: dict) -> str:
+    return f"{snippet.get('title', '')}\n{snippet.get('content', '')}"
+
+
+def _date_score(text: str, today: date, date_range: Optional[DateRange]) -> float:
+    """Best proximity of the dates mentioned in text to the requested range."""
+    days = []
+    for start, end in date_spans(text):
+        resolved = normalize_event_date(text[start:end], today, date_range)
+        if resolved:
+            days.append(parse_reference_date(resolved))
+    if not days:
+        return 0.0
+    if not date_range:
+        return UNRANGED_DATE_SCORE
+
+    range_start = parse_reference_date(date_range["start"])
+    range_end = parse_reference_date(date_range["end"])
+    best = 0.0
+    for day in days:
+        if range_start <= day <= range_end:
+            return 1.0
+        distance = (range_start - day).days if day < range_start else (day - range_end).days
+        best = max(best, 1 / (1 + distance / 7))
+    return best
+
+
+def _location_score(tokens: set[str], city_tokens: list[str]) -> float:
+    if not city_tokens:
+        return 0.0
+    return sum(1 for token in city_tokens if token in tokens) / len(city_tokens)
+
+
+def rerank(
+    snippets: list[dict],
+    user_query: str,
+    current_date: str,
+    date_range: Optional[DateRange] = None,
+) -> list[tuple[dict, float]]:
+    """Return (snippet, relevance) pairs, most relevant first (ties keep arrival order)."""
+    if not snippets:
+        return []
+
+    index = BM25Index()
+    for i, snippet in enumerate(snippets):
+        index.add(str(i), _snippet_text(snippet))
+    bm25 = {int(key): score for key, score, _ in index.search(user_query, k=len(snippets))}
+    best_bm25 = max(bm25.values(), default=0.0) or 1.0
+
+    today = parse_reference_date(current_date)
+    city = extract_city(user_query)
+    city_tokens = tokenize(city) if city else []
+
+    scored = []
+    for i, snippet in enumerate(snippets):
+        text = _snippet_text(snippet)
+        relevance = (
+            BM25_WEIGHT * bm25.get(i, 0.0) / best_bm25
+            + DATE_WEIGHT * _date_score(text, today, date_range)
+            + LOCATION_WEIGHT * _location_score(set(tokenize(text)), city_tokens)
+        )
+        scored.append((snippet, round(relevance, 4)))
+    return sorted(scored, key=lambda item: item[1], reverse=True)
+
+
+def snippet_tokens(snippet: dict) -> int:
+    """Estimated prompt tokens a snippet adds to the extraction context."""
+    characters = sum(len(snippet.get(field) or "") for field in ("url", "title", "content"))
+    return characters // CHARS_PER_TOKEN
+
+
+def select_within_budget(
+    ranked: list[tuple[dict, float]], token_budget: int, min_snippets: int = 1
+) -> list[dict]:
+    """
+    Keep the best-ranked snippets whose estimated tokens fit token_budget.
+    The first min_snippets are always kept; a snippet that does not fit is
+    skipped so a shorter one further down can still use the remaining budget.
+    """
+    selected: list[dict] = []
+    used = 0
+    for snippet, _ in ranked:
+        tokens = snippet_tokens(snippet)
+        if len(selected) >= min_snippets and used + tokens > token_budget:
+            continue
+        selected.append(snippet)
+        used += tokens
+    return selected
@@ -0,0 +1,110 @@
+"""
+Cleaning of Tavily snippet content before it reaches the extractor prompt.
+
+Tavily `content` often carries navigation text, cookie banners, repeated site
+headers and ticketing boilerplate. clean_snippets() processes the results of
+one search request as a batch:
+1. normalizes Unicode (NFKC, zero-width characters, markdown links) and
+   whitespace,
+2. drops boilerplate lines: lines that are only site chrome ("Accept
+   cookies", "Sign in | Sign up", cookie banners) and lines repeated in min_docs or more documents of
+   the batch, unless they mention a date or venue,
+3. keeps only the sentences within `context` sentences of a date or venue
+   mention (content without any such mention is kept whole).
+
+Usage:
+    from backend.app.utils.snippetCleaner import clean_snippets
+    cleaned, stats = clean_snippets(results)
+    stats  # {"bytes_in": 5120, "bytes_out": 1870}
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from backend.app.utils.heuristicExtractor import mentions_date_or_venue, split_sentences
+
+_ZERO_WIDTH = re.compile("[\u200b\u200c\u200d\u2060\ufeff\u00ad]")
+_MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_SPACES = re.compile(r"[ \t\f\v]+")
+# Chrome is matched on whole lines only: "Milk & Cookies Comedy Night" is an event
+_CHROME_ITEM = (
+    r"(?:accept|reject|allow|manage)(?: all)?(?: cookies)?|cookies?(?: settings| policy)?|"
+    r"privacy policy|terms of (?:use|service)|sign in|sign up|log in|subscribe|newsletter|"
+    r"skip to (?:main )?content|share this|follow us|back to top"
+)
+_BOILERPLATE = re.compile(
+    rf"\W*(?:{_CHROME_ITEM})(?:\W+(?:{_CHROME_ITEM}))*\W*"  # "Sign in | Sign up"
+    r"|(?:we|this (?:web)?site) uses? cookies\b.*"  # cookie banners
+    r"|(?:sign up|subscribe)\b.*\bnewsletter\b.*"
+    r"|(?:©|copyright\b).*|.*\ball rights reserved\W*"
+    r"|.*\b(?:enable javascript|javascript is disabled|your browser (?:is|does)\b).*",
+    re.IGNORECASE,
+)
+# Very short lines of multi-line content are menu entries ("Home", "Events", "Contact")
+_MIN_LINE_WORDS = 3
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFKC, no zero-width characters or markdown links, collapsed whitespace."""
+    text = unicodedata.normalize("NFKC", text)
+    text = _ZERO_WIDTH.sub("", text)
+    text = _MARKDOWN_LINK.sub(r"\1", text)
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _line_key(line: str) -> str:
+    """Form used to recognize the same line across documents."""
+    return re.sub(r"[^a-z]+", " ", line.lower()).strip()
+
+
+def _is_boilerplate(line: str, repeated: set[str], multiline: bool) -> bool:
+    if mentions_date_or_venue(line):
+        return False
+    if _BOILERPLATE.fullmatch(line) or _line_key(line) in repeated:
+        return True
+    return multiline and len(line.split()) < _MIN_LINE_WORDS
+
+
+def _keep_event_sentences(lines: list[str], context: int) -> str:
+    """Sentences within `context` of a date or venue mention, grouped back into lines."""
+    sentences = [
+        (n, sentence) for n, line in enumerate(lines) for sentence in split_sentences(line)
+    ]
+    anchors = [i for i, (_, sentence) in enumerate(sentences) if mentions_date_or_venue(sentence)]
+    if not anchors:
+        return "\n".join(lines)
+
+    keep = {j for i in anchors for j in range(i - context, i + context + 1)}
+    kept_lines: dict[int, list[str]] = {}
+    for i, (line_number, sentence) in enumerate(sentences):
+        if i in keep:
+            kept_lines.setdefault(line_number, []).append(sentence)
+    return "\n".join(" ".join(parts) for parts in kept_lines.values())
+
+
+def clean_snippets(
+    results: list[dict], min_docs: int = 3, context: int = 1
+) -> tuple[list[dict], dict]:
+    """
+    Clean the content of one request's search results.
+    Returns copies of the results and {"bytes_in", "bytes_out"} for the batch.
+    """
+    normalized = [normalize_text(result.get("content") or "") for result in results]
+
+    document_frequency: Counter[str] = Counter()
+    for text in normalized:
+        document_frequency.update({_line_key(line) for line in text.splitlines()})
+    repeated = {key for key, count in document_frequency.items() if key and count >= min_docs}
+
+    cleaned = []
+    bytes_in = bytes_out = 0
+    for result, text in zip(results, normalized):
+        lines = text.splitlines()
+        lines = [line for line in lines if not _is_boilerplate(line, repeated, len(lines) > 1)]
+        content = _keep_event_sentences(lines, context)
+        bytes_in += len((result.get("content") or "").encode())
+        bytes_out += len(content.encode())
+        cleaned.append({**result, "content": content})
+    return cleaned, {"bytes_in": bytes_in, "bytes_out": bytes_out}
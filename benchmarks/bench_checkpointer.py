@@ -0,0 +1,158 @@
+"""
+Benchmark: write overhead of graph checkpoints per backend.
+
+Runs the compiled agent graph with stand-in nodes (no LLM, Tavily or MongoDB
+calls) that return the 24 recorded snippets of
+benchmarks/fixtures/extraction_snippets.json and their labeled events, so the
+checkpointed state has the size of a real search. Each run is repeated with
+no checkpointer, InMemorySaver, the SQLite saver and, when MONGODB_URI points
+to a reachable server, the MongoDB saver. It reports:
+- mean and p95 wall time of a run and the overhead against no checkpointer,
+- checkpoints written per run and the overhead per checkpoint,
+- bytes of channel blobs written per run, against the bytes a saver that
+  stores the whole state in every checkpoint would write.
+
+Usage:
+    python -m benchmarks.bench_checkpointer
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.app.core import config
+from backend.app.core.checkpointer import (
+    MongoCheckpointSaver,
+    SqliteCheckpointSaver,
+    create_checkpointer,
+    thread_config,
+)
+from backend.app.graph import build_graph
+from backend.app.models.schemas import Event
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "extraction_snippets.json"
+RUNS = 200
+QUERY = "Comedy shows in Chicago this weekend"
+
+
+def stand_in_nodes(fixture: dict) -> list:
+    snippets = fixture["snippets"]
+    events = [
+        Event(
+            title=label["title"],
+            date=label["date"],
+            location="Chicago",
+            description=s["content"][:200],
+            url=s["url"],
+            score=s["score"],
+        )
+        for s in snippets
+        for label in s["expected_events"]
+    ]
+    return [
+        patch("backend.app.graph.query_validator_node", return_value={"query_status": "valid"}),
+        patch("backend.app.graph.event_index_node", return_value={"index_status": "miss"}),
+        patch(
+            "backend.app.graph.query_rewriter_node",
+            return_value={"search_queries": [QUERY, f"{QUERY} tickets"], "search_facets": []},
+        ),
+        patch(
+            "backend.app.graph.search_node",
+            return_value={"raw_results": snippets, "new_raw_results": snippets},
+        ),
+        patch("backend.app.graph.extraction_node", return_value={"events": events}),
+        patch("backend.app.graph.persistence_node", return_value={}),
+    ]
+
+
+def mongo_saver():
+    if not config.MONGODB_URI:
+        return None
+    try:
+        saver = MongoCheckpointSaver(f"bench_checkpoints_{uuid.uuid4().hex[:8]}")
+        saver.delete_thread("probe")
+        return saver
+    except Exception as e:
+        print(f"MongoDB saver skipped: {e}")
+        return None
+
+
+def written_bytes(saver, thread_id: str) -> tuple[int, int, int]:
+    """Checkpoints, channel blob bytes and whole-state bytes of one thread."""
+    checkpoints = list(saver.list(thread_config(thread_id)))
+    seen, blob_bytes, state_bytes = set(), 0, 0
+    for checkpoint_tuple in checkpoints:
+        checkpoint = checkpoint_tuple.checkpoint
+        for channel, value in checkpoint["channel_values"].items():
+            size = len(saver.serde.dumps_typed(value)[1])
+            state_bytes += size
+            key = (channel, str(checkpoint["channel_versions"][channel]))
+            if key not in seen:
+                seen.add(key)
+                blob_bytes += size
+    return len(checkpoints), blob_bytes, state_bytes
+
+
+async def run(saver, runs: int) -> dict:
+    graph = build_graph(checkpointer=saver) if saver else build_graph()
+    state = {"user_query": QUERY, "current_date": "2024-12-20", "retry_count": 0}
+    durations = []
+    for i in range(runs):
+        thread_id = f"bench-{i}"
+        kwargs = {"config": thread_config(thread_id)} if saver else {}
+        start = time.perf_counter()
+        await graph.ainvoke({**state, "search_id": thread_id}, **kwargs)
+        durations.append((time.perf_counter() - start) * 1000)
+
+    result = {"mean_ms": sum(durations) / runs, "p95_ms": sorted(durations)[int(0.95 * runs)]}
+    if saver:
+        checkpoints, blob_bytes, state_bytes = written_bytes(saver, "bench-0")
+        result.update(checkpoints=checkpoints, blob_bytes=blob_bytes, state_bytes=state_bytes)
+        for i in range(runs):
+            saver.delete_thread(f"bench-{i}")
+    return result
+
+
+async def main():
+    fixture = json.loads(FIXTURE_PATH.read_text())
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        for node_patch in stand_in_nodes(fixture):
+            stack.enter_context(node_patch)
+
+        savers = {
+            "none": None,
+            "memory": create_checkpointer("memory"),
+            "sqlite": SqliteCheckpointSaver(str(Path(tmp) / "checkpoints.db")),
+        }
+        if (mongo := mongo_saver()) is not None:
+            savers["mongodb"] = mongo
+
+        await run(None, 20)  # warm-up
+        results = {name: await run(saver, RUNS) for name, saver in savers.items()}
+        savers["sqlite"].close()
+
+    baseline = results["none"]["mean_ms"]
+    print(f"{RUNS} runs of the agent graph with {len(fixture['snippets'])} snippets in state\n")
+    print(
+        f"{'backend':<8} {'mean ms':>8} {'p95 ms':>7} {'overhead':>9} {'ckpts':>6} "
+        f"{'ms/ckpt':>8} {'blob KiB':>9} {'full KiB':>9}"
+    )
+    for name, r in results.items():
+        overhead = r["mean_ms"] - baseline
+        line = f"{name:<8} {r['mean_ms']:>8.2f} {r['p95_ms']:>7.2f} {overhead:>9.2f}"
+        if "checkpoints" in r:
+            line += (
+                f" {r['checkpoints']:>6} {overhead / r['checkpoints']:>8.3f}"
+                f" {r['blob_bytes'] / 1024:>9.1f} {r['state_bytes'] / 1024:>9.1f}"
+            )
+        print(line)
+    print("\nfull KiB: bytes written if every checkpoint stored the whole state")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
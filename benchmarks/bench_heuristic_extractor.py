@@ -0,0 +1,99 @@
+"""
+Benchmark: precision and recall of the heuristic extractor.
+
+Runs the local rules over hand-labeled Tavily snippets
+(benchmarks/fixtures/extraction_snippets.json) and reports:
+- the pre-filter at each EXTRACTOR_PREFILTER_MIN_SIGNALS threshold: a snippet
+  is relevant when it holds at least one labeled event, and a kept irrelevant
+  snippet is a false positive; dropped snippets are prompt tokens saved.
+- the fallback extractor: an extracted event matches a labeled one with the
+  same day and a title overlap (token Jaccard) of at least TITLE_MATCH.
+
+Usage:
+    python -m benchmarks.bench_heuristic_extractor
+"""
+
+import json
+import re
+from pathlib import Path
+
+from backend.app.utils.heuristicExtractor import event_signals, extract_events
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "extraction_snippets.json"
+
+THRESHOLDS = [1, 2, 3]
+TITLE_MATCH = 0.5
+
+
+def tokens(text: str) -> set[str]:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def title_overlap(a: str, b: str) -> float:
+    a_tokens, b_tokens = tokens(a), tokens(b)
+    if not a_tokens or not b_tokens:
+        return 0.0
+    return len(a_tokens & b_tokens) / len(a_tokens | b_tokens)
+
+
+def ratio(numerator: int, denominator: int) -> float:
+    return numerator / denominator if denominator else 1.0
+
+
+def bench_prefilter(snippets: list[dict]) -> None:
+    print(f"{'min signals':>11} {'kept':>6} {'precision':>10} {'recall':>8} {'chars saved':>12}")
+    total_chars = sum(len(s["content"]) + len(s["title"]) for s in snippets)
+    for threshold in THRESHOLDS:
+        kept = [s for s in snippets if len(event_signals(s)) >= threshold]
+        relevant_kept = sum(1 for s in kept if s["expected_events"])
+        relevant = sum(1 for s in snippets if s["expected_events"])
+        saved = total_chars - sum(len(s["content"]) + len(s["title"]) for s in kept)
+        print(
+            f"{threshold:>11} {len(kept):>3}/{len(snippets):<2} "
+            f"{ratio(relevant_kept, len(kept)):>10.2f} {ratio(relevant_kept, relevant):>8.2f} "
+            f"{saved / total_chars:>12.0%}"
+        )
+
+
+def bench_extraction(snippets: list[dict], current_date: str) -> None:
+    extracted = labeled = matched = 0
+    misses = []
+    for snippet in snippets:
+        events = extract_events([snippet], current_date)
+        expected = snippet["expected_events"]
+        extracted += len(events)
+        labeled += len(expected)
+        unmatched = list(events)
+        for label in expected:
+            match = next(
+                (
+                    event
+                    for event in unmatched
+                    if event.date[:10] == label["date"]
+                    and title_overlap(event.title, label["title"]) >= TITLE_MATCH
+                ),
+                None,
+            )
+            if match is None:
+                misses.append(f"{label['title']} ({label['date']})")
+            else:
+                unmatched.remove(match)
+                matched += 1
+
+    print(f"labeled events: {labeled}  extracted: {extracted}  matched: {matched}")
+    print(f"precision: {ratio(matched, extracted):.2f}  recall: {ratio(matched, labeled):.2f}")
+    print("missed: " + ", ".join(misses))
+
+
+def main():
+    fixture = json.loads(FIXTURE_PATH.read_text())
+    snippets = fixture["snippets"]
+    print(f"{len(snippets)} labeled snippets, current date {fixture['current_date']}\n")
+    print("Pre-filter (snippet level)")
+    bench_prefilter(snippets)
+    print("\nFallback extraction (event level)")
+    bench_extraction(snippets, fixture["current_date"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: local BM25 index build, memory, query latency and snapshot load.
+
+Builds an index over a synthetic corpus of event-like documents (deterministic,
+Zipf-distributed vocabulary) until it holds TARGET_POSTINGS postings, then
+reports memory per million postings, query latency percentiles, and the time
+to snapshot and to load the snapshot back via mmap.
+
+Usage:
+    python -m benchmarks.bench_local_index
+"""
+
+import itertools
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend.app.utils.bm25Index import BM25Index
+
+TARGET_POSTINGS = 1_000_000
+VOCABULARY_SIZE = 50_000
+TOKENS_PER_DOC = 40
+QUERIES = 500
+SEED = 42
+
+CITIES = ["chicago", "austin", "seattle", "boston", "denver", "miami", "portland", "atlanta"]
+CATEGORIES = ["comedy", "concert", "jazz", "festival", "theater", "food", "art", "film"]
+
+
+def build_vocabulary() -> tuple[list[str], list[float]]:
+    """Synthetic vocabulary with Zipf-distributed (cumulative) weights."""
+    vocabulary = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE)))
+    return vocabulary, cum_weights
+
+
+def make_document(rng: random.Random, vocabulary: list[str], cum_weights: list[float]) -> str:
+    words = rng.choices(vocabulary, cum_weights=cum_weights, k=TOKENS_PER_DOC - 2)
+    words += [rng.choice(CITIES), rng.choice(CATEGORIES)]
+    return " ".join(words)
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def time_queries(index: BM25Index, queries: list[str]) -> list[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k=10)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    rng = random.Random(SEED)
+    vocabulary, cum_weights = build_vocabulary()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = BM25Index()
+    docs = 0
+    while index.posting_count < TARGET_POSTINGS:
+        index.add(f"doc:{docs}", make_document(rng, vocabulary, cum_weights), payload={"n": docs})
+        docs += 1
+    build_s = time.perf_counter() - start
+    traced_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    postings = index.posting_count
+    per_million = 1_000_000 / postings
+    print(f"Indexed {docs} documents, {postings} postings in {build_s:.1f}s")
+    print(
+        f"Postings columns:   {index.postings_nbytes() * per_million / 2**20:.1f} MiB per 1M postings"
+    )
+    print(f"Whole index (heap): {traced_bytes * per_million / 2**20:.1f} MiB per 1M postings")
+
+    queries = [
+        f"{rng.choice(CATEGORIES)} {rng.choice(CITIES)} {rng.choice(vocabulary[:2000])}"
+        for _ in range(QUERIES)
+    ]
+    latencies = time_queries(index, queries)
+    print(
+        f"\nQuery latency (k=10, {QUERIES} queries): "
+        f"p50 {percentile(latencies, 0.5):.2f} ms  p95 {percentile(latencies, 0.95):.2f} ms  "
+        f"mean {statistics.mean(latencies):.2f} ms"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "index.bin")
+        start = time.perf_counter()
+        index.save(path)
+        save_s = time.perf_counter() - start
+        size_mib = Path(path).stat().st_size / 2**20
+
+        start = time.perf_counter()
+        loaded = BM25Index.load(path)
+        load_s = time.perf_counter() - start
+
+        mmap_latencies = time_queries(loaded, queries)
+        print(f"\nSnapshot: {size_mib:.1f} MiB, save {save_s:.2f}s, mmap load {load_s:.2f}s")
+        print(
+            f"Query latency after load: p50 {percentile(mmap_latencies, 0.5):.2f} ms  "
+            f"p95 {percentile(mmap_latencies, 0.95):.2f} ms"
+        )
+        assert loaded.search(queries[0]) == index.search(queries[0])
+        del loaded
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Benchmark: write volume and collection growth of saved searches, insert vs. upsert.
+
+Replays synthetic traffic through persistence_node: RUNS searches
+drawn from DISTINCT_QUERIES queries with Zipf-distributed popularity over
+DAYS date contexts. Every query returns the 24 recorded snippets of
+benchmarks/fixtures/extraction_snippets.json and their labeled events; in
+VARIANT_RATE of the runs the extractor returns a slightly different event
+set, which must be saved as a new document. The replay runs once with
+PERSISTENCE_UPSERT_ENABLED=false (a document per run) and once with upserts.
+
+Without MongoDB, writes go to an in-memory recorder that applies the insert
+and upsert semantics and sizes documents with BSON, so the bytes stored are
+modeled. When MONGODB_URI points to a reachable server, each mode also runs
+against a temporary collection and reports the measured storage size and
+write latency. It reports:
+- documents in the collection and bytes stored after the replay,
+- bytes of write payloads sent to the server,
+- mean write latency per run (MongoDB only).
+
+Usage:
+    python -m benchmarks.bench_persistence
+"""
+
+import itertools
+import json
+import logging
+import random
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+from typing import NamedTuple, Optional
+from unittest.mock import patch
+
+import bson
+
+from backend.app.agents import agentPersistence
+from backend.app.core import config
+from backend.app.models.schemas import Event
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "extraction_snippets.json"
+RUNS = 5000
+DISTINCT_QUERIES = 300
+DAYS = 3
+VARIANT_RATE = 0.1
+SEED = 42
+
+TEMPLATES = ["comedy shows in {}", "live music in {} tonight", "things to do in {} this weekend"]
+CITIES = ["Chicago", "Austin", "Seattle", "Boston", "Denver", "Miami", "Portland", "Atlanta"]
+
+
+class UpdateResult(NamedTuple):
+    matched_count: int
+    upserted_id: Optional[str]
+
+
+class WriteRecorder:
+    """In-memory stand-in for the searches collection that sizes every write."""
+
+    def __init__(self):
+        self.documents: dict[str, dict] = {}
+        self.by_hash: dict[str, str] = {}
+        self.payload_bytes = 0
+
+    def create_index(self, *args, **kwargs):
+        return "content_hash_1"
+
+    def insert_one(self, document):
+        self.payload_bytes += len(bson.encode(document))
+        self.documents[document["_id"]] = document
+
+    def update_one(self, query, update, upsert=False):
+        self.payload_bytes += len(bson.encode({"q": query, "u": update}))
+        _id = self.by_hash.get(query["content_hash"])
+        if _id is None and not upsert:
+            return UpdateResult(matched_count=0, upserted_id=None)
+        if _id is None:
+            document = {**update["$setOnInsert"], **query, "hit_count": 0, "hits": []}
+            _id = self.by_hash[query["content_hash"]] = document["_id"]
+            self.documents[_id] = document
+            result = UpdateResult(matched_count=0, upserted_id=_id)
+        else:
+            document = self.documents[_id]
+            result = UpdateResult(matched_count=1, upserted_id=None)
+        document["hit_count"] += update["$inc"]["hit_count"]
+        document.update(update["$set"])
+        push = update["$push"]["hits"]
+        document["hits"] = (document["hits"] + push["$each"])[push["$slice"] :]
+        return result
+
+    def stored_bytes(self) -> int:
+        return sum(len(bson.encode(document)) for document in self.documents.values())
+
+
+def load_fixture() -> tuple[list[dict], list[Event]]:
+    fixture = json.loads(FIXTURE_PATH.read_text())
+    snippets = [{k: v for k, v in s.items() if k != "expected_events"} for s in fixture["snippets"]]
+    events = [
+        Event(
+            title=label["title"],
+            date=label["date"],
+            location="Chicago",
+            description=s["content"][:200],
+            url=s["url"],
+            score=s["score"],
+        )
+        for s in fixture["snippets"]
+        for label in s["expected_events"]
+    ]
+    return snippets, events
+
+
+def replay_traffic(snippets: list[dict], events: list[Event]) -> list[dict]:
+    """Agent states of RUNS searches with Zipf-distributed query popularity."""
+    rng = random.Random(SEED)
+    queries = [t.format(c) for t, c in itertools.product(TEMPLATES, CITIES)]
+    queries += [f"{q} {i}" for i, q in enumerate(queries * (DISTINCT_QUERIES // len(queries)))]
+    queries = queries[:DISTINCT_QUERIES]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(queries))))
+    days = [f"2024-12-{20 + day}" for day in range(DAYS)]
+
+    states = []
+    for run in range(RUNS):
+        run_events = events
+        if rng.random() < VARIANT_RATE:
+            run_events = events[: rng.randint(len(events) // 2, len(events) - 1)]
+        states.append(
+            {
+                "search_id": str(uuid.uuid4()),
+                "user_query": rng.choices(queries, cum_weights=cum_weights)[0],
+                "current_date": days[run * DAYS // RUNS],
+                "events": run_events,
+                "raw_results": snippets,
+                "index_status": "miss",
+            }
+        )
+    return states
+
+
+def mongo_collection():
+    if not config.MONGODB_URI:
+        return None
+    try:
+        from backend.app.core.dbClient import get_named_collection
+
+        collection = get_named_collection(f"bench_searches_{uuid.uuid4().hex[:8]}")
+        collection.estimated_document_count()
+        return collection
+    except Exception as e:
+        print(f"MongoDB run skipped: {e}")
+        return None
+
+
+def run(states: list[dict], upsert: bool, collection) -> dict:
+    agentPersistence._indexes_ready = False
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(config, "PERSISTENCE_UPSERT_ENABLED", upsert))
+        stack.enter_context(patch.object(config, "EVENT_INDEX_ENABLED", False))
+        stack.enter_context(patch.object(config, "LOCAL_INDEX_ENABLED", False))
+        stack.enter_context(
+            patch.object(agentPersistence, "get_db_collection", return_value=collection)
+        )
+        start = time.perf_counter()
+        for state in states:
+            agentPersistence.persistence_node(state)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if isinstance(collection, WriteRecorder):
+        return {
+            "documents": len(collection.documents),
+            "stored_bytes": collection.stored_bytes(),
+            "payload_bytes": collection.payload_bytes,
+        }
+    stats = collection.database.command("collStats", collection.name)
+    result = {
+        "documents": stats["count"],
+        "stored_bytes": stats["size"],
+        "payload_bytes": None,
+        "write_ms": elapsed_ms / len(states),
+    }
+    collection.drop()
+    return result
+
+
+def main():
+    logging.getLogger(agentPersistence.__name__).setLevel(logging.WARNING)
+    snippets, events = load_fixture()
+    states = replay_traffic(snippets, events)
+    distinct = len({(s["user_query"], s["current_date"], len(s["events"])) for s in states})
+
+    results = {
+        "insert": run(states, upsert=False, collection=WriteRecorder()),
+        "upsert": run(states, upsert=True, collection=WriteRecorder()),
+    }
+    for mode in ("insert", "upsert"):
+        if (collection := mongo_collection()) is not None:
+            results[f"{mode} (mongo)"] = run(states, upsert=mode == "upsert", collection=collection)
+
+    print(
+        f"{RUNS} searches, {DISTINCT_QUERIES} queries over {DAYS} days, "
+        f"~{distinct} distinct (query, date, event set) combinations\n"
+    )
+    print(f"{'mode':<15} {'documents':>9} {'stored MiB':>11} {'sent MiB':>9} {'write ms':>9}")
+    for name, r in results.items():
+        sent = f"{r['payload_bytes'] / 2**20:>9.1f}" if r["payload_bytes"] is not None else " " * 9
+        write_ms = f"{r['write_ms']:>9.2f}" if "write_ms" in r else ""
+        print(
+            f"{name:<15} {r['documents']:>9} {r['stored_bytes'] / 2**20:>11.1f} {sent} {write_ms}"
+        )
+    growth = results["upsert"]["stored_bytes"] / results["insert"]["stored_bytes"]
+    print(f"\nupsert stores {growth:.0%} of the bytes of one document per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: local re-ranking with a token budget vs. arrival order.
+
+Replays searches over the hand-labeled snippets in
+benchmarks/fixtures/extraction_snippets.json (in their recorded arrival
+order). For each query and token budget it compares the extraction context
+built by rerank() + select_within_budget() with the same budget filled in
+arrival order, and with no budget at all. It reports:
+- context tokens sent to the extractor,
+- modeled extractor latency (fixed overhead + prefill per input token +
+  generation per output token, ~OUTPUT_TOKENS_PER_EVENT per event in context),
+- recall: share of labeled events dated inside the query's range whose
+  snippet made it into the context.
+
+Usage:
+    python -m benchmarks.bench_reranker
+"""
+
+import json
+from pathlib import Path
+
+from backend.app.utils.dateResolver import parse_reference_date, resolve_date_range
+from backend.app.utils.reranker import rerank, select_within_budget, snippet_tokens
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "extraction_snippets.json"
+
+QUERIES = [
+    "Comedy shows in Chicago this weekend",
+    "Concerts in Chicago next week",
+    "Things to do in Chicago on New Year's Eve",
+    "Events in Chicago next month",
+]
+BUDGETS = [200, 400, 800]
+MIN_SNIPPETS = 3
+
+# Latency model of one extraction call (gpt-4o class model)
+CALL_OVERHEAD_MS = 400
+PREFILL_MS_PER_TOKEN = 0.2
+GENERATION_MS_PER_TOKEN = 20
+OUTPUT_TOKENS_PER_EVENT = 60
+PROMPT_TOKENS = 250  # system prompt and instructions
+
+
+def in_range(label: dict, date_range: dict) -> bool:
+    return date_range["start"] <= label["date"] <= date_range["end"]
+
+
+def evaluate(context: list[dict], relevant: int, date_range: dict) -> dict:
+    tokens = sum(snippet_tokens(s) for s in context)
+    events = sum(len(s["expected_events"]) for s in context)
+    found = sum(1 for s in context for label in s["expected_events"] if in_range(label, date_range))
+    latency = (
+        CALL_OVERHEAD_MS
+        + PREFILL_MS_PER_TOKEN * (PROMPT_TOKENS + tokens)
+        + GENERATION_MS_PER_TOKEN * OUTPUT_TOKENS_PER_EVENT * events
+    )
+    return {
+        "snippets": len(context),
+        "tokens": tokens,
+        "latency_ms": latency,
+        "recall": found / relevant if relevant else 1.0,
+    }
+
+
+def arrival_order(snippets: list[dict], budget: int) -> list[dict]:
+    return select_within_budget([(s, 0.0) for s in snippets], budget, MIN_SNIPPETS)
+
+
+def main():
+    fixture = json.loads(FIXTURE_PATH.read_text())
+    snippets = fixture["snippets"]
+    current_date = fixture["current_date"]
+    today = parse_reference_date(current_date)
+
+    print(f"{len(snippets)} snippets, {sum(snippet_tokens(s) for s in snippets)} tokens in total\n")
+    print(
+        f"{'budget':>7} {'strategy':<10} {'snippets':>9} {'tokens':>7} {'latency ms':>11} {'recall':>7}"
+    )
+    totals: dict[tuple, list[dict]] = {}
+    for query in QUERIES:
+        date_range = resolve_date_range(query, today)
+        relevant = sum(
+            1 for s in snippets for label in s["expected_events"] if in_range(label, date_range)
+        )
+        ranked = rerank(snippets, query, current_date, date_range)
+        totals.setdefault(("all", "no budget"), []).append(evaluate(snippets, relevant, date_range))
+        for budget in BUDGETS:
+            reranked = select_within_budget(ranked, budget, MIN_SNIPPETS)
+            totals.setdefault((budget, "arrival"), []).append(
+                evaluate(arrival_order(snippets, budget), relevant, date_range)
+            )
+            totals.setdefault((budget, "reranked"), []).append(
+                evaluate(reranked, relevant, date_range)
+            )
+
+    for (budget, strategy), results in totals.items():
+        count = len(results)
+        print(
+            f"{budget:>7} {strategy:<10} "
+            f"{sum(r['snippets'] for r in results) / count:>9.1f} "
+            f"{sum(r['tokens'] for r in results) / count:>7.0f} "
+            f"{sum(r['latency_ms'] for r in results) / count:>11.0f} "
+            f"{sum(r['recall'] for r in results) / count:>7.2f}"
+        )
+    print(f"\nAverages over {len(QUERIES)} queries: {', '.join(QUERIES)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: adaptive Tavily search depth vs. always-advanced.
+
+Replays recorded Tavily responses (benchmarks/fixtures/tavily_responses.json)
+through search_node with a fake client that sleeps for the recorded latency,
+then compares wall-clock latency and API credits for both strategies.
+
+Usage (from the repository root; running the file directly fails with
+ModuleNotFoundError because `backend` is only importable from the root):
+    python -m benchmarks.bench_search_depth
+"""
+
+import asyncio
+import copy
+import json
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.app.agents.agentSearch import search_node, tavily_result_cache
+from backend.app.core import config, metrics
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "tavily_responses.json"
+
+# Recorded latencies are replayed 10x faster to keep the run short
+TIME_SCALE = 0.1
+QUERIES_PER_REQUEST = 3
+
+
+class RecordedTavilyClient:
+    """Fake async Tavily client that replays recorded responses and latencies."""
+
+    def __init__(self, recordings: dict):
+        self.recordings = recordings
+
+    async def search(self, query: str, search_depth: str, **kwargs) -> dict:
+        recording = self.recordings[query][search_depth]
+        await asyncio.sleep(recording["latency_ms"] / 1000 * TIME_SCALE)
+        return {"results": copy.deepcopy(recording["results"])}
+
+
+async def run_strategy(recordings: dict, adaptive: bool) -> dict:
+    config.TAVILY_ADAPTIVE_DEPTH = adaptive
+    config.TAVILY_SEARCH_DEPTH = "advanced"
+    metrics.reset()
+    tavily_result_cache.clear()
+
+    queries = list(recordings)
+    requests = [
+        queries[i : i + QUERIES_PER_REQUEST] for i in range(0, len(queries), QUERIES_PER_REQUEST)
+    ]
+    client = RecordedTavilyClient(recordings)
+
+    request_latencies = []
+    total_results = 0
+    with patch("backend.app.agents.agentSearch.get_async_tavily_client", return_value=client):
+        for request_queries in requests:
+            start = time.perf_counter()
+            result = await search_node({"search_queries": request_queries})
+            request_latencies.append((time.perf_counter() - start) / TIME_SCALE)
+            total_results += len(result["raw_results"])
+
+    return {
+        "requests": len(requests),
+        "request_latencies": request_latencies,
+        "latency_s": sum(request_latencies),
+        "credits": metrics.get_counter("tavily.credits"),
+        "escalations": metrics.get_counter("tavily.escalations"),
+        "results": total_results,
+    }
+
+
+async def main():
+    recordings = json.loads(FIXTURE_PATH.read_text())
+
+    baseline = await run_strategy(recordings, adaptive=False)
+    adaptive = await run_strategy(recordings, adaptive=True)
+
+    print(f"Replayed {len(recordings)} recorded queries in {baseline['requests']} requests\n")
+    print(f"{'strategy':<16}{'latency (s)':>12}{'credits':>10}{'escalations':>13}{'results':>10}")
+    for name, stats in (("always-advanced", baseline), ("adaptive", adaptive)):
+        print(
+            f"{name:<16}{stats['latency_s']:>12.2f}{stats['credits']:>10.0f}"
+            f"{stats['escalations']:>13.0f}{stats['results']:>10}"
+        )
+
+    print(
+        "\nPer-request latency (s): a weak query is escalated as soon as its basic results"
+        " arrive, but still pays basic + advanced latency"
+    )
+    for i, (base_s, adapt_s) in enumerate(
+        zip(baseline["request_latencies"], adaptive["request_latencies"]), start=1
+    ):
+        print(f"  request {i}: always-advanced {base_s:.2f}  adaptive {adapt_s:.2f}")
+
+    latency_saving = 1 - adaptive["latency_s"] / baseline["latency_s"]
+    credit_saving = 1 - adaptive["credits"] / baseline["credits"]
+    print(f"\nLatency saving: {latency_saving:.0%}  Credit saving: {credit_saving:.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark: micro-batched query validation, latency vs. LLM calls.
+
+Replays a Poisson stream of validation requests against a simulated validator
+LLM (fixed round-trip latency plus a small per-query cost) and compares
+unbatched calls with several batching windows. For each setting it reports
+the number of LLM calls, the mean batch size and the p50/p95 latency seen by
+a single validation.
+
+Usage:
+    python -m benchmarks.bench_validation_batch
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app.core.microBatcher import MicroBatcher
+
+REQUESTS = 300
+ARRIVAL_RATES = [20, 100]  # validations per second
+WINDOWS_MS = [0, 10, 20, 50]
+MAX_BATCH_SIZE = 16
+CALL_LATENCY_S = 0.35  # round trip of one small-model call
+PER_QUERY_LATENCY_S = 0.01  # extra output tokens per query in a batch
+SEED = 42
+
+
+class SimulatedValidator:
+    """Stand-in for the validator LLM that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, queries: list[str]) -> list[str]:
+        with self.lock:
+            self.calls += 1
+        time.sleep(CALL_LATENCY_S + PER_QUERY_LATENCY_S * len(queries))
+        return ["valid"] * len(queries)
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def run(rate: float, window_ms: int) -> dict:
+    validator = SimulatedValidator()
+    batched = window_ms > 0
+    batcher = MicroBatcher(
+        validator, window_seconds=window_ms / 1000, max_batch_size=MAX_BATCH_SIZE
+    )
+    rng = random.Random(SEED)
+    latencies: list[float] = []
+
+    def validate(query: str) -> None:
+        start = time.perf_counter()
+        if batched:
+            batcher.submit(query)
+        else:
+            validator([query])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    with ThreadPoolExecutor(max_workers=REQUESTS) as pool:
+        for i in range(REQUESTS):
+            pool.submit(validate, f"Comedy shows in city {i}")
+            time.sleep(rng.expovariate(rate))
+
+    return {
+        "calls": validator.calls,
+        "batch": REQUESTS / validator.calls,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+    }
+
+
+def main():
+    print(f"{REQUESTS} validations, simulated call latency {CALL_LATENCY_S * 1000:.0f} ms")
+    print(
+        f"{'rate/s':>7} {'window':>8} {'LLM calls':>10} {'avg batch':>10} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for rate in ARRIVAL_RATES:
+        for window_ms in WINDOWS_MS:
+            result = run(rate, window_ms)
+            label = f"{window_ms} ms" if window_ms else "off"
+            print(
+                f"{rate:>7} {label:>8} {result['calls']:>10} {result['batch']:>10.1f} "
+                f"{result['p50']:>8.0f} {result['p95']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
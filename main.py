@@ -1,20 +1,52 @@
+import asyncio
+import contextlib
+import json
+import re
 import time
-from datetime import datetime
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from typing import Literal, Optional
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-from backend.app.core import config
-from backend.app.core.dbClient import check_db_health, close_db_connection
+from backend.app.agents.agentExtractor import merge_events
+from backend.app.core import config, metrics
+from backend.app.core.admission import AdmissionRejected, search_admission
+from backend.app.core.cacheWarmer import CacheWarmer
+from backend.app.core.checkpointer import get_checkpointer, graph_checkpointer, thread_config
+from backend.app.core.circuitBreaker import breaker_states
+from backend.app.core.dbClient import (
+    check_db_health,
+    close_db_connection,
+    ensure_retention_indexes,
+)
+from backend.app.core.jobQueue import JobQueue, QueueFullError, ensure_job_indexes
+from backend.app.core.localIndex import get_local_index, save_local_index
 from backend.app.core.logger import get_logger
+from backend.app.core.resultStore import result_store
+from backend.app.core.retention import RetentionJob
+from backend.app.core.semanticCache import cache_scope, semantic_cache
+from backend.app.core.sessionStore import Session, session_store
 from backend.app.graph import build_graph
+from backend.app.models.schemas import Event
+from backend.app.utils.dateResolver import resolve_date_range
+from backend.app.utils.eventFilters import EventQuery, decode_cursor, encode_cursor, page
+from backend.app.utils.refinement import (
+    Constraints,
+    RefinementPlan,
+    answer_locally,
+    plan_refinement,
+    same_intent,
+)
 
 logger = get_logger(__name__)
 
@@ -41,18 +73,81 @@ async def startup_event():
         logger.info("CORS enabled for all origins (configure CORS_ORIGINS for production)")
     else:
         logger.info(f"CORS enabled for: {config.CORS_ORIGINS}")
+    if config.LOCAL_INDEX_ENABLED:
+        get_local_index()
+    if config.CACHE_WARMER_ENABLED:
+        cache_warmer.start()
+    job_queue.start()
+    if config.JOBS_MONGODB_ENABLED:
+        try:
+            ensure_job_indexes()
+        except Exception as e:
+            logger.warning(f"Could not create job indexes: {e}")
+    if config.SEARCH_RETENTION_ENABLED:
+        try:
+            ensure_retention_indexes()
+        except Exception as e:
+            logger.warning(f"Could not create search retention indexes: {e}")
+        retention_job.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Tavily Events Finder API")
+    await cache_warmer.stop()
+    await retention_job.stop()
+    await job_queue.stop()
     close_db_connection()
+    if config.LOCAL_INDEX_ENABLED:
+        save_local_index()
 
 
 class SearchRequest(BaseModel):
     query: str
 
 
+class EventSearchRequest(SearchRequest):
+    """A /search request with optional local filters, sort order and pagination."""
+
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    min_score: Optional[float] = None
+    location: Optional[str] = None
+    sort_by: Optional[Literal["date", "score"]] = None
+    limit: Optional[int] = Field(default=None, ge=1, le=config.SEARCH_PAGE_MAX_SIZE)
+    cursor: Optional[str] = None
+
+    def event_query(self) -> Optional[EventQuery]:
+        """The requested filters and sort order, or None for a plain search."""
+        options = self.model_dump(exclude={"query", "limit", "cursor"}, exclude_none=True)
+        if not options and self.limit is None and self.cursor is None:
+            return None
+        return EventQuery(**options)
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[str] = Field(min_length=1, max_length=config.BATCH_MAX_QUERIES)
+
+
+# Caps concurrent graph runs across all batch requests (LLM and Tavily load)
+_batch_semaphore: Optional[asyncio.Semaphore] = None
+_batch_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_batch_semaphore() -> asyncio.Semaphore:
+    """
+    The batch semaphore of the running event loop, created on first use (on
+    Python 3.9 a semaphore binds to the loop that is current when it is created).
+    """
+    global _batch_semaphore, _batch_semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _batch_semaphore is None or _batch_semaphore_loop is not loop:
+        _batch_semaphore = asyncio.Semaphore(config.BATCH_MAX_CONCURRENCY)
+        _batch_semaphore_loop = loop
+    return _batch_semaphore
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -72,49 +167,516 @@ async def health_check():
                 "api": "healthy",
                 "database": "healthy" if db_healthy else "unhealthy",
             },
+            "circuit_breakers": {name: state["state"] for name, state in breaker_states().items()},
         },
     )
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """
+    In-process metrics (counters, gauges and latency observations).
+    """
+    return {**metrics.snapshot(), "circuit_breakers": breaker_states()}
+
+
+@contextlib.asynccontextmanager
+async def _no_admission() -> AsyncIterator[None]:
+    """Async no-op stand-in for an admission slot (contextlib.nullcontext is sync-only on 3.9)."""
+    yield
+
+
+async def execute_search(
+    query: str,
+    graph=None,
+    on_update=None,
+    admission=None,
+    on_event=None,
+    search_id: Optional[str] = None,
+    resume: bool = False,
+    on_state=None,
+    warm: bool = False,
+    prior_state: Optional[dict] = None,
+) -> dict:
+    """
+    Answer a query from the semantic cache, or run the agent graph and cache the result.
+    Shared by the /search endpoint, batch searches, jobs and the background cache warmer.
+    A compiled graph can be passed in to reuse it across several queries. With
+    on_update, the graph is streamed and on_update(node, output) is called as
+    each node finishes; with on_event, on_event(event) is called for every event
+    the extractor emits while streaming. With an admission controller, the graph run (but not a
+    cache hit) must first obtain one of its slots.
+    The run is keyed by search_id (generated if not given). With resume, a graph
+    compiled with a checkpointer continues that run from its last completed node
+    instead of starting over (the semantic cache is not consulted). With on_state,
+    on_state(state) is called with the final graph state; on a cache hit, with
+    the cached events and raw_results. prior_state ({"events", "raw_results"} of
+    an earlier search) seeds the run: its URLs are not fetched or extracted
+    again and its events are merged into the result, which is then not cached.
+    A warm run (from the cache warmer) caches its results for CACHE_WARMER_TTL_SECONDS,
+    reuses a cached response only if it stays valid for at least half of that,
+    and is not saved to the search history.
+    """
+    now = datetime.now()
+    scope = cache_scope(resolve_date_range(query, now.date()))
+    search_id = search_id or str(uuid.uuid4())
+
+    if config.SEMANTIC_CACHE_ENABLED and not resume:
+        min_ttl = config.CACHE_WARMER_TTL_SECONDS / 2 if warm else 0
+        hit = semantic_cache.lookup(query, scope, min_ttl_seconds=min_ttl)
+        if hit is not None:
+            logger.info(
+                f"Semantic cache hit for '{query}' "
+                f"(matched '{hit.cached_query}', similarity {hit.similarity:.2f})"
+            )
+            response = dict(hit.value)
+            raw_results = response.pop("raw_results", [])
+            if on_state:
+                events = [Event(**e) for e in response["events"]]
+                on_state({"user_query": query, "events": events, "raw_results": raw_results})
+            return {**response, "cached": True}
+
+    graph = graph or build_graph()
+    checkpointer = graph_checkpointer(graph)
+    run_kwargs = {"config": thread_config(search_id)} if checkpointer else {}
+
+    initial_state = {
+        "user_query": query,
+        "current_date": now.strftime("%Y-%m-%d"),
+        "search_id": search_id,
+        "retry_count": 0,
+        "warm_run": warm,
+        **(prior_state or {}),
+    }
+    graph_input: Optional[dict[str, object]] = initial_state
+    if resume and checkpointer:
+        # No input: LangGraph continues the thread from its latest checkpoint
+        snapshot = await graph.aget_state(run_kwargs["config"])
+        initial_state, graph_input = dict(snapshot.values), None
+        metrics.increment("graph.resumed")
+        logger.info(f"Resuming search {search_id} at {list(snapshot.next)}")
+
+    logger.info(f"Processing query: {query}")
+    async with admission.slot() if admission else _no_admission():
+        if on_update is None and on_event is None:
+            result = await graph.ainvoke(graph_input, **run_kwargs)
+        else:
+            result = dict(initial_state)
+            async for mode, chunk in graph.astream(
+                graph_input, stream_mode=["updates", "custom"], **run_kwargs
+            ):
+                if mode == "custom":
+                    if on_event and "event" in chunk:
+                        on_event(chunk["event"])
+                    continue
+                for node, update in chunk.items():
+                    result.update(update or {})
+                    if on_update:
+                        on_update(node, update or {})
+
+    if checkpointer and config.CHECKPOINT_DELETE_ON_SUCCESS:
+        await checkpointer.adelete_thread(search_id)
+
+    if on_state:
+        on_state(result)
+
+    events = result.get("events", [])
+    logger.info(
+        f"Search completed: {len(events)} events found (search_id: {result.get('search_id')})"
+    )
+
+    # Pure JSON Response for UI
+    response = {
+        "status": "success",
+        "search_id": result.get("search_id"),
+        "query_status": result.get("query_status"),
+        # The UI will loop through this list to create elements
+        "events": [e.model_dump() for e in events],
+    }
+    if result.get("facet_timings"):
+        response["facets"] = result["facet_timings"]
+    if config.SEMANTIC_CACHE_ENABLED and events and prior_state is None:
+        ttl = config.CACHE_WARMER_TTL_SECONDS if warm else None
+        # raw_results let a refinement session started from a cache hit work locally
+        cached = {**response, "raw_results": result.get("raw_results", [])}
+        semantic_cache.store(query, scope, cached, ttl_seconds=ttl)
+
+    return {**response, "cached": False}
+
+
+cache_warmer = CacheWarmer(runner=lambda query: execute_search(query, warm=True))
+retention_job = RetentionJob()
+job_queue = JobQueue(
+    runner=lambda query, on_update: execute_search(query, on_update=on_update),
+    workers=config.JOB_WORKERS,
+    max_queue_size=config.JOB_QUEUE_MAX_SIZE,
+    ttl_seconds=config.JOB_TTL_SECONDS,
+)
+
+
 @app.post("/search")
 @limiter.limit("10/minute")
-async def search_events(request: Request, search_request: SearchRequest):
+async def search_events(request: Request, search_request: EventSearchRequest):
+    """
+    With filters, sort_by or limit, the events are filtered, sorted and paged
+    locally over the full result (cached or fresh). A next_cursor names the
+    next page, which is served from the result store without a new search.
+    """
+    start_time = time.time()
+    search_id = str(uuid.uuid4())
+    event_query = search_request.event_query()
+
+    if search_request.cursor:
+        assert event_query is not None  # a cursor always makes event_query() a query
+        try:
+            search_id, offset = decode_cursor(search_request.cursor, event_query)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        response = result_store.get(search_id)
+        if response is None:
+            raise HTTPException(
+                status_code=410, detail="Cursor expired; repeat the search without a cursor"
+            )
+        metrics.increment("search.local_pages")
+        return _event_page(response, search_id, event_query, offset, search_request, start_time)
+
+    try:
+        response = await execute_search(
+            search_request.query, admission=search_admission, search_id=search_id
+        )
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except Exception as e:
+        logger.error(f"Error processing search request: {e}", exc_info=True)
+        return JSONResponse(status_code=500, content=_error_content(str(e), search_id))
+
+    if event_query is None:
+        return {**response, "elapsed_time": round(time.time() - start_time, 2)}
+    return _event_page(
+        response, response.get("search_id") or search_id, event_query, 0, search_request, start_time
+    )
+
+
+def _event_page(
+    response: dict,
+    search_id: str,
+    event_query: EventQuery,
+    offset: int,
+    search_request: EventSearchRequest,
+    start_time: float,
+) -> dict:
+    """One page of a response's filtered events; keeps the response for the next page."""
+    events = event_query.apply(response["events"])
+    items, next_offset = page(events, offset, search_request.limit)
+    next_cursor = None
+    if next_offset is not None:
+        result_store.save(search_id, response)
+        next_cursor = encode_cursor(search_id, next_offset, event_query)
+    return {
+        **response,
+        "events": items,
+        "total_events": len(events),
+        "next_cursor": next_cursor,
+        "elapsed_time": round(time.time() - start_time, 2),
+    }
+
+
+def _error_content(detail: str, search_id: str) -> dict:
+    """Error payload; with checkpoints it names the search_id that can be resumed."""
+    content = {"detail": detail}
+    if get_checkpointer() is not None:
+        content["search_id"] = search_id
+    return content
+
+
+@app.post("/search/{search_id}/resume")
+@limiter.limit("10/minute")
+async def resume_search(request: Request, search_id: str):
+    """
+    Resume a failed search from its last completed node (needs CHECKPOINTER_BACKEND).
+    Returns the same payload as POST /search.
+    """
     start_time = time.time()
+    graph = build_graph()
+    if graph_checkpointer(graph) is None:
+        raise HTTPException(status_code=404, detail="Checkpointing is disabled")
+
+    snapshot = await graph.aget_state(thread_config(search_id))
+    if not snapshot.next:
+        raise HTTPException(status_code=404, detail="No interrupted search with this id")
 
     try:
-        graph = build_graph()
+        response = await execute_search(
+            snapshot.values["user_query"],
+            graph=graph,
+            admission=search_admission,
+            search_id=search_id,
+            resume=True,
+        )
+        return {**response, "elapsed_time": round(time.time() - start_time, 2)}
 
-        initial_state = {
-            "user_query": search_request.query,
-            "current_date": datetime.now().strftime("%Y-%m-%d"),
-            "retry_count": 0,
-        }
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except Exception as e:
+        logger.error(f"Error resuming search {search_id}: {e}", exc_info=True)
+        return JSONResponse(status_code=500, content=_error_content(str(e), search_id))
+
+
+@app.post("/search/stream")
+@limiter.limit("10/minute")
+async def search_stream(request: Request, search_request: SearchRequest):
+    """
+    Run a search and stream NDJSON as it progresses: a {"type": "node"} line per
+    finished graph node, a {"type": "event"} line per event as soon as the
+    extractor parses it (EXTRACTOR_STREAMING_ENABLED), then one {"type": "result"}
+    line with the same payload as POST /search.
+    """
+    start_time = time.time()
+    search_id = str(uuid.uuid4())
+    lines: asyncio.Queue = asyncio.Queue()
 
-        logger.info(f"Processing query: {search_request.query}")
-        result = await graph.ainvoke(initial_state)
+    def on_update(node: str, update: dict) -> None:
+        lines.put_nowait({"type": "node", "node": node})
 
-        events = result.get("events", [])
-        elapsed_time = round(time.time() - start_time, 2)
+    def on_event(event: dict) -> None:
+        lines.put_nowait({"type": "event", "event": event})
 
-        logger.info(
-            f"Search completed: {len(events)} events found in {elapsed_time}s "
-            f"(search_id: {result.get('search_id')})"
+    async def run() -> None:
+        try:
+            response = await execute_search(
+                search_request.query,
+                on_update=on_update,
+                on_event=on_event,
+                admission=search_admission,
+                search_id=search_id,
+            )
+            line = {"type": "result", **response}
+            line["elapsed_time"] = round(time.time() - start_time, 2)
+        except AdmissionRejected as e:
+            line = {"type": "error", "error": str(e), "retry_after": e.retry_after}
+        except Exception as e:
+            logger.error(f"Error processing streaming search: {e}", exc_info=True)
+            line = {"type": "error", "error": str(e)}
+            if get_checkpointer() is not None:
+                line["search_id"] = search_id
+        lines.put_nowait(line)
+        lines.put_nowait(None)
+
+    async def stream():
+        task = asyncio.create_task(run())
+        try:
+            while (line := await lines.get()) is not None:
+                yield json.dumps(line) + "\n"
+        finally:
+            task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+async def _search_into_session(session: Session, constraints: Constraints) -> dict:
+    """
+    Search constraints.query and make the results the session's new coverage.
+    A search for the session's city and category is incremental: it is seeded
+    with the session's snippets and events, which it extends, and the response
+    lists the combined events that match the constraints.
+    """
+    incremental = bool(session.raw_results) and same_intent(constraints, session.covered)
+    prior_state = (
+        {"events": session.events, "raw_results": session.raw_results} if incremental else None
+    )
+    states: list[dict] = []
+    response = await execute_search(
+        constraints.query,
+        admission=search_admission,
+        on_state=states.append,
+        prior_state=prior_state,
+    )
+    events = [Event(**e) for e in response["events"]]
+    raw_results = states[-1].get("raw_results", []) if states else []
+    if not incremental:
+        session.record_search(constraints, events, raw_results)
+        metrics.increment("sessions.searches")
+        return response
+
+    session.extend_search(constraints, merge_events(session.events, events), raw_results)
+    plan = RefinementPlan("search", constraints, "incremental search")
+    matching = answer_locally(plan, session.events, session.raw_results, session.current_date)
+    metrics.increment("sessions.incremental_searches")
+    return {**response, "events": [e.model_dump() for e in matching]}
+
+
+def _session_response(session: Session, response: dict, mode: str, reason: str) -> dict:
+    session.turns.append(
+        {"query": session.current.query, "mode": mode, "events": len(response["events"])}
+    )
+    session_store.save(session)
+    return {
+        **response,
+        "session_id": session.session_id,
+        "refinement": {"mode": mode, "query": session.current.query, "reason": reason},
+    }
+
+
+@app.post("/sessions")
+@limiter.limit("10/minute")
+async def start_session(request: Request, search_request: SearchRequest):
+    """
+    Start a refinement session with a full search of the query. Follow-up
+    queries ("only Saturday", "near Wicker Park") go to POST /sessions/{session_id}.
+    """
+    start_time = time.time()
+    session = session_store.start(search_request.query, datetime.now().strftime("%Y-%m-%d"))
+
+    try:
+        response = await _search_into_session(session, session.current)
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
         )
+    except Exception as e:
+        logger.error(f"Error starting session: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    response = _session_response(session, response, "search", "first query")
+    return {**response, "elapsed_time": round(time.time() - start_time, 2)}
 
-        # Pure JSON Response for UI
-        return {
-            "status": "success",
-            "search_id": result.get("search_id"),
-            "query_status": result.get("query_status"),
-            "elapsed_time": elapsed_time,
-            # The UI will loop through this list to create elements
-            "events": [e.model_dump() for e in events],
-        }
 
+@app.post("/sessions/{session_id}")
+@limiter.limit("10/minute")
+async def refine_session(request: Request, session_id: str, search_request: SearchRequest):
+    """
+    Refine a session with a follow-up query. Follow-ups that narrow the last
+    search (dates inside its range, a neighborhood, a keyword) are answered from
+    its events and snippets without LLM or Tavily calls; anything else searches
+    the composed query ("comedy in Austin on December 21") and starts a new coverage.
+    Follow-ups ranking by data events do not have ("closer") get HTTP 422.
+    """
+    start_time = time.time()
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    now = datetime.now()
+    session.current_date = now.strftime("%Y-%m-%d")
+    plan = plan_refinement(
+        search_request.query, session.current, session.covered, now.date(), session.known_places()
+    )
+    logger.info(f"Session {session_id}: {plan.mode} refinement to '{plan.query}' ({plan.reason})")
+
+    if plan.mode == "unsupported":
+        raise HTTPException(status_code=422, detail=plan.reason)
+
+    if plan.mode == "local":
+        events = answer_locally(plan, session.events, session.raw_results, session.current_date)
+        if events:
+            metrics.increment("sessions.local_answers")
+            session.current = plan.constraints
+            response = {
+                "status": "success",
+                "search_id": None,
+                "query_status": "valid",
+                "events": [e.model_dump() for e in events],
+                "cached": False,
+            }
+            response = _session_response(session, response, "local", plan.reason)
+            return {**response, "elapsed_time": round(time.time() - start_time, 2)}
+        plan.reason = "no matching events in the session's results"
+
+    try:
+        response = await _search_into_session(session, plan.constraints)
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
-        logger.error(f"Error processing search request: {e}", exc_info=True)
+        logger.error(f"Error refining session {session_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e)) from e
 
+    response = _session_response(session, response, "search", plan.reason)
+    return {**response, "elapsed_time": round(time.time() - start_time, 2)}
+
+
+@app.post("/jobs", status_code=202)
+@limiter.limit("10/minute")
+async def create_job(request: Request, search_request: SearchRequest):
+    """Queue a search and return its job id immediately; poll GET /jobs/{job_id}."""
+    try:
+        job = await job_queue.submit(search_request.query)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    return {"job_id": job["job_id"], "status": job["status"]}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status, per-node outputs so far and, once completed, the final events."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query.strip().casefold())
+
+
+@app.post("/search/batch")
+@limiter.limit(config.BATCH_RATE_LIMIT)
+async def search_batch(request: Request, batch_request: BatchSearchRequest):
+    """
+    Run many queries through one compiled graph and stream one NDJSON line per
+    query, in completion order. Identical queries (case/whitespace-insensitive)
+    are run once; concurrency is bounded by the process-wide batch semaphore.
+    """
+    graph = build_graph()
+
+    # Map each distinct query to the positions it was submitted at
+    positions: dict[str, list[int]] = {}
+    for index, query in enumerate(batch_request.queries):
+        positions.setdefault(_normalize_query(query), []).append(index)
+
+    metrics.increment("batch.requests")
+    metrics.increment("batch.queries", len(batch_request.queries))
+    metrics.increment("batch.deduplicated", len(batch_request.queries) - len(positions))
+
+    async def run_one(key: str) -> tuple[str, dict]:
+        query = batch_request.queries[positions[key][0]]
+        async with get_batch_semaphore():
+            start_time = time.time()
+            try:
+                response = await execute_search(query, graph=graph)
+            except Exception as e:
+                logger.error(f"Error processing batch query '{query}': {e}", exc_info=True)
+                response = {"status": "error", "error": str(e)}
+            return key, {**response, "elapsed_time": round(time.time() - start_time, 2)}
+
+    async def stream():
+        tasks = [asyncio.create_task(run_one(key)) for key in positions]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                key, response = await finished
+                for index in positions[key]:
+                    line = {"index": index, "query": batch_request.queries[index], **response}
+                    yield json.dumps(line) + "\n"
+        finally:
+            # Stop remaining work if the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 
 app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
 
@@ -22,6 +22,81 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("LOG_LEVEL", "WARNING")  # Reduce test noise
 
 
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Give every test fresh (closed) circuit breakers."""
+    from backend.app.core.circuitBreaker import reset_breakers
+
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def isolate_local_index(monkeypatch):
+    """Keep the local BM25 index in memory and empty for every test."""
+    from backend.app.core import config
+    from backend.app.core.localIndex import reset_local_index
+
+    monkeypatch.setenv("LOCAL_INDEX_PATH", "")
+    monkeypatch.setattr(config, "LOCAL_INDEX_PATH", "")
+    reset_local_index()
+    yield
+    reset_local_index()
+
+
+@pytest.fixture(autouse=True)
+def clear_semantic_cache():
+    """Start every test with an empty semantic response cache."""
+    from backend.app.core.semanticCache import semantic_cache
+
+    semantic_cache.clear()
+    yield
+    semantic_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_tavily_caches():
+    """Start every test with empty Tavily response caches."""
+    from backend.app.agents.agentSearch import tavily_fallback_cache, tavily_result_cache
+
+    tavily_result_cache.clear()
+    tavily_fallback_cache.clear()
+    yield
+    tavily_result_cache.clear()
+    tavily_fallback_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache():
+    """Start every test with an empty cache of extracted pages."""
+    from backend.app.core.pageCache import page_cache
+
+    page_cache.clear()
+    yield
+    page_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions():
+    """Start every test without refinement sessions."""
+    from backend.app.core.sessionStore import session_store
+
+    session_store.clear()
+    yield
+    session_store.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_result_store():
+    """Start every test without stored /search results."""
+    from backend.app.core.resultStore import result_store
+
+    result_store.clear()
+    yield
+    result_store.clear()
+
+
 # =============================================================================
 # Mock LLM Fixtures
 # =============================================================================
@@ -107,6 +182,7 @@ def sample_agent_state():
         "current_date": "2024-12-20",
         "retry_count": 0,
         "search_queries": [],
+        "query_history": [],
         "query_status": "",
         "raw_results": [],
         "events": [],
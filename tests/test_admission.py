@@ -0,0 +1,93 @@
+"""
+Tests for backend.app.core.admission module.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.core import metrics
+from backend.app.core.admission import AdmissionController, AdmissionRejected
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController slots, queueing and rejection."""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_runs(self):
+        """Should never hold more slots than max_in_flight."""
+        controller = AdmissionController(max_in_flight=2, max_queue=10, max_wait_seconds=1.0)
+        running = 0
+        peak = 0
+
+        async def run():
+            nonlocal running, peak
+            async with controller.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(run() for _ in range(6)))
+
+        assert peak == 2
+        assert controller.in_flight == 0
+        assert metrics.get_counter("admission.admitted") == 6
+        assert metrics.snapshot()["observations"]["admission.wait_ms"]["count"] == 6
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Should reject immediately once max_queue requests are already waiting."""
+        controller = AdmissionController(max_in_flight=1, max_queue=1, max_wait_seconds=1.0)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        try:
+            assert controller.in_flight == 1
+            assert controller.waiting == 1
+            with pytest.raises(AdmissionRejected) as exc_info:
+                await controller.acquire()
+        finally:
+            release.set()
+            await asyncio.gather(holder, waiter)
+
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after >= 1
+        assert metrics.get_counter("admission.rejected.queue_full") == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_deadline(self):
+        """Should reject a waiting request that cannot start within max_wait_seconds."""
+        controller = AdmissionController(max_in_flight=1, max_queue=5, max_wait_seconds=0.01)
+
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire()
+        controller.release(0.5)
+
+        assert exc_info.value.reason == "timeout"
+        assert controller.waiting == 0
+        assert controller.in_flight == 0
+        assert metrics.snapshot()["gauges"]["admission.queue_depth"] == 0
+
+    def test_retry_after_scales_with_backlog(self):
+        """Should estimate the drain time from the average run time and backlog."""
+        controller = AdmissionController(max_in_flight=2, max_queue=5, max_wait_seconds=1.0)
+        controller._avg_run_seconds = 4.0
+        controller.in_flight = 2
+        controller.waiting = 4
+
+        assert controller.retry_after() == 12
@@ -2,6 +2,7 @@
 Tests for the FastAPI application endpoints.
 """
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -10,6 +11,14 @@ from httpx import ASGITransport, AsyncClient
 from backend.app.models.schemas import Event
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Give every test the full per-minute request budget."""
+    from main import limiter
+
+    limiter.reset()
+
+
 @pytest.fixture
 def sample_graph_result(sample_events):
     """Sample result from graph.ainvoke()."""
@@ -48,6 +57,63 @@ class TestSearchEndpoint:
             assert "elapsed_time" in data
             assert isinstance(data["elapsed_time"], float)
 
+    @pytest.mark.asyncio
+    async def test_paraphrased_query_served_from_semantic_cache(self, sample_graph_result):
+        """Should answer a near-duplicate query from the semantic cache without the graph."""
+        with patch("main.build_graph") as mock_build:
+            mock_graph = MagicMock()
+            mock_graph.ainvoke = AsyncMock(return_value=sample_graph_result)
+            mock_build.return_value = mock_graph
+
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                first = await client.post(
+                    "/search", json={"query": "Comedy shows in Chicago this weekend"}
+                )
+                second = await client.post(
+                    "/search", json={"query": "chicago comedy show this weekend"}
+                )
+
+            assert first.json()["cached"] is False
+            data = second.json()
+            assert data["cached"] is True
+            assert data["search_id"] == "test-search-id-123"
+            assert len(data["events"]) == 2
+            mock_graph.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_overload_returns_503_but_cache_hits_bypass(
+        self, sample_graph_result, monkeypatch
+    ):
+        """Should reject graph runs with 503 + Retry-After while cache hits are still served."""
+        import main
+        from backend.app.core.admission import AdmissionController
+
+        controller = AdmissionController(max_in_flight=1, max_queue=0, max_wait_seconds=0.01)
+        monkeypatch.setattr(main, "search_admission", controller)
+        mock_graph = MagicMock()
+        mock_graph.ainvoke = AsyncMock(return_value=sample_graph_result)
+
+        with patch("main.build_graph", return_value=mock_graph):
+            async with AsyncClient(
+                transport=ASGITransport(app=main.app), base_url="http://test"
+            ) as client:
+                await client.post("/search", json={"query": "Comedy shows in Chicago this weekend"})
+                await controller.acquire()  # saturate the only slot
+                rejected = await client.post("/search", json={"query": "Jazz in Boston tonight"})
+                cached = await client.post(
+                    "/search", json={"query": "chicago comedy show this weekend"}
+                )
+                controller.release(0.1)
+
+        assert rejected.status_code == 503
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert cached.status_code == 200
+        assert cached.json()["cached"] is True
+
     @pytest.mark.asyncio
     async def test_search_with_empty_results(self):
         """Should handle searches with no events found."""
@@ -128,6 +194,481 @@ class TestSearchEndpoint:
 
         assert response.status_code == 422
 
+    @pytest.mark.asyncio
+    async def test_filtered_pages_served_from_result_store(self, sample_events):
+        """Should filter, sort and page the events, serving later pages without the graph."""
+        events = [
+            event.model_copy(update={"title": f"Show {i}", "date": f"2024-12-2{i}", "score": i})
+            for i, event in enumerate(sample_events * 3)
+        ]
+        result = {"search_id": "paged-search", "query_status": "valid", "events": events}
+        body = {"query": "Comedy shows in Chicago", "min_score": 1, "sort_by": "score", "limit": 2}
+        with (
+            patch("main.build_graph") as mock_build,
+            patch("backend.app.core.config.SEMANTIC_CACHE_ENABLED", False),
+        ):
+            mock_graph = MagicMock()
+            mock_graph.ainvoke = AsyncMock(return_value=result)
+            mock_build.return_value = mock_graph
+
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                pages = [(await client.post("/search", json=body)).json()]
+                while pages[-1]["next_cursor"]:
+                    cursor = pages[-1]["next_cursor"]
+                    pages.append(
+                        (await client.post("/search", json={**body, "cursor": cursor})).json()
+                    )
+                other_sort = await client.post(
+                    "/search", json={**body, "sort_by": "date", "cursor": cursor}
+                )
+
+        assert [[e["title"] for e in p["events"]] for p in pages] == [
+            ["Show 5", "Show 4"],
+            ["Show 3", "Show 2"],
+            ["Show 1"],
+        ]
+        assert pages[0]["total_events"] == 5
+        assert mock_graph.ainvoke.await_count == 1
+        assert other_sort.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_expired_cursor(self):
+        """Should return 410 when the cursor's results are no longer stored."""
+        from backend.app.utils.eventFilters import EventQuery, encode_cursor
+        from main import app
+
+        cursor = encode_cursor("gone", 20, EventQuery())
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/search", json={"query": "comedy", "cursor": cursor})
+
+        assert response.status_code == 410
+
+
+class TestSearchStreamEndpoint:
+    """Tests for POST /search/stream endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_streams_nodes_events_then_result(self, sample_events):
+        """Should stream node and event lines before the final result line."""
+
+        async def astream(state, stream_mode):
+            yield "updates", {"validator": {"query_status": "valid"}}
+            for event in sample_events:
+                yield "custom", {"event": event.model_dump()}
+            yield "updates", {"extractor": {"events": sample_events}}
+            yield "updates", {"persistence": {"search_id": "stream-search-id"}}
+
+        mock_graph = MagicMock()
+        mock_graph.astream = astream
+        with patch("main.build_graph", return_value=mock_graph):
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/search/stream", json={"query": "Comedy shows in Chicago"}
+                )
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == [
+            "node",
+            "event",
+            "event",
+            "node",
+            "node",
+            "result",
+        ]
+        assert lines[1]["event"]["title"] == sample_events[0].title
+        assert lines[-1]["search_id"] == "stream-search-id"
+        assert len(lines[-1]["events"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_reports_errors_as_last_line(self):
+        """Should end the stream with an error line when the graph fails."""
+
+        async def astream(state, stream_mode):
+            raise RuntimeError("Graph failed")
+            yield  # pragma: no cover
+
+        mock_graph = MagicMock()
+        mock_graph.astream = astream
+        with patch("main.build_graph", return_value=mock_graph):
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post("/search/stream", json={"query": "Jazz in Paris"})
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"type": "error", "error": "Graph failed"}]
+
+
+class TestBatchSearchEndpoint:
+    """Tests for POST /search/batch endpoint."""
+
+    @staticmethod
+    def _graph_for(results: dict):
+        """Mock graph returning a result per query (or raising an exception)."""
+
+        async def ainvoke(state):
+            result = results[state["user_query"]]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        mock_graph = MagicMock()
+        mock_graph.ainvoke = AsyncMock(side_effect=ainvoke)
+        return mock_graph
+
+    @pytest.mark.asyncio
+    async def test_streams_ndjson_and_dedupes(self, sample_graph_result):
+        """Should run duplicate queries once and return one line per submitted query."""
+        empty = {"search_id": "empty-id", "query_status": "valid", "events": []}
+        mock_graph = self._graph_for(
+            {"Comedy shows in Chicago": sample_graph_result, "Jazz in Austin": empty}
+        )
+        with patch("main.build_graph", return_value=mock_graph) as mock_build:
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/search/batch",
+                    json={
+                        "queries": [
+                            "Comedy shows in Chicago",
+                            "Jazz in Austin",
+                            "  comedy shows in  chicago ",
+                        ]
+                    },
+                )
+
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            by_index = {line["index"]: line for line in lines}
+            assert sorted(by_index) == [0, 1, 2]
+            assert by_index[0]["search_id"] == by_index[2]["search_id"] == "test-search-id-123"
+            assert by_index[2]["query"] == "  comedy shows in  chicago "
+            assert by_index[1]["events"] == []
+            assert mock_graph.ainvoke.await_count == 2
+            mock_build.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_reports_errors_per_query(self, sample_graph_result):
+        """Should keep streaming other results when one query fails."""
+        mock_graph = self._graph_for(
+            {"Comedy shows in Chicago": sample_graph_result, "Broken": Exception("Graph failed")}
+        )
+        with patch("main.build_graph", return_value=mock_graph):
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/search/batch", json={"queries": ["Broken", "Comedy shows in Chicago"]}
+                )
+
+            lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+            assert lines[0]["status"] == "error"
+            assert "Graph failed" in lines[0]["error"]
+            assert lines[1]["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_shares_concurrency_limit(self, sample_graph_result, monkeypatch):
+        """Should never run more graphs at once than the batch semaphore allows."""
+        import asyncio
+
+        import main
+
+        monkeypatch.setattr(main.config, "BATCH_MAX_CONCURRENCY", 2)
+        monkeypatch.setattr(main, "_batch_semaphore", None)
+        running = 0
+        peak = 0
+
+        async def ainvoke(state):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {**sample_graph_result, "events": []}
+
+        mock_graph = MagicMock()
+        mock_graph.ainvoke = AsyncMock(side_effect=ainvoke)
+        with patch("main.build_graph", return_value=mock_graph):
+            async with AsyncClient(
+                transport=ASGITransport(app=main.app), base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/search/batch", json={"queries": [f"Concerts in city {i}" for i in range(6)]}
+                )
+
+        assert len(response.text.splitlines()) == 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_batch(self):
+        """Should return 422 for an empty list of queries."""
+        from main import app
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/search/batch", json={"queries": []})
+
+        assert response.status_code == 422
+
+
+class TestSessionEndpoints:
+    """Tests for POST /sessions and POST /sessions/{session_id}."""
+
+    @staticmethod
+    def _weekend_result() -> dict:
+        from datetime import date
+
+        from backend.app.utils.dateResolver import resolve_date_range
+
+        weekend = resolve_date_range("this weekend", date.today())
+        saturday, sunday = weekend["start"], weekend["end"]
+        return {
+            "search_id": "session-search-id",
+            "query_status": "valid",
+            "events": [
+                Event(
+                    title="Improv Jam",
+                    date=saturday,
+                    location="The Hideout",
+                    description="Improv comedy",
+                    url="https://hideout.com",
+                ),
+                Event(
+                    title="Sunday Standup",
+                    date=sunday,
+                    location="Laugh Factory",
+                    description="Stand-up comedy",
+                    url="https://laughfactory.com",
+                ),
+            ],
+            "raw_results": [
+                {"url": "https://hideout.com", "content": "Improv Jam in Wicker Park"},
+                {"url": "https://laughfactory.com", "content": "Sunday Standup in Lakeview"},
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_refinements_answered_locally_until_new_intent(self):
+        """Should narrow the session's results locally and search only for a new city."""
+        with patch("main.build_graph") as mock_build:
+            mock_graph = MagicMock()
+            mock_graph.ainvoke = AsyncMock(return_value=self._weekend_result())
+            mock_build.return_value = mock_graph
+
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                first = await client.post(
+                    "/sessions", json={"query": "comedy in Chicago this weekend"}
+                )
+                session_id = first.json()["session_id"]
+                near = await client.post(
+                    f"/sessions/{session_id}", json={"query": "near Wicker Park"}
+                )
+                sunday = await client.post(f"/sessions/{session_id}", json={"query": "Sunday"})
+                graph_runs_before_austin = mock_graph.ainvoke.await_count
+                austin = await client.post(
+                    f"/sessions/{session_id}", json={"query": "what about in Austin"}
+                )
+
+        assert first.json()["refinement"]["mode"] == "search"
+        assert len(first.json()["events"]) == 2
+        assert near.json()["refinement"]["mode"] == "local"
+        assert [e["title"] for e in near.json()["events"]] == ["Improv Jam"]
+        # Wicker Park is kept and Sunday has no event there: searched again
+        assert sunday.json()["refinement"]["mode"] == "search"
+        assert graph_runs_before_austin == 2
+        assert austin.json()["refinement"]["mode"] == "search"
+        assert "Austin" in austin.json()["refinement"]["query"]
+        assert mock_graph.ainvoke.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_session_from_cache_hit_keeps_raw_results(self):
+        """Should start a session from a cached search with the snippets it was built from."""
+        with patch("main.build_graph") as mock_build:
+            mock_graph = MagicMock()
+            mock_graph.ainvoke = AsyncMock(return_value=self._weekend_result())
+            mock_build.return_value = mock_graph
+
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                await client.post("/sessions", json={"query": "comedy in Chicago this weekend"})
+                cached = await client.post(
+                    "/sessions", json={"query": "comedy in Chicago this weekend"}
+                )
+                near = await client.post(
+                    f"/sessions/{cached.json()['session_id']}", json={"query": "near Wicker Park"}
+                )
+
+        assert cached.json()["cached"] is True
+        assert "raw_results" not in cached.json()
+        assert mock_graph.ainvoke.await_count == 1
+        # Wicker Park is only named in the snippet of the Improv Jam page
+        assert near.json()["refinement"]["mode"] == "local"
+        assert [e["title"] for e in near.json()["events"]] == ["Improv Jam"]
+
+    @pytest.mark.asyncio
+    async def test_search_for_same_intent_extends_the_session(self):
+        """Should seed a search for new dates with the session's results and merge them."""
+        from datetime import date, timedelta
+
+        from backend.app.core.sessionStore import session_store
+
+        next_saturday = date.fromisoformat(self._weekend_result()["events"][0].date) + timedelta(
+            days=7
+        )
+        late_show = Event(
+            title="Late Show",
+            date=next_saturday.isoformat(),
+            location="Zanies",
+            description="Comedy",
+            url="https://zanies.com",
+        )
+        first, second = self._weekend_result(), self._weekend_result()
+        second["events"].append(late_show)
+        second["raw_results"].append({"url": "https://zanies.com", "content": "Late Show"})
+        with patch("main.build_graph") as mock_build:
+            mock_graph = MagicMock()
+            mock_graph.ainvoke = AsyncMock(side_effect=[first, second])
+            mock_build.return_value = mock_graph
+
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                started = await client.post(
+                    "/sessions", json={"query": "comedy in Chicago this weekend"}
+                )
+                session_id = started.json()["session_id"]
+                later = await client.post(f"/sessions/{session_id}", json={"query": "next weekend"})
+
+        graph_input = mock_graph.ainvoke.await_args_list[1].args[0]
+        assert [r["url"] for r in graph_input["raw_results"]] == [
+            "https://hideout.com",
+            "https://laughfactory.com",
+        ]
+        assert later.json()["refinement"]["mode"] == "search"
+        assert [e["title"] for e in later.json()["events"]] == ["Late Show"]
+        session = session_store.get(session_id)
+        assert len(session.events) == 3
+        assert len(session.raw_results) == 3
+
+    @pytest.mark.asyncio
+    async def test_unsupported_refinement_is_rejected(self):
+        """Should answer "closer" with 422 and its reason, without searching again."""
+        with patch("main.build_graph") as mock_build:
+            mock_graph = MagicMock()
+            mock_graph.ainvoke = AsyncMock(return_value=self._weekend_result())
+            mock_build.return_value = mock_graph
+
+            from main import app
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                first = await client.post(
+                    "/sessions", json={"query": "comedy in Chicago this weekend"}
+                )
+                session_id = first.json()["session_id"]
+                closer = await client.post(
+                    f"/sessions/{session_id}", json={"query": "anything closer?"}
+                )
+
+        assert closer.status_code == 422
+        assert "unsupported refinement: 'closer'" in closer.json()["detail"]
+        assert mock_graph.ainvoke.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_session(self):
+        """Should return 404 for an unknown or expired session."""
+        from main import app
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/sessions/missing", json={"query": "only Saturday"})
+
+        assert response.status_code == 404
+
+
+class TestJobsEndpoint:
+    """Tests for POST /jobs and GET /jobs/{job_id}."""
+
+    @pytest.mark.asyncio
+    async def test_job_lifecycle(self, sample_events):
+        """Should return a job id immediately and expose node outputs and final events."""
+        import asyncio
+
+        async def astream(state, stream_mode):
+            assert "updates" in stream_mode
+            yield "updates", {"validator": {"query_status": "valid"}}
+            yield (
+                "updates",
+                {"searcher": {"raw_results": [{"url": "a"}], "new_raw_results": [{"url": "a"}]}},
+            )
+            yield "updates", {"extractor": {"events": sample_events}}
+            yield "updates", {"persistence": {"search_id": "job-search-id"}}
+
+        mock_graph = MagicMock()
+        mock_graph.astream = astream
+        with patch("main.build_graph", return_value=mock_graph):
+            from main import app, job_queue
+
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                created = await client.post("/jobs", json={"query": "Comedy shows in Chicago"})
+                assert created.status_code == 202
+                job_id = created.json()["job_id"]
+
+                for _ in range(200):
+                    job = (await client.get(f"/jobs/{job_id}")).json()
+                    if job["status"] == "completed":
+                        break
+                    await asyncio.sleep(0.005)
+
+            await job_queue.stop()
+
+        assert job["status"] == "completed"
+        assert [n["node"] for n in job["nodes"]] == [
+            "validator",
+            "searcher",
+            "extractor",
+            "persistence",
+        ]
+        assert job["nodes"][1]["output"]["raw_results_count"] == 1
+        assert len(job["events"]) == 2
+        assert job["result"]["search_id"] == "job-search-id"
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_returns_404(self):
+        """Should return 404 for unknown job ids."""
+        from main import app
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/jobs/does-not-exist")
+
+        assert response.status_code == 404
+
 
 class TestHealthEndpoint:
     """Tests for GET /health endpoint."""
@@ -166,6 +707,27 @@ class TestHealthEndpoint:
             assert data["components"]["database"] == "unhealthy"
 
 
+class TestMetricsEndpoint:
+    """Tests for GET /metrics endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_returns_snapshot(self):
+        """Should expose counters, gauges and observations."""
+        from backend.app.core import metrics
+        from main import app
+
+        metrics.increment("test.counter")
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["counters"]["test.counter"] >= 1
+        assert "gauges" in data
+        assert "observations" in data
+
+
 class TestRootEndpoint:
     """Tests for GET / endpoint."""
 
@@ -0,0 +1,133 @@
+"""
+Tests for backend.app.utils.bm25Index module.
+"""
+
+from array import array
+
+import pytest
+
+from backend.app.utils.bm25Index import BM25Index, tokenize
+
+
+@pytest.fixture
+def index():
+    index = BM25Index()
+    index.add("e1", "Holiday Concert at the Symphony Center Chicago", payload={"id": 1})
+    index.add("e2", "Stand-up comedy night at the Laugh Factory Chicago", payload={"id": 2})
+    index.add("e3", "Jazz concert in New Orleans", payload={"id": 3})
+    index.add("e4", "Comedy comedy comedy festival Austin", payload={"id": 4})
+    return index
+
+
+class TestTokenize:
+    """Tests for tokenize."""
+
+    def test_lowercases_and_drops_stop_words(self):
+        """Should keep lowercase alphanumeric tokens without stop words."""
+        assert tokenize("The Jazz Concert, in 2024!") == ["jazz", "concert", "2024"]
+
+
+class TestBM25Index:
+    """Tests for BM25Index ranking and updates."""
+
+    def test_ranks_by_bm25(self, index):
+        """Should rank documents matching more (and rarer) terms higher."""
+        results = index.search("comedy chicago", k=2)
+
+        assert [key for key, _, _ in results] == ["e2", "e4"]
+        assert results[0][2] == {"id": 2}
+        assert results[0][1] > results[1][1] > 0
+
+    def test_search_by_key_prefix(self, index):
+        """Should only rank documents whose key starts with the prefix."""
+        index.add("s1", "Comedy comedy comedy Chicago Chicago", payload={"id": 5})
+
+        assert [key for key, _, _ in index.search("comedy chicago", k=1, prefix="e")] == ["e2"]
+
+    def test_returns_empty_for_unknown_terms(self, index):
+        """Should return no results when no query term is indexed."""
+        assert index.search("opera berlin") == []
+        assert BM25Index().search("comedy") == []
+
+    def test_readding_key_replaces_document(self, index):
+        """Should replace a document that is added again under the same key."""
+        index.add("e3", "Blues festival in Memphis", payload={"id": 30})
+
+        assert len(index) == 4
+        assert index.search("new orleans") == []
+        assert index.search("memphis")[0][2] == {"id": 30}
+
+    def test_remove(self, index):
+        """Should skip removed documents at query time."""
+        index.remove("e2")
+
+        assert "e2" not in index
+        assert [key for key, _, _ in index.search("laugh factory")] == []
+
+    def test_compact_drops_tombstones(self, index):
+        """Should score like an index built from the live documents only."""
+        index.add("e3", "Blues festival in Memphis", payload={"id": 30})
+        index.remove("e2")
+        rebuilt = BM25Index()
+        rebuilt.add("e1", "Holiday Concert at the Symphony Center Chicago", payload={"id": 1})
+        rebuilt.add("e4", "Comedy comedy comedy festival Austin", payload={"id": 4})
+        rebuilt.add("e3", "Blues festival in Memphis", payload={"id": 30})
+
+        assert index.compact() == 2
+        assert index.tombstones == 0
+        assert index.posting_count == rebuilt.posting_count
+        for query in ["comedy chicago", "festival memphis", "new orleans"]:
+            assert index.search(query) == rebuilt.search(query)
+
+    def test_compact_after_load(self, index, tmp_path):
+        """Should compact a snapshot-backed index into arrays."""
+        path = str(tmp_path / "index.bin")
+        index.remove("e1")
+        index.save(path)
+        loaded = BM25Index.load(path)
+
+        assert loaded.compact() == 1
+        assert len(loaded) == 3
+        assert [key for key, _, _ in loaded.search("jazz concert")] == ["e3"]
+        assert isinstance(loaded._doc_ids[0], array)
+
+    def test_postings_are_compact(self, index):
+        """Should use 8 bytes per posting (uint32 doc id + frequency)."""
+        assert index.postings_nbytes() == 8 * index.posting_count
+
+
+class TestSnapshots:
+    """Tests for save/load via a memory-mapped snapshot."""
+
+    def test_round_trip(self, index, tmp_path):
+        """A loaded snapshot should return the same results as the original index."""
+        path = str(tmp_path / "index.bin")
+        index.remove("e1")
+        index.save(path)
+
+        loaded = BM25Index.load(path)
+
+        assert len(loaded) == 3
+        for query in ["comedy chicago", "jazz concert", "holiday symphony"]:
+            assert loaded.search(query) == index.search(query)
+        assert isinstance(loaded._doc_ids[0], memoryview)
+
+    def test_add_after_load(self, index, tmp_path):
+        """Should accept incremental updates on top of a loaded snapshot."""
+        path = str(tmp_path / "index.bin")
+        index.save(path)
+        loaded = BM25Index.load(path)
+
+        loaded.add("e5", "Comedy showcase Chicago", payload={"id": 5})
+
+        assert "e5" in [key for key, _, _ in loaded.search("comedy showcase")]
+        loaded.save(path)
+        assert len(BM25Index.load(path)) == 5
+
+    def test_rejects_invalid_file(self, tmp_path):
+        """Should raise ValueError for files that are not snapshots."""
+        path = tmp_path / "bad.bin"
+        path.write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            BM25Index.load(str(path))
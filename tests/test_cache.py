@@ -0,0 +1,48 @@
+"""
+Tests for backend.app.core.cache module.
+"""
+
+from unittest.mock import patch
+
+from backend.app.core.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for the TTLCache class."""
+
+    def test_get_returns_stored_value(self):
+        """Should return values that were set."""
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Should drop the least recently used entry when full."""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+
+    def test_per_entry_ttl_overrides_default(self):
+        """Should keep an entry stored with a longer TTL past the cache's TTL."""
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        with patch("backend.app.core.cache.time.monotonic", return_value=1000.0):
+            cache.set("warm", 1, ttl_seconds=3600)
+            cache.set("cold", 2)
+        with patch("backend.app.core.cache.time.monotonic", return_value=1061.0):
+            assert cache.get("warm") == 1
+            assert cache.get("cold") is None
+
+    def test_expires_entries_after_ttl(self):
+        """Should treat entries older than the TTL as missing."""
+        cache = TTLCache(max_entries=10, ttl_seconds=60)
+        with patch("backend.app.core.cache.time.monotonic", return_value=1000.0):
+            cache.set("a", 1)
+        with patch("backend.app.core.cache.time.monotonic", return_value=1061.0):
+            assert cache.get("a") is None
@@ -0,0 +1,168 @@
+"""
+Tests for backend.app.core.cacheWarmer module.
+"""
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.app.core import cacheWarmer, config, metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestIsOffPeak:
+    """Tests for is_off_peak."""
+
+    def test_simple_window(self, monkeypatch):
+        """Should match hours in [start, end)."""
+        monkeypatch.setattr(config, "CACHE_WARMER_OFF_PEAK_START_HOUR", 2)
+        monkeypatch.setattr(config, "CACHE_WARMER_OFF_PEAK_END_HOUR", 6)
+
+        assert cacheWarmer.is_off_peak(datetime.datetime(2024, 12, 20, 3))
+        assert not cacheWarmer.is_off_peak(datetime.datetime(2024, 12, 20, 6))
+
+    def test_window_wrapping_midnight(self, monkeypatch):
+        """Should support windows such as 23:00-05:00."""
+        monkeypatch.setattr(config, "CACHE_WARMER_OFF_PEAK_START_HOUR", 23)
+        monkeypatch.setattr(config, "CACHE_WARMER_OFF_PEAK_END_HOUR", 5)
+
+        assert cacheWarmer.is_off_peak(datetime.datetime(2024, 12, 20, 23))
+        assert cacheWarmer.is_off_peak(datetime.datetime(2024, 12, 20, 1))
+        assert not cacheWarmer.is_off_peak(datetime.datetime(2024, 12, 20, 12))
+
+
+class TestMineHotQueries:
+    """Tests for mine_hot_queries."""
+
+    def test_aggregates_recent_query_frequencies(self):
+        """Should group recent successful searches by normalized query, hottest first."""
+        collection = MagicMock()
+        collection.aggregate.return_value = [
+            {"_id": "comedy shows in chicago this weekend", "count": 12},
+            {"_id": "concerts in austin", "count": 4},
+        ]
+        with patch.object(cacheWarmer, "get_db_collection", return_value=collection):
+            now = datetime.datetime(2024, 12, 20, 3)
+            result = cacheWarmer.mine_hot_queries(now)
+
+        assert result == [("comedy shows in chicago this weekend", 12), ("concerts in austin", 4)]
+        pipeline = collection.aggregate.call_args[0][0]
+        cutoff = pipeline[0]["$match"]["$or"][0]["timestamp"]["$gte"]
+        assert cutoff == now - datetime.timedelta(hours=config.CACHE_WARMER_LOOKBACK_HOURS)
+        assert pipeline[-1] == {"$limit": config.CACHE_WARMER_TOP_QUERIES}
+
+
+class TestRunWarmCycle:
+    """Tests for run_warm_cycle."""
+
+    @pytest.mark.asyncio
+    async def test_warms_and_skips_cached(self):
+        """Should count cache hits as skipped and new runs as warmed."""
+        runner = AsyncMock(side_effect=[{"cached": False}, {"cached": True}])
+
+        summary = await cacheWarmer.run_warm_cycle(runner, [("a", 5), ("b", 3)])
+
+        assert summary["warmed"] == 1
+        assert summary["skipped"] == 1
+        assert runner.await_args_list[0].args == ("a",)
+
+    @pytest.mark.asyncio
+    async def test_stops_when_tavily_budget_spent(self, monkeypatch):
+        """Should stop before the next query once the credit cap is reached."""
+        monkeypatch.setattr(config, "CACHE_WARMER_MAX_TAVILY_CREDITS", 5)
+
+        async def runner(query):
+            metrics.increment("tavily.credits", 3)
+            return {"cached": False}
+
+        summary = await cacheWarmer.run_warm_cycle(runner, [("a", 9), ("b", 8), ("c", 7)])
+
+        assert summary["warmed"] == 2
+        assert summary["budget_exhausted"] is True
+        assert summary["tavily_credits"] == 6
+
+    @pytest.mark.asyncio
+    async def test_stops_when_llm_budget_spent(self, monkeypatch):
+        """Should track LLM spend across all models."""
+        monkeypatch.setattr(config, "CACHE_WARMER_MAX_LLM_COST_USD", 0.01)
+
+        async def runner(query):
+            metrics.increment("llm.gpt-4o.cost_usd", 0.008)
+            metrics.increment("llm.gpt-4o-mini.cost_usd", 0.002)
+            return {"cached": False}
+
+        summary = await cacheWarmer.run_warm_cycle(runner, [("a", 9), ("b", 8)])
+
+        assert summary["warmed"] == 1
+        assert summary["budget_exhausted"] is True
+
+    @pytest.mark.asyncio
+    async def test_ignores_concurrent_user_spend(self, monkeypatch):
+        """Should meter only the warmer's own runs, not spend of concurrent requests."""
+        monkeypatch.setattr(config, "CACHE_WARMER_MAX_TAVILY_CREDITS", 5)
+
+        async def user_request():
+            for _ in range(3):
+                metrics.increment("tavily.credits", 100)
+                await asyncio.sleep(0)
+
+        async def runner(query):
+            metrics.increment("tavily.credits", 1)
+            await asyncio.sleep(0)
+            return {"cached": False}
+
+        user = asyncio.create_task(user_request())
+        summary = await cacheWarmer.run_warm_cycle(runner, [("a", 9), ("b", 8), ("c", 7)])
+        await user
+
+        assert summary["warmed"] == 3
+        assert summary["tavily_credits"] == 3
+        assert metrics.get_counter("tavily.credits") == 303
+
+    @pytest.mark.asyncio
+    async def test_continues_after_failure(self):
+        """Should keep warming other queries when one fails."""
+        runner = AsyncMock(side_effect=[Exception("boom"), {"cached": False}])
+
+        summary = await cacheWarmer.run_warm_cycle(runner, [("a", 5), ("b", 3)])
+
+        assert summary["failed"] == 1
+        assert summary["warmed"] == 1
+
+
+class TestCacheWarmer:
+    """Tests for the CacheWarmer scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_only_warms_off_peak(self, monkeypatch):
+        """Should not run a cycle during peak hours."""
+        monkeypatch.setattr(config, "CACHE_WARMER_OFF_PEAK_START_HOUR", 2)
+        monkeypatch.setattr(config, "CACHE_WARMER_OFF_PEAK_END_HOUR", 6)
+        runner = AsyncMock(return_value={"cached": False})
+        warmer = cacheWarmer.CacheWarmer(runner)
+
+        with patch.object(cacheWarmer, "mine_hot_queries", return_value=[("a", 3)]):
+            assert await warmer.warm_once(datetime.datetime(2024, 12, 20, 18)) is None
+            summary = await warmer.warm_once(datetime.datetime(2024, 12, 20, 3))
+
+        assert summary["warmed"] == 1
+        runner.assert_awaited_once_with("a")
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, monkeypatch):
+        """Should run in a background task that can be cancelled."""
+        warmer = cacheWarmer.CacheWarmer(AsyncMock())
+        monkeypatch.setattr(warmer, "warm_once", AsyncMock(return_value=None))
+
+        warmer.start()
+        await warmer.stop()
+
+        assert warmer._task is None
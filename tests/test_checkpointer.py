@@ -0,0 +1,320 @@
+"""
+Tests for backend.app.core.checkpointer module (graph checkpoints and resume).
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.app.core import checkpointer as checkpointer_module
+from backend.app.core.checkpointer import (
+    MongoCheckpointSaver,
+    SqliteCheckpointSaver,
+    StoreCheckpointSaver,
+    create_checkpointer,
+    get_checkpointer,
+    thread_config,
+)
+from backend.app.graph import build_graph
+from backend.app.models.schemas import Event
+
+SNIPPET = {"url": "https://www.zanies.com/chicago", "content": "Comedy on Dec 21", "score": 0.9}
+EVENT = Event(
+    title="Comedy Night",
+    date="2024-12-21",
+    location="Zanies",
+    description="Stand-up",
+    url=SNIPPET["url"],
+    score=0.9,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def saver(request, tmp_path):
+    if request.param == "memory":
+        yield create_checkpointer("memory")
+    else:
+        sqlite_saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.db"))
+        yield sqlite_saver
+        sqlite_saver.close()
+
+
+class FlakyPipeline:
+    """Patched graph nodes that count their calls; the extractor fails on its first call."""
+
+    def __init__(self):
+        self.calls = {"validator": 0, "rewriter": 0, "searcher": 0, "extractor": 0}
+
+    def _count(self, node: str) -> None:
+        self.calls[node] += 1
+
+    def validator(self, state):
+        self._count("validator")
+        return {"query_status": "valid"}
+
+    def rewriter(self, state):
+        self._count("rewriter")
+        return {"search_queries": ["comedy chicago"], "search_facets": []}
+
+    def searcher(self, state):
+        self._count("searcher")
+        return {"raw_results": [SNIPPET], "new_raw_results": [SNIPPET]}
+
+    def extractor(self, state):
+        self._count("extractor")
+        if self.calls["extractor"] == 1:
+            raise RuntimeError("OpenAI connection reset")
+        return {"events": [EVENT]}
+
+    def patches(self):
+        return (
+            patch("backend.app.graph.query_validator_node", side_effect=self.validator),
+            patch("backend.app.graph.event_index_node", return_value={"index_status": "miss"}),
+            patch("backend.app.graph.query_rewriter_node", side_effect=self.rewriter),
+            patch("backend.app.graph.search_node", side_effect=self.searcher),
+            patch("backend.app.graph.extraction_node", side_effect=self.extractor),
+            patch("backend.app.graph.persistence_node", side_effect=lambda s: {}),
+        )
+
+
+class TestGraphResume:
+    """Resuming a failed graph run from its checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_nodes(self, saver):
+        """Should re-run only the failed node, with the state of the completed ones."""
+        pipeline = FlakyPipeline()
+        state = {"user_query": "comedy in Chicago", "current_date": "2024-12-20", "retry_count": 0}
+        run = thread_config("search-1")
+
+        validator, index, rewriter, searcher, extractor, persistence = pipeline.patches()
+        with validator, index, rewriter, searcher, extractor, persistence:
+            graph = build_graph(checkpointer=saver)
+            with pytest.raises(RuntimeError):
+                await graph.ainvoke({**state, "search_id": "search-1"}, run)
+
+            snapshot = await graph.aget_state(run)
+            assert snapshot.next == ("extractor",)
+
+            result = await graph.ainvoke(None, run)
+
+        assert result["events"] == [EVENT]
+        assert result["raw_results"] == [SNIPPET]
+        assert result["search_id"] == "search-1"
+        assert pipeline.calls == {"validator": 1, "rewriter": 1, "searcher": 1, "extractor": 2}
+
+    @pytest.mark.asyncio
+    async def test_threads_are_independent(self, saver):
+        """Should keep the checkpoints of different search_ids apart."""
+        pipeline = FlakyPipeline()
+        state = {"user_query": "comedy in Chicago", "current_date": "2024-12-20", "retry_count": 0}
+
+        validator, index, rewriter, searcher, extractor, persistence = pipeline.patches()
+        with validator, index, rewriter, searcher, extractor, persistence:
+            graph = build_graph(checkpointer=saver)
+            with pytest.raises(RuntimeError):
+                await graph.ainvoke(state, thread_config("failed"))
+            await graph.ainvoke(state, thread_config("other"))
+
+            assert (await graph.aget_state(thread_config("failed"))).next == ("extractor",)
+            assert (await graph.aget_state(thread_config("other"))).next == ()
+
+
+class TestSqliteCheckpointSaver:
+    """Tests for the SqliteCheckpointSaver class."""
+
+    @pytest.mark.asyncio
+    async def test_survives_reopening_the_file(self, tmp_path):
+        """Should resume from checkpoints written by a previous process."""
+        path = str(tmp_path / "checkpoints.db")
+        pipeline = FlakyPipeline()
+        state = {"user_query": "comedy in Chicago", "current_date": "2024-12-20", "retry_count": 0}
+        run = thread_config("search-1")
+
+        validator, index, rewriter, searcher, extractor, persistence = pipeline.patches()
+        with validator, index, rewriter, searcher, extractor, persistence:
+            first = SqliteCheckpointSaver(path)
+            with pytest.raises(RuntimeError):
+                await build_graph(checkpointer=first).ainvoke(state, run)
+            first.close()
+
+            second = SqliteCheckpointSaver(path)
+            result = await build_graph(checkpointer=second).ainvoke(None, run)
+            second.close()
+
+        assert result["events"] == [EVENT]
+        assert pipeline.calls["searcher"] == 1
+
+    @pytest.mark.asyncio
+    async def test_list_and_delete_thread(self, tmp_path):
+        """Should list a thread's checkpoints newest first and delete them all."""
+        saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.db"))
+        pipeline = FlakyPipeline()
+        state = {"user_query": "comedy in Chicago", "current_date": "2024-12-20", "retry_count": 0}
+
+        validator, index, rewriter, searcher, extractor, persistence = pipeline.patches()
+        with validator, index, rewriter, searcher, extractor, persistence:
+            graph = build_graph(checkpointer=saver)
+            with pytest.raises(RuntimeError):
+                await graph.ainvoke(state, thread_config("search-1"))
+
+        listed = list(saver.list(thread_config("search-1")))
+        ids = [t.config["configurable"]["checkpoint_id"] for t in listed]
+        assert len(listed) > 3
+        assert ids == sorted(ids, reverse=True)
+        assert listed[0].parent_config["configurable"]["checkpoint_id"] == ids[1]
+        assert len(list(saver.list(thread_config("search-1"), limit=2))) == 2
+        assert len(list(saver.list(None, before=listed[1].config))) == len(listed) - 2
+        assert list(saver.list(None, filter={"source": "input"}))[0].checkpoint["id"] == ids[-1]
+
+        saver.delete_thread("search-1")
+        assert saver.get_tuple(thread_config("search-1")) is None
+        saver.close()
+
+
+class TestMongoCheckpointSaver:
+    """Tests for the MongoCheckpointSaver class."""
+
+    def test_store_saver_requires_storage_primitives(self):
+        """Should not instantiate a store saver that does not implement its rows."""
+        with pytest.raises(TypeError):
+            StoreCheckpointSaver()  # type: ignore[abstract]
+
+    def test_rows_carry_created_at_for_ttl(self):
+        """Should index the collections once and stamp rows with created_at."""
+        collections: dict = {}
+        with (
+            patch(
+                "backend.app.core.dbClient.get_named_collection",
+                side_effect=lambda name: collections.setdefault(name, MagicMock()),
+            ),
+            patch("backend.app.core.dbClient.ensure_checkpoint_indexes") as mock_indexes,
+        ):
+            saver = MongoCheckpointSaver("checkpoints")
+            saver._save_writes(
+                [
+                    {
+                        "thread_id": "search-1",
+                        "checkpoint_ns": "",
+                        "checkpoint_id": "1",
+                        "task_id": "task",
+                        "idx": 0,
+                    }
+                ]
+            )
+            saver.delete_thread("search-1")
+
+        mock_indexes.assert_called_once_with("checkpoints")
+        operation = collections["checkpoints_writes"].bulk_write.call_args[0][0][0]
+        assert "created_at" in operation._doc["$setOnInsert"]
+
+    def test_fails_fast_when_mongodb_breaker_open(self):
+        """Should not touch MongoDB while its circuit breaker is open."""
+        from backend.app.core import config
+        from backend.app.core.circuitBreaker import CircuitOpenError, get_breaker
+
+        breaker = get_breaker("mongodb")
+        for _ in range(config.CIRCUIT_BREAKER_MIN_CALLS):
+            breaker.record_failure()
+        collection = MagicMock()
+        with (
+            patch("backend.app.core.dbClient.get_named_collection", return_value=collection),
+            patch("backend.app.core.dbClient.ensure_checkpoint_indexes"),
+        ):
+            saver = MongoCheckpointSaver("checkpoints")
+            with pytest.raises(CircuitOpenError):
+                saver.get_tuple(thread_config("search-1"))
+
+        collection.find.assert_not_called()
+
+
+class TestGetCheckpointer:
+    """Tests for get_checkpointer and create_checkpointer."""
+
+    def test_none_backend_disables_checkpoints(self):
+        """Should return no checkpointer by default."""
+        with patch("backend.app.core.config.CHECKPOINTER_BACKEND", "none"):
+            assert get_checkpointer() is None
+
+    def test_shared_instance_per_process(self):
+        """Should create the configured checkpointer once."""
+        with patch("backend.app.core.config.CHECKPOINTER_BACKEND", "memory"):
+            first = get_checkpointer()
+            assert isinstance(first, InMemorySaver)
+            assert get_checkpointer() is first
+        checkpointer_module.reset_checkpointer()
+
+    def test_unknown_backend(self):
+        """Should reject an unknown backend name."""
+        with pytest.raises(ValueError, match="postgres"):
+            create_checkpointer("postgres")
+
+
+class TestResumeSearch:
+    """execute_search and POST /search/{search_id}/resume with checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_execute_search_resumes_and_drops_checkpoints(self, saver):
+        """Should finish a failed run from its checkpoint, then delete the thread."""
+        from main import execute_search
+
+        pipeline = FlakyPipeline()
+        validator, index, rewriter, searcher, extractor, persistence = pipeline.patches()
+        with (
+            validator,
+            index,
+            rewriter,
+            searcher,
+            extractor,
+            persistence,
+            patch("backend.app.core.config.SEMANTIC_CACHE_ENABLED", False),
+        ):
+            graph = build_graph(checkpointer=saver)
+            with pytest.raises(RuntimeError):
+                await execute_search("comedy in Chicago", graph=graph, search_id="search-1")
+
+            response = await execute_search(
+                "comedy in Chicago", graph=graph, search_id="search-1", resume=True
+            )
+
+        assert response["search_id"] == "search-1"
+        assert [e["title"] for e in response["events"]] == ["Comedy Night"]
+        assert pipeline.calls["searcher"] == 1
+        assert saver.get_tuple(thread_config("search-1")) is None
+
+    @pytest.mark.asyncio
+    async def test_resume_endpoint(self):
+        """Should name the search_id of a failed search and resume it by that id."""
+        from httpx import ASGITransport, AsyncClient
+
+        from main import app
+
+        saver = create_checkpointer("memory")
+        pipeline = FlakyPipeline()
+        validator, index, rewriter, searcher, extractor, persistence = pipeline.patches()
+        with (
+            validator,
+            index,
+            rewriter,
+            searcher,
+            extractor,
+            persistence,
+            patch("backend.app.core.config.SEMANTIC_CACHE_ENABLED", False),
+            patch("main.get_checkpointer", return_value=saver),
+            patch("main.build_graph", side_effect=lambda: build_graph(checkpointer=saver)),
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                failed = await client.post("/search", json={"query": "comedy in Chicago"})
+                search_id = failed.json()["search_id"]
+                resumed = await client.post(f"/search/{search_id}/resume")
+                again = await client.post(f"/search/{search_id}/resume")
+
+        assert failed.status_code == 500
+        assert resumed.status_code == 200
+        assert resumed.json()["search_id"] == search_id
+        assert len(resumed.json()["events"]) == 1
+        assert again.status_code == 404
+        assert pipeline.calls["validator"] == 1
@@ -0,0 +1,166 @@
+"""
+Tests for backend.app.core.circuitBreaker module.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.core.circuitBreaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    breaker_states,
+    get_breaker,
+)
+
+
+def _failing():
+    raise ConnectionError("upstream down")
+
+
+def _make_breaker(**overrides) -> CircuitBreaker:
+    options = {"slow_call_ms": 1000, "window_size": 10, "min_calls": 4, "open_seconds": 60}
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker state machine."""
+
+    def test_opens_after_failure_rate_threshold(self):
+        """Should open once the failure rate over the window crosses the threshold."""
+        breaker = _make_breaker()
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                breaker.call(_failing)
+
+        assert breaker.state == OPEN
+
+    def test_fails_fast_while_open(self):
+        """Should reject calls without invoking the dependency."""
+        breaker = _make_breaker()
+        for _ in range(4):
+            breaker.record_failure()
+
+        calls = []
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.call(lambda: calls.append(1))
+
+        assert calls == []
+        assert exc_info.value.retry_after > 0
+
+    def test_stays_closed_below_min_calls(self):
+        """Should not open on a handful of failures before min_calls is reached."""
+        breaker = _make_breaker()
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_opens_on_slow_call_rate(self):
+        """Should open when most calls exceed the latency threshold."""
+        breaker = _make_breaker(slow_call_rate_threshold=0.75)
+        for _ in range(4):
+            breaker.record_success(latency_ms=5000)
+        assert breaker.state == OPEN
+
+    def test_half_open_probe_success_closes(self):
+        """Should let one probe through after the open period and close on success."""
+        breaker = _make_breaker(open_seconds=0)
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_failure_reopens(self):
+        """Should go back to open when the probe fails."""
+        breaker = _make_breaker(open_seconds=0)
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert breaker.state == HALF_OPEN
+        breaker.open_seconds = 60
+        with pytest.raises(ConnectionError):
+            breaker.call(_failing)
+        assert breaker.state == OPEN
+
+    def test_ignored_errors_do_not_count(self):
+        """Should re-raise ignored errors without recording a failure."""
+        breaker = _make_breaker()
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                breaker.call(_failing, ignore=ConnectionError)
+
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["window_calls"] == 0
+
+    def test_probe_without_outcome_releases_slot(self):
+        """Should let the next probe through when an ignored error ends the probe."""
+        breaker = _make_breaker(open_seconds=0)
+        for _ in range(4):
+            breaker.record_failure()
+
+        with pytest.raises(ConnectionError):
+            breaker.call(_failing, ignore=ConnectionError)
+        assert breaker.state == HALF_OPEN
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_slot(self):
+        """Should give back the half-open slot when the probe is cancelled."""
+        breaker = _make_breaker(open_seconds=0)
+        for _ in range(4):
+            breaker.record_failure()
+
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        with pytest.raises(asyncio.CancelledError):
+            await breaker.acall(cancelled)
+        assert breaker.allow_request()
+
+    def test_disabled_breaker_passes_calls_through(self, monkeypatch):
+        """Should never reject when CIRCUIT_BREAKER_ENABLED is false."""
+        from backend.app.core import config
+
+        monkeypatch.setattr(config, "CIRCUIT_BREAKER_ENABLED", False)
+        breaker = _make_breaker()
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert breaker.call(lambda: "ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_acall_records_async_failures(self):
+        """Should track failures of async calls."""
+        breaker = _make_breaker()
+
+        async def failing():
+            raise ConnectionError("down")
+
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                await breaker.acall(failing)
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.acall(failing)
+
+
+class TestBreakerRegistry:
+    """Tests for the per-dependency registry."""
+
+    def test_returns_one_breaker_per_dependency(self):
+        """Should share state per dependency name."""
+        assert get_breaker("tavily") is get_breaker("tavily")
+        assert get_breaker("tavily") is not get_breaker("openai")
+
+    def test_breaker_states_reports_each_dependency(self):
+        """Should expose state per dependency for metrics."""
+        get_breaker("mongodb")
+        states = breaker_states()
+        assert states["mongodb"]["state"] == CLOSED
@@ -151,6 +151,29 @@ class TestConfigDefaults:
         assert config.LLM_MODEL == "gpt-4o"
         assert config.LLM_TEMPERATURE == 0.0
 
+    def test_per_node_model_defaults(self, monkeypatch):
+        """Should route short-output nodes to the small model by default."""
+        for key in (
+            "LLM_MODEL",
+            "LLM_SMALL_MODEL",
+            "VALIDATOR_MODEL",
+            "REWRITER_MODEL",
+            "EXTRACTOR_MODEL",
+            "EXTRACTOR_ROUTER_ENABLED",
+        ):
+            monkeypatch.delenv(key, raising=False)
+
+        import importlib
+
+        from backend.app.core import config
+
+        importlib.reload(config)
+
+        assert config.VALIDATOR_MODEL == "gpt-4o-mini"
+        assert config.REWRITER_MODEL == "gpt-4o-mini"
+        assert config.EXTRACTOR_MODEL == "gpt-4o"
+        assert config.EXTRACTOR_ROUTER_ENABLED is False
+
     def test_server_defaults(self, monkeypatch):
         """Should have correct server defaults."""
         monkeypatch.delenv("SERVER_HOST", raising=False)
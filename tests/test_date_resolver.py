@@ -0,0 +1,128 @@
+"""
+Tests for backend.app.utils.dateResolver module.
+"""
+
+from datetime import date
+
+import pytest
+
+from backend.app.utils.dateResolver import (
+    date_spans,
+    has_absolute_date,
+    normalize_event_date,
+    resolve_date_range,
+)
+
+# Friday, 2024-12-20
+TODAY = date(2024, 12, 20)
+
+
+class TestResolveDateRange:
+    """Tests for resolve_date_range function."""
+
+    @pytest.mark.parametrize(
+        ("query", "start", "end"),
+        [
+            ("Comedy shows in Chicago this weekend", "2024-12-21", "2024-12-22"),
+            ("Jazz next weekend", "2024-12-28", "2024-12-29"),
+            ("Concerts tonight in Austin", "2024-12-20", "2024-12-20"),
+            ("Shows tomorrow night", "2024-12-21", "2024-12-21"),
+            ("Trivia on Sunday", "2024-12-22", "2024-12-22"),
+            ("Open mic next Tuesday", "2024-12-24", "2024-12-24"),
+            ("Food festivals next month", "2025-01-01", "2025-01-31"),
+            ("Markets this month", "2024-12-20", "2024-12-31"),
+            ("Parties on New Year's Eve", "2024-12-31", "2024-12-31"),
+            ("Thanksgiving parade", "2025-11-27", "2025-11-27"),
+            ("Concerts Dec 27-29", "2024-12-27", "2024-12-29"),
+            ("Parties Dec 30 - Jan 2", "2024-12-30", "2025-01-02"),
+            ("Parties dec 30 to jan 2, 2026", "2025-12-30", "2026-01-02"),
+            ("Events from 2025-01-03 to 2025-01-05", "2025-01-03", "2025-01-05"),
+            ("Comedy between Friday and Sunday", "2024-12-20", "2024-12-22"),
+            ("Festivals in March", "2025-03-01", "2025-03-31"),
+            ("Festivals this summer", "2025-06-01", "2025-08-31"),
+            ("Things to do in the next 3 days", "2024-12-20", "2024-12-22"),
+            ("Conferences in Berlin 2025", "2025-01-01", "2025-12-31"),
+        ],
+    )
+    def test_resolves_expressions(self, query, start, end):
+        """Should resolve common date expressions to concrete ranges."""
+        result = resolve_date_range(query, TODAY)
+        assert result is not None
+        assert (result["start"], result["end"]) == (start, end)
+
+    def test_weekend_on_sunday_starts_today(self):
+        """Should not return a range starting in the past."""
+        result = resolve_date_range("this weekend", date(2024, 12, 22))
+        assert (result["start"], result["end"]) == ("2024-12-22", "2024-12-22")
+
+    def test_past_period_is_not_inverted(self):
+        """Should keep an explicit past month as is instead of clamping its start to today."""
+        result = resolve_date_range("gigs in March 2024", TODAY)
+        assert (result["start"], result["end"]) == ("2024-03-01", "2024-03-31")
+
+    def test_keeps_matched_expression(self):
+        """Should report which expression was resolved."""
+        assert resolve_date_range("comedy this weekend", TODAY)["expression"] == "this weekend"
+
+    @pytest.mark.parametrize(
+        "query", ["Tech conferences in Berlin", "Marathons in Boston", "Events that may sell out"]
+    )
+    def test_returns_none_without_date_expression(self, query):
+        """Should not mistake words like 'marathons' or 'may' for dates."""
+        assert resolve_date_range(query, TODAY) is None
+
+
+class TestNormalizeEventDate:
+    """Tests for normalize_event_date function."""
+
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            ("2024-12-25", "2024-12-25"),
+            ("2024-12-25T19:30:00", "2024-12-25 19:30"),
+            ("December 28, 2024 at 7:30 pm", "2024-12-28 19:30"),
+            ("Dec 26", "2024-12-26"),
+            ("12/31/2024", "2024-12-31"),
+        ],
+    )
+    def test_normalizes_absolute_dates(self, raw, expected):
+        """Should produce sortable YYYY-MM-DD[ HH:MM] strings."""
+        assert normalize_event_date(raw, TODAY) == expected
+
+    def test_resolves_weekday_inside_requested_range(self):
+        """Should anchor relative dates to the start of the requested range."""
+        date_range = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+        assert normalize_event_date("Sunday, 9pm", TODAY, date_range) == "2024-12-22 21:00"
+
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            ("December 28, 2024. Doors 7:30, show 9pm", "2024-12-28 21:00"),
+            ("December 28, 2024, 7:30", "2024-12-28"),
+            ("December 28, 2024, 07:30", "2024-12-28 07:30"),
+            ("December 28, 2024, 20:00", "2024-12-28 20:00"),
+        ],
+    )
+    def test_bare_times_before_noon_are_ambiguous(self, raw, expected):
+        """Should prefer am/pm times and not read a lone "7:30" as 07:30."""
+        assert normalize_event_date(raw, TODAY) == expected
+
+    def test_returns_none_for_unparseable_dates(self):
+        """Should leave unknown formats to the caller."""
+        assert normalize_event_date("TBA", TODAY) is None
+
+
+class TestDateSpans:
+    """Tests for date_spans and has_absolute_date functions."""
+
+    def test_spans_cover_dates_weekdays_and_times(self):
+        """Should locate every date and time expression in the original text."""
+        text = "Jazz Night - Sat, December 21 at 8pm"
+        found = [text[start:end] for start, end in date_spans(text)]
+        assert found == ["Sat", "December 21", "8pm"]
+
+    def test_absolute_dates_only(self):
+        """Should not count weekday names or times as calendar dates."""
+        assert has_absolute_date("Show on 12/21/2024")
+        assert has_absolute_date("Doors 7pm, 21st of December")
+        assert not has_absolute_date("Every Friday at 8pm")
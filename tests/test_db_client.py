@@ -5,6 +5,7 @@ Tests for backend.app.core.dbClient module.
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pymongo.errors import OperationFailure
 
 
 class TestGetDbClient:
@@ -67,6 +68,43 @@ class TestGetDbClient:
         # Reset for other tests
         db_module._client = None
 
+    def test_fails_fast_when_breaker_open(self, monkeypatch):
+        """Should not attempt a new connection while the MongoDB breaker is open."""
+        import backend.app.core.dbClient as db_module
+        from backend.app.core import config
+        from backend.app.core.circuitBreaker import CircuitOpenError, get_breaker
+
+        monkeypatch.setattr(config, "MONGODB_URI", "mongodb://localhost:27017")
+        db_module._client = None
+        breaker = get_breaker("mongodb")
+        for _ in range(config.CIRCUIT_BREAKER_MIN_CALLS):
+            breaker.record_failure()
+
+        with patch("backend.app.core.dbClient.MongoClient") as mock_mongo:
+            from backend.app.core.dbClient import get_db_client
+
+            with pytest.raises(CircuitOpenError):
+                get_db_client()
+            mock_mongo.assert_not_called()
+
+    def test_unexpected_connect_error_counts_as_failure(self, monkeypatch):
+        """Should record any connection error, not only ConnectionFailure."""
+        import backend.app.core.dbClient as db_module
+        from backend.app.core import config
+        from backend.app.core.circuitBreaker import get_breaker
+
+        monkeypatch.setattr(config, "MONGODB_URI", "mongodb://localhost:27017")
+        db_module._client = None
+        with patch("backend.app.core.dbClient.MongoClient") as mock_mongo:
+            mock_mongo.return_value.admin.command.side_effect = OperationFailure("auth failed")
+            from backend.app.core.dbClient import get_db_client
+
+            with pytest.raises(OperationFailure):
+                get_db_client()
+
+        assert get_breaker("mongodb").snapshot()["failure_rate"] == 1.0
+        assert db_module._client is None
+
 
 class TestGetDbCollection:
     """Tests for get_db_collection function."""
@@ -0,0 +1,96 @@
+"""
+Tests for backend.app.utils.eventFilters module (local filters, sort order and cursors).
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.app.utils.eventFilters import (
+    EventQuery,
+    decode_cursor,
+    encode_cursor,
+    event_datetime,
+    page,
+)
+
+EVENTS = [
+    {
+        "title": "Late Show",
+        "date": "2024-12-21 22:00",
+        "location": "Zanies, Old Town",
+        "score": 0.7,
+    },
+    {"title": "Open Mic", "date": "Every Tuesday", "location": "The Hideout", "score": None},
+    {"title": "Matinee", "date": "2024-12-21 14:00", "location": "Second City", "score": 0.9},
+    {"title": "Sunday Standup", "date": "2024-12-22", "location": "Laugh Factory", "score": 0.8},
+]
+
+
+def titles(events: list[dict]) -> list[str]:
+    return [event["title"] for event in events]
+
+
+class TestEventDatetime:
+    """Tests for event_datetime."""
+
+    def test_normalized_dates(self):
+        """Should parse both normalized forms and reject free-form dates."""
+        assert event_datetime("2024-12-21 22:00") == datetime(2024, 12, 21, 22, 0)
+        assert event_datetime("2024-12-22") == datetime(2024, 12, 22)
+        assert event_datetime("Every Tuesday") is None
+        assert event_datetime("") is None
+
+
+class TestEventQuery:
+    """Tests for EventQuery.apply."""
+
+    def test_no_filters_keeps_relevance_order(self):
+        """Should return every event in its original order."""
+        assert titles(EventQuery().apply(EVENTS)) == titles(EVENTS)
+
+    def test_date_range_excludes_undated_events(self):
+        """Should keep events inside the inclusive range and drop free-form dates."""
+        event_query = EventQuery(date_from=date(2024, 12, 21), date_to=date(2024, 12, 21))
+        assert titles(event_query.apply(EVENTS)) == ["Late Show", "Matinee"]
+
+    def test_min_score_and_location(self):
+        """Should drop unscored events under min_score and match location case-insensitively."""
+        assert titles(EventQuery(min_score=0.75).apply(EVENTS)) == ["Matinee", "Sunday Standup"]
+        assert titles(EventQuery(location="old town").apply(EVENTS)) == ["Late Show"]
+
+    def test_sort_by_date_and_score(self):
+        """Should sort by start time or score, with undated and unscored events last."""
+        by_date = EventQuery(sort_by="date").apply(EVENTS)
+        by_score = EventQuery(sort_by="score").apply(EVENTS)
+        assert titles(by_date) == ["Matinee", "Late Show", "Sunday Standup", "Open Mic"]
+        assert titles(by_score) == ["Matinee", "Sunday Standup", "Late Show", "Open Mic"]
+
+    def test_unknown_sort_field(self):
+        """Should reject a sort field other than date or score."""
+        with pytest.raises(ValueError, match="title"):
+            EventQuery(sort_by="title")
+
+
+class TestPagination:
+    """Tests for page, encode_cursor and decode_cursor."""
+
+    def test_pages_until_the_last(self):
+        """Should return the next offset until the last page."""
+        assert page(EVENTS, 0, 3) == (EVENTS[:3], 3)
+        assert page(EVENTS, 3, 3) == (EVENTS[3:], None)
+        assert page(EVENTS, 0, None) == (EVENTS, None)
+
+    def test_cursor_round_trip(self):
+        """Should decode the search_id and offset of a cursor for the same filters."""
+        event_query = EventQuery(min_score=0.5, sort_by="date")
+        cursor = encode_cursor("search-1", 20, event_query)
+        assert decode_cursor(cursor, EventQuery(min_score=0.5, sort_by="date")) == ("search-1", 20)
+
+    def test_cursor_rejected_for_other_filters_or_garbage(self):
+        """Should raise ValueError for a cursor of other filters or a malformed one."""
+        cursor = encode_cursor("search-1", 20, EventQuery(sort_by="date"))
+        with pytest.raises(ValueError, match="different filters"):
+            decode_cursor(cursor, EventQuery(sort_by="score"))
+        with pytest.raises(ValueError, match="Malformed"):
+            decode_cursor("not-a-cursor", EventQuery())
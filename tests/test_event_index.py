@@ -0,0 +1,128 @@
+"""
+Tests for backend.app.core.eventIndex module.
+"""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.app.core import eventIndex
+from backend.app.models.schemas import Event
+
+DATE_RANGE = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    """Mocked events and coverage collections."""
+    events = MagicMock()
+    coverage = MagicMock()
+    monkeypatch.setattr(eventIndex, "_indexes_ready", False)
+    with patch.object(eventIndex, "get_named_collection") as mock_get:
+        mock_get.side_effect = lambda name: events if name == "events" else coverage
+        yield events, coverage
+
+
+class TestIndexEvents:
+    """Tests for index_events."""
+
+    def test_upserts_events_with_normalized_fields(self, collections, sample_events):
+        """Should upsert one document per event keyed by title, date and city."""
+        events, _ = collections
+
+        assert eventIndex.index_events(sample_events, "chicago", None) == 2
+
+        operations = events.bulk_write.call_args[0][0]
+        documents = [op._doc["$set"] for op in operations]
+        assert {doc["city"] for doc in documents} == {"chicago"}
+        assert {doc["start_date"] for doc in documents} == {"2024-12-25", "2024-12-26"}
+        assert documents[1]["category"] == "comedy"
+        assert operations[0]._filter["_id"] == eventIndex.event_key(
+            "Test Concert", "2024-12-25", "chicago"
+        )
+        events.create_index.assert_called_once()
+
+    def test_skips_events_without_iso_date(self, collections):
+        """Should not index events whose date could not be normalized."""
+        events, _ = collections
+        event = Event(
+            title="Open Mic",
+            date="Friday night",
+            location="Chicago",
+            description="",
+            url="https://example.com",
+        )
+
+        assert eventIndex.index_events([event], "chicago", "music") == 0
+        events.bulk_write.assert_not_called()
+
+    def test_event_key_ignores_title_punctuation(self):
+        """Should map the same event found by different searches to one key."""
+        assert eventIndex.event_key("Holiday Concert!", "2024-12-25", "chicago") == (
+            eventIndex.event_key("holiday  concert", "2024-12-25", "chicago")
+        )
+
+
+class TestLookupEvents:
+    """Tests for lookup_events and record_coverage."""
+
+    def test_returns_events_and_freshness(self, collections, sample_event):
+        """Should return indexed events and whether fresh coverage exists."""
+        events, coverage = collections
+        coverage.find_one.return_value = {"_id": "chicago|music|2024-12-21|2024-12-22"}
+        events.find.return_value.sort.return_value = [
+            {**sample_event.model_dump(), "city": "chicago", "start_date": "2024-12-25"}
+        ]
+
+        found, fresh = eventIndex.lookup_events("chicago", "music", DATE_RANGE)
+
+        assert fresh is True
+        assert found == [sample_event]
+        event_filter = events.find.call_args[0][0]
+        assert event_filter["category"] == "music"
+        assert event_filter["start_date"] == {"$gte": "2024-12-21", "$lte": "2024-12-22"}
+        coverage_filter = coverage.find_one.call_args[0][0]
+        assert coverage_filter["start"] == {"$lte": "2024-12-21"}
+        assert coverage_filter["end"] == {"$gte": "2024-12-22"}
+        assert isinstance(coverage_filter["refreshed_at"]["$gte"], datetime.datetime)
+
+    def test_stale_without_coverage(self, collections):
+        """Should report stale coverage when no recent search covers the range."""
+        events, coverage = collections
+        coverage.find_one.return_value = None
+        events.find.return_value.sort.return_value = []
+
+        assert eventIndex.lookup_events("chicago", None, DATE_RANGE) == ([], False)
+        assert "category" not in events.find.call_args[0][0]
+
+    def test_record_coverage_upserts(self, collections):
+        """Should upsert a coverage document for the searched range."""
+        _, coverage = collections
+
+        eventIndex.record_coverage("chicago", "music", DATE_RANGE, ["jazz", "free"])
+
+        args, kwargs = coverage.update_one.call_args
+        assert args[0] == {"_id": "chicago|music|free+jazz|2024-12-21|2024-12-22"}
+        assert args[1]["$set"]["city"] == "chicago"
+        assert args[1]["$set"]["terms"] == ["free", "jazz"]
+        assert kwargs["upsert"] is True
+
+    def test_lookup_matches_content_terms(self, collections, sample_event):
+        """Should only count coverage and events found by queries with the same terms."""
+        events, coverage = collections
+        coverage.find_one.return_value = None
+        events.find.return_value.sort.return_value = [
+            {
+                **sample_event.model_dump(),
+                "city": "chicago",
+                "start_date": "2024-12-25",
+                "terms": ["jazz", "rock"],
+            }
+        ]
+
+        found, fresh = eventIndex.lookup_events("chicago", "music", DATE_RANGE, ["jazz"])
+
+        assert (found, fresh) == ([sample_event], False)
+        assert events.find.call_args[0][0]["terms"] == {"$all": ["jazz"]}
+        assert coverage.find_one.call_args[0][0]["terms"] == ["jazz"]
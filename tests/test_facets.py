@@ -0,0 +1,181 @@
+"""
+Tests for backend.app.agents.agentFacets module (facet fan-out and merge).
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from langgraph.types import Send
+
+from backend.app.agents.agentFacets import facet_merge_node, facet_node, route_after_rewrite
+from backend.app.models.schemas import Event
+
+
+def _event(title: str, score: float = 0.5) -> Event:
+    return Event(
+        title=title,
+        date="2025-03-08",
+        location="Austin, TX",
+        description="Food festival",
+        url=f"https://example.com/{title}",
+        score=score,
+    )
+
+
+class TestRouteAfterRewrite:
+    """Tests for route_after_rewrite."""
+
+    def test_single_pipeline_without_facets(self, sample_agent_state):
+        """Should continue with the searcher when the query was not split."""
+        sample_agent_state["search_facets"] = []
+
+        assert route_after_rewrite(sample_agent_state) == "searcher"
+
+    def test_sends_one_task_per_facet(self, sample_agent_state):
+        """Should fan out a Send per facet carrying only that facet's queries."""
+        sample_agent_state["search_facets"] = [
+            {"label": "Austin", "queries": ["food festivals Austin March 2025"]},
+            {"label": "Dallas", "queries": ["food festivals Dallas March 2025"]},
+        ]
+
+        sends = route_after_rewrite(sample_agent_state)
+
+        assert all(isinstance(send, Send) and send.node == "facet" for send in sends)
+        assert [send.arg["facet_label"] for send in sends] == ["Austin", "Dallas"]
+        assert sends[1].arg["search_queries"] == ["food festivals Dallas March 2025"]
+        assert sends[0].arg["events"] == []
+
+
+class TestFacetNode:
+    """Tests for facet_node."""
+
+    @pytest.mark.asyncio
+    async def test_searches_extracts_and_reports_timings(self, sample_agent_state):
+        """Should run search then extraction for the facet and report its timings."""
+        snippet = {"url": "https://example.com/a", "title": "A", "content": "..."}
+
+        async def fake_search(state):
+            return {"raw_results": [snippet], "new_raw_results": [snippet]}
+
+        def fake_extract(state):
+            assert state["new_raw_results"] == [snippet]
+            return {"events": [_event("Austin Food Fest")], "extraction_error": None}
+
+        with (
+            patch("backend.app.agents.agentFacets.search_node", side_effect=fake_search),
+            patch("backend.app.agents.agentFacets.extraction_node", side_effect=fake_extract),
+        ):
+            update = await facet_node(
+                {**sample_agent_state, "facet_label": "Austin", "search_queries": ["q"]}
+            )
+
+        (result,) = update["facet_results"]
+        assert result["label"] == "Austin"
+        assert result["timing"]["events"] == 1
+        assert result["timing"]["snippets"] == 1
+        assert result["timing"]["search_ms"] >= 0
+
+
+class TestFacetMergeNode:
+    """Tests for facet_merge_node."""
+
+    def test_merges_latest_attempt_only(self):
+        """Should merge events and snippets of the current attempt, deduplicating URLs."""
+        shared = {"url": "https://example.com/shared"}
+        state = {
+            "retry_count": 1,
+            "events": [],
+            "raw_results": [],
+            "facet_results": [
+                {
+                    "label": "old",
+                    "attempt": 0,
+                    "events": [_event("Stale")],
+                    "new_raw_results": [],
+                    "extraction_error": None,
+                    "timing": {},
+                },
+                {
+                    "label": "Austin",
+                    "attempt": 1,
+                    "events": [_event("Fest", 0.4)],
+                    "new_raw_results": [shared],
+                    "extraction_error": None,
+                    "timing": {"label": "Austin"},
+                },
+                {
+                    "label": "Dallas",
+                    "attempt": 1,
+                    "events": [_event("Fest", 0.9), _event("Taco Day")],
+                    "new_raw_results": [shared, {"url": "https://example.com/d"}],
+                    "extraction_error": None,
+                    "timing": {"label": "Dallas"},
+                },
+            ],
+        }
+
+        update = facet_merge_node(state)
+
+        titles = {event.title: event.score for event in update["events"]}
+        assert titles == {"Fest": 0.9, "Taco Day": 0.5}
+        assert len(update["new_raw_results"]) == 2
+        assert [t["label"] for t in update["facet_timings"]] == ["Austin", "Dallas"]
+        assert update["extraction_error"] is None
+
+
+class TestFacetFanOutGraph:
+    """End-to-end fan-out through the compiled graph."""
+
+    @pytest.mark.asyncio
+    async def test_facets_run_in_parallel_and_merge(self):
+        """Should search all facets concurrently and merge their events before persistence."""
+        from backend.app.graph import build_graph
+
+        started = 0
+        all_started = asyncio.Event()
+
+        async def fake_search(state):
+            nonlocal started
+            started += 1
+            if started == 2:
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), timeout=1)  # both facets in flight
+            snippet = {"url": f"https://example.com/{state['facet_label']}"}
+            return {"raw_results": [snippet], "new_raw_results": [snippet]}
+
+        def fake_extract(state):
+            return {"events": [_event(f"{state['facet_label']} Food Fest")]}
+
+        def fake_rewriter(state):
+            return {
+                "search_queries": ["a", "b"],
+                "search_facets": [
+                    {"label": "Austin", "queries": ["a"]},
+                    {"label": "Dallas", "queries": ["b"]},
+                ],
+                "retry_count": state.get("retry_count", 0) + 1,
+            }
+
+        with (
+            patch("backend.app.graph.query_validator_node", return_value={"query_status": "valid"}),
+            patch("backend.app.graph.event_index_node", return_value={"index_status": "miss"}),
+            patch("backend.app.graph.query_rewriter_node", side_effect=fake_rewriter),
+            patch("backend.app.graph.persistence_node", return_value={"search_id": "id"}),
+            patch("backend.app.agents.agentFacets.search_node", side_effect=fake_search),
+            patch("backend.app.agents.agentFacets.extraction_node", side_effect=fake_extract),
+        ):
+            result = await build_graph().ainvoke(
+                {
+                    "user_query": "food festivals in Austin and Dallas next month",
+                    "current_date": "2025-02-10",
+                    "retry_count": 0,
+                }
+            )
+
+        assert {event.title for event in result["events"]} == {
+            "Austin Food Fest",
+            "Dallas Food Fest",
+        }
+        assert {t["label"] for t in result["facet_timings"]} == {"Austin", "Dallas"}
+        assert len(result["raw_results"]) == 2
@@ -54,6 +54,12 @@ class TestCheckResults:
         result = check_results(state)
         assert result == "give_up"
 
+    def test_gives_up_when_extraction_rate_limited(self):
+        """Should not retry when extraction failed on the LLM rate limit."""
+        state = {"events": [], "retry_count": 0, "extraction_error": "rate_limited"}
+
+        assert check_results(state) == "give_up"
+
     def test_handles_missing_events_key(self, monkeypatch):
         """Should treat missing 'events' key as empty list."""
         monkeypatch.setenv("MAX_RETRY_COUNT", "0")
@@ -93,7 +99,17 @@ class TestBuildGraph:
         # LangGraph compiled graphs have a 'nodes' attribute
         node_names = list(graph.nodes.keys())
 
-        expected_nodes = ["validator", "rewriter", "searcher", "extractor", "persistence"]
+        expected_nodes = [
+            "validator",
+            "date_resolver",
+            "event_index",
+            "rewriter",
+            "searcher",
+            "extractor",
+            "facet",
+            "facet_merge",
+            "persistence",
+        ]
         for node in expected_nodes:
             assert node in node_names, f"Missing node: {node}"
 
@@ -0,0 +1,110 @@
+"""
+Tests for backend.app.utils.heuristicExtractor module.
+"""
+
+from backend.app.utils.heuristicExtractor import (
+    event_signals,
+    extract_events,
+    find_venue,
+    has_event_signals,
+)
+
+CURRENT_DATE = "2024-12-20"
+
+
+def _snippet(content: str, title: str = "Listings", score: float = 0.8) -> dict:
+    return {
+        "title": title,
+        "url": "https://example.com/listings",
+        "content": content,
+        "score": score,
+    }
+
+
+class TestEventSignals:
+    """Tests for event_signals and has_event_signals."""
+
+    def test_detects_all_signal_kinds(self):
+        """Should report date, venue, price and keyword signals."""
+        snippet = _snippet("Jazz trio at The Green Mill on December 21, 8pm. Tickets $15.")
+        assert event_signals(snippet) == {"date", "venue", "price", "keyword"}
+
+    def test_article_without_signals(self):
+        """Should find nothing in text that is not about an event."""
+        snippet = _snippet("We ranked thirty deep dish pies so you don't have to.", title="Pizza")
+        assert event_signals(snippet) == set()
+        assert not has_event_signals(snippet)
+
+    def test_min_signals_threshold(self):
+        """Should require the configured number of signal kinds."""
+        snippet = _snippet("The best comedy clubs in town, ranked by our critics.")
+        assert has_event_signals(snippet, min_signals=1)
+        assert not has_event_signals(snippet, min_signals=2)
+
+
+class TestFindVenue:
+    """Tests for find_venue function."""
+
+    def test_venue_after_at(self):
+        """Should take the capitalized phrase after 'at', stopping at dates."""
+        assert find_venue("Robbie Fulks at The Hideout December 21") == "The Hideout"
+
+    def test_venue_by_noun(self):
+        """Should recognize capitalized names ending in a venue noun."""
+        assert find_venue("Saturday, 8:00 PM - Thalia Hall, Chicago IL") == "Thalia Hall"
+
+    def test_no_venue(self):
+        """Should return None when no venue is named."""
+        assert find_venue("doors open early, bring friends") is None
+
+
+class TestExtractEvents:
+    """Tests for extract_events function."""
+
+    def test_extracts_one_event_per_dated_line(self):
+        """Should build an event from each line naming a calendar date."""
+        snippet = _snippet(
+            "12/21/2024 - Robbie Fulks at The Hideout, doors 8pm, $20\n"
+            "12/28/2024 - Devil in a Woodpile, doors 9pm, $15"
+        )
+        events = extract_events([snippet], CURRENT_DATE)
+
+        assert [(e.title, e.date) for e in events] == [
+            ("Robbie Fulks", "2024-12-21 20:00"),
+            ("Devil in a Woodpile", "2024-12-28 21:00"),
+        ]
+        assert events[0].location == "The Hideout"
+        assert events[0].url == "https://example.com/listings"
+        assert events[0].score == 0.4
+
+    def test_skips_past_and_out_of_range_dates(self):
+        """Should drop events before today or outside the requested date range."""
+        snippet = _snippet(
+            "Fall Showcase - November 10, 2024\n"
+            "Holiday Jam - December 21, 2024\n"
+            "New Year Bash - December 31, 2024"
+        )
+        date_range = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+        events = extract_events([snippet], CURRENT_DATE, date_range)
+
+        assert [e.title for e in events] == ["Holiday Jam"]
+
+    def test_ignores_weekday_only_lines(self):
+        """Should not guess dates from weekday names alone."""
+        snippet = _snippet("Catch The Harold on Friday at 8pm.")
+        assert extract_events([snippet], CURRENT_DATE) == []
+
+    def test_falls_back_to_snippet_title(self):
+        """Should use the snippet title when the dated line has no title phrase."""
+        snippet = _snippet(
+            "Performances run January 9, 2025.",
+            title="A Streetcar Named Desire - Steppenwolf",
+        )
+        events = extract_events([snippet], CURRENT_DATE)
+
+        assert [(e.title, e.date) for e in events] == [("A Streetcar Named Desire", "2025-01-09")]
+
+    def test_deduplicates_title_and_date(self):
+        """Should keep one event when snippets repeat the same listing."""
+        snippet = _snippet("Holiday Jam - December 21, 2024")
+        assert len(extract_events([snippet, dict(snippet)], CURRENT_DATE)) == 1
@@ -0,0 +1,133 @@
+"""
+Tests for backend.app.core.jobQueue module.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.app.core import config, jobQueue
+from backend.app.core.jobQueue import JobQueue, QueueFullError, summarize_node_output
+
+
+async def _wait_for(queue: JobQueue, job_id: str, status: str) -> dict:
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"Job {job_id} never reached {status}")
+
+
+class TestSummarizeNodeOutput:
+    """Tests for summarize_node_output."""
+
+    def test_dumps_events_and_counts_raw_results(self, sample_events):
+        """Should serialize events and replace raw results with counts."""
+        summary = summarize_node_output(
+            {"events": sample_events, "raw_results": [{}, {}], "search_queries": ["q"]}
+        )
+
+        assert summary["events"][0]["title"] == sample_events[0].title
+        assert summary["raw_results_count"] == 2
+        assert summary["search_queries"] == ["q"]
+
+
+class TestJobQueue:
+    """Tests for JobQueue execution and bookkeeping."""
+
+    @pytest.mark.asyncio
+    async def test_runs_job_and_records_node_outputs(self, sample_events):
+        """Should expose per-node outputs and the final result."""
+
+        async def runner(query, on_update):
+            on_update("validator", {"query_status": "valid"})
+            on_update("extractor", {"events": sample_events})
+            return {"status": "success", "events": [e.model_dump() for e in sample_events]}
+
+        queue = JobQueue(runner, workers=1)
+        job = await queue.submit("Comedy shows in Chicago")
+        assert job["status"] == "queued"
+
+        done = await _wait_for(queue, job["job_id"], "completed")
+        await queue.stop()
+
+        assert [n["node"] for n in done["nodes"]] == ["validator", "extractor"]
+        assert len(done["events"]) == 2
+        assert done["result"]["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_records_failures(self):
+        """Should mark the job failed with the error message."""
+
+        async def runner(query, on_update):
+            raise RuntimeError("Graph failed")
+
+        queue = JobQueue(runner, workers=1)
+        job = await queue.submit("q")
+        failed = await _wait_for(queue, job["job_id"], "failed")
+        await queue.stop()
+
+        assert failed["error"] == "Graph failed"
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Should raise QueueFullError instead of queueing without bound."""
+        release = asyncio.Event()
+
+        async def runner(query, on_update):
+            await release.wait()
+            return {}
+
+        queue = JobQueue(runner, workers=1, max_queue_size=1)
+        await queue.submit("running")
+        await asyncio.sleep(0.01)  # let the worker pick up the first job
+        await queue.submit("queued")
+        assert queue.queue_depth == 1
+
+        with pytest.raises(QueueFullError):
+            await queue.submit("rejected")
+        release.set()
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_drops_expired_jobs(self, monkeypatch):
+        """Should remove finished jobs older than the TTL."""
+
+        async def runner(query, on_update):
+            return {}
+
+        queue = JobQueue(runner, workers=1, ttl_seconds=60)
+        job = await queue.submit("q")
+        await _wait_for(queue, job["job_id"], "completed")
+        await queue.stop()
+
+        now = jobQueue.time.monotonic()
+        monkeypatch.setattr(jobQueue.time, "monotonic", lambda: now + 120)
+
+        assert queue.cleanup() == 1
+        assert await queue.get(job["job_id"]) is None
+
+    @pytest.mark.asyncio
+    async def test_mirrors_jobs_to_mongodb(self, monkeypatch):
+        """Should upsert job state into MongoDB and read it back when not in memory."""
+        monkeypatch.setattr(config, "JOBS_MONGODB_ENABLED", True)
+        collection = MagicMock()
+        collection.find_one.return_value = {
+            "_id": "other",
+            "job_id": "other",
+            "status": "completed",
+        }
+
+        async def runner(query, on_update):
+            return {}
+
+        with patch.object(jobQueue, "get_named_collection", return_value=collection):
+            queue = JobQueue(runner, workers=1)
+            job = await queue.submit("q")
+            await _wait_for(queue, job["job_id"], "completed")
+            await queue.stop()
+
+            assert collection.replace_one.call_count >= 3  # queued, running, completed
+            assert (await queue.get("other"))["status"] == "completed"
@@ -0,0 +1,161 @@
+"""
+Tests for backend.app.core.llmClient module.
+"""
+
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.app.core import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test with an empty metrics registry."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestGetLlm:
+    """Tests for get_llm function."""
+
+    @pytest.fixture(autouse=True)
+    def api_key(self, monkeypatch):
+        from backend.app.core import config
+
+        monkeypatch.setattr(config, "OPENAI_API_KEY", "test-openai-key")
+
+    def test_uses_model_override(self):
+        """Should build the client with the requested model and temperature."""
+        with patch("backend.app.core.llmClient.ChatOpenAI") as mock_chat:
+            from backend.app.core.llmClient import get_llm
+
+            get_llm(temperature=0.3, model="gpt-4o-mini")
+
+            kwargs = mock_chat.call_args.kwargs
+            assert kwargs["model"] == "gpt-4o-mini"
+            assert kwargs["temperature"] == 0.3
+            assert kwargs["callbacks"][0].model == "gpt-4o-mini"
+
+    def test_defaults_to_configured_model(self):
+        """Should fall back to LLM_MODEL when no model is given."""
+        with patch("backend.app.core.llmClient.ChatOpenAI") as mock_chat:
+            from backend.app.core import config
+            from backend.app.core.llmClient import get_llm
+
+            get_llm()
+
+            assert mock_chat.call_args.kwargs["model"] == config.LLM_MODEL
+
+
+class TestLLMUsageTracker:
+    """Tests for the per-model usage callback."""
+
+    def test_records_latency_tokens_and_cost(self):
+        """Should break down calls, tokens and cost by model."""
+        from backend.app.core.llmClient import LLMUsageTracker
+
+        tracker = LLMUsageTracker("gpt-4o-mini")
+        run_id = uuid.uuid4()
+        response = MagicMock(
+            llm_output={"token_usage": {"prompt_tokens": 1_000_000, "completion_tokens": 0}}
+        )
+
+        tracker.on_chat_model_start({}, [], run_id=run_id)
+        tracker.on_llm_end(response, run_id=run_id)
+
+        snap = metrics.snapshot()
+        assert snap["counters"]["llm.gpt-4o-mini.calls"] == 1
+        assert snap["counters"]["llm.gpt-4o-mini.prompt_tokens"] == 1_000_000
+        assert snap["counters"]["llm.gpt-4o-mini.cost_usd"] == pytest.approx(0.15)
+        assert snap["observations"]["llm.gpt-4o-mini.latency_ms"]["count"] == 1
+
+    def test_counts_errors(self):
+        """Should count failed calls per model."""
+        from backend.app.core.llmClient import LLMUsageTracker
+
+        tracker = LLMUsageTracker("gpt-4o")
+        run_id = uuid.uuid4()
+        tracker.on_chat_model_start({}, [], run_id=run_id)
+        tracker.on_llm_error(Exception("boom"), run_id=run_id)
+
+        assert metrics.get_counter("llm.gpt-4o.errors") == 1
+
+
+def _rate_limit_error(headers=None, code=None):
+    import httpx
+    import openai
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    body = {"code": code} if code else None
+    return openai.RateLimitError("Rate limit reached", response=response, body=body)
+
+
+class TestInvokeLlm:
+    """Tests for invoke_llm rate-limit handling."""
+
+    @pytest.fixture(autouse=True)
+    def reset_scheduler(self):
+        from backend.app.core.llmScheduler import llm_scheduler
+
+        llm_scheduler.reset()
+        yield
+        llm_scheduler.reset()
+
+    def test_retries_after_429_with_retry_after(self):
+        """Should pause for Retry-After and retry instead of failing."""
+        from backend.app.core.llmClient import invoke_llm
+
+        runnable = MagicMock()
+        runnable.invoke.side_effect = [_rate_limit_error({"retry-after-ms": "20"}), "ok"]
+
+        assert invoke_llm(runnable, ["hello"]) == "ok"
+        assert runnable.invoke.call_count == 2
+        assert metrics.get_counter("llm.rate_limited") == 1
+        assert metrics.snapshot()["observations"]["llm.scheduler.wait_ms"]["max"] >= 15
+
+    def test_raises_rate_limit_error_after_max_retries(self, monkeypatch):
+        """Should raise LLMRateLimitError once retries are exhausted."""
+        from backend.app.core import config
+        from backend.app.core.llmClient import invoke_llm
+        from backend.app.core.llmScheduler import LLMRateLimitError
+
+        monkeypatch.setattr(config, "LLM_RATE_LIMIT_MAX_RETRIES", 1)
+        runnable = MagicMock()
+        runnable.invoke.side_effect = _rate_limit_error({"retry-after": "0"})
+
+        with pytest.raises(LLMRateLimitError):
+            invoke_llm(runnable, ["hello"])
+        assert runnable.invoke.call_count == 2
+
+    def test_does_not_retry_exhausted_quota(self):
+        """Should fail immediately when the account has no quota left."""
+        from backend.app.core.llmClient import invoke_llm
+        from backend.app.core.llmScheduler import LLMRateLimitError
+
+        runnable = MagicMock()
+        runnable.invoke.side_effect = _rate_limit_error(code="insufficient_quota")
+
+        with pytest.raises(LLMRateLimitError):
+            invoke_llm(runnable, ["hello"])
+        assert runnable.invoke.call_count == 1
+
+    def test_rate_limits_and_parse_errors_do_not_trip_breaker(self):
+        """Should not count 429s or malformed structured output as OpenAI failures."""
+        from langchain_core.exceptions import OutputParserException
+
+        from backend.app.core.circuitBreaker import get_breaker
+        from backend.app.core.llmClient import invoke_llm
+
+        runnable = MagicMock()
+        runnable.invoke.side_effect = [
+            _rate_limit_error({"retry-after": "0"}),
+            OutputParserException("not valid JSON"),
+        ]
+
+        with pytest.raises(OutputParserException):
+            invoke_llm(runnable, ["hello"])
+        assert get_breaker("openai").snapshot()["window_calls"] == 0
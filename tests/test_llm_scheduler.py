@@ -0,0 +1,95 @@
+"""
+Tests for backend.app.core.llmScheduler module.
+"""
+
+import threading
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from backend.app.core import metrics
+from backend.app.core.llmScheduler import (
+    PRIORITY_EXTRACTION,
+    PRIORITY_VALIDATION,
+    LLMRateLimitError,
+    LLMScheduler,
+    estimate_tokens,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestEstimateTokens:
+    """Tests for estimate_tokens."""
+
+    def test_counts_prompt_characters_and_output(self):
+        """Should estimate ~4 characters per token plus the expected output."""
+        messages = [SystemMessage(content="a" * 400), HumanMessage(content="b" * 400)]
+
+        assert estimate_tokens(messages, output_tokens=100) == 300
+
+
+class TestLLMScheduler:
+    """Tests for LLMScheduler budgets, priorities and pauses."""
+
+    def test_unlimited_scheduler_does_not_wait(self):
+        """Should admit calls immediately when both limits are disabled."""
+        scheduler = LLMScheduler(rpm=0, tpm=0)
+
+        waited = [scheduler.acquire(10_000) for _ in range(100)]
+
+        assert max(waited) < 0.01
+
+    def test_waits_for_token_budget(self):
+        """Should delay a call until the TPM bucket has refilled enough."""
+        scheduler = LLMScheduler(rpm=0, tpm=60_000)  # refills 1,000 tokens per second
+        scheduler.acquire(60_000)
+
+        waited = scheduler.acquire(50)
+
+        assert 0.03 <= waited < 0.5
+        assert metrics.get_counter("llm.scheduler.throttled") == 1
+
+    def test_rejects_after_max_wait(self):
+        """Should raise LLMRateLimitError when the budget cannot cover a call in time."""
+        scheduler = LLMScheduler(rpm=1, tpm=0, max_wait_seconds=0.05)
+        scheduler.acquire(1)
+
+        with pytest.raises(LLMRateLimitError):
+            scheduler.acquire(1)
+        assert metrics.get_counter("llm.scheduler.rejected") == 1
+
+    def test_serves_higher_priority_first(self):
+        """Should let a waiting extraction go before a validation that arrived earlier."""
+        scheduler = LLMScheduler(rpm=600, tpm=0)  # one request per 0.1s once drained
+        for _ in range(600):
+            scheduler.acquire(1)
+
+        order = []
+
+        def call(name, priority):
+            scheduler.acquire(1, priority)
+            order.append(name)
+
+        validation = threading.Thread(target=call, args=("validation", PRIORITY_VALIDATION))
+        validation.start()
+        time.sleep(0.02)
+        extraction = threading.Thread(target=call, args=("extraction", PRIORITY_EXTRACTION))
+        extraction.start()
+        validation.join()
+        extraction.join()
+
+        assert order == ["extraction", "validation"]
+
+    def test_pause_holds_back_all_calls(self):
+        """Should make every call wait out a pause (e.g. after a 429)."""
+        scheduler = LLMScheduler(rpm=0, tpm=0)
+        scheduler.pause(0.05)
+
+        assert scheduler.acquire(1) >= 0.04
@@ -0,0 +1,111 @@
+"""
+Tests for backend.app.core.localIndex module.
+"""
+
+from backend.app.core import config, localIndex
+from backend.app.models.schemas import Event
+
+DATE_RANGE = {"start": "2024-12-25", "end": "2024-12-26", "expression": "dec 25-26"}
+
+
+class TestLocalIndex:
+    """Tests for the shared local index."""
+
+    def test_indexes_events_and_snippets(self, sample_events, sample_raw_results):
+        """Should make events and raw snippets searchable."""
+        added = localIndex.index_search_results(sample_events, sample_raw_results)
+
+        assert added == len(sample_events) + len(sample_raw_results)
+        kinds = {payload["kind"] for _, _, payload in localIndex.search_local("chicago", k=10)}
+        assert kinds == {"event", "snippet"}
+        top = localIndex.search_local("stand-up comedy", k=1)[0][2]
+        assert top["title"] == "Comedy Show"
+
+    def test_snapshot_and_warm_start(self, sample_events, tmp_path, monkeypatch):
+        """Should snapshot after LOCAL_INDEX_SNAPSHOT_EVERY updates and load it on restart."""
+        path = tmp_path / "local_index.bin"
+        monkeypatch.setattr(config, "LOCAL_INDEX_PATH", str(path))
+        monkeypatch.setattr(config, "LOCAL_INDEX_SNAPSHOT_EVERY", 1)
+
+        localIndex.index_search_results(sample_events, [])
+        assert path.exists()
+
+        localIndex.reset_local_index()
+        assert len(localIndex.get_local_index()) == len(sample_events)
+
+    def test_starts_empty_on_corrupt_snapshot(self, tmp_path, monkeypatch):
+        """Should fall back to an empty index if the snapshot cannot be read."""
+        path = tmp_path / "local_index.bin"
+        path.write_bytes(b"garbage")
+        monkeypatch.setattr(config, "LOCAL_INDEX_PATH", str(path))
+
+        assert len(localIndex.get_local_index()) == 0
+
+    def test_skips_unchanged_documents(self, sample_events, sample_raw_results):
+        """Should not re-add documents that are already indexed with the same content."""
+        localIndex.index_search_results(sample_events, sample_raw_results)
+        added = localIndex.index_search_results(sample_events, sample_raw_results)
+
+        assert added == 0
+        assert localIndex.get_local_index().tombstones == 0
+
+    def test_compacts_when_replaced_documents_dominate(self, sample_raw_results):
+        """Should compact instead of growing with every changed snippet."""
+        for version in range(5):
+            results = [{**r, "content": f"{r['content']} v{version}"} for r in sample_raw_results]
+            localIndex.index_search_results([], results)
+
+        index = localIndex.get_local_index()
+        assert len(index) == len(sample_raw_results)
+        assert index.tombstones <= len(index)
+
+
+class TestLookupLocalEvents:
+    """Tests for lookup_local_events."""
+
+    def test_filters_by_city_category_and_dates(self, sample_events):
+        """Should return only indexed events of the city, category and range."""
+        boston = Event(
+            title="Comedy in Boston",
+            date="2024-12-25",
+            location="Wilbur Theatre, Boston",
+            description="Stand-up comedy",
+            url="https://example.com/boston",
+        )
+        localIndex.index_search_results([*sample_events, boston], [])
+
+        events, fresh = localIndex.lookup_local_events(
+            "comedy in chicago", "chicago", "comedy", DATE_RANGE
+        )
+
+        assert [event.title for event in events] == ["Comedy Show"]
+        assert fresh
+
+    def test_snippets_do_not_take_candidate_slots(self, sample_events, monkeypatch):
+        """Should find events even when better-matching snippets fill the candidates."""
+        monkeypatch.setattr(localIndex, "_LOOKUP_CANDIDATES", 2)
+        snippets = [
+            {
+                "url": f"https://example.com/listing-{n}",
+                "title": "Chicago comedy comedy listing",
+                "content": "Chicago comedy comedy comedy",
+            }
+            for n in range(5)
+        ]
+        localIndex.index_search_results(sample_events, snippets)
+
+        events, _ = localIndex.lookup_local_events(
+            "comedy in chicago", "chicago", "comedy", DATE_RANGE
+        )
+
+        assert [event.title for event in events] == ["Comedy Show"]
+
+    def test_stale_events_are_not_fresh(self, sample_events, monkeypatch):
+        """Should report events indexed before EVENT_INDEX_MAX_AGE_HOURS as stale."""
+        localIndex.index_search_results(sample_events, [])
+        monkeypatch.setattr(config, "EVENT_INDEX_MAX_AGE_HOURS", -1.0)
+
+        events, fresh = localIndex.lookup_local_events("concert", "chicago", None, DATE_RANGE)
+
+        assert len(events) == 2
+        assert not fresh
@@ -0,0 +1,82 @@
+"""
+Tests for backend.app.core.metrics module.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.core import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test with an empty registry."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestMetrics:
+    """Tests for the metrics registry."""
+
+    def test_increment_accumulates(self):
+        """Should add up counter increments."""
+        metrics.increment("calls")
+        metrics.increment("calls", 2)
+        assert metrics.get_counter("calls") == 3
+        assert metrics.get_counter("missing") == 0
+
+    def test_observe_tracks_count_sum_max_and_avg(self):
+        """Should summarize observations."""
+        metrics.observe("latency_ms", 10)
+        metrics.observe("latency_ms", 30)
+
+        stats = metrics.snapshot()["observations"]["latency_ms"]
+        assert stats == {"count": 2, "sum": 40.0, "max": 30.0, "avg": 20.0}
+
+    def test_sum_counters_by_prefix_and_suffix(self):
+        """Should add up all counters matching the pattern."""
+        metrics.increment("llm.gpt-4o.cost_usd", 0.5)
+        metrics.increment("llm.gpt-4o-mini.cost_usd", 0.25)
+        metrics.increment("llm.gpt-4o.calls", 3)
+        assert metrics.sum_counters("llm.", ".cost_usd") == 0.75
+
+    @pytest.mark.asyncio
+    async def test_meter_counts_only_its_own_work(self):
+        """Should collect increments of the block and its tasks and threads, not other work."""
+
+        async def work():
+            metrics.increment("tavily.credits", 2)
+            await asyncio.to_thread(metrics.increment, "llm.gpt-4o.cost_usd", 0.1)
+
+        with metrics.meter() as usage:
+            concurrent = asyncio.create_task(asyncio.sleep(0))
+            await asyncio.create_task(work())
+        metrics.increment("tavily.credits", 5)
+        await concurrent
+
+        assert usage == {"tavily.credits": 2, "llm.gpt-4o.cost_usd": 0.1}
+        assert metrics.get_counter("tavily.credits") == 7
+
+    @pytest.mark.asyncio
+    async def test_concurrent_meters_are_separate(self):
+        """Should not mix up the usage of two blocks running at the same time."""
+
+        async def metered(credits):
+            with metrics.meter() as usage:
+                for _ in range(3):
+                    metrics.increment("tavily.credits", credits)
+                    await asyncio.sleep(0)
+            return usage
+
+        first, second = await asyncio.gather(metered(1), metered(2))
+
+        assert (first["tavily.credits"], second["tavily.credits"]) == (3, 6)
+
+    def test_snapshot_is_a_copy(self):
+        """Should not expose internal state through the snapshot."""
+        metrics.set_gauge("in_flight", 4)
+        snap = metrics.snapshot()
+        snap["gauges"]["in_flight"] = 99
+        assert metrics.snapshot()["gauges"]["in_flight"] == 4
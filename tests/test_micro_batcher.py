@@ -0,0 +1,77 @@
+"""
+Tests for backend.app.core.microBatcher module.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.app.core import metrics
+from backend.app.core.microBatcher import MicroBatcher
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher batching and fan-out."""
+
+    def test_merges_concurrent_calls_and_fans_out_results(self):
+        """Should run concurrent submissions as one batch and return each caller's result."""
+        batches = []
+
+        def batch_fn(items):
+            batches.append(list(items))
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(batch_fn, window_seconds=0.2, max_batch_size=4)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(batcher.submit, ["a", "b", "c", "d"]))
+
+        assert results == ["A", "B", "C", "D"]
+        assert len(batches) == 1
+        assert metrics.get_counter("batcher.batches") == 1
+
+    def test_splits_at_max_batch_size(self):
+        """Should start a new batch once the open one is full."""
+        sizes = []
+        lock = threading.Lock()
+
+        def batch_fn(items):
+            with lock:
+                sizes.append(len(items))
+            return items
+
+        batcher = MicroBatcher(batch_fn, window_seconds=0.1, max_batch_size=2)
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(batcher.submit, range(5)))
+
+        assert results == [0, 1, 2, 3, 4]
+        assert max(sizes) == 2
+        assert sum(sizes) == 5
+
+    def test_single_call_runs_after_window(self):
+        """Should not wait for company beyond the window."""
+        batcher = MicroBatcher(lambda items: [len(items)], window_seconds=0.01, max_batch_size=8)
+
+        assert batcher.submit("only") == 1
+
+    def test_propagates_batch_errors_to_every_caller(self):
+        """Should raise the batch call's exception in each waiting caller."""
+
+        def batch_fn(items):
+            raise RuntimeError("LLM down")
+
+        batcher = MicroBatcher(batch_fn, window_seconds=0.05, max_batch_size=2)
+
+        def submit(item):
+            with pytest.raises(RuntimeError, match="LLM down"):
+                batcher.submit(item)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(submit, ["a", "b"]))
@@ -0,0 +1,100 @@
+"""
+Tests for backend.app.core.pageCache module.
+"""
+
+import time
+
+from backend.app.core.pageCache import PageCache, matching_events, normalize_url
+from backend.app.models.schemas import Event
+
+
+def _event(title: str, url: str, date: str = "2024-12-21", location: str = "Chicago") -> Event:
+    return Event(title=title, date=date, location=location, description="", url=url, score=0.8)
+
+
+class TestNormalizeUrl:
+    """Tests for normalize_url function."""
+
+    def test_ignores_case_fragment_tracking_and_trailing_slash(self):
+        """Should map variants of the same page to one key."""
+        assert normalize_url("HTTPS://WWW.Zanies.com/chicago/?utm_source=x&day=sat#top") == (
+            "https://www.zanies.com/chicago?day=sat"
+        )
+        assert normalize_url("https://www.zanies.com/chicago") == normalize_url(
+            "https://www.zanies.com/chicago/"
+        )
+
+
+class TestPageCache:
+    """Tests for the PageCache class."""
+
+    def test_store_extraction_groups_events_by_page(self):
+        """Should cache each snippet with the events extracted from it, skipping empty pages."""
+        cache = PageCache(max_entries=10, ttl_seconds=60)
+        snippets = [
+            {"url": "https://a.com/shows", "content": "Show A on Dec 21"},
+            {"url": "https://b.com/guide", "content": "A guide"},
+        ]
+        events = [_event("Show A", "https://a.com/shows/"), _event("Elsewhere", "https://c.com")]
+
+        assert cache.store_extraction(snippets, events) == 1
+        assert [e.title for e in cache.get("https://a.com/shows").events] == ["Show A"]
+        assert cache.get("https://b.com/guide") is None
+        assert cache.get("https://c.com") is None
+
+    def test_merged_events_are_cached_on_every_page_mentioning_them(self):
+        """Should give an event merged under one URL to the other pages listing it."""
+        cache = PageCache(max_entries=10, ttl_seconds=60)
+        snippets = [
+            {"url": "https://a.com/shows", "content": "Robbie Fulks live, Dec 21"},
+            {"url": "https://b.com/guide", "content": "This weekend: ROBBIE FULKS at The Hideout"},
+        ]
+
+        assert (
+            cache.store_extraction(snippets, [_event("Robbie Fulks", "https://a.com/shows")]) == 2
+        )
+        assert [e.title for e in cache.get("https://b.com/guide").events] == ["Robbie Fulks"]
+
+    def test_later_extractions_add_events(self):
+        """Should keep the cached events of a page and add newly extracted ones."""
+        cache = PageCache(max_entries=10, ttl_seconds=60)
+        snippet = {"url": "https://a.com/shows", "content": "Jazz Night and Comedy Night"}
+        cache.store_extraction([snippet], [_event("Jazz Night", "https://a.com/shows")])
+        cache.store_extraction([snippet], [_event("Comedy Night", "https://a.com/shows")])
+
+        titles = [e.title for e in cache.get("https://a.com/shows").events]
+        assert titles == ["Jazz Night", "Comedy Night"]
+
+    def test_entries_expire(self):
+        """Should treat pages older than the TTL as unknown."""
+        cache = PageCache(max_entries=10, ttl_seconds=0.01)
+        cache.store("https://a.com", [])
+        time.sleep(0.02)
+
+        assert cache.get("https://a.com") is None
+
+    def test_missing_url(self):
+        """Should not look up results without a URL."""
+        cache = PageCache(max_entries=10, ttl_seconds=60)
+        assert cache.get(None) is None
+        assert cache.store_extraction([{"content": "no url"}], []) == 0
+
+
+class TestMatchingEvents:
+    """Tests for matching_events."""
+
+    def test_filters_by_dates_cities_and_category(self):
+        """Should keep cached events of the query's dates, cities and category."""
+        weekend = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+        events = [
+            _event("Jazz Night", "https://a.com"),
+            _event("Jazz Brunch", "https://a.com", date="2025-01-10"),
+            _event("Jazz Cruise", "https://a.com", location="Riverside Theater, Milwaukee"),
+            _event("Comedy Night", "https://a.com"),
+        ]
+
+        kept = matching_events(events, ["chicago"], "music", weekend)
+
+        assert [e.title for e in kept] == ["Jazz Night"]
+        assert len(matching_events(events, [], None, None)) == 4
+        assert len(matching_events(events, ["chicago", "milwaukee"], None, weekend)) == 3
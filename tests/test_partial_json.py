@@ -0,0 +1,50 @@
+"""
+Tests for backend.app.utils.partialJson module.
+"""
+
+import json
+
+from backend.app.utils.partialJson import ArrayObjectParser
+
+
+def _feed_in_chunks(document: str, size: int) -> list[dict]:
+    parser = ArrayObjectParser()
+    objects = []
+    for start in range(0, len(document), size):
+        objects.extend(parser.feed(document[start : start + size]))
+    return objects
+
+
+class TestArrayObjectParser:
+    """Tests for ArrayObjectParser."""
+
+    def test_emits_each_object_when_it_closes(self):
+        """Should return an object as soon as its closing brace arrives."""
+        parser = ArrayObjectParser()
+
+        assert parser.feed('{"events": [{"title": "A"}, {"tit') == [{"title": "A"}]
+        assert parser.feed('le": "B"') == []
+        assert parser.feed("}]}") == [{"title": "B"}]
+
+    def test_handles_strings_escapes_and_nesting(self):
+        """Should ignore braces inside strings and keep nested values intact."""
+        events = [
+            {"title": 'Brace } and "quote" \\ [x]', "tags": [1, {"a": 2}]},
+            {"title": "[B]"},
+        ]
+        document = json.dumps({"events": events})
+
+        for size in (1, 3, 7, len(document)):
+            assert _feed_in_chunks(document, size) == events
+
+    def test_only_reads_first_array(self):
+        """Should stop after the first array closes and skip non-object elements."""
+        document = '{"events": ["x", {"title": "A"}], "other": [{"title": "B"}]}'
+
+        assert _feed_in_chunks(document, 4) == [{"title": "A"}]
+
+    def test_skips_malformed_objects(self):
+        """Should drop an element that is not valid JSON and keep parsing."""
+        document = '{"events": [{"title": A}, {"title": "B"}]}'
+
+        assert _feed_in_chunks(document, 5) == [{"title": "B"}]
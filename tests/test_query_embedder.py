@@ -0,0 +1,45 @@
+"""
+Tests for backend.app.utils.queryEmbedder module.
+"""
+
+import numpy as np
+
+from backend.app.utils.queryEmbedder import embed_query, query_terms
+
+
+class TestQueryTerms:
+    """Tests for query_terms."""
+
+    def test_drops_filler_and_date_words(self):
+        """Should keep only the words that describe what is searched for."""
+        assert query_terms("Stand-up comedy shows in Chicago this weekend") == [
+            "standup",
+            "comedy",
+            "chicago",
+        ]
+
+
+class TestEmbedQuery:
+    """Tests for embed_query."""
+
+    def test_is_normalized_and_deterministic(self):
+        """Should return the same unit-length vector for the same query."""
+        vector = embed_query("comedy chicago", dim=256)
+
+        assert vector.shape == (256,)
+        assert vector.dtype == np.float32
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+        assert np.array_equal(vector, embed_query("Comedy  Chicago!", dim=256))
+
+    def test_paraphrases_are_closer_than_different_queries(self):
+        """Paraphrases should score higher than queries for other events."""
+        query = embed_query("standup comedy chicago this weekend")
+        paraphrase = embed_query("comedy shows in Chicago this weekend")
+        other = embed_query("jazz concerts in Chicago this weekend")
+
+        assert float(query @ paraphrase) >= 0.8
+        assert float(query @ other) < 0.6
+
+    def test_empty_query_is_zero_vector(self):
+        """Should return a zero vector when no content words remain."""
+        assert not embed_query("events this weekend").any()
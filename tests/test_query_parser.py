@@ -0,0 +1,102 @@
+"""
+Tests for backend.app.utils.queryParser module.
+"""
+
+import pytest
+
+from backend.app.utils.queryParser import (
+    city_from_location,
+    content_terms,
+    extract_category,
+    extract_cities,
+    extract_city,
+    normalize_city,
+)
+
+
+class TestExtractCity:
+    """Tests for extract_city."""
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("Comedy shows in Chicago this weekend", "chicago"),
+            ("Jazz in New Orleans on Friday", "new orleans"),
+            ("concerts in new york city next week", "new york city"),
+            ("Markets near Austin in December", "austin"),
+        ],
+    )
+    def test_finds_city(self, query, expected):
+        """Should return the normalized city following 'in'/'near'."""
+        assert extract_city(query) == expected
+
+    def test_returns_none_without_location(self):
+        """Should return None when the query names no place."""
+        assert extract_city("Comedy shows this weekend") is None
+
+    def test_finds_every_city(self):
+        """Should return each city of a query naming several."""
+        assert extract_cities("food festivals in austin and dallas") == ["austin", "dallas"]
+        assert extract_cities("Jazz in Chicago, New Orleans or Memphis") == [
+            "chicago",
+            "new orleans",
+            "memphis",
+        ]
+        assert extract_cities("Markets near Austin in December") == ["austin"]
+
+
+class TestContentTerms:
+    """Tests for content_terms."""
+
+    def test_excludes_cities_and_singularizes(self):
+        """Should return the sorted, singular content words without the cities."""
+        assert content_terms("food festivals in austin and dallas") == ["festival", "food"]
+
+    def test_distinguishes_modifiers(self):
+        """Should keep the words that change what is searched for."""
+        assert content_terms("jazz concerts in chicago") != content_terms(
+            "rock concerts in chicago"
+        )
+
+
+class TestExtractCategory:
+    """Tests for extract_category."""
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("Stand-up comedy tonight", "comedy"),
+            ("Concerts in Chicago", "music"),
+            ("Electronic music festival in Barcelona", "music"),
+            ("Food festivals in Austin", "food"),
+            ("Street festivals in Austin", "festival"),
+        ],
+    )
+    def test_maps_keywords(self, query, expected):
+        """Should prefer specific categories over the generic festival category."""
+        assert extract_category(query) == expected
+
+    def test_returns_none_for_generic_query(self):
+        """Should return None for queries without category keywords."""
+        assert extract_category("Things to do in Chicago") is None
+
+
+class TestCityFromLocation:
+    """Tests for city_from_location and normalize_city."""
+
+    def test_parses_venue_city_state(self):
+        """Should skip state codes, zip codes and countries."""
+        assert city_from_location("Zanies, 1548 N Wells St, Chicago, IL 60610, USA") == "chicago"
+
+    def test_uses_hint_when_present(self):
+        """Should use the query's city when it appears in the location."""
+        assert city_from_location("Laugh Factory Chicago", hint="chicago") == "chicago"
+
+    def test_does_not_fall_back_to_hint(self):
+        """Should not file a location without a city part under the hint city."""
+        assert city_from_location("Online", hint="chicago") is None
+        assert city_from_location("Online") is None
+
+    def test_normalize_city(self):
+        """Should lowercase and collapse whitespace."""
+        assert normalize_city("  New   York. ") == "new york"
@@ -0,0 +1,196 @@
+"""
+Tests for backend.app.utils.refinement module.
+"""
+
+from datetime import date
+
+from backend.app.models.schemas import Event
+from backend.app.utils.refinement import (
+    Constraints,
+    answer_locally,
+    constraints_from_query,
+    covered_range,
+    plan_refinement,
+)
+
+TODAY = date(2024, 12, 20)  # Friday
+FIRST_QUERY = "comedy in Chicago this weekend"
+
+
+def _event(title: str, day: str, location: str, url: str, description: str = "") -> Event:
+    return Event(
+        title=title, date=day, location=location, description=description, url=url, score=0.8
+    )
+
+
+EVENTS = [
+    _event("Late Night Laughs", "2024-12-21 20:00", "Zanies", "https://zanies.com/chicago"),
+    _event("Improv Jam", "2024-12-21 21:00", "The Hideout", "https://hideout.com"),
+    _event("Sunday Standup", "2024-12-22 19:00", "Laugh Factory", "https://laughfactory.com"),
+]
+RAW_RESULTS = [
+    {
+        "url": "https://hideout.com",
+        "title": "The Hideout",
+        "content": "Improv Jam at The Hideout in Wicker Park, Dec 21. Free admission.",
+    },
+    {
+        "url": "https://zanies.com/chicago",
+        "title": "Zanies Chicago",
+        "content": "Late Night Laughs at Zanies in Old Town on December 21, tickets $25.",
+    },
+    {
+        "url": "https://laughfactory.com",
+        "title": "Laugh Factory",
+        "content": "Sunday Standup at Laugh Factory, Lakeview.",
+    },
+]
+
+
+def _session() -> Constraints:
+    return constraints_from_query(FIRST_QUERY, TODAY)
+
+
+class TestPlanRefinement:
+    """Tests for plan_refinement function."""
+
+    def test_weekday_inside_searched_range_is_local(self):
+        """Should narrow "this weekend" to its Saturday without searching."""
+        plan = plan_refinement("only Saturday", _session(), _session(), TODAY)
+        assert plan.mode == "local"
+        assert plan.constraints.date_range["start"] == plan.constraints.date_range["end"]
+        assert plan.constraints.date_range["start"] == "2024-12-21"
+        assert plan.query == "comedy in Chicago on December 21"
+
+    def test_weekday_is_anchored_in_searched_range(self):
+        """Should resolve "Sunday" after "next weekend" to that weekend's Sunday."""
+        covered = constraints_from_query("comedy in Chicago next weekend", TODAY)
+        plan = plan_refinement("what about Sunday", covered, covered, TODAY)
+        assert plan.mode == "local"
+        assert plan.constraints.date_range["start"] == "2024-12-29"
+
+    def test_place_and_keyword_narrowing_accumulate(self):
+        """Should keep earlier narrowing when a further follow-up arrives."""
+        covered = _session()
+        saturday = plan_refinement("only Saturday", covered, covered, TODAY).constraints
+        near = plan_refinement("near Wicker Park", saturday, covered, TODAY)
+        free = plan_refinement("free ones", near.constraints, covered, TODAY)
+
+        assert near.mode == free.mode == "local"
+        assert free.constraints.terms == ["wicker park", "free"]
+        assert free.constraints.date_range["start"] == "2024-12-21"
+        assert free.query == "comedy in Chicago on December 21 near Wicker Park free"
+
+    def test_known_place_in_results_narrows_instead_of_switching_city(self):
+        """Should treat "in Wicker Park" as a neighborhood when the results mention it."""
+        plan = plan_refinement(
+            "in Wicker Park", _session(), _session(), TODAY, known_places="The Hideout, Wicker Park"
+        )
+        assert plan.mode == "local"
+        assert plan.constraints.city == "chicago"
+        assert plan.constraints.places == ["Wicker Park"]
+
+    def test_new_city_category_or_dates_need_a_search(self):
+        """Should search for anything the last search did not cover."""
+        covered = _session()
+        austin = plan_refinement("in Austin instead", covered, covered, TODAY)
+        jazz = plan_refinement("what about jazz", covered, covered, TODAY)
+        later = plan_refinement("next weekend", covered, covered, TODAY)
+
+        assert (austin.mode, austin.query) == ("search", "comedy in Austin this weekend")
+        assert (jazz.mode, jazz.query) == ("search", "jazz in Chicago this weekend")
+        assert (later.mode, later.query) == ("search", "comedy in Chicago next weekend")
+        assert jazz.constraints.category == "music"
+
+    def test_time_of_day_and_comparatives_are_not_literal_terms(self):
+        """Should map "evening"/"later" to a time of day and "cheaper" to a price filter."""
+        covered = _session()
+        evening = plan_refinement("sunday evening", covered, covered, TODAY)
+        later = plan_refinement("later shows", covered, covered, TODAY)
+        cheaper = plan_refinement("cheaper ones", covered, covered, TODAY)
+        other = plan_refinement("something else", covered, covered, TODAY)
+
+        assert evening.mode == later.mode == cheaper.mode == "local"
+        assert (evening.constraints.time_of_day, evening.constraints.terms) == ("evening", [])
+        assert evening.constraints.date_range["start"] == "2024-12-22"
+        assert (later.constraints.time_of_day, later.constraints.terms) == ("later", [])
+        assert (cheaper.constraints.cheaper, cheaper.constraints.terms) == (True, [])
+        assert (cheaper.reason, cheaper.query) == ("narrowed price", f"{FIRST_QUERY} cheap")
+        assert other.reason == "no new constraints"
+
+    def test_comparatives_without_data_are_unsupported(self):
+        """Should not search "closer" or "bigger" follow-ups, but narrow "closer to <place>"."""
+        covered = _session()
+        closer = plan_refinement("something closer", covered, covered, TODAY)
+        bigger = plan_refinement("bigger venues on saturday", covered, covered, TODAY)
+        place = plan_refinement("closer to Wicker Park", covered, covered, TODAY)
+
+        assert closer.mode == bigger.mode == "unsupported"
+        assert "'closer'" in closer.reason
+        assert closer.query == FIRST_QUERY
+        assert (place.mode, place.constraints.terms) == ("local", ["wicker park"])
+
+
+class TestCoveredRange:
+    """Tests for covered_range function."""
+
+    def test_joins_touching_ranges(self):
+        """Should cover both ranges when the new one overlaps or follows the old one."""
+        this_weekend = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+        monday = {"start": "2024-12-23", "end": "2024-12-23", "expression": "monday"}
+        assert covered_range(this_weekend, monday) == {
+            "start": "2024-12-21",
+            "end": "2024-12-23",
+            "expression": "this weekend and monday",
+        }
+
+    def test_disjoint_ranges_keep_the_searched_one(self):
+        """Should not claim the days between two disjoint searches."""
+        this_weekend = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+        next_weekend = {"start": "2024-12-28", "end": "2024-12-29", "expression": "next weekend"}
+        assert covered_range(this_weekend, next_weekend) == next_weekend
+        assert covered_range(None, next_weekend) == next_weekend
+
+
+class TestAnswerLocally:
+    """Tests for answer_locally function."""
+
+    def test_filters_by_date_range(self):
+        """Should keep only the events of the narrowed dates."""
+        plan = plan_refinement("only Sunday", _session(), _session(), TODAY)
+        events = answer_locally(plan, EVENTS, RAW_RESULTS, "2024-12-20")
+        assert [e.title for e in events] == ["Sunday Standup"]
+
+    def test_filters_by_time_of_day(self):
+        """Should keep only the events starting at the asked time of day."""
+        plan = plan_refinement("later shows", _session(), _session(), TODAY)
+        events = answer_locally(plan, EVENTS, RAW_RESULTS, "2024-12-20")
+        assert [e.title for e in events] == ["Improv Jam"]
+
+    def test_cheaper_keeps_low_prices_cheapest_first(self):
+        """Should keep the events priced at or below the median, using source snippet prices."""
+        plan = plan_refinement("cheaper ones", _session(), _session(), TODAY)
+        priced = [
+            *EVENTS,
+            _event("Pricey Gala", "2024-12-21 19:00", "Chicago", "https://gala.com", "$80"),
+            _event("Open Mic", "2024-12-22 18:00", "Chicago", "https://mic.com", "$10 cover"),
+        ]
+        events = answer_locally(plan, priced, RAW_RESULTS, "2024-12-20")
+        assert [e.title for e in events] == ["Improv Jam", "Open Mic"]
+
+    def test_matches_terms_in_source_snippets(self):
+        """Should match a neighborhood named only in the event's source snippet."""
+        plan = plan_refinement("near Wicker Park", _session(), _session(), TODAY)
+        events = answer_locally(plan, EVENTS, RAW_RESULTS, "2024-12-20")
+        assert [e.title for e in events] == ["Improv Jam"]
+
+    def test_extracts_from_snippets_when_no_event_matches(self):
+        """Should fall back to rule-based extraction over the matching snippets."""
+        plan = plan_refinement("near Wicker Park", _session(), _session(), TODAY)
+        events = answer_locally(plan, [], RAW_RESULTS, "2024-12-20")
+        assert [(e.title, e.date[:10]) for e in events] == [("Improv Jam", "2024-12-21")]
+
+    def test_no_match(self):
+        """Should return nothing when neither events nor snippets match."""
+        plan = plan_refinement("near Hyde Park", _session(), _session(), TODAY)
+        assert answer_locally(plan, EVENTS, RAW_RESULTS, "2024-12-20") == []
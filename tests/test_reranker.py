@@ -0,0 +1,68 @@
+"""
+Tests for backend.app.utils.reranker module.
+"""
+
+from backend.app.utils.reranker import rerank, select_within_budget, snippet_tokens
+
+CURRENT_DATE = "2024-12-20"
+WEEKEND = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+
+
+def _snippet(title: str, content: str, url: str = "https://example.com") -> dict:
+    return {"title": title, "url": url, "content": content, "score": 0.5}
+
+
+class TestRerank:
+    """Tests for rerank function."""
+
+    def test_orders_by_query_relevance(self):
+        """Should rank the snippet matching the query, dates and city first."""
+        snippets = [
+            _snippet("Pizza guide", "The best deep dish in Chicago, ranked."),
+            _snippet("Comedy in Austin", "Stand-up comedy shows on December 21, 2024."),
+            _snippet("Chicago comedy", "Comedy shows in Chicago on December 21, 2024."),
+        ]
+        ranked = rerank(snippets, "Comedy shows in Chicago this weekend", CURRENT_DATE, WEEKEND)
+
+        assert [s["title"] for s, _ in ranked] == [
+            "Chicago comedy",
+            "Comedy in Austin",
+            "Pizza guide",
+        ]
+        assert ranked[0][1] > ranked[1][1] > ranked[2][1]
+
+    def test_dates_near_the_range_outrank_distant_ones(self):
+        """Should prefer snippets whose dates fall in or near the requested range."""
+        snippets = [
+            _snippet("Comedy shows", "Comedy shows on March 3, 2025."),
+            _snippet("Comedy shows", "Comedy shows on December 21, 2024."),
+        ]
+        ranked = rerank(snippets, "comedy shows", CURRENT_DATE, WEEKEND)
+
+        assert "December 21" in ranked[0][0]["content"]
+
+    def test_empty_input(self):
+        """Should return an empty list for no snippets."""
+        assert rerank([], "comedy", CURRENT_DATE) == []
+
+
+class TestSelectWithinBudget:
+    """Tests for select_within_budget function."""
+
+    def test_keeps_best_snippets_within_budget(self):
+        """Should skip snippets that do not fit and keep shorter ones further down."""
+        long_snippet = _snippet("Long", "x" * 400)
+        short_snippet = _snippet("Short", "y" * 40)
+        ranked = [(_snippet("Best", "z" * 40), 0.9), (long_snippet, 0.8), (short_snippet, 0.7)]
+        budget = snippet_tokens(ranked[0][0]) + snippet_tokens(short_snippet)
+
+        selected = select_within_budget(ranked, budget)
+
+        assert [s["title"] for s in selected] == ["Best", "Short"]
+
+    def test_always_keeps_min_snippets(self):
+        """Should keep the first min_snippets even when they exceed the budget."""
+        ranked = [(_snippet(f"S{i}", "x" * 400), 1.0 - i / 10) for i in range(4)]
+        selected = select_within_budget(ranked, token_budget=10, min_snippets=2)
+
+        assert [s["title"] for s in selected] == ["S0", "S1"]
@@ -0,0 +1,154 @@
+"""
+Tests for search retention: dbClient TTL indexes and compaction, and the RetentionJob.
+"""
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from backend.app.core import config, metrics
+from backend.app.core.dbClient import (
+    compact_raw_results,
+    ensure_checkpoint_indexes,
+    ensure_retention_indexes,
+)
+from backend.app.core.retention import RetentionJob
+
+NOW = datetime.datetime(2024, 12, 20, 3)
+
+
+class TestEnsureRetentionIndexes:
+    """Tests for ensure_retention_indexes."""
+
+    def test_creates_ttl_index_on_last_seen(self):
+        """Should expire searches SEARCH_RETENTION_DAYS after their last hit."""
+        collection = MagicMock()
+        with (
+            patch("backend.app.core.dbClient.get_db_collection", return_value=collection),
+            patch.object(config, "SEARCH_RETENTION_DAYS", 30),
+        ):
+            ensure_retention_indexes()
+
+        collection.create_index.assert_called_with("last_seen", expireAfterSeconds=30 * 86400)
+
+    def test_changes_existing_ttl_in_place(self):
+        """Should collMod the TTL index when it exists with another retention."""
+        collection = MagicMock()
+        collection.name = "searches"
+        collection.create_index.side_effect = [None, OperationFailure("IndexOptionsConflict")]
+        with (
+            patch("backend.app.core.dbClient.get_db_collection", return_value=collection),
+            patch.object(config, "SEARCH_RETENTION_DAYS", 7),
+        ):
+            ensure_retention_indexes()
+
+        collection.database.command.assert_called_once_with(
+            "collMod",
+            "searches",
+            index={"keyPattern": {"last_seen": 1}, "expireAfterSeconds": 7 * 86400},
+        )
+
+    def test_zero_days_keeps_searches(self):
+        """Should not create a TTL index when retention is 0."""
+        collection = MagicMock()
+        with (
+            patch("backend.app.core.dbClient.get_db_collection", return_value=collection),
+            patch.object(config, "SEARCH_RETENTION_DAYS", 0),
+        ):
+            ensure_retention_indexes()
+
+        collection.create_index.assert_called_once()
+        assert "expireAfterSeconds" not in collection.create_index.call_args[1]
+
+
+class TestEnsureCheckpointIndexes:
+    """Tests for ensure_checkpoint_indexes."""
+
+    def test_creates_ttl_index_on_every_collection(self):
+        """Should expire checkpoints, blobs and writes CHECKPOINT_TTL_HOURS after creation."""
+        collections: dict = {}
+        with (
+            patch(
+                "backend.app.core.dbClient.get_named_collection",
+                side_effect=lambda name: collections.setdefault(name, MagicMock()),
+            ),
+            patch.object(config, "CHECKPOINT_TTL_HOURS", 12),
+        ):
+            ensure_checkpoint_indexes("checkpoints")
+
+        for name in ("checkpoints", "checkpoints_blobs", "checkpoints_writes"):
+            collections[name].create_index.assert_called_with(
+                "created_at", expireAfterSeconds=12 * 3600
+            )
+
+    def test_zero_hours_keeps_checkpoints(self):
+        """Should only create the lookup indexes when the TTL is 0."""
+        collection = MagicMock()
+        with (
+            patch("backend.app.core.dbClient.get_named_collection", return_value=collection),
+            patch.object(config, "CHECKPOINT_TTL_HOURS", 0),
+        ):
+            ensure_checkpoint_indexes("checkpoints")
+
+        assert collection.create_index.call_count == 2
+        assert all("expireAfterSeconds" not in c[1] for c in collection.create_index.call_args_list)
+
+
+class TestCompactRawResults:
+    """Tests for compact_raw_results."""
+
+    def test_strips_old_payloads_in_batches(self):
+        """Should unset raw_results batch by batch and sum the reclaimed bytes."""
+        collection = MagicMock()
+        collection.aggregate.side_effect = [
+            [{"_id": "a", "raw_bytes": 4000}, {"_id": "b", "raw_bytes": 6000}],
+            [{"_id": "c", "raw_bytes": 1000}],
+        ]
+        with (
+            patch("backend.app.core.dbClient.get_db_collection", return_value=collection),
+            patch.object(config, "SEARCH_COMPACTION_BATCH_SIZE", 2),
+            patch.object(config, "SEARCH_RAW_RESULTS_RETENTION_DAYS", 7),
+        ):
+            summary = compact_raw_results(NOW)
+
+        assert summary == {"documents": 3, "batches": 2, "reclaimed_bytes": 11000}
+        pipeline = collection.aggregate.call_args[0][0]
+        assert pipeline[0]["$match"]["timestamp"] == {"$lt": NOW - datetime.timedelta(days=7)}
+        assert pipeline[1] == {"$limit": 2}
+        # First update_many backfills last_seen, then one per batch
+        backfill, first, second = collection.update_many.call_args_list
+        assert backfill[0][0] == {"last_seen": {"$exists": False}}
+        assert first[0][0] == {"_id": {"$in": ["a", "b"]}}
+        assert second[0][1] == {"$unset": {"raw_results": ""}, "$set": {"compacted_at": NOW}}
+
+    def test_nothing_to_compact(self):
+        """Should stop after an empty batch."""
+        collection = MagicMock()
+        collection.aggregate.return_value = []
+        with patch("backend.app.core.dbClient.get_db_collection", return_value=collection):
+            summary = compact_raw_results(NOW)
+
+        assert summary == {"documents": 0, "batches": 0, "reclaimed_bytes": 0}
+        assert collection.update_many.call_count == 1
+
+
+class TestRetentionJob:
+    """Tests for the RetentionJob class."""
+
+    @pytest.mark.asyncio
+    async def test_counts_reclaimed_bytes(self):
+        """Should report a compaction's documents and bytes in metrics."""
+        summary = {"documents": 3, "batches": 1, "reclaimed_bytes": 11000}
+        before = metrics.get_counter("retention.reclaimed_bytes")
+        with patch("backend.app.core.retention.compact_raw_results", return_value=summary):
+            assert await RetentionJob().compact_once(NOW) == summary
+
+        assert metrics.get_counter("retention.reclaimed_bytes") == before + 11000
+
+    @pytest.mark.asyncio
+    async def test_survives_mongodb_errors(self):
+        """Should log and return None when MongoDB is unavailable."""
+        with patch("backend.app.core.retention.compact_raw_results", side_effect=Exception("down")):
+            assert await RetentionJob().compact_once(NOW) is None
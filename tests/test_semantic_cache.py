@@ -0,0 +1,119 @@
+"""
+Tests for backend.app.core.semanticCache module.
+"""
+
+import pytest
+
+from backend.app.core.semanticCache import SemanticCache, cache_scope
+
+WEEKEND = ("2024-12-21", "2024-12-22")
+
+
+class TestCacheScope:
+    """Tests for cache_scope."""
+
+    def test_uses_resolved_dates(self):
+        """Should scope by start and end date, ignoring the matched expression."""
+        date_range = {"start": "2024-12-21", "end": "2024-12-22", "expression": "this weekend"}
+        assert cache_scope(date_range) == WEEKEND
+        assert cache_scope(None) is None
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache lookups."""
+
+    def test_reuses_response_for_paraphrase(self):
+        """Should return the cached response for a near-duplicate query."""
+        cache = SemanticCache(max_entries=10, threshold=0.8)
+        cache.store("comedy shows in Chicago this weekend", WEEKEND, {"events": [1]})
+
+        hit = cache.lookup("chicago comedy show this weekend", WEEKEND)
+
+        assert hit is not None
+        assert hit.value == {"events": [1]}
+        assert hit.cached_query == "comedy shows in Chicago this weekend"
+        assert hit.similarity >= 0.8
+
+    def test_scoped_to_date_range(self):
+        """Should not reuse a response cached for other dates."""
+        cache = SemanticCache(max_entries=10, threshold=0.8)
+        cache.store("comedy shows in Chicago", WEEKEND, {"events": [1]})
+
+        assert cache.lookup("comedy shows in Chicago", ("2024-12-28", "2024-12-29")) is None
+        assert cache.lookup("comedy shows in Chicago", None) is None
+
+    def test_misses_below_threshold(self):
+        """Should not reuse a response for a different kind of event."""
+        cache = SemanticCache(max_entries=10, threshold=0.8)
+        cache.store("comedy shows in Chicago", WEEKEND, {"events": [1]})
+
+        assert cache.lookup("jazz concerts in Chicago", WEEKEND) is None
+
+    def test_guards_against_different_city(self):
+        """Should not reuse a response for another city even when similarity is high."""
+        cache = SemanticCache(max_entries=10, threshold=0.1)
+        cache.store("comedy shows in Chicago", WEEKEND, {"events": [1]})
+
+        assert cache.lookup("comedy shows in Austin", WEEKEND) is None
+
+    @pytest.mark.parametrize(
+        "cached,query",
+        [
+            ("outdoor concerts in chicago", "indoor concerts in chicago"),
+            ("concerts in chicago", "free concerts in chicago"),
+            ("free concerts in chicago", "concerts in chicago"),
+            ("food festivals in austin", "food festivals in austin and dallas"),
+            ("food festivals in austin and dallas", "food festivals in austin"),
+        ],
+    )
+    def test_guards_against_different_terms_or_cities(self, cached, query):
+        """Should not reuse a response for a query with other content terms or cities."""
+        cache = SemanticCache(max_entries=10, threshold=0.8)
+        cache.store(cached, WEEKEND, {"events": [1]})
+
+        assert cache.lookup(query, WEEKEND) is None
+
+    def test_evicts_oldest_when_full(self):
+        """Should overwrite the oldest row once capacity is reached."""
+        cache = SemanticCache(max_entries=2, threshold=0.8)
+        cache.store("comedy shows in Chicago", WEEKEND, "comedy")
+        cache.store("jazz concerts in Chicago", WEEKEND, "jazz")
+        cache.store("art exhibitions in Chicago", WEEKEND, "art")
+
+        assert len(cache) == 2
+        assert cache.lookup("comedy shows in Chicago", WEEKEND) is None
+        assert cache.lookup("art exhibitions in Chicago", WEEKEND).value == "art"
+
+    def test_same_query_replaces_entry(self):
+        """Should update the existing row when the same query is stored again."""
+        cache = SemanticCache(max_entries=10, threshold=0.8)
+        cache.store("comedy shows in Chicago", WEEKEND, "old")
+        cache.store("Comedy shows in Chicago", WEEKEND, "new")
+
+        assert len(cache) == 1
+        assert cache.lookup("comedy shows in chicago", WEEKEND).value == "new"
+
+    def test_expired_entries_are_ignored(self, monkeypatch):
+        """Should skip entries older than ttl_seconds."""
+        from backend.app.core import semanticCache
+
+        cache = SemanticCache(max_entries=10, threshold=0.8, ttl_seconds=60)
+        cache.store("comedy shows in Chicago", WEEKEND, "value")
+
+        now = semanticCache.time.monotonic()
+        monkeypatch.setattr(semanticCache.time, "monotonic", lambda: now + 120)
+
+        assert cache.lookup("comedy shows in Chicago", WEEKEND) is None
+
+    def test_per_entry_ttl_and_min_ttl(self, monkeypatch):
+        """Should honour a per-entry TTL and skip entries expiring within min_ttl_seconds."""
+        from backend.app.core import semanticCache
+
+        cache = SemanticCache(max_entries=10, threshold=0.8, ttl_seconds=60)
+        cache.store("comedy shows in Chicago", WEEKEND, "warm", ttl_seconds=3600)
+
+        now = semanticCache.time.monotonic()
+        monkeypatch.setattr(semanticCache.time, "monotonic", lambda: now + 120)
+
+        assert cache.lookup("comedy shows in Chicago", WEEKEND).value == "warm"
+        assert cache.lookup("comedy shows in Chicago", WEEKEND, min_ttl_seconds=3500) is None
@@ -0,0 +1,106 @@
+"""
+Tests for backend.app.utils.snippetCleaner module.
+"""
+
+from backend.app.utils.snippetCleaner import clean_snippets, normalize_text
+
+NAV = "Home\nEvents\nContact"
+FOOTER = "Sign up for our newsletter to get the latest listings."
+
+
+def _result(content: str, url: str = "https://example.com") -> dict:
+    return {"title": "Listings", "url": url, "content": content, "score": 0.7}
+
+
+class TestNormalizeText:
+    """Tests for normalize_text function."""
+
+    def test_normalizes_unicode_and_whitespace(self):
+        """Should fold compatibility characters, drop zero-width ones and collapse spaces."""
+        text = "Jazz\u00a0\u00a0Night\u200b  at  The\tHideout\n\n\n  \ufb01nal   show  "
+        assert normalize_text(text) == "Jazz Night at The Hideout\nfinal show"
+
+    def test_strips_markdown_links(self):
+        """Should keep link text and drop the URL."""
+        assert normalize_text("[Buy tickets](https://tix.example.com/123) now") == "Buy tickets now"
+
+
+class TestCleanSnippets:
+    """Tests for clean_snippets function."""
+
+    def test_drops_site_chrome_and_menu_lines(self):
+        """Should remove cookie banners, menus and footers but keep event lines."""
+        content = (
+            f"{NAV}\nWe use cookies to improve your experience. Accept all\n"
+            "Robbie Fulks plays The Hideout on December 21, 2024 at 8pm.\n"
+            f"{FOOTER}"
+        )
+        cleaned, _ = clean_snippets([_result(content)])
+
+        assert (
+            cleaned[0]["content"] == "Robbie Fulks plays The Hideout on December 21, 2024 at 8pm."
+        )
+
+    def test_keeps_event_lines_with_chrome_words(self):
+        """Should only drop lines that are entirely site chrome."""
+        content = (
+            "Sign in | Sign up | Share this\n"
+            "Milk & Cookies Comedy Night — tickets available\n"
+            "Subscribe to the Jazz Showcase podcast for weekly interviews\n"
+            "© 2024 Chicago Reader. All rights reserved."
+        )
+        cleaned, _ = clean_snippets([_result(content)])
+
+        assert cleaned[0]["content"] == (
+            "Milk & Cookies Comedy Night — tickets available\n"
+            "Subscribe to the Jazz Showcase podcast for weekly interviews"
+        )
+
+    def test_drops_lines_repeated_across_documents(self):
+        """Should treat a line shared by min_docs results as boilerplate."""
+        shared = "The best guide to the city's arts and culture scene"
+        results = [
+            _result(f"{shared}\nComedy night on December {day}, 2024.", url=f"https://s{day}.com")
+            for day in (21, 22, 23)
+        ]
+        cleaned, _ = clean_snippets(results, min_docs=3)
+
+        assert [r["content"] for r in cleaned] == [
+            f"Comedy night on December {day}, 2024." for day in (21, 22, 23)
+        ]
+        two, _ = clean_snippets(results[:2], min_docs=3)
+        assert shared in two[0]["content"]
+
+    def test_keeps_sentences_around_dates_and_venues(self):
+        """Should keep only the sentences next to a date or venue mention."""
+        content = (
+            "Our history goes back to 1950. The founders loved music. "
+            "Many legends played here over the years. Tickets go fast. "
+            "Patricia Barber Quartet returns December 27, 2024. Doors open early. "
+            "Parking is available nearby. The neighborhood has great restaurants."
+        )
+        cleaned, _ = clean_snippets([_result(content)], context=1)
+
+        assert cleaned[0]["content"] == (
+            "Tickets go fast. Patricia Barber Quartet returns December 27, 2024. Doors open early."
+        )
+
+    def test_keeps_content_without_event_mentions(self):
+        """Should leave content without dates or venues to the pre-filter."""
+        content = "Find the best events happening in Chicago..."
+        cleaned, _ = clean_snippets([_result(content)])
+
+        assert cleaned[0]["content"] == content
+
+    def test_reports_bytes_in_and_out(self):
+        """Should report the content size before and after cleaning."""
+        content = f"{NAV}\nJazz at The Green Mill, December 21, 2024.\n{FOOTER}"
+        results = [_result(content)]
+        cleaned, stats = clean_snippets(results)
+
+        assert stats == {
+            "bytes_in": len(content.encode()),
+            "bytes_out": len(cleaned[0]["content"].encode()),
+        }
+        assert stats["bytes_out"] < stats["bytes_in"]
+        assert results[0]["content"] == content